@@ -52,6 +52,9 @@ class AdversarialConfig:
     enable_mutation: bool = True
     max_mutants: int = 30
     mutation_timeout_per_mutant: int = 30
+    mutation_workers: Optional[int] = None  # Defaults to available CPUs
+    mutation_coverage_guided: bool = True  # Only run tests covering each mutant
+    mutation_sandbox_root: Optional[Path] = None  # Copied into each sandbox; must hold the tests
 
     # Property testing settings
     enable_property: bool = True
@@ -178,7 +181,9 @@ class AdversarialRunner:
 
         self.mutation_tester = MutationTester(
             max_mutants=self.config.max_mutants,
-            timeout_per_mutant=self.config.mutation_timeout_per_mutant
+            timeout_per_mutant=self.config.mutation_timeout_per_mutant,
+            max_workers=self.config.mutation_workers,
+            coverage_guided=self.config.mutation_coverage_guided
         ) if self.config.enable_mutation else None
 
         self.property_tester = PropertyTester(
@@ -200,7 +205,8 @@ class AdversarialRunner:
         specification: str = "",
         function_names: Optional[List[str]] = None,
         self_test_findings: int = 0,
-        progress_callback: Optional[Callable[[str], None]] = None
+        progress_callback: Optional[Callable[[str], None]] = None,
+        mutation_sandbox_root: Optional[Path] = None
     ) -> AdversarialResults:
         """
         Run the complete adversarial testing suite.
@@ -212,12 +218,17 @@ class AdversarialRunner:
             function_names: Specific functions to property test (auto-detected if not provided)
             self_test_findings: Number of issues found by self-tests (for metrics)
             progress_callback: Optional callback for progress updates
+            mutation_sandbox_root: Directory copied into each mutation
+                sandbox, containing code_path and the tests the test command
+                runs (default: config.mutation_sandbox_root, then the
+                file's directory)
 
         Returns:
             AdversarialResults with complete report
         """
         start_time = datetime.now()
         code_path = Path(code_path)
+        sandbox_root = mutation_sandbox_root or self.config.mutation_sandbox_root
 
         results = AdversarialResults(
             config=self.config,
@@ -247,12 +258,12 @@ class AdversarialRunner:
         if self.config.enable_parallel and self.config.max_workers > 1:
             self._run_parallel(
                 results, code, code_path, test_command, specification,
-                function_names, log_progress
+                function_names, log_progress, sandbox_root
             )
         else:
             self._run_sequential(
                 results, code, code_path, test_command, specification,
-                function_names, log_progress
+                function_names, log_progress, sandbox_root
             )
 
         # Compute epistemic score
@@ -283,7 +294,8 @@ class AdversarialRunner:
         test_command: str,
         specification: str,
         function_names: Optional[List[str]],
-        log_progress: Callable[[str], None]
+        log_progress: Callable[[str], None],
+        sandbox_root: Optional[Path] = None
     ):
         """Run all components sequentially."""
 
@@ -306,9 +318,12 @@ class AdversarialRunner:
             try:
                 results.report.mutation_result = self.mutation_tester.run_mutation_testing(
                     code_path=code_path,
-                    test_command=test_command
+                    test_command=test_command,
+                    sandbox_root=sandbox_root
                 )
-                if results.report.mutation_result.score:
+                if not results.report.mutation_result.success:
+                    results.errors.append(f"Mutation testing failed: {results.report.mutation_result.error}")
+                elif results.report.mutation_result.score:
                     log_progress(f"Mutation score: {results.report.mutation_result.score.score:.0%}")
             except Exception as e:
                 results.errors.append(f"Mutation testing failed: {e}")
@@ -359,7 +374,8 @@ class AdversarialRunner:
         test_command: str,
         specification: str,
         function_names: Optional[List[str]],
-        log_progress: Callable[[str], None]
+        log_progress: Callable[[str], None],
+        sandbox_root: Optional[Path] = None
     ):
         """Run components in parallel where possible."""
 
@@ -400,15 +416,18 @@ class AdversarialRunner:
                 except Exception as e:
                     results.errors.append(f"{name} failed: {e}")
 
-        # Run mutation testing (modifies files, must be sequential)
+        # Run mutation testing (parallel across mutants in its own sandboxes)
         if self.mutation_tester and self.config.enable_mutation and test_command:
             log_progress("Running mutation testing...")
             try:
                 results.report.mutation_result = self.mutation_tester.run_mutation_testing(
                     code_path=code_path,
-                    test_command=test_command
+                    test_command=test_command,
+                    sandbox_root=sandbox_root
                 )
-                if results.report.mutation_result.score:
+                if not results.report.mutation_result.success:
+                    results.errors.append(f"Mutation testing failed: {results.report.mutation_result.error}")
+                elif results.report.mutation_result.score:
                     log_progress(f"Mutation score: {results.report.mutation_result.score.score:.0%}")
             except Exception as e:
                 results.errors.append(f"Mutation testing failed: {e}")
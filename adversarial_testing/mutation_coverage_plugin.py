@@ -0,0 +1,89 @@
+"""
+Mutation Coverage Plugin - pytest plugin loaded into mutation test runs.
+
+Not imported by adversarial_testing: MutationTester copies this file next
+to each sandbox and loads it with "-p mutation_coverage_plugin", so it
+must only depend on the standard library.
+
+Two modes, selected by environment variables:
+- MUTATION_COVERAGE_TARGET / MUTATION_COVERAGE_OUTPUT: record the lines of
+  the target file executed by each test (and at import time, outside of
+  any test) and write them to the output file as JSON
+- MUTATION_SELECT_TESTS: only run the test node IDs listed in this file
+"""
+
+import json
+import os
+import sys
+import threading
+
+import pytest
+
+_target = os.environ.get("MUTATION_COVERAGE_TARGET")
+_target = os.path.realpath(_target) if _target else None
+_output = os.environ.get("MUTATION_COVERAGE_OUTPUT")
+_select = os.environ.get("MUTATION_SELECT_TESTS")
+
+_import_lines = set()
+_test_lines = {}
+_current = _import_lines
+_is_target = {}  # co_filename -> bool
+
+
+def _trace_lines(frame, event, arg):
+    if event == "line":
+        _current.add(frame.f_lineno)
+    return _trace_lines
+
+
+def _trace_calls(frame, event, arg):
+    filename = frame.f_code.co_filename
+    is_target = _is_target.get(filename)
+    if is_target is None:
+        is_target = _is_target[filename] = os.path.realpath(filename) == _target
+    if is_target:
+        _current.add(frame.f_lineno)
+        return _trace_lines
+    return None
+
+
+def pytest_sessionstart(session):
+    if _target and _output:
+        threading.settrace(_trace_calls)
+        sys.settrace(_trace_calls)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    global _current
+    if not (_target and _output):
+        yield
+        return
+    _current = _test_lines.setdefault(item.nodeid, set())
+    try:
+        yield
+    finally:
+        _current = _import_lines
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not (_target and _output):
+        return
+    sys.settrace(None)
+    threading.settrace(None)
+    with open(_output, "w") as f:
+        json.dump({
+            "import_lines": sorted(_import_lines),
+            "tests": {nodeid: sorted(lines) for nodeid, lines in _test_lines.items()},
+        }, f)
+
+
+def pytest_collection_modifyitems(session, config, items):
+    if not _select:
+        return
+    with open(_select) as f:
+        selected = set(f.read().splitlines())
+    deselected = [item for item in items if item.nodeid not in selected]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in selected]
@@ -7,21 +7,56 @@ being 'proven,' but by surviving rigorous attempts to disprove them.
 The key insight: "If a mutant is introduced, this normally causes a bug in
 the program's functionality which the tests should find. This way, the tests
 are tested."
+
+Mutants never touch the original file: each worker runs them in its own
+sandbox copy of the code, so mutants are tested in parallel (one test
+process per available core by default).
 """
 
 import ast
 import copy
+import os
+import queue
+import shutil
+import signal
 import subprocess
 import tempfile
 import hashlib
+import json
 import random
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import datetime
 from enum import Enum
 
 
+# pytest plugin recording per-test line coverage (see mutation_coverage_plugin.py)
+COVERAGE_PLUGIN = Path(__file__).parent / "mutation_coverage_plugin.py"
+
+# Coverage guidance is dropped when more mutants than this share are uncovered
+MAX_UNCOVERED_RATIO = 0.5
+
+# Not copied into sandboxes
+SANDBOX_IGNORE = shutil.ignore_patterns(
+    '.git', '__pycache__', '*.pyc', '.pytest_cache', '.mypy_cache', '.tox', '.venv', 'venv', 'node_modules'
+)
+
+
+class BaselineTestFailure(RuntimeError):
+    """The tests fail (or time out) on the unmutated code in a sandbox."""
+
+
+def available_cpus() -> int:
+    """Number of CPUs this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
 class MutantOperator(Enum):
     """Types of mutation operators."""
     # Arithmetic operators
@@ -60,6 +95,7 @@ class Mutant:
     killed: bool = False
     error: Optional[str] = None
     test_output: str = ""
+    covered: Optional[bool] = None  # False: no test executes its line, not run
 
 
 @dataclass
@@ -70,6 +106,7 @@ class MutationScore:
     survived_mutants: int
     error_mutants: int
     score: float  # killed / (total - errors)
+    not_covered_mutants: int = 0  # Survived without running (included in survived)
     survived_details: List[Mutant] = field(default_factory=list)
 
     @property
@@ -103,7 +140,8 @@ class MutationResult:
                     "location": m.location,
                     "description": m.description,
                     "killed": m.killed,
-                    "error": m.error
+                    "error": m.error,
+                    "covered": m.covered
                 }
                 for m in self.mutants
             ],
@@ -112,6 +150,7 @@ class MutationResult:
                 "killed": self.score.killed_mutants,
                 "survived": self.score.survived_mutants,
                 "errors": self.score.error_mutants,
+                "not_covered": self.score.not_covered_mutants,
                 "score": self.score.score
             } if self.score else None,
             "success": self.success,
@@ -303,6 +342,55 @@ class PythonMutator(ast.NodeTransformer):
         return node
 
 
+class MutantSandbox:
+    """
+    Private copy of the code under test for running mutants.
+
+    The sandbox root directory is copied once; mutants are then written
+    over the copy of the target file and the original content is put back
+    between runs. Tests run from the copy of the target's directory, with
+    the copy (and its parent) first on PYTHONPATH, so a package under test
+    resolves to the copy rather than to an installed one. Tests must not
+    import the code under test by absolute file path.
+    """
+
+    def __init__(self, root: Path, target: Path):
+        """
+        Create the sandbox.
+
+        Args:
+            root: Directory to copy (must contain target)
+            target: File that mutants replace
+        """
+        self._tmp = tempfile.TemporaryDirectory(prefix="mutants_")
+        self.path = Path(self._tmp.name) / root.name
+        shutil.copytree(root, self.path, ignore=SANDBOX_IGNORE, symlinks=True)
+        self.target = self.path / target.relative_to(root)
+        self.cwd = self.target.parent
+        # The root itself may be the package, or hold it
+        self.import_paths = [str(self.path), str(self.path.parent)]
+        self._original_code = target.read_text()
+
+        # Scratch files and the coverage plugin live outside the copy
+        self.scratch = Path(self._tmp.name) / "scratch"
+        self.scratch.mkdir()
+        shutil.copy(COVERAGE_PLUGIN, self.scratch)
+
+    def install(self, code: str) -> None:
+        """Write code to the sandboxed target."""
+        tmp = self.target.with_name(f".{self.target.name}.tmp")
+        tmp.write_text(code)
+        os.replace(tmp, self.target)
+
+    def restore(self) -> None:
+        """Put the original code back."""
+        self.install(self._original_code)
+
+    def close(self) -> None:
+        """Delete the sandbox."""
+        self._tmp.cleanup()
+
+
 class MutationTester:
     """
     Runs mutation testing on Python code.
@@ -310,15 +398,32 @@ class MutationTester:
     Process:
     1. Parse the source code into AST
     2. Generate mutants by applying mutation operators
-    3. Run tests against each mutant
+    3. Run tests against each mutant, in parallel sandboxes
     4. Calculate mutation score (killed / total)
+
+    pytest commands get "-x --ff": a run stops at the first failing test,
+    and each sandbox's pytest cache puts the tests that killed its previous
+    mutant first. Mutants are tested in line order, so consecutive mutants
+    in a sandbox tend to be killed by the same tests.
+
+    With coverage guidance (pytest only), the tests are first run once on
+    the original code, recording which lines of the file each test
+    executes. Mutants on lines no test executes survive without being run
+    (covered=False), and every other mutant only runs the tests covering
+    its line. Lines executed at import time run all tests. Code executed in
+    subprocesses is not traced, so every mutant runs all tests when the
+    traced run executes no line of the file or leaves most mutants
+    uncovered (more than MAX_UNCOVERED_RATIO).
     """
 
     def __init__(
         self,
         max_mutants: int = 50,
         timeout_per_mutant: int = 30,
-        sample_ratio: float = 1.0
+        sample_ratio: float = 1.0,
+        max_workers: Optional[int] = None,
+        fail_fast: bool = True,
+        coverage_guided: bool = True
     ):
         """
         Initialize mutation tester.
@@ -327,10 +432,16 @@ class MutationTester:
             max_mutants: Maximum number of mutants to generate
             timeout_per_mutant: Timeout for each test run in seconds
             sample_ratio: Ratio of mutants to actually test (for sampling)
+            max_workers: Mutants tested in parallel (default: available CPUs)
+            fail_fast: Stop pytest runs at the first failure, likely killers first
+            coverage_guided: Skip uncovered mutants and only run covering tests
         """
         self.max_mutants = max_mutants
         self.timeout_per_mutant = timeout_per_mutant
         self.sample_ratio = sample_ratio
+        self.max_workers = max_workers or available_cpus()
+        self.fail_fast = fail_fast
+        self.coverage_guided = coverage_guided
         self.mutator = PythonMutator()
 
     def generate_mutants(self, code: str) -> List[Mutant]:
@@ -351,13 +462,14 @@ class MutationTester:
         # Collect all possible mutations
         mutations = self.mutator.collect_mutations(tree)
 
-        # Sample if needed
-        if len(mutations) > self.max_mutants:
-            mutations = random.sample(mutations, self.max_mutants)
+        # Sample if needed, keeping each mutation's index in the tree
+        indexed = list(enumerate(mutations))
+        if len(indexed) > self.max_mutants:
+            indexed = random.sample(indexed, self.max_mutants)
 
         # Generate actual mutants
         mutants = []
-        for i, (op_type, line, desc) in enumerate(mutations):
+        for i, (op_type, line, desc) in indexed:
             try:
                 # Re-parse for each mutation (to get fresh tree)
                 tree = ast.parse(code)
@@ -387,7 +499,9 @@ class MutationTester:
         self,
         mutant: Mutant,
         test_command: str,
-        original_file: Path
+        original_file: Path,
+        sandbox: Optional[MutantSandbox] = None,
+        tests: Optional[List[str]] = None
     ) -> Mutant:
         """
         Test a single mutant by running tests against it.
@@ -396,40 +510,31 @@ class MutationTester:
             mutant: The mutant to test
             test_command: Command to run tests (e.g., "pytest tests/")
             original_file: Path to the original file being mutated
+            sandbox: Sandbox to run in (default: a temporary copy of the
+                file's directory)
+            tests: pytest node IDs to run (default: all tests of the command)
 
         Returns:
             Updated Mutant with killed status
         """
-        with tempfile.NamedTemporaryFile(
-            mode='w',
-            suffix='.py',
-            delete=False,
-            dir=original_file.parent
-        ) as tmp:
-            tmp.write(mutant.mutated_code)
-            tmp_path = Path(tmp.name)
-
+        own_sandbox = sandbox is None
         try:
-            # Backup original file
-            original_code = original_file.read_text()
-
-            # Replace with mutant
-            original_file.write_text(mutant.mutated_code)
-
-            # Run tests
-            result = subprocess.run(
-                test_command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout_per_mutant,
-                cwd=original_file.parent
+            if own_sandbox:
+                original_file = Path(original_file)
+                sandbox = MutantSandbox(original_file.parent, original_file)
+            env = {}
+            if tests and self._is_pytest(test_command):
+                selection = sandbox.scratch / "selected_tests.txt"
+                selection.write_text("\n".join(tests))
+                env["MUTATION_SELECT_TESTS"] = str(selection)
+
+            sandbox.install(mutant.mutated_code)
+            returncode, mutant.test_output = self._run_tests(
+                self._test_command(test_command, plugin=bool(env)), sandbox, env
             )
 
-            mutant.test_output = result.stdout + result.stderr
-
             # If tests fail, mutant is killed
-            if result.returncode != 0:
+            if returncode != 0:
                 mutant.killed = True
             else:
                 mutant.killed = False  # Mutant survived - tests didn't catch it!
@@ -440,24 +545,258 @@ class MutationTester:
         except Exception as e:
             mutant.error = str(e)
         finally:
-            # Restore original file
-            original_file.write_text(original_code)
-            # Clean up temp file
-            tmp_path.unlink(missing_ok=True)
+            if sandbox is not None:
+                if own_sandbox:
+                    sandbox.close()
+                else:
+                    sandbox.restore()
 
         return mutant
 
+    @staticmethod
+    def _is_pytest(test_command: str) -> bool:
+        """True for a plain pytest invocation that options can be appended to."""
+        if any(op in test_command for op in ('|', '&', ';', '>')):
+            return False
+        words = test_command.split()
+        return bool(words) and (Path(words[0]).name == "pytest" or words[1:3] == ["-m", "pytest"])
+
+    def _test_command(self, test_command: str, fail_fast: Optional[bool] = None,
+                      plugin: bool = False) -> str:
+        """Add the mutation options to plain pytest commands."""
+        if not self._is_pytest(test_command):
+            return test_command
+        if plugin:
+            test_command += f" -p {COVERAGE_PLUGIN.stem}"
+        if self.fail_fast if fail_fast is None else fail_fast:
+            test_command += " -x --ff"
+        return test_command
+
+    def _run_tests(self, command: str, sandbox: MutantSandbox,
+                   env: Optional[Dict[str, str]] = None) -> Tuple[int, str]:
+        """Run the test command in a sandbox; on timeout the whole process group is killed."""
+        # Mutants can have the same size and mtime as the original, which
+        # would make Python reuse the original's bytecode
+        env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1", **(env or {}))
+        paths = list(sandbox.import_paths)
+        if env.keys() & {"MUTATION_SELECT_TESTS", "MUTATION_COVERAGE_OUTPUT"}:
+            paths.insert(0, str(sandbox.scratch))
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, paths + [env.get("PYTHONPATH")]))
+        process = subprocess.Popen(
+            command,
+            shell=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            cwd=sandbox.cwd,
+            env=env,
+            start_new_session=True
+        )
+        try:
+            stdout, stderr = process.communicate(timeout=self.timeout_per_mutant)
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            process.communicate()
+            raise
+        return process.returncode, stdout + stderr
+
+    def collect_coverage(self, sandbox: MutantSandbox, test_command: str) -> Optional[Dict[str, Any]]:
+        """
+        Run the tests once on the original code, recording line coverage per test.
+
+        Args:
+            sandbox: Sandbox holding the original code
+            test_command: pytest command
+
+        Returns:
+            {"import_lines": [...], "tests": {node_id: [lines]}}, or None if
+            the tests could not be traced, executed no line of the file in
+            the test process, or fail on the original code
+        """
+        if not self._is_pytest(test_command):
+            return None
+        output = sandbox.scratch / "coverage.json"
+        env = {
+            "MUTATION_COVERAGE_TARGET": str(sandbox.target),
+            "MUTATION_COVERAGE_OUTPUT": str(output)
+        }
+        try:
+            with_plugin = self._test_command(test_command, fail_fast=False, plugin=True)
+            returncode, _ = self._run_tests(with_plugin, sandbox, env)
+        except subprocess.TimeoutExpired:
+            return None
+        if returncode != 0 or not output.exists():
+            return None
+        with open(output) as f:
+            coverage = json.load(f)
+        if not any(coverage["tests"].values()):
+            return None  # Tested through subprocesses, which are not traced
+        return coverage
+
+    @staticmethod
+    def _statement_lines(code: str) -> Dict[int, int]:
+        """Map each line to the first line of the innermost statement containing it."""
+        spans: Dict[int, Tuple[int, int]] = {}
+        for node in ast.walk(ast.parse(code)):
+            if isinstance(node, ast.stmt):
+                end = getattr(node, 'end_lineno', None) or node.lineno
+                for line in range(node.lineno, end + 1):
+                    span = spans.get(line)
+                    if span is None or end - node.lineno < span[1] - span[0]:
+                        spans[line] = (node.lineno, end)
+        return {line: span[0] for line, span in spans.items()}
+
+    def select_tests(self, mutants: List[Mutant],
+                     coverage: Dict[str, Any]) -> Dict[str, Optional[List[str]]]:
+        """
+        Tests to run per mutant from the coverage pre-pass.
+
+        Returns:
+            mutant ID -> covering node IDs ([] if not covered, None to run all)
+        """
+        line_tests: Dict[int, Set[str]] = defaultdict(set)
+        for node_id, lines in coverage["tests"].items():
+            for line in lines:
+                line_tests[line].add(node_id)
+        import_lines = set(coverage["import_lines"])
+        statements = self._statement_lines(mutants[0].original_code) if mutants else {}
+
+        selection: Dict[str, Optional[List[str]]] = {}
+        for mutant in mutants:
+            line = int(mutant.location.split(":")[-1] or 0)
+            lines = {line, statements.get(line, line)}
+            if not line or lines & import_lines:
+                selection[mutant.id] = None
+            else:
+                selection[mutant.id] = sorted(set().union(*(line_tests.get(l, ()) for l in lines)))
+        return selection
+
+    def check_baseline(self, sandbox: MutantSandbox, test_command: str) -> None:
+        """
+        Run the tests on the unmutated code in a sandbox.
+
+        Raises:
+            BaselineTestFailure: If they fail or time out. Every mutant would
+                count as killed, e.g. because tests outside the sandbox root
+                are missing from the copy
+        """
+        try:
+            returncode, output = self._run_tests(self._test_command(test_command), sandbox)
+        except subprocess.TimeoutExpired:
+            raise BaselineTestFailure(
+                f"Tests time out on the unmutated code (limit {self.timeout_per_mutant}s)"
+            )
+        if returncode != 0:
+            raise BaselineTestFailure(
+                f"Tests fail on the unmutated code in the sandbox (is the sandbox root "
+                f"missing tests or fixtures?):\n{output[-2000:]}"
+            )
+
+    def test_mutants(
+        self,
+        mutants: List[Mutant],
+        test_command: str,
+        code_path: Path,
+        sandbox_root: Optional[Path] = None
+    ) -> List[Mutant]:
+        """
+        Test mutants in parallel, one sandbox per worker.
+
+        The tests are first run on the unmutated code in a sandbox (together
+        with the coverage pre-pass when coverage guided).
+
+        Args:
+            mutants: Mutants to test
+            test_command: Command to run tests
+            code_path: Path to the original file being mutated
+            sandbox_root: Directory copied into each sandbox (default: the
+                file's directory); must contain the tests
+
+        Returns:
+            The mutants, updated with their killed status
+
+        Raises:
+            BaselineTestFailure: If the tests fail on the unmutated code
+        """
+        code_path = Path(code_path).resolve()
+        root = Path(sandbox_root).resolve() if sandbox_root else code_path.parent
+        if root not in code_path.parents:
+            raise ValueError(f"{code_path} is not inside the sandbox root {root}")
+        sandboxes: "queue.Queue[MutantSandbox]" = queue.Queue()
+        created: List[MutantSandbox] = []
+
+        def get_sandbox() -> MutantSandbox:
+            try:
+                return sandboxes.get_nowait()
+            except queue.Empty:
+                # At most one sandbox per worker is ever created
+                sandbox = MutantSandbox(root, code_path)
+                created.append(sandbox)
+                return sandbox
+
+        selection: Dict[str, Optional[List[str]]] = {}
+
+        def run(mutant: Mutant) -> Mutant:
+            sandbox = get_sandbox()
+            try:
+                return self.test_mutant(mutant, test_command, code_path, sandbox,
+                                        tests=selection.get(mutant.id))
+            finally:
+                sandboxes.put(sandbox)
+
+        try:
+            to_run = mutants
+            if mutants:
+                sandbox = get_sandbox()
+                coverage = None
+                if self.coverage_guided and self._is_pytest(test_command):
+                    coverage = self.collect_coverage(sandbox, test_command)
+                # A traced run already passed on the original code
+                if coverage is None:
+                    self.check_baseline(sandbox, test_command)
+                sandboxes.put(sandbox)
+                if coverage is not None:
+                    selection = self.select_tests(mutants, coverage)
+                    uncovered = sum(1 for tests in selection.values() if tests == [])
+                    if uncovered > MAX_UNCOVERED_RATIO * len(mutants):
+                        # Likely tested through subprocesses, which are not traced
+                        selection = {}
+                        coverage = None
+                if coverage is not None:
+                    to_run = []
+                    for mutant in mutants:
+                        mutant.covered = selection[mutant.id] != []
+                        if mutant.covered:
+                            to_run.append(mutant)
+                        else:
+                            mutant.killed = False
+                            mutant.test_output = "Not covered: no test executes this line"
+
+            ordered = sorted(to_run, key=lambda m: int(m.location.split(":")[-1] or 0))
+            with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(ordered)))) as executor:
+                list(executor.map(run, ordered))
+        finally:
+            for sandbox in created:
+                sandbox.close()
+        return mutants
+
     def run_mutation_testing(
         self,
         code_path: Path,
-        test_command: str
+        test_command: str,
+        sandbox_root: Optional[Path] = None
     ) -> MutationResult:
         """
         Run full mutation testing on a file.
 
         Args:
             code_path: Path to the Python file to mutate
-            test_command: Command to run tests
+            test_command: Command to run tests (from the file's directory)
+            sandbox_root: Directory copied into each sandbox (default: the
+                file's directory); must contain the tests
 
         Returns:
             MutationResult with score and details
@@ -498,15 +837,21 @@ class MutationTester:
             sample_size = max(1, int(len(mutants) * self.sample_ratio))
             mutants = random.sample(mutants, sample_size)
 
-        # Test each mutant
-        for mutant in mutants:
-            self.test_mutant(mutant, test_command, code_path)
+        # Test mutants in parallel sandboxes
+        try:
+            self.test_mutants(mutants, test_command, code_path, sandbox_root)
+        except BaselineTestFailure as e:
+            result.success = False
+            result.error = str(e)
+            result.duration_ms = (datetime.now() - start_time).total_seconds() * 1000
+            return result
 
         result.mutants = mutants
 
         # Calculate score
         killed = sum(1 for m in mutants if m.killed and not m.error)
         errors = sum(1 for m in mutants if m.error)
+        not_covered = sum(1 for m in mutants if m.covered is False)
         total = len(mutants)
         survived = total - killed - errors
         testable = total - errors
@@ -519,6 +864,7 @@ class MutationTester:
             survived_mutants=survived,
             error_mutants=errors,
             score=score,
+            not_covered_mutants=not_covered,
             survived_details=[m for m in mutants if not m.killed and not m.error]
         )
 
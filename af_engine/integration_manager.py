@@ -3,11 +3,39 @@ af_engine.integration_manager - Event Bus for Integration Handlers
 
 This module provides the IntegrationManager class that coordinates event
 dispatch to all registered integration handlers.
+
+Dispatch modes:
+    SYNC (default): handlers run in the emitting thread, in priority order.
+    ASYNC: handlers run on a bounded worker pool so slow integrations (git,
+        snapshots, transcript archival) don't delay stage transitions.
+        Priority order is kept per event: a priority tier starts only after
+        all higher-priority handlers finished that event, and each handler
+        sees events in emit order. Handlers with ``synchronous = True``
+        still run in the emitting thread, after emit() waited for the
+        higher-priority handlers of the event.
+
+Set AF_INTEGRATION_DISPATCH=async (or pass dispatch_mode) to enable ASYNC.
+
+Every handler call is timed; get_profile() reports p50/p95/p99 latency,
+call counts and error rates per handler and per StageEvent. The
+orchestrator saves it to state/integration_profile.json, which the
+dashboard serves and ``python -m af_engine.integration_profile`` prints.
 """
 
+import atexit
+import heapq
+import itertools
+import json
 import logging
-from collections import defaultdict
-from typing import Dict, List, Optional, Type
+import math
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple, Type, Union
 
 from .integrations.base import (
     IntegrationHandler,
@@ -20,6 +48,90 @@ from .integrations.base import (
 logger = logging.getLogger(__name__)
 
 
+class DispatchMode(Enum):
+    """How IntegrationManager delivers events to handlers."""
+    SYNC = "sync"    # In the emitting thread
+    ASYNC = "async"  # On the worker pool
+
+
+# Async dispatch defaults (handlers can override queue_depth and timeout)
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_QUEUE_DEPTH = 64
+DEFAULT_HANDLER_TIMEOUT = 30.0  # seconds
+
+# Upper bounds (ms) of the latency histogram buckets
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Most recent durations kept per histogram for percentiles
+LATENCY_SAMPLE_WINDOW = 1024
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket histogram of handler call durations.
+
+    Also keeps the most recent LATENCY_SAMPLE_WINDOW durations so that
+    percentiles reflect current behaviour rather than bucket bounds.
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples: Deque[float] = deque(maxlen=LATENCY_SAMPLE_WINDOW)
+
+    def record(self, duration_ms: float, error: bool = False) -> None:
+        """Add one observation."""
+        index = 0
+        while index < len(LATENCY_BUCKETS_MS) and duration_ms > LATENCY_BUCKETS_MS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        if error:
+            self.errors += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.samples.append(duration_ms)
+
+    def percentiles(self, quantiles: Tuple[float, ...] = (0.5, 0.95, 0.99)) -> List[float]:
+        """Nearest-rank percentiles (ms) over the sample window."""
+        if not self.samples:
+            return [0.0 for _ in quantiles]
+        ordered = sorted(self.samples)
+        last = len(ordered) - 1
+        return [ordered[min(last, max(0, math.ceil(q * len(ordered)) - 1))] for q in quantiles]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for get_stats()."""
+        buckets = {f"<={bound}ms": n for bound, n in zip(LATENCY_BUCKETS_MS, self.counts)}
+        buckets[f">{LATENCY_BUCKETS_MS[-1]}ms"] = self.counts[-1]
+        p50, p95, p99 = self.percentiles()
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.count, 4) if self.count else 0.0,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(p50, 3),
+            "p95_ms": round(p95, 3),
+            "p99_ms": round(p99, 3),
+            "max_ms": round(self.max_ms, 3),
+            "total_ms": round(self.total_ms, 3),
+            "buckets": buckets,
+        }
+
+
+class _Dispatch:
+    """One asynchronously dispatched event, released one priority tier at a time."""
+
+    def __init__(self, event: Event):
+        self.event = event
+        self.tiers: List[List[str]] = []
+        self.current = -1  # Released tier (-1 = still being queued)
+        self.pending = 0   # Handlers of the current tier not yet finished
+
+
 class IntegrationManager:
     """
     Manages integration handlers and coordinates event dispatch.
@@ -30,10 +142,37 @@ class IntegrationManager:
     - Priority-based execution order
     - Graceful error handling (failures don't block other handlers)
     - Handler availability checking
+    - Optional asynchronous dispatch with per-handler queues and backpressure
+    - Per-handler and per-event latency profiling (see get_profile())
     """
 
-    def __init__(self):
-        """Initialize the integration manager."""
+    def __init__(
+        self,
+        dispatch_mode: Optional[DispatchMode] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        queue_depth: int = DEFAULT_QUEUE_DEPTH,
+        handler_timeout: float = DEFAULT_HANDLER_TIMEOUT,
+    ):
+        """
+        Initialize the integration manager.
+
+        Args:
+            dispatch_mode: SYNC or ASYNC (default: AF_INTEGRATION_DISPATCH env var, else SYNC)
+            max_workers: Worker threads for ASYNC dispatch
+            queue_depth: Default max queued events per handler; emit() blocks
+                when a handler's queue is full (backpressure)
+            handler_timeout: Default seconds a handler call may take before it
+                is counted as timed out, and the longest emit() waits for
+                queue space before dropping the event for that handler
+        """
+        if dispatch_mode is None:
+            env_mode = os.environ.get("AF_INTEGRATION_DISPATCH", "sync").strip().lower()
+            dispatch_mode = DispatchMode.ASYNC if env_mode == "async" else DispatchMode.SYNC
+        self.dispatch_mode = dispatch_mode
+        self.max_workers = max(1, max_workers)
+        self.queue_depth = max(1, queue_depth)
+        self.handler_timeout = handler_timeout
+
         # Handler registry: name -> handler instance
         self._handlers: Dict[str, IntegrationHandler] = {}
 
@@ -48,7 +187,26 @@ class IntegrationManager:
             "events_emitted": 0,
             "handlers_invoked": 0,
             "errors_handled": 0,
+            "handler_timeouts": 0,
+            "events_dropped": 0,
         }
+        # Latency profiling: handler calls per handler, per event type and
+        # per (handler, event type); emit() wall time per event type
+        self._latency: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self._event_latency: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self._handler_event_latency: Dict[Tuple[str, str], LatencyHistogram] = defaultdict(LatencyHistogram)
+        self._emit_latency: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self._stats_lock = threading.Lock()
+
+        # Async dispatch state (guarded by _cond)
+        self._cond = threading.Condition()
+        self._queues: Dict[str, Deque[Tuple[_Dispatch, int]]] = defaultdict(deque)
+        self._ready: List[Tuple[int, int, str]] = []  # (priority, seq, handler name)
+        self._busy: Set[str] = set()  # Handlers scheduled or running
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._workers: List[threading.Thread] = []
+        self._stopping = False
 
     def register(self, handler: IntegrationHandler) -> None:
         """
@@ -94,6 +252,17 @@ class IntegrationManager:
             if name in handlers:
                 handlers.remove(name)
 
+        # Events still queued for it count as delivered
+        with self._cond:
+            queue = self._queues.pop(name, None)
+            for dispatch, tier in queue or ():
+                if tier == dispatch.current:
+                    self._finish(dispatch)
+                else:
+                    dispatch.tiers[tier].remove(name)
+                    self._in_flight -= 1
+            self._cond.notify_all()
+
         logger.debug(f"Unregistered integration: {name}")
 
     def emit(self, event: Event) -> None:
@@ -102,11 +271,14 @@ class IntegrationManager:
 
         Events are dispatched to handlers in priority order. Handler
         errors are caught and logged but don't block other handlers.
+        In ASYNC mode this returns once the event is queued; handlers
+        that opted into synchronous delivery have already run.
 
         Args:
             event: The event to emit
         """
-        self._stats["events_emitted"] += 1
+        with self._stats_lock:
+            self._stats["events_emitted"] += 1
 
         handler_names = self._subscriptions.get(event.type, [])
         if not handler_names:
@@ -115,7 +287,25 @@ class IntegrationManager:
 
         logger.debug(f"Emitting {event.type.value} to {len(handler_names)} handlers")
 
-        for name in handler_names:
+        started = time.perf_counter()
+        try:
+            self._dispatch(event, handler_names)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            with self._stats_lock:
+                self._emit_latency[event.type.value].record(elapsed_ms)
+
+    def _dispatch(self, event: Event, handler_names: List[str]) -> None:
+        """
+        Run handlers in one priority-ordered pass.
+
+        In ASYNC mode handlers are queued, except synchronous ones: those
+        run here once the queued higher-priority handlers of the event
+        finished (or their timeouts passed).
+        """
+
+        deferred: List[str] = []
+        for name in list(handler_names):
             handler = self._handlers.get(name)
             if not handler:
                 continue
@@ -124,12 +314,226 @@ class IntegrationManager:
                 logger.debug(f"Handler {name} not available, skipping")
                 continue
 
-            try:
-                handler.handle_event(event)
+            if self.dispatch_mode == DispatchMode.ASYNC and not getattr(handler, "synchronous", False):
+                deferred.append(name)
+                continue
+
+            priority = self._priorities.get(name, 999)
+            if any(self._priorities.get(other, 999) < priority for other in deferred):
+                self._wait(self._enqueue(event, deferred), deferred)
+                deferred = []
+            self._invoke(name, handler, event)
+
+        if deferred:
+            self._enqueue(event, deferred)
+
+    def _invoke(self, name: str, handler: IntegrationHandler, event: Event) -> None:
+        """Run one handler for one event, recording latency and errors."""
+        # BaseIntegrationHandler.handle_event() catches handler errors itself
+        errors_before = getattr(handler, "error_count", 0)
+        started = time.perf_counter()
+        error: Optional[Exception] = None
+        try:
+            handler.handle_event(event)
+        except Exception as e:
+            error = e
+        elapsed = time.perf_counter() - started
+        failed = error is not None or getattr(handler, "error_count", 0) != errors_before
+
+        timeout = getattr(handler, "timeout", None) or self.handler_timeout
+        elapsed_ms = elapsed * 1000.0
+        event_type = event.type.value
+        with self._stats_lock:
+            self._latency[name].record(elapsed_ms, failed)
+            self._event_latency[event_type].record(elapsed_ms, failed)
+            self._handler_event_latency[(name, event_type)].record(elapsed_ms, failed)
+            if error is None:
                 self._stats["handlers_invoked"] += 1
-            except Exception as e:
+            else:
                 self._stats["errors_handled"] += 1
-                logger.warning(f"Handler {name} failed for {event.type.value}: {e}")
+            if timeout and elapsed > timeout:
+                self._stats["handler_timeouts"] += 1
+
+        if error is not None:
+            logger.warning(f"Handler {name} failed for {event.type.value}: {error}")
+        if timeout and elapsed > timeout:
+            logger.warning(
+                f"Handler {name} took {elapsed:.1f}s for {event.type.value} "
+                f"(timeout {timeout:.1f}s)"
+            )
+
+    # === ASYNC DISPATCH ===
+
+    def _enqueue(self, event: Event, handler_names: List[str]) -> _Dispatch:
+        """Queue an event for handlers (already in priority order)."""
+        dispatch = _Dispatch(event)
+
+        with self._cond:
+            self._start_workers()
+            for name in handler_names:
+                handler = self._handlers.get(name)
+                if handler is None:
+                    continue
+                depth = getattr(handler, "queue_depth", None) or self.queue_depth
+                wait = getattr(handler, "timeout", None) or self.handler_timeout
+
+                # Backpressure: wait for queue space, then give up on this handler
+                deadline = time.monotonic() + wait
+                while len(self._queues[name]) >= depth and name in self._handlers:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if name not in self._handlers:
+                    continue
+                if len(self._queues[name]) >= depth:
+                    with self._stats_lock:
+                        self._stats["events_dropped"] += 1
+                    logger.warning(
+                        f"Handler {name} queue full ({depth} events), "
+                        f"dropping {event.type.value}"
+                    )
+                    continue
+
+                priority = self._priorities.get(name, 999)
+                if not dispatch.tiers or self._priorities.get(dispatch.tiers[-1][0], 999) != priority:
+                    dispatch.tiers.append([])
+                dispatch.tiers[-1].append(name)
+                self._queues[name].append((dispatch, len(dispatch.tiers) - 1))
+                self._in_flight += 1
+
+            self._advance(dispatch)
+        return dispatch
+
+    def _wait(self, dispatch: _Dispatch, handler_names: List[str]) -> None:
+        """Wait until every tier of a dispatch ran, at most the handlers' timeouts."""
+        wait = sum(
+            getattr(self._handlers.get(name), "timeout", None) or self.handler_timeout
+            for name in handler_names
+        )
+        deadline = time.monotonic() + wait
+        with self._cond:
+            while dispatch.current < len(dispatch.tiers):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(
+                        f"Higher-priority handlers still running {dispatch.event.type.value} "
+                        f"after {wait:.1f}s, continuing"
+                    )
+                    return
+                self._cond.wait(remaining)
+
+    def _advance(self, dispatch: _Dispatch) -> None:
+        """Release the next priority tier of a dispatch (assumes _cond held)."""
+        dispatch.current += 1
+        while dispatch.current < len(dispatch.tiers) and not dispatch.tiers[dispatch.current]:
+            dispatch.current += 1  # Every handler of the tier was unregistered
+        if dispatch.current >= len(dispatch.tiers):
+            return
+        dispatch.pending = len(dispatch.tiers[dispatch.current])
+        for name in list(dispatch.tiers[dispatch.current]):
+            self._schedule(name)
+
+    def _finish(self, dispatch: _Dispatch) -> None:
+        """Mark one handler of the current tier as done (assumes _cond held)."""
+        self._in_flight -= 1
+        dispatch.pending -= 1
+        if dispatch.pending == 0:
+            self._advance(dispatch)
+
+    def _schedule(self, name: str) -> None:
+        """Make a handler runnable if its oldest event is released (assumes _cond held)."""
+        queue = self._queues.get(name)
+        if name in self._busy or not queue:
+            return
+        dispatch, tier = queue[0]
+        if dispatch.current != tier:
+            return  # Waiting for higher-priority handlers of that event
+        self._busy.add(name)
+        heapq.heappush(self._ready, (self._priorities.get(name, 999), next(self._sequence), name))
+        self._cond.notify_all()
+
+    def _start_workers(self) -> None:
+        """Start the worker pool on first use (assumes _cond held)."""
+        if self._workers:
+            return
+        self._stopping = False
+        for i in range(self.max_workers):
+            worker = threading.Thread(
+                target=self._worker_loop,
+                daemon=True,
+                name=f"IntegrationWorker-{i}"
+            )
+            worker.start()
+            self._workers.append(worker)
+        atexit.register(self.shutdown)
+
+    def _worker_loop(self) -> None:
+        """Run queued handler calls, highest priority first."""
+        while True:
+            with self._cond:
+                while not self._ready and not self._stopping:
+                    self._cond.wait()
+                if not self._ready:
+                    return
+                _, _, name = heapq.heappop(self._ready)
+                queue = self._queues.get(name)
+                if not queue:
+                    self._busy.discard(name)
+                    continue
+                dispatch, _ = queue.popleft()
+                handler = self._handlers.get(name)
+                self._cond.notify_all()  # Queue space for blocked emitters
+
+            if handler is not None:
+                self._invoke(name, handler, dispatch.event)
+
+            with self._cond:
+                self._busy.discard(name)
+                self._finish(dispatch)
+                self._schedule(name)
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all queued events have been handled.
+
+        Args:
+            timeout: Max seconds to wait (None = no limit)
+
+        Returns:
+            True if the queues drained
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._in_flight > 0:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """
+        Drain the queues and stop the worker pool.
+
+        Args:
+            timeout: Max seconds to wait for queued events
+                (default: the handler timeout)
+
+        Returns:
+            True if all queued events were handled
+        """
+        drained = self.flush(self.handler_timeout if timeout is None else timeout)
+        with self._cond:
+            self._stopping = True
+            workers, self._workers = self._workers, []
+            self._cond.notify_all()
+        for worker in workers:
+            worker.join(timeout=1.0)
+        if workers:
+            atexit.unregister(self.shutdown)
+        return drained
 
     def emit_stage_started(
         self,
@@ -256,14 +660,99 @@ class IntegrationManager:
             if handler.is_available()
         }
 
-    def get_stats(self) -> Dict[str, int]:
-        """Get integration manager statistics."""
+    def get_stats(self) -> Dict[str, Any]:
+        """Get integration manager statistics, including per-handler latency histograms."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+            latency = {name: hist.to_dict() for name, hist in self._latency.items()}
+        with self._cond:
+            queue_depths = {name: len(queue) for name, queue in self._queues.items() if queue}
+            in_flight = self._in_flight
         return {
-            **self._stats,
+            **stats,
             "handlers_registered": len(self._handlers),
             "handlers_available": len(self.get_available_handlers()),
+            "dispatch_mode": self.dispatch_mode.value,
+            "events_in_flight": in_flight,
+            "queue_depths": queue_depths,
+            "handler_latency": latency,
         }
 
+    def get_profile(self) -> Dict[str, Any]:
+        """
+        Get the latency profile of the integrations.
+
+        Returns:
+            Dictionary with:
+            - handlers: per-handler call latency (p50/p95/p99, counts, error rate)
+            - events: per-event-type emit() wall time (the time the emitting
+              thread, e.g. StageOrchestrator.update_stage, was blocked), the
+              latency of all handler calls for that event, and a per-handler
+              breakdown
+        """
+        with self._stats_lock:
+            handlers = {name: hist.to_dict() for name, hist in self._latency.items()}
+            events: Dict[str, Dict[str, Any]] = {}
+            for event_type in set(self._emit_latency) | set(self._event_latency):
+                events[event_type] = {
+                    "emit": self._emit_latency.get(event_type, LatencyHistogram()).to_dict(),
+                    "handler_calls": self._event_latency.get(event_type, LatencyHistogram()).to_dict(),
+                    "handlers": {},
+                }
+            for (name, event_type), hist in self._handler_event_latency.items():
+                events[event_type]["handlers"][name] = hist.to_dict()
+            events_emitted = self._stats["events_emitted"]
+
+        for name, entry in handlers.items():
+            handler = self._handlers.get(name)
+            entry["priority"] = handler.priority.name if handler else None
+            entry["synchronous"] = (
+                self.dispatch_mode == DispatchMode.SYNC
+                or bool(getattr(handler, "synchronous", False))
+            )
+
+        return {
+            "generated_at": datetime.now().isoformat(),
+            "dispatch_mode": self.dispatch_mode.value,
+            "events_emitted": events_emitted,
+            "sample_window": LATENCY_SAMPLE_WINDOW,
+            "handlers": handlers,
+            "events": events,
+        }
+
+    def save_profile(self, path: Union[str, Path]) -> bool:
+        """
+        Write get_profile() to a JSON file (read by the dashboard and the
+        af_engine.integration_profile CLI).
+
+        Args:
+            path: Output file
+
+        Returns:
+            True if the profile was written
+        """
+        profile = self.get_profile()
+        try:
+            try:
+                import io_utils
+                return io_utils.atomic_write_json(path, profile)
+            except ImportError:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                with open(path, 'w') as f:
+                    json.dump(profile, f, indent=2)
+                return True
+        except Exception as e:
+            logger.warning(f"Failed to save integration profile: {e}")
+            return False
+
+    def reset_profile(self) -> None:
+        """Clear all latency histograms."""
+        with self._stats_lock:
+            self._latency.clear()
+            self._event_latency.clear()
+            self._handler_event_latency.clear()
+            self._emit_latency.clear()
+
     def load_default_integrations(self) -> None:
         """
         Load all default integration handlers.
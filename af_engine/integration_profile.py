@@ -0,0 +1,132 @@
+"""
+af_engine.integration_profile - Slow-Handler Report for Integrations
+
+Reads the latency profile that StageOrchestrator saves after each stage
+transition (state/integration_profile.json, see
+IntegrationManager.get_profile()) and formats it as a report of the
+slowest handlers and events.
+
+Usage:
+    python -m af_engine.integration_profile              # Slowest handlers first
+    python -m af_engine.integration_profile --top 5      # Only the 5 slowest
+    python -m af_engine.integration_profile --json       # Raw profile
+    python -m af_engine.integration_profile --path FILE  # Another profile file
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+PROFILE_FILENAME = "integration_profile.json"
+
+# Default location, next to mission.json
+DEFAULT_PROFILE_PATH = Path(__file__).parent.parent / "state" / PROFILE_FILENAME
+
+
+def load_profile(path: Union[str, Path] = DEFAULT_PROFILE_PATH) -> Optional[Dict[str, Any]]:
+    """
+    Load a saved integration profile.
+
+    Args:
+        path: Profile file
+
+    Returns:
+        The profile, or None if the file is missing or unreadable
+    """
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def slowest_handlers(profile: Dict[str, Any], top: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Handlers sorted by p95 latency, slowest first.
+
+    Args:
+        profile: Profile from IntegrationManager.get_profile()
+        top: Max number of handlers (None = all)
+
+    Returns:
+        Handler stats, each with a "name" key
+    """
+    rows = [dict(stats, name=name) for name, stats in profile.get("handlers", {}).items()]
+    rows.sort(key=lambda r: (r.get("p95_ms", 0.0), r.get("total_ms", 0.0)), reverse=True)
+    return rows[:top] if top else rows
+
+
+def format_profile(profile: Dict[str, Any], top: Optional[int] = None) -> str:
+    """
+    Format a profile as a plain-text slow-handler report.
+
+    Args:
+        profile: Profile from IntegrationManager.get_profile()
+        top: Max number of handlers per table (None = all)
+
+    Returns:
+        The report
+    """
+    header = f"{'':<28} {'calls':>7} {'err%':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+
+    def row(label: str, stats: Dict[str, Any]) -> str:
+        return (
+            f"{label[:28]:<28} {stats.get('count', 0):>7} "
+            f"{stats.get('error_rate', 0.0) * 100:>6.1f} "
+            f"{stats.get('p50_ms', 0.0):>9.1f} {stats.get('p95_ms', 0.0):>9.1f} "
+            f"{stats.get('p99_ms', 0.0):>9.1f} {stats.get('max_ms', 0.0):>9.1f}"
+        )
+
+    lines = [
+        f"Integration profile ({profile.get('generated_at', 'unknown time')}, "
+        f"{profile.get('dispatch_mode', 'sync')} dispatch, "
+        f"{profile.get('events_emitted', 0)} events emitted)",
+        "",
+        "Handlers (slowest p95 first)",
+        header,
+    ]
+    for stats in slowest_handlers(profile, top):
+        lines.append(row(stats["name"], stats))
+
+    events = profile.get("events", {})
+    lines += ["", "Events (emit wall time, slowest p95 first)", header]
+    ordered = sorted(events.items(), key=lambda item: item[1].get("emit", {}).get("p95_ms", 0.0), reverse=True)
+    for event_type, entry in ordered:
+        lines.append(row(event_type, entry.get("emit", {})))
+        breakdown = sorted(
+            entry.get("handlers", {}).items(),
+            key=lambda item: item[1].get("p95_ms", 0.0),
+            reverse=True
+        )
+        for name, stats in breakdown[:top] if top else breakdown:
+            lines.append(row(f"  {name}", stats))
+
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Show the integration latency profile")
+    parser.add_argument("--path", type=Path, default=DEFAULT_PROFILE_PATH,
+                        help=f"Profile file (default: {DEFAULT_PROFILE_PATH})")
+    parser.add_argument("--top", type=int, default=None,
+                        help="Only show the N slowest handlers per table")
+    parser.add_argument("--json", action="store_true", help="Print the raw profile as JSON")
+    args = parser.parse_args(argv)
+
+    profile = load_profile(args.path)
+    if profile is None:
+        print(f"No integration profile at {args.path}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(profile, indent=2))
+    else:
+        print(format_profile(profile, args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -27,6 +27,7 @@ class AnalyticsIntegration(BaseIntegrationHandler):
 
     name = "analytics"
     priority = IntegrationPriority.CRITICAL
+    synchronous = True  # Must not lag behind stage transitions
     subscriptions = [
         StageEvent.RESPONSE_RECEIVED,
         StageEvent.MISSION_STARTED,
@@ -153,10 +153,18 @@ class BaseIntegrationHandler:
     # Subscribed events (override in subclasses)
     subscriptions: List[StageEvent] = []
 
+    # Asynchronous dispatch (IntegrationManager in ASYNC mode)
+    synchronous: bool = False  # Always run in the emitting thread
+    queue_depth: Optional[int] = None  # Max queued events (None = manager default)
+    timeout: Optional[float] = None  # Seconds per call before it counts as timed out
+
     # Internal state
     _available: bool = True
     _enabled: bool = True
 
+    # Errors caught by handle_event() (read by IntegrationManager profiling)
+    error_count: int = 0
+
     def __init__(self):
         """Initialize the integration handler."""
         self._available = self._check_availability()
@@ -177,6 +185,7 @@ class BaseIntegrationHandler:
             try:
                 getattr(self, handler_method)(event)
             except Exception as e:
+                self.error_count += 1
                 self._handle_error(event, e)
 
     def get_subscriptions(self) -> List[StageEvent]:
@@ -29,6 +29,7 @@ class RecoveryIntegration(BaseIntegrationHandler):
 
     name = "recovery"
     priority = IntegrationPriority.HIGH
+    synchronous = True  # Must not lag behind stage transitions
     subscriptions = [
         StageEvent.STAGE_STARTED,
         StageEvent.STAGE_COMPLETED,
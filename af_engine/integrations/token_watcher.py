@@ -27,6 +27,7 @@ class TokenWatcherIntegration(BaseIntegrationHandler):
 
     name = "token_watcher"
     priority = IntegrationPriority.CRITICAL
+    synchronous = True  # Must not lag behind stage transitions
     subscriptions = [
         StageEvent.RESPONSE_RECEIVED,
         StageEvent.STAGE_STARTED,
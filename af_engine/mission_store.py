@@ -0,0 +1,246 @@
+"""
+af_engine.mission_store - SQLite Storage for Mission State
+
+Stores the mission dict as rows instead of one JSON document:
+- scalar (top-level) fields in mission_fields, one row per key
+- history and cycle_history entries in history_entries, one row per entry
+
+so that logging a history entry or bumping the iteration is a single-row
+write regardless of how long the mission has been running. The legacy
+mission dict is materialized from the rows on load.
+
+Used by StateManager when AF_MISSION_STATE_BACKEND=sqlite.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Mission fields stored as rows of history_entries
+HISTORY_FIELDS = ("history", "cycle_history")
+
+# Current schema version
+SCHEMA_VERSION = 1
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, default=str)
+
+
+class SQLiteMissionStore:
+    """SQLite-backed storage for a single mission's state."""
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: SQLite database file (created if missing)
+        """
+        self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._ensure_schema()
+
+    @contextmanager
+    def _get_connection(self) -> Generator[sqlite3.Connection, None, None]:
+        """
+        Get the store's connection inside a transaction.
+
+        The connection is kept open: closing the last connection to a WAL
+        database checkpoints it, which would cost more than the write.
+        """
+        with self._lock:
+            if self._conn is None:
+                self._conn = sqlite3.connect(str(self.db_path), timeout=30.0, check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            try:
+                yield self._conn
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _ensure_schema(self) -> None:
+        """Create database schema if it doesn't exist."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._get_connection() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                conn.executescript("""
+                    CREATE TABLE IF NOT EXISTS mission_fields (
+                        key TEXT PRIMARY KEY,
+                        value TEXT NOT NULL
+                    );
+
+                    CREATE TABLE IF NOT EXISTS history_entries (
+                        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                        field TEXT NOT NULL,
+                        entry TEXT NOT NULL
+                    );
+
+                    CREATE INDEX IF NOT EXISTS idx_history_field
+                        ON history_entries(field, seq);
+
+                    CREATE TABLE IF NOT EXISTS store_meta (
+                        key TEXT PRIMARY KEY,
+                        value TEXT
+                    );
+                """)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    # =========================================================================
+    # Whole-mission operations
+    # =========================================================================
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Materialize the legacy mission dict.
+
+        Returns:
+            The mission, or None if the store is empty
+        """
+        with self._get_connection() as conn:
+            fields = conn.execute("SELECT key, value FROM mission_fields").fetchall()
+            if not fields:
+                return None
+            mission: Dict[str, Any] = {key: json.loads(value) for key, value in fields}
+            for name in HISTORY_FIELDS:
+                if name in mission:
+                    mission[name] = []
+            for field, entry in conn.execute(
+                "SELECT field, entry FROM history_entries ORDER BY seq"
+            ):
+                mission.setdefault(field, []).append(json.loads(entry))
+        return mission
+
+    def replace(self, mission: Dict[str, Any]) -> None:
+        """
+        Replace the stored mission with a full mission dict.
+
+        Args:
+            mission: The mission dictionary
+        """
+        with self._get_connection() as conn:
+            conn.execute("DELETE FROM mission_fields")
+            conn.execute("DELETE FROM history_entries")
+            self._write_fields(conn, mission)
+            for name in HISTORY_FIELDS:
+                self._write_entries(conn, name, mission.get(name))
+
+    # =========================================================================
+    # Row-level operations
+    # =========================================================================
+
+    def set_fields(
+        self,
+        mission: Dict[str, Any],
+        keys: Iterable[str],
+        appended: Optional[Tuple[str, Dict[str, Any]]] = None
+    ) -> None:
+        """
+        Persist some fields of the mission dict, in one transaction.
+
+        History fields listed in keys are rewritten as a whole; pass
+        appended to add a single entry instead.
+
+        Args:
+            mission: The mission dictionary holding the new values
+            keys: Names of the fields to persist
+            appended: (history field, entry) to append
+        """
+        keys = list(keys)
+        with self._get_connection() as conn:
+            if appended is not None:
+                self._append(conn, *appended)
+            self._write_fields(conn, {k: mission[k] for k in keys if k in mission})
+            for key in keys:
+                if key not in mission:
+                    conn.execute("DELETE FROM mission_fields WHERE key = ?", (key,))
+                if key in HISTORY_FIELDS:
+                    conn.execute("DELETE FROM history_entries WHERE field = ?", (key,))
+                    self._write_entries(conn, key, mission.get(key))
+
+    def append(self, field: str, entry: Dict[str, Any]) -> None:
+        """
+        Append one entry to a history field.
+
+        Args:
+            field: "history" or "cycle_history"
+            entry: The entry to append
+        """
+        with self._get_connection() as conn:
+            self._append(conn, field, entry)
+
+    def count_entries(self, field: str) -> int:
+        """Get the number of stored entries of a history field."""
+        with self._get_connection() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM history_entries WHERE field = ?", (field,)
+            ).fetchone()[0]
+
+    # =========================================================================
+    # Metadata
+    # =========================================================================
+
+    def get_meta(self, key: str) -> Optional[str]:
+        """Get a store metadata value."""
+        with self._get_connection() as conn:
+            row = conn.execute("SELECT value FROM store_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: Optional[str]) -> None:
+        """Set a store metadata value."""
+        with self._get_connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)",
+                (key, value)
+            )
+
+    # =========================================================================
+    # Helpers
+    # =========================================================================
+
+    @staticmethod
+    def _append(conn: sqlite3.Connection, field: str, entry: Dict[str, Any]) -> None:
+        conn.execute(
+            "INSERT OR IGNORE INTO mission_fields (key, value) VALUES (?, '[]')",
+            (field,)
+        )
+        conn.execute(
+            "INSERT INTO history_entries (field, entry) VALUES (?, ?)",
+            (field, _encode(entry))
+        )
+
+    @staticmethod
+    def _write_fields(conn: sqlite3.Connection, fields: Dict[str, Any]) -> None:
+        # History lists live in history_entries; their field row is a placeholder
+        conn.executemany(
+            "INSERT OR REPLACE INTO mission_fields (key, value) VALUES (?, ?)",
+            [(key, '[]' if key in HISTORY_FIELDS else _encode(value))
+             for key, value in fields.items()]
+        )
+
+    @staticmethod
+    def _write_entries(conn: sqlite3.Connection, field: str, entries: Optional[List[Any]]) -> None:
+        if not entries:
+            return
+        conn.executemany(
+            "INSERT INTO history_entries (field, entry) VALUES (?, ?)",
+            [(field, _encode(entry)) for entry in entries]
+        )
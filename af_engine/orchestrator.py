@@ -25,6 +25,7 @@ from typing import Dict, Any, Optional
 from .state_manager import StateManager
 from .stage_registry import StageRegistry
 from .integration_manager import IntegrationManager
+from .integration_profile import PROFILE_FILENAME
 from .cycle_manager import CycleManager
 from .prompt_factory import PromptFactory
 from .stages.base import StageContext, StageResult
@@ -191,6 +192,16 @@ class StageOrchestrator:
             # Process mission queue - start next queued mission
             self._process_mission_queue()
 
+        self._save_integration_profile()
+
+    def _save_integration_profile(self) -> None:
+        """Persist handler latencies for the dashboard and the profile CLI."""
+        try:
+            profile_path = Path(self.state.mission_path).parent / PROFILE_FILENAME
+            self.integrations.save_profile(profile_path)
+        except Exception as e:
+            logger.debug(f"Failed to save integration profile: {e}")
+
     def build_rd_prompt(self, context: str = "") -> str:
         """
         Build the R&D prompt for the current stage.
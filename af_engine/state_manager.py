@@ -3,16 +3,38 @@ af_engine.state_manager - Mission State Persistence
 
 This module provides the StateManager class for loading, saving, and
 managing mission state.
+
+Backends:
+    json (default): every change rewrites mission.json.
+    sqlite: changes are row-level writes to mission.db next to mission.json
+        (see mission_store.py); mission.json is kept as a mirror for other
+        processes, rewritten immediately on stage, iteration and cycle
+        changes and at most every MIRROR_INTERVAL_SECONDS for history
+        entries and other fields (from the database, by a timer thread;
+        retried if the write fails). A mission.json changed by another
+        process is imported on the next load; history entries of the same
+        mission that were not mirrored yet are kept.
+
+Set AF_MISSION_STATE_BACKEND=sqlite (or pass backend) to enable SQLite.
 """
 
+import atexit
 import json
 import logging
+import os
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
+
+from .mission_store import HISTORY_FIELDS, SQLiteMissionStore
 
 logger = logging.getLogger(__name__)
 
+# Longest delay before a row-level change reaches the mission.json mirror
+MIRROR_INTERVAL_SECONDS = 2.0
+
 
 class StateManager:
     """
@@ -25,19 +47,32 @@ class StateManager:
     - Mission history logging
     """
 
-    def __init__(self, mission_path: Path, auto_save: bool = True):
+    def __init__(self, mission_path: Path, auto_save: bool = True, backend: Optional[str] = None):
         """
         Initialize the state manager.
 
         Args:
             mission_path: Path to the mission JSON file
             auto_save: Whether to auto-save after modifications
+            backend: "json" or "sqlite" (default: AF_MISSION_STATE_BACKEND env var, else json)
         """
         self.mission_path = mission_path
         self.auto_save = auto_save
         self._mission: Dict[str, Any] = {}
         self._dirty: bool = False
 
+        if backend is None:
+            backend = os.environ.get("AF_MISSION_STATE_BACKEND", "json")
+        self.backend = backend.strip().lower()
+        self._store: Optional[SQLiteMissionStore] = None
+        if self.backend == "sqlite":
+            self._store = SQLiteMissionStore(Path(mission_path).with_suffix(".db"))
+
+        # mission.json mirror (sqlite backend)
+        self._mirror_lock = threading.RLock()
+        self._mirror_timer: Optional[threading.Timer] = None
+        self._mirrored_at = 0.0
+
     @property
     def mission(self) -> Dict[str, Any]:
         """Get the current mission state."""
@@ -63,16 +98,21 @@ class StateManager:
         default_mission = self._get_default_mission()
 
         try:
-            # Use io_utils for atomic reads if available
-            try:
-                import io_utils
-                loaded = io_utils.atomic_read_json(self.mission_path, default_mission)
-            except ImportError:
-                if self.mission_path.exists():
-                    with open(self.mission_path, 'r') as f:
-                        loaded = json.load(f)
-                else:
-                    loaded = default_mission
+            # No mirror is written between the check and the import
+            with self._mirror_lock:
+                loaded = None
+                if self._store is not None and not self._json_changed_externally():
+                    loaded = self._store.load()
+
+                if loaded is None:
+                    loaded = self._read_json(default_mission)
+                    if self._store is not None:
+                        # First use, or mission.json was written by another process
+                        stored = self._store.load()
+                        if stored is not None:
+                            loaded = self._merge_unmirrored(loaded, stored)
+                        self._store.replace({**default_mission, **loaded})
+                        self._store.set_meta("mirror_signature", self._json_signature())
 
             # Merge with defaults to ensure required fields exist
             self._mission = {**default_mission, **loaded}
@@ -92,14 +132,11 @@ class StateManager:
             # Update last_updated timestamp
             self._mission["last_updated"] = datetime.now().isoformat()
 
-            # Use io_utils for atomic writes if available
-            try:
-                import io_utils
-                io_utils.atomic_write_json(self.mission_path, self._mission)
-            except ImportError:
-                self.mission_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(self.mission_path, 'w') as f:
-                    json.dump(self._mission, f, indent=2)
+            if self._store is not None:
+                self._store.replace(self._mission)
+                self._write_mirror()
+            else:
+                self._write_json()
 
             self._dirty = False
             logger.debug(f"Saved mission to {self.mission_path}")
@@ -108,6 +145,149 @@ class StateManager:
             logger.error(f"Failed to save mission: {e}")
             raise
 
+    def flush(self) -> None:
+        """Bring the mission.json mirror up to date (sqlite backend)."""
+        if self._store is not None:
+            self._write_mirror()
+
+    # =========================================================================
+    # Persistence helpers
+    # =========================================================================
+
+    def _read_json(self, default_mission: Dict[str, Any]) -> Dict[str, Any]:
+        """Read mission.json."""
+        # Use io_utils for atomic reads if available
+        try:
+            import io_utils
+            return io_utils.atomic_read_json(self.mission_path, default_mission)
+        except ImportError:
+            if self.mission_path.exists():
+                with open(self.mission_path, 'r') as f:
+                    return json.load(f)
+            return default_mission
+
+    def _write_json(self, mission: Optional[Dict[str, Any]] = None) -> bool:
+        """Write the whole mission (default: the in-memory one) to mission.json."""
+        if mission is None:
+            mission = self._mission
+        # Use io_utils for atomic writes if available
+        try:
+            import io_utils
+            return io_utils.atomic_write_json(self.mission_path, mission)
+        except ImportError:
+            self.mission_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.mission_path, 'w') as f:
+                json.dump(mission, f, indent=2)
+            return True
+
+    @staticmethod
+    def _merge_unmirrored(external: Dict[str, Any], stored: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Keep stored history entries missing from an externally written mission.json.
+
+        Entries logged within the mirror interval before the other process
+        wrote mission.json never reached it. Fields other than history come
+        from mission.json, and nothing is kept if it holds another mission.
+        """
+        if external.get("mission_id") != stored.get("mission_id"):
+            return external
+        merged = dict(external)
+        for name in HISTORY_FIELDS:
+            entries = list(external.get(name) or [])
+            seen = {json.dumps(entry, sort_keys=True, default=str) for entry in entries}
+            unmirrored = [entry for entry in stored.get(name) or []
+                          if json.dumps(entry, sort_keys=True, default=str) not in seen]
+            if not unmirrored:
+                continue
+            entries.extend(unmirrored)
+            if all(isinstance(entry, dict) and isinstance(entry.get("timestamp"), str) for entry in entries):
+                entries.sort(key=lambda entry: entry["timestamp"])
+            merged[name] = entries
+        return merged
+
+    def _json_signature(self) -> Optional[str]:
+        """Identity of the current mission.json (inode, mtime, size)."""
+        try:
+            st = os.stat(self.mission_path)
+        except OSError:
+            return None
+        return f"{st.st_ino}:{st.st_mtime_ns}:{st.st_size}"
+
+    def _json_changed_externally(self) -> bool:
+        """True if mission.json differs from the last mirror this backend wrote."""
+        signature = self._json_signature()
+        return signature is not None and signature != self._store.get_meta("mirror_signature")
+
+    def _persist(
+        self,
+        fields: Tuple[str, ...] = (),
+        appended: Optional[Tuple[str, Dict[str, Any]]] = None,
+        mirror_now: bool = False
+    ) -> None:
+        """
+        Persist a change to the mission (if auto_save is on).
+
+        Args:
+            fields: Top-level fields that changed
+            appended: (history field, entry) appended to a history list
+            mirror_now: Update the mission.json mirror immediately (sqlite backend)
+        """
+        self._dirty = True
+        if not self.auto_save:
+            return
+        if self._store is None:
+            self.save_mission()
+            return
+
+        try:
+            self._mission["last_updated"] = datetime.now().isoformat()
+            self._store.set_fields(self._mission, fields + ("last_updated",), appended)
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"Failed to save mission: {e}")
+            raise
+
+        if mirror_now or time.monotonic() - self._mirrored_at >= MIRROR_INTERVAL_SECONDS:
+            self._write_mirror()
+        else:
+            self._schedule_mirror()
+
+    def _schedule_mirror(self) -> None:
+        """Update the mirror once the mirror interval has passed."""
+        with self._mirror_lock:
+            if self._mirror_timer is not None:
+                return
+            delay = max(0.0, MIRROR_INTERVAL_SECONDS - (time.monotonic() - self._mirrored_at))
+            self._mirror_timer = threading.Timer(delay, self._write_mirror, kwargs={"from_store": True})
+            self._mirror_timer.daemon = True
+            self._mirror_timer.start()
+            atexit.register(self.flush)
+
+    def _write_mirror(self, from_store: bool = False) -> None:
+        """
+        Rewrite mission.json (sqlite backend).
+
+        Args:
+            from_store: Mirror the mission as stored in the database instead
+                of the in-memory dict, which the timer thread must not read
+                while the owning thread mutates it
+        """
+        with self._mirror_lock:
+            if self._mirror_timer is not None:
+                self._mirror_timer.cancel()
+                self._mirror_timer = None
+                atexit.unregister(self.flush)
+            try:
+                mission = self._store.load() if from_store else self._mission
+                if not self._write_json(mission):
+                    raise OSError("write failed")
+                self._store.set_meta("mirror_signature", self._json_signature())
+                self._mirrored_at = time.monotonic()
+            except Exception as e:
+                logger.warning(f"Failed to mirror mission to {self.mission_path}, retrying: {e}")
+                self._mirrored_at = time.monotonic()  # Retry after a full interval
+                self._schedule_mirror()
+
     def _get_default_mission(self) -> Dict[str, Any]:
         """Get default mission structure."""
         return {
@@ -146,9 +326,7 @@ class StateManager:
     def current_stage(self, value: str) -> None:
         """Set current stage."""
         self._mission["current_stage"] = value
-        self._dirty = True
-        if self.auto_save:
-            self.save_mission()
+        self._persist(("current_stage",), mirror_now=True)
 
     @property
     def iteration(self) -> int:
@@ -199,9 +377,7 @@ class StateManager:
             self._mission["history"] = []
         self._mission["history"].append(history_entry)
 
-        self._dirty = True
-        if self.auto_save:
-            self.save_mission()
+        self._persist(appended=("history", history_entry))
 
     def increment_iteration(self) -> int:
         """
@@ -213,9 +389,7 @@ class StateManager:
         # Use self.mission to ensure lazy loading happens first
         current = self.mission.get("iteration", 0)
         self._mission["iteration"] = current + 1
-        self._dirty = True
-        if self.auto_save:
-            self.save_mission()
+        self._persist(("iteration",), mirror_now=True)
         return self._mission["iteration"]
 
     def advance_cycle(self, continuation_prompt: str) -> int:
@@ -253,9 +427,11 @@ class StateManager:
         self._mission["current_cycle"] = current_cycle + 1
         self._mission["iteration"] = 0  # Reset iteration for new cycle
 
-        self._dirty = True
-        if self.auto_save:
-            self.save_mission()
+        self._persist(
+            ("problem_statement", "current_cycle", "iteration"),
+            appended=("cycle_history", cycle_summary),
+            mirror_now=True
+        )
 
         logger.info(f"Advanced to cycle {self._mission['current_cycle']}")
         return self._mission["current_cycle"]
@@ -276,9 +452,7 @@ class StateManager:
 
         self.log_history(f"Stage transition: {old_stage} -> {new_stage}")
 
-        self._dirty = True
-        if self.auto_save:
-            self.save_mission()
+        self._persist(("current_stage",), mirror_now=True)
 
         return old_stage
 
@@ -291,9 +465,7 @@ class StateManager:
             value: Field value
         """
         self._mission[key] = value
-        self._dirty = True
-        if self.auto_save:
-            self.save_mission()
+        self._persist((key,))
 
     def get_field(self, key: str, default: Any = None) -> Any:
         """
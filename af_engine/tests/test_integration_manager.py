@@ -7,11 +7,17 @@ These tests validate:
 - Priority-based execution order
 - Error handling and graceful degradation
 - Hot-reload functionality
+- Asynchronous dispatch, backpressure and latency stats
+- Latency profiling and the slow-handler report
 """
 
+import threading
+import time
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
-from af_engine.integration_manager import IntegrationManager
+from af_engine.integration_manager import DispatchMode, IntegrationManager, LatencyHistogram
+from af_engine.integration_profile import format_profile, load_profile, main as profile_main
 from af_engine.integrations.base import (
     BaseIntegrationHandler,
     Event,
@@ -351,5 +357,208 @@ class TestStats:
         assert stats["handlers_available"] == 1
 
 
+class TestAsyncDispatch:
+    """Asynchronous dispatch tests."""
+
+    def test_emit_returns_before_slow_handler(self):
+        """Test that a slow handler doesn't block emit() in async mode."""
+        mgr = IntegrationManager(dispatch_mode=DispatchMode.ASYNC)
+        release = threading.Event()
+
+        class SlowIntegration(MockIntegration):
+            def handle_event(self, event):
+                release.wait(5)
+                super().handle_event(event)
+
+        handler = SlowIntegration()
+        mgr.register(handler)
+
+        mgr.emit_stage_started("TEST", "mission")
+        assert handler.events_received == []
+
+        release.set()
+        assert mgr.flush(timeout=5)
+        assert len(handler.events_received) == 1
+        mgr.shutdown()
+
+    def test_priority_and_event_order_preserved(self):
+        """Test that priority tiers and per-handler event order hold across workers."""
+        mgr = IntegrationManager(dispatch_mode=DispatchMode.ASYNC, max_workers=4)
+        execution_order = []
+        lock = threading.Lock()
+
+        def tracked(base, label, delay):
+            class Tracked(base):
+                def handle_event(self, event):
+                    time.sleep(delay)
+                    with lock:
+                        execution_order.append((event.stage, label))
+            return Tracked()
+
+        mgr.register(tracked(LowPriorityIntegration, "low", 0.0))
+        mgr.register(tracked(HighPriorityIntegration, "high", 0.02))
+        mgr.register(tracked(MockIntegration, "normal", 0.01))
+
+        for stage in ("A", "B", "C"):
+            mgr.emit_stage_started(stage, "mission")
+        assert mgr.flush(timeout=5)
+
+        for stage in ("A", "B", "C"):
+            labels = [label for s, label in execution_order if s == stage]
+            assert labels == ["high", "normal", "low"]
+        for label in ("high", "normal", "low"):
+            stages = [s for s, l in execution_order if l == label]
+            assert stages == ["A", "B", "C"]
+        mgr.shutdown()
+
+    def test_synchronous_handler_runs_inline(self):
+        """Test that handlers opting into synchronous delivery run in emit()."""
+        mgr = IntegrationManager(dispatch_mode=DispatchMode.ASYNC)
+
+        class CriticalIntegration(HighPriorityIntegration):
+            synchronous = True
+
+            def handle_event(self, event):
+                self.thread = threading.current_thread()
+
+        handler = CriticalIntegration()
+        mgr.register(handler)
+        mgr.emit_stage_started("TEST", "mission")
+        assert handler.thread is threading.current_thread()
+        mgr.shutdown()
+
+    def test_synchronous_handler_keeps_priority_order(self):
+        """Test that a synchronous handler runs after higher-priority queued handlers."""
+        mgr = IntegrationManager(dispatch_mode=DispatchMode.ASYNC)
+        execution_order = []
+
+        class SlowHigh(HighPriorityIntegration):
+            def handle_event(self, event):
+                time.sleep(0.05)
+                execution_order.append(("high", event.stage))
+
+        class InlineNormal(MockIntegration):
+            synchronous = True
+
+            def handle_event(self, event):
+                execution_order.append(("normal", event.stage))
+
+        class QueuedLow(LowPriorityIntegration):
+            def handle_event(self, event):
+                execution_order.append(("low", event.stage))
+
+        for handler in (QueuedLow(), InlineNormal(), SlowHigh()):
+            mgr.register(handler)
+        mgr.emit_stage_started("A", "mission")
+        # The inline handler ran in emit(), after the high-priority one
+        assert execution_order[:2] == [("high", "A"), ("normal", "A")]
+
+        assert mgr.flush(timeout=5)
+        assert execution_order == [("high", "A"), ("normal", "A"), ("low", "A")]
+        mgr.shutdown()
+
+    def test_backpressure_drops_after_timeout(self):
+        """Test that a full queue blocks emit() and then drops the event."""
+        mgr = IntegrationManager(dispatch_mode=DispatchMode.ASYNC, max_workers=1)
+        release = threading.Event()
+
+        class StuckIntegration(MockIntegration):
+            queue_depth = 1
+            timeout = 0.1
+
+            def handle_event(self, event):
+                release.wait(5)
+                super().handle_event(event)
+
+        handler = StuckIntegration()
+        mgr.register(handler)
+
+        mgr.emit_stage_started("A", "mission")  # Running
+        time.sleep(0.05)
+        mgr.emit_stage_started("B", "mission")  # Queued
+        started = time.monotonic()
+        mgr.emit_stage_started("C", "mission")  # Queue full
+        assert time.monotonic() - started >= 0.1
+
+        release.set()
+        assert mgr.flush(timeout=5)
+        assert [e.stage for e in handler.events_received] == ["A", "B"]
+        stats = mgr.get_stats()
+        assert stats["events_dropped"] == 1
+        assert stats["handler_timeouts"] >= 1
+        mgr.shutdown()
+
+    def test_latency_histogram_in_stats(self):
+        """Test that per-handler latency histograms are reported."""
+        mgr = IntegrationManager()
+        mgr.register(MockIntegration())
+        mgr.emit_stage_started("TEST", "mission")
+
+        latency = mgr.get_stats()["handler_latency"]["mock_integration"]
+        assert latency["count"] == 1
+        assert sum(latency["buckets"].values()) == 1
+
+
+class SwallowingIntegration(BaseIntegrationHandler):
+    """Integration whose errors are caught by BaseIntegrationHandler.handle_event."""
+    name = "swallowing"
+    priority = IntegrationPriority.NORMAL
+    subscriptions = [StageEvent.STAGE_STARTED, StageEvent.STAGE_COMPLETED]
+
+    def on_stage_started(self, event: Event) -> None:
+        raise RuntimeError("Intentional failure for testing")
+
+
+class TestProfiling:
+    """Latency profiling tests."""
+
+    def test_histogram_percentiles(self):
+        """Test nearest-rank percentiles over the sample window."""
+        hist = LatencyHistogram()
+        for ms in range(1, 101):
+            hist.record(float(ms), error=(ms % 10 == 0))
+
+        stats = hist.to_dict()
+        assert stats["p50_ms"] == 50.0
+        assert stats["p95_ms"] == 95.0
+        assert stats["p99_ms"] == 99.0
+        assert stats["errors"] == 10
+        assert stats["error_rate"] == 0.1
+
+    def test_profile_per_handler_and_event(self):
+        """Test counts and error rates per handler and per event type."""
+        mgr = IntegrationManager()
+        mgr.register(MockIntegration())
+        mgr.register(SwallowingIntegration())
+
+        mgr.emit_stage_started("TEST", "mission")
+        mgr.emit_stage_completed("TEST", "mission")
+
+        profile = mgr.get_profile()
+        assert profile["handlers"]["mock_integration"]["count"] == 2
+        assert profile["handlers"]["swallowing"]["errors"] == 1
+        assert profile["handlers"]["swallowing"]["error_rate"] == 0.5
+
+        started = profile["events"]["stage_started"]
+        assert started["emit"]["count"] == 1
+        assert started["handler_calls"]["count"] == 2
+        assert started["handlers"]["swallowing"]["errors"] == 1
+        assert profile["events"]["stage_completed"]["handlers"]["swallowing"]["errors"] == 0
+
+    def test_profile_report_cli(self, tmp_path, capsys):
+        """Test saving the profile and printing the slow-handler report."""
+        mgr = IntegrationManager()
+        mgr.register(MockIntegration())
+        mgr.emit_stage_started("TEST", "mission")
+
+        path = tmp_path / "integration_profile.json"
+        assert mgr.save_profile(path)
+        assert "mock_integration" in format_profile(load_profile(path))
+
+        assert profile_main(["--path", str(path), "--top", "1"]) == 0
+        assert "stage_started" in capsys.readouterr().out
+        assert profile_main(["--path", str(tmp_path / "missing.json")]) == 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,172 @@
+"""
+Tests for StateManager - Mission State Persistence
+
+These tests validate:
+- The SQLite backend materializes the same mission dict as the JSON backend
+- History entries are appended as rows instead of rewriting the mission
+- The mission.json mirror is kept up to date for other processes
+- A mission.json written by another process is imported on load
+- History not mirrored yet survives another process's write
+- The mirror timer writes from the database and retries failures
+"""
+
+import json
+import time
+
+import pytest
+
+from af_engine import state_manager
+from af_engine.mission_store import SQLiteMissionStore
+from af_engine.state_manager import StateManager
+
+
+@pytest.fixture
+def mission_path(tmp_path, mission_factory):
+    """Mission file with an initial mission."""
+    path = tmp_path / "state" / "mission.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(mission_factory(), f, indent=2)
+    return path
+
+
+def _exercise(state):
+    """Apply the same sequence of changes through any backend."""
+    state.load_mission()
+    for i in range(5):
+        state.log_history(f"entry {i}", {"i": i})
+    state.increment_iteration()
+    state.set_field("preferences", {"verbose": True})
+    state.update_stage("BUILDING")
+    state.advance_cycle("Next cycle")
+
+
+TIMESTAMP_FIELDS = ("last_updated", "created_at", "cycle_started_at")
+
+
+def _without_timestamps(mission):
+    return {k: v for k, v in mission.items() if k not in TIMESTAMP_FIELDS}
+
+
+class TestSQLiteBackend:
+    """SQLite mission state backend tests."""
+
+    def test_same_mission_as_json_backend(self, tmp_path, mission_factory):
+        """Test that both backends produce the same mission dict."""
+        missions = {}
+        for backend in ("json", "sqlite"):
+            path = tmp_path / backend / "mission.json"
+            path.parent.mkdir()
+            path.write_text(json.dumps(mission_factory()))
+            state = StateManager(path, backend=backend)
+            _exercise(state)
+            state.flush()
+            missions[backend] = StateManager(path, backend=backend).load_mission()
+
+        json_history = [h["event"] for h in missions["json"]["history"]]
+        sqlite_history = [h["event"] for h in missions["sqlite"]["history"]]
+        assert sqlite_history == json_history
+        assert missions["sqlite"]["cycle_history"][0]["continuation_prompt"] == "Next cycle"
+
+        for mission in missions.values():
+            for entry in mission["history"] + mission["cycle_history"]:
+                entry.pop("timestamp", None)
+                entry.pop("completed_at", None)
+        assert _without_timestamps(missions["sqlite"]) == _without_timestamps(missions["json"])
+
+    def test_history_appends_rows(self, mission_path, monkeypatch):
+        """Test that log_history writes a row, not the whole mission."""
+        monkeypatch.setattr(state_manager, "MIRROR_INTERVAL_SECONDS", 3600.0)
+        state = StateManager(mission_path, backend="sqlite")
+        state.load_mission()
+        state.flush()
+        replaced = []
+        monkeypatch.setattr(SQLiteMissionStore, "replace", lambda self, m: replaced.append(m))
+
+        for i in range(100):
+            state.log_history(f"entry {i}")
+
+        assert replaced == []
+        assert state._store.count_entries("history") == 100
+        # Reloading from the database sees every entry
+        reloaded = StateManager(mission_path, backend="sqlite").load_mission()
+        assert len(reloaded["history"]) == 100
+        state.flush()
+
+    def test_mirror_updated(self, mission_path):
+        """Test that mission.json follows stage changes immediately."""
+        state = StateManager(mission_path, backend="sqlite")
+        state.load_mission()
+        state.update_stage("TESTING")
+
+        with open(mission_path) as f:
+            assert json.load(f)["current_stage"] == "TESTING"
+
+    def test_external_json_change_imported(self, mission_path, mission_factory):
+        """Test that a mission.json written by another process wins on load."""
+        state = StateManager(mission_path, backend="sqlite")
+        state.load_mission()
+        state.log_history("before")
+        state.flush()
+
+        replacement = mission_factory(mission_id="replaced_mission")
+        with open(mission_path, 'w') as f:
+            json.dump(replacement, f)
+
+        reloaded = StateManager(mission_path, backend="sqlite").load_mission()
+        assert reloaded["mission_id"] == "replaced_mission"
+        assert reloaded["history"] == replacement.get("history", [])
+
+    def test_unmirrored_history_kept_on_external_change(self, mission_path, monkeypatch):
+        """Test that entries not mirrored yet are merged into an external mission.json."""
+        monkeypatch.setattr(state_manager, "MIRROR_INTERVAL_SECONDS", 3600.0)
+        state = StateManager(mission_path, backend="sqlite")
+        state.load_mission()
+        state.log_history("mirrored")
+        state.flush()
+        state.log_history("not mirrored yet")
+
+        # Another process edits the mirror it last saw
+        with open(mission_path) as f:
+            external = json.load(f)
+        external["current_stage"] = "TESTING"
+        external["history"].append({"timestamp": "9999-01-01T00:00:00", "event": "external"})
+        with open(mission_path, 'w') as f:
+            json.dump(external, f)
+
+        reloaded = StateManager(mission_path, backend="sqlite").load_mission()
+        assert reloaded["current_stage"] == "TESTING"
+        assert [h["event"] for h in reloaded["history"]][-3:] == ["mirrored", "not mirrored yet", "external"]
+        state._mirror_timer.cancel()
+
+    def test_timer_mirrors_database_and_retries(self, mission_path, monkeypatch):
+        """Test that the timer mirror reads the database and retries a failed write."""
+        monkeypatch.setattr(state_manager, "MIRROR_INTERVAL_SECONDS", 0.05)
+        state = StateManager(mission_path, backend="sqlite")
+        state.load_mission()
+        state.flush()
+
+        written = []
+        write_json = StateManager._write_json
+
+        def flaky_write(self, mission=None):
+            written.append(mission)
+            if len(written) == 1:
+                raise OSError("disk full")
+            return write_json(self, mission)
+
+        monkeypatch.setattr(StateManager, "_write_json", flaky_write)
+        state.log_history("queued")
+        # Not serialized by the timer thread
+        state._mission["history"].append({"event": "in memory only"})
+
+        deadline = time.monotonic() + 5
+        while len(written) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        state._mirror_lock.acquire()
+        state._mirror_lock.release()
+
+        assert len(written) == 2 and written[0] is not state._mission
+        with open(mission_path) as f:
+            events = [h["event"] for h in json.load(f)["history"]]
+        assert events[-1] == "queued"
@@ -305,8 +305,8 @@ def load_state() -> dict:
 
 
 def save_state(state: dict):
-    """Save Claude's persistent state."""
-    io_utils.atomic_write_json(CLAUDE_STATE_PATH, state)
+    """Save Claude's persistent state (coalesced with saves following shortly after)."""
+    io_utils.atomic_write_json(CLAUDE_STATE_PATH, state, coalesce=True)
 
 
 def load_memory() -> dict:
@@ -327,19 +327,21 @@ def save_memory(memory: dict):
 
 def add_to_memory(key: str, value: str, max_items: int = 100):
     """Add an item to a memory list, keeping it bounded."""
+    timestamp = datetime.now().isoformat()  # update_fn runs when the write is flushed
+
     def update_fn(memory):
         if key not in memory:
             memory[key] = []
         memory[key].append({
             "content": value,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         })
         # Keep bounded
         if len(memory[key]) > max_items:
             memory[key] = memory[key][-max_items:]
         return memory
 
-    io_utils.atomic_update_json(CLAUDE_MEMORY_PATH, update_fn, {})
+    io_utils.atomic_update_json(CLAUDE_MEMORY_PATH, update_fn, {}, coalesce=True)
 
 
 def append_journal(entry: dict):
@@ -352,6 +354,7 @@ def append_journal(entry: dict):
 def send_to_chat(message: str):
     """Send a message to the chat history for UI display."""
     provider = get_llm_provider()
+    timestamp = datetime.now().isoformat()  # update_history runs when the write is flushed
 
     def update_history(history):
         if not isinstance(history, list):
@@ -360,13 +363,13 @@ def send_to_chat(message: str):
             "role": "claude",
             "provider": provider,
             "content": message,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         })
         if len(history) > 500:
             history = history[-500:]
         return history
 
-    io_utils.atomic_update_json(CHAT_HISTORY_PATH, update_history, [])
+    io_utils.atomic_update_json(CHAT_HISTORY_PATH, update_history, [], coalesce=True)
     logger.info(f"Chat: {message[:100]}...")
 
 
@@ -47,6 +47,30 @@ except ImportError:
     np = None
     logger.warning("NumPy not available - semantic search disabled")
 
+try:
+    from .graph_storage import GraphLogStore, encode_record
+except ImportError:
+    from graph_storage import GraphLogStore, encode_record
+
+# Persistent similarity index (requires NumPy)
+try:
+    from .vector_index import VectorIndex
+except ImportError:
+    try:
+        from vector_index import VectorIndex
+    except ImportError:
+        VectorIndex = None
+
+# Cached force-directed layout (requires NumPy)
+try:
+    from .graph_layout import GraphLayout, LAYOUT_FILENAME
+except ImportError:
+    try:
+        from graph_layout import GraphLayout, LAYOUT_FILENAME
+    except ImportError:
+        GraphLayout = None
+        LAYOUT_FILENAME = None
+
 
 # =============================================================================
 # CONSTANTS AND CONFIGURATION
@@ -57,6 +81,7 @@ MAX_NODES = 10000  # Threshold for automatic pruning
 MAX_RETRY_ATTEMPTS = 3  # Retry attempts for model initialization
 RETRY_BACKOFF_BASE = 2.0  # Exponential backoff base (seconds)
 MODEL_COOLDOWN_PERIOD = 300  # Seconds to wait before retrying failed model load
+COMPACTION_CHUNK_SIZE = 1000  # Records serialized per lock hold during compaction
 
 
 # =============================================================================
@@ -430,6 +455,7 @@ class ExplorationGraph:
     - Memory usage monitoring
     - Comprehensive error handling
     - Input validation and sanitization
+    - Append-only WAL persistence with background compaction (graph_storage)
     """
 
     def __init__(self, storage_path: Optional[Path] = None, auto_prune: bool = True):
@@ -467,11 +493,34 @@ class ExplorationGraph:
         self._node_by_tag: Dict[str, Set[str]] = defaultdict(set)  # tag -> set of node_ids
         self._edges_by_source: Dict[str, List[ExplorationEdge]] = defaultdict(list)
         self._edges_by_target: Dict[str, List[ExplorationEdge]] = defaultdict(list)
+        self._edge_keys: Set[Tuple] = set()  # Dedup edges when replaying the WAL
 
         # FAISS index cache
         self._faiss_index = None
         self._faiss_node_ids = None
 
+        # Append-only persistence: only changed items are written on save()
+        self._store = GraphLogStore(self.storage_path)
+        self._dirty_nodes: Set[str] = set()
+        self._dirty_insights: Set[str] = set()
+        self._pending_edges: List[ExplorationEdge] = []
+        self._needs_compaction = False  # Set when pruning removes data
+        self._compaction_thread: Optional[threading.Thread] = None
+
+        # Persistent similarity indexes, kept in sync as items are embedded
+        self._node_index = None
+        self._insight_index = None
+        if VectorIndex is not None:
+            try:
+                self._node_index = VectorIndex(self.storage_path, 'node')
+                self._insight_index = VectorIndex(self.storage_path, 'insight')
+            except Exception as e:
+                logger.warning(f"Vector index unavailable, using brute-force search: {e}")
+                self._node_index = self._insight_index = None
+
+        # Node positions, persisted and warm-started between exports
+        self._layout = GraphLayout(self.storage_path / LAYOUT_FILENAME) if GraphLayout else None
+
         self._load()
 
     @contextmanager
@@ -484,65 +533,98 @@ class ExplorationGraph:
             self._lock.release()
 
     def _load(self):
-        """Load graph from storage with error handling."""
+        """Load graph from the snapshot and replay the WAL on top of it."""
         with self._graph_lock():
-            nodes_file = self.storage_path / "nodes.json"
-            edges_file = self.storage_path / "edges.json"
-            insights_file = self.storage_path / "insights.json"
+            with self._store.file_lock(exclusive=False):
+                snapshot, records = self._store.load()
+            self._apply_snapshot(snapshot)
+            for record in records:
+                self._apply_record(record)
+            self._sync_vector_indexes()
+
+    def _sync_vector_indexes(self):
+        """Reconcile the vector indexes with the loaded embeddings."""
+        try:
+            if self._node_index is not None:
+                self._node_index.sync({
+                    nid: n.embedding for nid, n in self.nodes.items() if n.embedding is not None
+                })
+            if self._insight_index is not None:
+                self._insight_index.sync({
+                    iid: i.embedding for iid, i in self.insights.items() if i.embedding is not None
+                })
+        except Exception as e:
+            logger.warning(f"Failed to sync vector index: {e}")
 
-            # Load nodes
-            if nodes_file.exists():
-                try:
-                    with open(nodes_file, 'r') as f:
-                        data = json.load(f)
-                        for node_data in data:
-                            try:
-                                node = ExplorationNode.from_dict(node_data)
-                                self.nodes[node.id] = node
-                                self._index_node(node)
-                            except Exception as e:
-                                logger.warning(f"Skipping malformed node: {e}")
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse nodes.json: {e}")
-                except Exception as e:
-                    logger.error(f"Failed to load nodes: {e}")
-
-            # Load edges
-            if edges_file.exists():
-                try:
-                    with open(edges_file, 'r') as f:
-                        data = json.load(f)
-                        for edge_data in data:
-                            try:
-                                edge = ExplorationEdge.from_dict(edge_data)
-                                self.edges.append(edge)
-                                self._index_edge(edge)
-                            except Exception as e:
-                                logger.warning(f"Skipping malformed edge: {e}")
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse edges.json: {e}")
-                except Exception as e:
-                    logger.error(f"Failed to load edges: {e}")
-
-            # Load insights
-            if insights_file.exists():
-                try:
-                    with open(insights_file, 'r') as f:
-                        data = json.load(f)
-                        for insight_data in data:
-                            try:
-                                insight = ExplorationInsight.from_dict(insight_data)
-                                self.insights[insight.id] = insight
-                            except Exception as e:
-                                logger.warning(f"Skipping malformed insight: {e}")
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse insights.json: {e}")
-                except Exception as e:
-                    logger.error(f"Failed to load insights: {e}")
+    def _index_embedding(self, index: Optional[Any], item: Union[ExplorationNode, ExplorationInsight]):
+        """Mirror an item's embedding into a vector index."""
+        if index is None or item.embedding is None:
+            return
+        try:
+            index.add(item.id, item.embedding)
+        except Exception as e:
+            logger.warning(f"Failed to index embedding for {item.id}: {e}")
+
+    def _apply_snapshot(self, snapshot: Dict[str, List[dict]]):
+        """Populate in-memory structures from snapshot records."""
+        for node_data in snapshot.get('node', []):
+            try:
+                node = ExplorationNode.from_dict(node_data)
+                self.nodes[node.id] = node
+                self._index_node(node)
+            except Exception as e:
+                logger.warning(f"Skipping malformed node: {e}")
+
+        for edge_data in snapshot.get('edge', []):
+            try:
+                edge = ExplorationEdge.from_dict(edge_data)
+                self.edges.append(edge)
+                self._index_edge(edge)
+            except Exception as e:
+                logger.warning(f"Skipping malformed edge: {e}")
+
+        for insight_data in snapshot.get('insight', []):
+            try:
+                insight = ExplorationInsight.from_dict(insight_data)
+                self.insights[insight.id] = insight
+            except Exception as e:
+                logger.warning(f"Skipping malformed insight: {e}")
+
+    def _apply_record(self, record: dict):
+        """Apply a single WAL record (idempotent upsert)."""
+        try:
+            op = record.get('op')
+            data = record.get('data') or {}
+            if op == 'node':
+                node = ExplorationNode.from_dict(data)
+                existing = self.nodes.get(node.id)
+                if existing is not None:
+                    self._unindex_node(existing)
+                self.nodes[node.id] = node
+                self._index_node(node)
+                self._index_embedding(self._node_index, node)
+            elif op == 'edge':
+                edge = ExplorationEdge.from_dict(data)
+                if self._edge_key(edge) not in self._edge_keys:
+                    self.edges.append(edge)
+                    self._index_edge(edge)
+            elif op == 'insight':
+                insight = ExplorationInsight.from_dict(data)
+                self.insights[insight.id] = insight
+                self._index_embedding(self._insight_index, insight)
+            else:
+                logger.warning(f"Skipping unknown WAL record: {op}")
+        except Exception as e:
+            logger.warning(f"Skipping malformed WAL record: {e}")
 
     def save(self, prune_if_needed: bool = True):
         """
-        Save graph to storage with atomic writes.
+        Persist changes made since the last save.
+
+        Only new or updated nodes, edges and insights are appended to the
+        write-ahead log. The log is folded into a fresh snapshot in the
+        background once it outgrows the snapshot; pruning forces an
+        immediate compaction since removals are not logged.
 
         Args:
             prune_if_needed: Run pruning if graph exceeds max size
@@ -552,62 +634,183 @@ class ExplorationGraph:
             if prune_if_needed and self.auto_prune and len(self.nodes) > self._max_nodes:
                 self.prune_old_nodes()
 
-            nodes_file = self.storage_path / "nodes.json"
-            edges_file = self.storage_path / "edges.json"
-            insights_file = self.storage_path / "insights.json"
-
-            # Use atomic writes with temp files
             try:
-                self._atomic_write(nodes_file, [n.to_dict() for n in self.nodes.values()])
-                self._atomic_write(edges_file, [e.to_dict() for e in self.edges])
-                self._atomic_write(insights_file, [i.to_dict() for i in self.insights.values()])
+                if self._needs_compaction or not self._store.has_snapshot():
+                    self.compact()
+                    return
+                self._flush_changes()
             except Exception as e:
                 logger.error(f"Failed to save graph: {e}")
                 raise
 
-    def _atomic_write(self, filepath: Path, data: Any):
-        """Write data to file atomically using a temp file."""
-        temp_file = filepath.with_suffix('.tmp')
+            if self._store.should_compact():
+                self._start_background_compaction()
+
+    def _mark_node_dirty(self, node_id: str):
+        self._dirty_nodes.add(node_id)
+
+    def _mark_insight_dirty(self, insight_id: str):
+        self._dirty_insights.add(insight_id)
+
+    def _flush_changes(self):
+        """Append dirty items to the WAL, first catching up with other writers."""
+        with self._graph_lock():
+            lines = []
+            written_nodes = {nid for nid in self._dirty_nodes if nid in self.nodes}
+            written_insights = {iid for iid in self._dirty_insights if iid in self.insights}
+            for node_id in written_nodes:
+                lines.append(encode_record('node', self.nodes[node_id].to_dict()))
+            for edge in self._pending_edges:
+                lines.append(encode_record('edge', edge.to_dict()))
+            for insight_id in written_insights:
+                lines.append(encode_record('insight', self.insights[insight_id].to_dict()))
+            if not lines:
+                return
+
+            with self._store.file_lock():
+                tail = self._store.read_tail()
+                if tail is None:
+                    # Another process compacted the graph: reload, then reapply ours
+                    own_nodes = [self.nodes[nid] for nid in written_nodes]
+                    own_insights = [self.insights[iid] for iid in written_insights]
+                    own_edges = list(self._pending_edges)
+                    self._clear_state()
+                    snapshot, tail = self._store.load()
+                    self._apply_snapshot(snapshot)
+                else:
+                    own_nodes = own_insights = own_edges = []
+
+                for record in tail:
+                    # Our pending version is appended after, so it wins on replay
+                    record_id = (record.get('data') or {}).get('id')
+                    if record.get('op') == 'node' and record_id in written_nodes:
+                        continue
+                    if record.get('op') == 'insight' and record_id in written_insights:
+                        continue
+                    self._apply_record(record)
+
+                for node in own_nodes:
+                    existing = self.nodes.get(node.id)
+                    if existing is not None:
+                        self._unindex_node(existing)
+                    self.nodes[node.id] = node
+                    self._index_node(node)
+                for edge in own_edges:
+                    if self._edge_key(edge) not in self._edge_keys:
+                        self.edges.append(edge)
+                        self._index_edge(edge)
+                for insight in own_insights:
+                    self.insights[insight.id] = insight
+
+                self._store.append(lines)
+
+            self._dirty_nodes.clear()
+            self._dirty_insights.clear()
+            self._pending_edges.clear()
+
+    def compact(self, background: bool = False):
+        """
+        Fold the WAL into a fresh snapshot.
+
+        The snapshot is captured under the graph lock but serialized in
+        chunks, so other threads can keep adding to the graph meanwhile;
+        anything written after the capture point carries over into the
+        next WAL generation.
+
+        Args:
+            background: Run on a daemon thread instead of blocking
+        """
+        if background:
+            self._start_background_compaction()
+            return
+
+        with self._graph_lock():
+            self._flush_changes()
+            generation = self._store.generation
+            cutoff = self._store.wal_offset
+            nodes = list(self.nodes.values())
+            edges = list(self.edges)
+            insights = list(self.insights.values())
+            self._needs_compaction = False
+
+        snapshot = {
+            'node': self._serialize_chunked(nodes),
+            'edge': self._serialize_chunked(edges),
+            'insight': self._serialize_chunked(insights),
+        }
+        temp_files = self._store.write_snapshot(snapshot, generation)
+
+        with self._graph_lock():
+            with self._store.file_lock():
+                committed = self._store.commit_compaction(temp_files, generation, cutoff)
+        if not committed:
+            logger.info("Graph was compacted by another writer, skipping")
+
+    def _serialize_chunked(self, items: List[Any]):
+        """Yield JSON records, releasing the graph lock between chunks."""
+        for i in range(0, len(items), COMPACTION_CHUNK_SIZE):
+            with self._graph_lock():
+                chunk = [
+                    json.dumps(item.to_dict(), separators=(',', ':'), default=str)
+                    for item in items[i:i + COMPACTION_CHUNK_SIZE]
+                ]
+            yield from chunk
+
+    def _start_background_compaction(self):
+        """Start a compaction thread unless one is already running."""
+        with self._graph_lock():
+            if self._compaction_thread is not None and self._compaction_thread.is_alive():
+                return
+            self._compaction_thread = threading.Thread(
+                target=self._background_compact,
+                name="ExplorationGraphCompaction",
+                daemon=True
+            )
+            self._compaction_thread.start()
+
+    def _background_compact(self):
         try:
-            with open(temp_file, 'w') as f:
-                json.dump(data, f, indent=2)
-            # Atomic rename
-            temp_file.replace(filepath)
+            self.compact()
         except Exception as e:
-            # Clean up temp file on error
-            if temp_file.exists():
-                try:
-                    temp_file.unlink()
-                except:
-                    pass
-            raise
+            logger.error(f"Background graph compaction failed: {e}")
+
+    def _clear_state(self):
+        """Drop all in-memory data and indices."""
+        self.nodes.clear()
+        self.edges.clear()
+        self.insights.clear()
+        self._node_by_path.clear()
+        self._node_by_type.clear()
+        self._node_by_tag.clear()
+        self._edges_by_source.clear()
+        self._edges_by_target.clear()
+        self._edge_keys.clear()
 
     def reload(self):
         """
-        Reload graph from storage, replacing in-memory data.
+        Reload graph from storage.
 
         This is useful for dashboard APIs to get fresh data from disk
-        when data may have been written by another process.
+        when data may have been written by another process. Only WAL
+        records written since the last load are replayed; a full reload
+        happens only after another process compacted the graph.
         """
         with self._graph_lock():
-            # Clear existing data
-            self.nodes.clear()
-            self.edges.clear()
-            self.insights.clear()
-
-            # Clear node indices (these are defaultdicts, so they'll be recreated on access)
-            self._node_by_path.clear()
-            self._node_by_type.clear()
-            self._node_by_tag.clear()
-
-            # Clear edge indices
-            if hasattr(self, '_edges_by_source'):
-                self._edges_by_source.clear()
-            if hasattr(self, '_edges_by_target'):
-                self._edges_by_target.clear()
-
-        # Reload from disk
-        self._load()
+            with self._store.file_lock(exclusive=False):
+                tail = self._store.read_tail()
+            if tail is not None:
+                for record in tail:
+                    self._apply_record(record)
+                return
+
+            # Clear existing data, including unsaved changes
+            self._clear_state()
+            self._dirty_nodes.clear()
+            self._dirty_insights.clear()
+            self._pending_edges.clear()
+
+            # Reload from disk
+            self._load()
 
     # -------------------------------------------------------------------------
     # Memory Management
@@ -706,16 +909,9 @@ class ExplorationGraph:
 
             for node_id in pruned_ids:
                 if node_id in self.nodes:
-                    node = self.nodes[node_id]
-
-                    # Remove from indices
-                    if node.path and node.path in self._node_by_path:
-                        del self._node_by_path[node.path]
-                    if node.node_type in self._node_by_type:
-                        self._node_by_type[node.node_type].discard(node_id)
-                    for tag in node.tags:
-                        if tag in self._node_by_tag:
-                            self._node_by_tag[tag].discard(node_id)
+                    self._unindex_node(self.nodes[node_id])
+                    if self._node_index is not None:
+                        self._node_index.remove(node_id)
 
                     # Remove node
                     del self.nodes[node_id]
@@ -729,8 +925,15 @@ class ExplorationGraph:
             # Rebuild edge indices
             self._edges_by_source.clear()
             self._edges_by_target.clear()
+            self._edge_keys.clear()
             for edge in self.edges:
                 self._index_edge(edge)
+            self._pending_edges = [e for e in self._pending_edges
+                                   if e.source_id in self.nodes and e.target_id in self.nodes]
+
+            # Removals can't be expressed as WAL deltas; rewrite the snapshot
+            self._needs_compaction = True
+            self._sync_vector_indexes()
 
             logger.info(f"Pruned {pruned_count} nodes and {original_edge_count - len(self.edges)} edges")
             return pruned_count
@@ -749,10 +952,27 @@ class ExplorationGraph:
         for tag in node.tags:
             self._node_by_tag[tag].add(node.id)
 
+    def _unindex_node(self, node: ExplorationNode):
+        """Remove node from indices."""
+        if node.path and self._node_by_path.get(node.path) == node.id:
+            del self._node_by_path[node.path]
+        if node.node_type in self._node_by_type:
+            self._node_by_type[node.node_type].discard(node.id)
+        for tag in node.tags:
+            if tag in self._node_by_tag:
+                self._node_by_tag[tag].discard(node.id)
+
     def _index_edge(self, edge: ExplorationEdge):
         """Add edge to indices."""
         self._edges_by_source[edge.source_id].append(edge)
         self._edges_by_target[edge.target_id].append(edge)
+        self._edge_keys.add(self._edge_key(edge))
+
+    @staticmethod
+    def _edge_key(edge: ExplorationEdge) -> Tuple:
+        """Identity of an edge, used to deduplicate WAL replays."""
+        return (edge.source_id, edge.target_id, edge.relationship,
+                edge.discovered_at, edge.mission_id)
 
     # -------------------------------------------------------------------------
     # Node Operations
@@ -831,6 +1051,7 @@ class ExplorationGraph:
                 self.nodes[node_id] = node
                 self._index_node(node)
 
+            self._mark_node_dirty(node_id)
             return node
 
     def add_concept_node(
@@ -898,6 +1119,7 @@ class ExplorationGraph:
                 self.nodes[node_id] = node
                 self._index_node(node)
 
+            self._mark_node_dirty(node_id)
             return node
 
     def add_pattern_node(
@@ -972,6 +1194,7 @@ class ExplorationGraph:
                 self.nodes[node_id] = node
                 self._index_node(node)
 
+            self._mark_node_dirty(node_id)
             return node
 
     # -------------------------------------------------------------------------
@@ -1031,6 +1254,7 @@ class ExplorationGraph:
 
             self.edges.append(edge)
             self._index_edge(edge)
+            self._pending_edges.append(edge)
 
             return edge
 
@@ -1110,6 +1334,7 @@ class ExplorationGraph:
             )
 
             self.insights[insight_id] = insight
+            self._mark_insight_dirty(insight_id)
             return insight
 
     # -------------------------------------------------------------------------
@@ -1322,6 +1547,8 @@ class ExplorationGraph:
         embedding = self.generate_embedding(text)
         if embedding:
             node.embedding = embedding
+            self._mark_node_dirty(node.id)
+            self._index_embedding(self._node_index, node)
             return True
         return False
 
@@ -1358,6 +1585,9 @@ class ExplorationGraph:
                 with self._graph_lock():
                     for node, embedding in zip(nodes_to_embed, embeddings):
                         node.embedding = embedding.tolist()
+                        self._mark_node_dirty(node.id)
+                    if self._node_index is not None:
+                        self._node_index.add_many((n.id, n.embedding) for n in nodes_to_embed)
                 logger.info(f"Generated {len(embeddings)} embeddings")
         except Exception as e:
             logger.error(f"Failed to generate embeddings: {e}")
@@ -1413,6 +1643,12 @@ class ExplorationGraph:
         if query_embedding is None:
             return self._keyword_search(query, top_k, node_type)
 
+        if self._node_index is not None and len(self._node_index) > 0:
+            return self._vector_search(
+                self._node_index, self.nodes, query_embedding, top_k, min_similarity,
+                predicate=(lambda n: n.node_type == node_type) if node_type else None
+            )
+
         query_vec = np.array(query_embedding)
 
         # Get all node embeddings
@@ -1451,6 +1687,44 @@ class ExplorationGraph:
         results.sort(key=lambda x: x[1], reverse=True)
         return results[:top_k]
 
+    def _vector_search(
+        self,
+        index: Any,
+        items: Dict[str, Any],
+        query_vec: List[float],
+        top_k: int,
+        min_similarity: float,
+        predicate=None
+    ) -> List[Tuple[Any, float]]:
+        """
+        Query a vector index, widening the candidate set if filters drop hits.
+
+        Args:
+            index: VectorIndex to query
+            items: id -> node/insight lookup
+            query_vec: Query embedding
+            top_k: Maximum number of results
+            min_similarity: Minimum similarity threshold (0-1)
+            predicate: Optional filter applied to each candidate
+
+        Returns:
+            List of (item, similarity_score) tuples, sorted by similarity descending
+        """
+        k = top_k if predicate is None else top_k * 4
+        while True:
+            hits = index.search(query_vec, k, min_score=min_similarity)
+            results = []
+            for item_id, score in hits:
+                item = items.get(item_id)
+                if item is None or (predicate is not None and not predicate(item)):
+                    continue
+                results.append((item, score))
+                if len(results) >= top_k:
+                    return results
+            if len(hits) < k:
+                return results
+            k *= 4
+
     def hybrid_search(
         self,
         query: str,
@@ -1566,11 +1840,18 @@ class ExplorationGraph:
             return self._keyword_search(node.get_searchable_text(), top_k + 1)
 
         # Search with node's embedding
-        results = self.semantic_search(
-            node.get_searchable_text(),
-            top_k + 1,  # +1 because the node itself will be in results
-            min_similarity=0.3
-        )
+        if self._node_index is not None:
+            results = self._vector_search(
+                self._node_index, self.nodes, node.embedding,
+                top_k + 1,  # +1 because the node itself will be in results
+                min_similarity=0.3
+            )
+        else:
+            results = self.semantic_search(
+                node.get_searchable_text(),
+                top_k + 1,
+                min_similarity=0.3
+            )
 
         # Remove the node itself from results
         return [(n, s) for n, s in results if n.id != node_id][:top_k]
@@ -1592,6 +1873,8 @@ class ExplorationGraph:
         embedding = self.generate_embedding(text)
         if embedding:
             insight.embedding = embedding
+            self._mark_insight_dirty(insight.id)
+            self._index_embedding(self._insight_index, insight)
             return True
         return False
 
@@ -1628,6 +1911,9 @@ class ExplorationGraph:
                 with self._graph_lock():
                     for insight, embedding in zip(insights_to_embed, embeddings):
                         insight.embedding = embedding.tolist()
+                        self._mark_insight_dirty(insight.id)
+                    if self._insight_index is not None:
+                        self._insight_index.add_many((i.id, i.embedding) for i in insights_to_embed)
                 logger.info(f"Generated {len(embeddings)} insight embeddings")
         except Exception as e:
             logger.error(f"Failed to generate insight embeddings: {e}")
@@ -1660,6 +1946,11 @@ class ExplorationGraph:
         if query_embedding is None:
             return self._keyword_search_insights(query, top_k)
 
+        if self._insight_index is not None and len(self._insight_index) > 0:
+            return self._vector_search(
+                self._insight_index, self.insights, query_embedding, top_k, min_similarity
+            )
+
         query_vec = np.array(query_embedding)
 
         results = []
@@ -1735,119 +2026,45 @@ class ExplorationGraph:
         """
         Calculate node positions using force-directed layout algorithm.
 
-        Uses a vectorized Fruchterman-Reingold algorithm:
-        1. Initialize random positions
-        2. Apply repulsive forces between all nodes (vectorized)
-        3. Apply attractive forces along edges
-        4. Apply centering force
-        5. Repeat until stable
+        Fruchterman-Reingold with grid-bucketed repulsion for large graphs
+        (see graph_layout). Positions are persisted: an unchanged graph is
+        not laid out again, and added nodes are placed next to their
+        neighbours and relaxed locally.
 
         Args:
             width: Canvas width
             height: Canvas height
-            iterations: Number of simulation iterations
+            iterations: Number of simulation iterations for a layout from scratch
 
         Returns:
             Dict mapping node_id -> (x, y) position
         """
-        if not self.nodes:
+        if self._layout is None:
             return {}
 
-        node_ids = list(self.nodes.keys())
-        n_nodes = len(node_ids)
-
-        if n_nodes <= 1:
-            return {node_ids[0]: (width / 2, height / 2)} if n_nodes == 1 else {}
-
-        # Use numpy arrays for vectorized operations
-        pos = np.random.uniform(
-            [50, 50],
-            [width - 50, height - 50],
-            size=(n_nodes, 2)
-        )
+        with self._graph_lock():
+            node_ids = list(self.nodes.keys())
+            id_to_idx = {nid: i for i, nid in enumerate(node_ids)}
+            edge_indices = []
+            edge_strengths = []
+            for edge in self.edges:
+                if edge.source_id in id_to_idx and edge.target_id in id_to_idx:
+                    edge_indices.append((id_to_idx[edge.source_id], id_to_idx[edge.target_id]))
+                    edge_strengths.append(edge.strength)
 
-        # Node ID to index mapping
-        id_to_idx = {nid: i for i, nid in enumerate(node_ids)}
+        return self._layout.layout(node_ids, edge_indices, edge_strengths, width, height, iterations)
 
-        # Build edge indices
-        edge_indices = []
-        edge_strengths = []
-        for edge in self.edges:
-            if edge.source_id in id_to_idx and edge.target_id in id_to_idx:
-                edge_indices.append((id_to_idx[edge.source_id], id_to_idx[edge.target_id]))
-                edge_strengths.append(edge.strength)
-        edge_indices = np.array(edge_indices) if edge_indices else np.array([]).reshape(0, 2)
-        edge_strengths = np.array(edge_strengths)
-
-        # Force parameters
-        k = np.sqrt((width * height) / n_nodes)  # Optimal distance
-        k_sq = k * k
-        temp = width / 10  # Initial temperature
-
-        # Adaptive iterations based on node count
-        actual_iterations = min(iterations, max(50, 150 - n_nodes))
-
-        for _ in range(actual_iterations):
-            # Calculate all pairwise displacements (vectorized)
-            # diff[i, j] = pos[j] - pos[i]
-            diff = pos[np.newaxis, :, :] - pos[:, np.newaxis, :]  # Shape: (n, n, 2)
-
-            # Calculate distances
-            dist = np.sqrt(np.sum(diff ** 2, axis=2))  # Shape: (n, n)
-            dist = np.maximum(dist, 0.01)  # Avoid division by zero
-
-            # Repulsive forces: F = k^2 / d (along direction from i to j)
-            # Force on i from j is -F * direction, force on j from i is +F * direction
-            repulsion_magnitude = k_sq / dist  # Shape: (n, n)
-
-            # Set diagonal to 0 (no self-force)
-            np.fill_diagonal(repulsion_magnitude, 0)
-
-            # Calculate repulsive force vectors
-            # Normalize diff to get directions
-            directions = diff / dist[:, :, np.newaxis]
-            np.nan_to_num(directions, copy=False)
-
-            # Sum repulsive forces (negative because we want to push apart)
-            forces = -np.sum(repulsion_magnitude[:, :, np.newaxis] * directions, axis=1)
-
-            # Attractive forces along edges
-            if len(edge_indices) > 0:
-                for idx, (i, j) in enumerate(edge_indices):
-                    d = pos[j] - pos[i]
-                    dist_ij = max(np.linalg.norm(d), 0.01)
-                    # Attractive force: F = d^2 / k
-                    attraction = (dist_ij * dist_ij) / k * edge_strengths[idx]
-                    direction = d / dist_ij
-                    forces[i] += attraction * direction
-                    forces[j] -= attraction * direction
-
-            # Apply forces with temperature limiting
-            force_magnitudes = np.linalg.norm(forces, axis=1)
-            force_magnitudes = np.maximum(force_magnitudes, 0.01)
-
-            # Limit displacement by temperature
-            scale = np.minimum(force_magnitudes, temp) / force_magnitudes
-            displacement = forces * scale[:, np.newaxis]
-
-            # Update positions
-            pos += displacement
-
-            # Keep within bounds
-            pos[:, 0] = np.clip(pos[:, 0], 30, width - 30)
-            pos[:, 1] = np.clip(pos[:, 1], 30, height - 30)
-
-            # Cool down
-            temp *= 0.95
-
-        # Convert back to dict
-        return {node_ids[i]: (float(pos[i, 0]), float(pos[i, 1])) for i in range(n_nodes)}
+    def reset_layout(self):
+        """Discard stored node positions; the next export lays the graph out from scratch."""
+        if self._layout is not None:
+            self._layout.reset()
 
     def export_for_visualization(
         self,
         width: float = 800,
         height: float = 600,
-        layout_iterations: int = 100
+        layout_iterations: int = 100,
+        include_layout: bool = True
     ) -> Dict:
         """
         Export graph in visualization-friendly format.
@@ -1859,6 +2076,8 @@ class ExplorationGraph:
             width: Canvas width
             height: Canvas height
             layout_iterations: Iterations for layout algorithm
+            include_layout: Compute node positions ('x', 'y'); exports that
+                don't draw the graph skip the layout
 
         Returns:
             Dict with nodes, edges, and stats
@@ -1866,17 +2085,15 @@ class ExplorationGraph:
         from collections import Counter
 
         # Calculate layout
-        positions = self._force_directed_layout(width, height, layout_iterations)
+        positions = self._force_directed_layout(width, height, layout_iterations) if include_layout else None
 
         # Build nodes list
         nodes = []
         for node in self.nodes.values():
-            x, y = positions.get(node.id, (width/2, height/2))
-
             # Calculate size based on exploration count
             size = min(20 + node.exploration_count * 2, 50)
 
-            nodes.append({
+            node_data = {
                 'id': node.id,
                 'name': node.name,
                 'type': node.node_type,
@@ -1884,11 +2101,14 @@ class ExplorationGraph:
                 'summary': node.summary[:200] if node.summary else '',
                 'exploration_count': node.exploration_count,
                 'tags': node.tags[:5],
-                'x': round(x, 2),
-                'y': round(y, 2),
                 'size': size,
                 'has_embedding': node.embedding is not None
-            })
+            }
+            if positions is not None:
+                x, y = positions.get(node.id, (width/2, height/2))
+                node_data['x'] = round(x, 2)
+                node_data['y'] = round(y, 2)
+            nodes.append(node_data)
 
         # Build edges list
         edges = []
@@ -2034,9 +2254,14 @@ class ExplorationGraph:
         """
         node_count = len(self.nodes)
         has_faiss = self._check_faiss_available()
+        index_stats = self._node_index.get_stats() if self._node_index is not None else None
 
-        recommendation = "numpy (current)"
-        if node_count >= 10000:
+        if index_stats is not None:
+            if index_stats['ivf_trained']:
+                recommendation = "Built-in vector index with IVF quantizer (current)"
+            else:
+                recommendation = "Built-in vector index, exact search (current)"
+        elif node_count >= 10000:
             if has_faiss:
                 recommendation = "FAISS recommended - call build_faiss_index()"
             else:
@@ -2051,6 +2276,7 @@ class ExplorationGraph:
             'embedding_count': sum(1 for n in self.nodes.values() if n.embedding is not None),
             'faiss_available': has_faiss,
             'faiss_index_built': hasattr(self, '_faiss_index') and self._faiss_index is not None,
+            'vector_index': index_stats,
             'recommendation': recommendation
         }
 
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Graph Layout - Cached, incremental force-directed layout for the Exploration Graph
+
+A Fruchterman-Reingold layout that scales past a few thousand nodes:
+
+- Repulsion is exact (all pairs) for small graphs and grid-bucketed for
+  larger ones: nodes are bucketed into cells of twice the ideal edge
+  length and only repel nodes in the same or an adjacent cell (the grid
+  variant of the original algorithm), so an iteration costs O(n) instead
+  of O(n^2)
+- Attraction along edges is vectorized
+- Positions are persisted in <storage>/layout.json, normalized to the unit
+  square so any canvas size reuses them. A layout request for an
+  unchanged graph runs no iterations; new nodes start next to their
+  neighbours and only they (and those neighbours) are relaxed for a few
+  steps. The graph is laid out from scratch when most nodes are new
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+LAYOUT_FILENAME = "layout.json"
+GRID_MIN_NODES = 1000  # Below this, repulsion is computed between all pairs
+MARGIN = 30  # Nodes are kept this far from the canvas edges
+LOCAL_ITERATIONS = 20  # Relaxation steps after nodes are added
+FULL_LAYOUT_RATIO = 0.5  # Lay out from scratch when this share of nodes is new
+COOLING = 0.95
+RANDOM_SEED = 0  # Layouts from scratch are reproducible
+
+
+# =============================================================================
+# FORCES
+# =============================================================================
+
+# Repulsion functions return the forces on the nodes listed in active
+
+def _exact_repulsion(pos: np.ndarray, k_sq: float, active: np.ndarray) -> np.ndarray:
+    diff = pos[np.newaxis, :, :] - pos[active, np.newaxis, :]  # diff[a, j] = pos[j] - pos[active[a]]
+    dist_sq = np.maximum(np.sum(diff ** 2, axis=2), 1e-4)
+    magnitude = k_sq / dist_sq  # k^2 / d, divided by d to normalize diff
+    magnitude[np.arange(len(active)), active] = 0
+    return -np.sum(magnitude[:, :, np.newaxis] * diff, axis=1)
+
+
+def _grid_repulsion(pos: np.ndarray, k_sq: float, active: np.ndarray) -> np.ndarray:
+    n = len(active)
+    cell_size = 2 * np.sqrt(k_sq)
+    cells = np.floor(pos / cell_size).astype(np.int64)
+    cells -= cells.min(axis=0)
+    # One empty cell of padding on each side, so neighbour keys never wrap
+    n_cols = int(cells[:, 0].max()) + 3
+    keys = (cells[:, 1] + 1) * n_cols + cells[:, 0] + 1
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+
+    forces = np.zeros((n, 2))
+    node_range = np.arange(n)
+    active_keys = keys[active]
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            neighbour_keys = active_keys + dy * n_cols + dx
+            start = np.searchsorted(sorted_keys, neighbour_keys, side='left')
+            counts = np.searchsorted(sorted_keys, neighbour_keys, side='right') - start
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            # Every (active node, node in the neighbour cell) pair; src
+            # indexes active, dst indexes pos
+            src = np.repeat(node_range, counts)
+            offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            dst = order[np.repeat(start, counts) + offsets]
+            keep = active[src] != dst
+            src, dst = src[keep], dst[keep]
+
+            diff = pos[dst] - pos[active[src]]
+            dist_sq = np.maximum(np.einsum('ij,ij->i', diff, diff), 1e-4)
+            magnitude = np.where(dist_sq < cell_size * cell_size, k_sq / dist_sq, 0.0)
+            forces[:, 0] -= np.bincount(src, weights=magnitude * diff[:, 0], minlength=n)
+            forces[:, 1] -= np.bincount(src, weights=magnitude * diff[:, 1], minlength=n)
+    return forces
+
+
+def _attraction(pos: np.ndarray, edges: np.ndarray, strengths: np.ndarray, k: float) -> np.ndarray:
+    forces = np.zeros_like(pos)
+    if not len(edges):
+        return forces
+    src, dst = edges[:, 0], edges[:, 1]
+    diff = pos[dst] - pos[src]
+    dist = np.maximum(np.linalg.norm(diff, axis=1), 0.01)
+    # d^2 / k along the edge direction
+    pull = diff * (dist / k * strengths)[:, np.newaxis]
+    n = len(pos)
+    for axis in (0, 1):
+        forces[:, axis] += np.bincount(src, weights=pull[:, axis], minlength=n)
+        forces[:, axis] -= np.bincount(dst, weights=pull[:, axis], minlength=n)
+    return forces
+
+
+def relax(
+    pos: np.ndarray,
+    edges: np.ndarray,
+    strengths: np.ndarray,
+    width: float,
+    height: float,
+    iterations: int,
+    temperature: float,
+    movable: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Run force-directed iterations on positions (in place).
+
+    Args:
+        pos: (n, 2) positions on the canvas
+        edges: (m, 2) node index pairs
+        strengths: (m,) edge weights
+        width: Canvas width
+        height: Canvas height
+        iterations: Number of iterations
+        temperature: Max displacement in the first iteration (cools down)
+        movable: Optional (n,) mask of the nodes allowed to move
+
+    Returns:
+        pos
+    """
+    n = len(pos)
+    k_sq = (width * height) / n  # Squared ideal edge length
+    k = np.sqrt(k_sq)
+    repulsion = _grid_repulsion if n >= GRID_MIN_NODES else _exact_repulsion
+
+    # Forces are only computed for the nodes that move
+    if movable is None:
+        active = np.arange(n)
+    else:
+        active = np.flatnonzero(movable)
+        touching = movable[edges[:, 0]] | movable[edges[:, 1]]
+        edges, strengths = edges[touching], strengths[touching]
+
+    for _ in range(iterations):
+        forces = repulsion(pos, k_sq, active) + _attraction(pos, edges, strengths, k)[active]
+        magnitude = np.maximum(np.linalg.norm(forces, axis=1), 0.01)
+        displacement = forces * (np.minimum(magnitude, temperature) / magnitude)[:, np.newaxis]
+        pos[active] += displacement
+        pos[:, 0] = np.clip(pos[:, 0], MARGIN, width - MARGIN)
+        pos[:, 1] = np.clip(pos[:, 1], MARGIN, height - MARGIN)
+        temperature *= COOLING
+    return pos
+
+
+# =============================================================================
+# CACHED LAYOUT
+# =============================================================================
+
+class GraphLayout:
+    """Persistent node positions, updated incrementally as the graph grows."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: JSON file the positions are kept in (None = memory only)
+        """
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._positions: Optional[Dict[str, Tuple[float, float]]] = None  # Unit square
+        self.last_iterations = 0  # Iterations run by the last layout() call
+
+    def _load(self) -> Dict[str, Tuple[float, float]]:
+        if self._positions is None:
+            self._positions = {}
+            if self.path and self.path.exists():
+                try:
+                    with open(self.path, 'r') as f:
+                        self._positions = {nid: tuple(xy) for nid, xy in json.load(f)['positions'].items()}
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Ignoring unreadable layout cache {self.path}: {e}")
+        return self._positions
+
+    def _save(self):
+        if not self.path:
+            return
+        temp_path = self.path.with_suffix('.tmp')
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump({'positions': self._positions}, f, separators=(',', ':'))
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save layout cache: {e}")
+
+    def reset(self):
+        """Forget all positions: the next layout starts from scratch."""
+        with self._lock:
+            self._positions = {}
+            if self.path:
+                try:
+                    self.path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def layout(
+        self,
+        node_ids: Sequence[str],
+        edges: List[Tuple[int, int]],
+        strengths: List[float],
+        width: float = 800,
+        height: float = 600,
+        iterations: int = 100
+    ) -> Dict[str, Tuple[float, float]]:
+        """
+        Get node positions, reusing cached ones.
+
+        Args:
+            node_ids: Nodes to place
+            edges: Node index pairs (indexes into node_ids)
+            strengths: Edge weights
+            width: Canvas width
+            height: Canvas height
+            iterations: Iterations for a layout from scratch
+
+        Returns:
+            Dict mapping node_id -> (x, y) position
+        """
+        n = len(node_ids)
+        if n <= 1:
+            self.last_iterations = 0
+            return {node_ids[0]: (width / 2, height / 2)} if n == 1 else {}
+
+        edge_array = np.array(edges, dtype=np.int64).reshape(-1, 2)
+        strength_array = np.array(strengths, dtype=np.float64)
+        scale = np.array([width, height], dtype=np.float64)
+
+        with self._lock:
+            cached = self._load()
+            known = np.fromiter((nid in cached for nid in node_ids), dtype=bool, count=n)
+            n_new = n - int(known.sum())
+            changed = n_new > 0 or len(cached) != n - n_new
+
+            if n_new > n * FULL_LAYOUT_RATIO:
+                rng = np.random.default_rng(RANDOM_SEED)
+                pos = rng.uniform([50, 50], [width - 50, height - 50], size=(n, 2))
+                self.last_iterations = min(iterations, max(50, 150 - n))
+                relax(pos, edge_array, strength_array, width, height, self.last_iterations, width / 10)
+            else:
+                pos = np.empty((n, 2))
+                pos[known] = np.array([cached[nid] for nid, k in zip(node_ids, known) if k]) * scale
+                self.last_iterations = 0
+                if n_new:
+                    self._place_new(pos, known, edge_array, scale)
+                    # Relax the new nodes and their neighbours only
+                    movable = ~known
+                    touching = movable[edge_array[:, 0]] | movable[edge_array[:, 1]]
+                    movable[edge_array[touching].ravel()] = True
+                    self.last_iterations = LOCAL_ITERATIONS
+                    k = np.sqrt(width * height / n)
+                    relax(pos, edge_array, strength_array, width, height, LOCAL_ITERATIONS, k, movable)
+
+            # Stored normalized, and returned exactly as a later call will scale them
+            normalized = pos / scale
+            if changed:
+                self._positions = {nid: (float(x), float(y)) for nid, (x, y) in zip(node_ids, normalized)}
+                self._save()
+
+        return {nid: (float(x), float(y)) for nid, (x, y) in zip(node_ids, normalized * scale)}
+
+    @staticmethod
+    def _place_new(pos: np.ndarray, known: np.ndarray, edges: np.ndarray, scale: np.ndarray):
+        """Start new nodes at the centroid of their placed neighbours (or at random)."""
+        n = len(pos)
+        rng = np.random.default_rng(RANDOM_SEED + n)
+        total = np.zeros((n, 2))
+        count = np.zeros(n)
+        for a, b in ((0, 1), (1, 0)):
+            # Neighbour b of new node a, where b is already placed
+            mask = ~known[edges[:, a]] & known[edges[:, b]]
+            np.add.at(total, edges[mask, a], pos[edges[mask, b]])
+            np.add.at(count, edges[mask, a], 1)
+
+        new = ~known
+        has_neighbour = new & (count > 0)
+        jitter = rng.normal(0, 0.02, size=(n, 2)) * scale
+        pos[has_neighbour] = total[has_neighbour] / count[has_neighbour, np.newaxis] + jitter[has_neighbour]
+        lonely = new & (count == 0)
+        pos[lonely] = rng.uniform([MARGIN, MARGIN], scale - MARGIN, size=(int(lonely.sum()), 2))
+        np.clip(pos, MARGIN, scale - MARGIN, out=pos)
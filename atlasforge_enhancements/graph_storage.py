@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Graph Storage - Append-only persistence for the Exploration Graph
+
+Stores ExplorationGraph state as a compacted snapshot plus a write-ahead
+log (WAL) of deltas, so that saving and reloading cost grows with the
+change set instead of the whole graph:
+
+- nodes.json / edges.json / insights.json: the snapshot. One compact JSON
+  record per line, which keeps the files valid JSON arrays for legacy
+  readers while letting the loader scan them through mmap line by line.
+- graph_manifest.json: snapshot generation and format.
+- graph_wal_<generation>.jsonl: deltas appended since the snapshot
+  ({"op": "node" | "edge" | "insight", "data": {...}}).
+
+Replaying the WAL is idempotent: nodes and insights are upserts, and edges
+are deduplicated by their identity key. Compaction folds the WAL into a new
+snapshot and rotates to the next generation; cross-process safety comes
+from an flock on a sidecar lock file.
+"""
+
+import fcntl
+import json
+import logging
+import mmap
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+MANIFEST_FILE = "graph_manifest.json"
+LOCK_FILE = ".graph.lock"
+WAL_FILE_TEMPLATE = "graph_wal_{generation}.jsonl"
+SNAPSHOT_FILES = {
+    'node': 'nodes.json',
+    'edge': 'edges.json',
+    'insight': 'insights.json',
+}
+SNAPSHOT_FORMAT_LINES = 'lines-v1'  # One compact JSON record per line
+
+# Fields identifying an edge (ExplorationGraph._edge_key), for WAL dedup
+EDGE_KEY_FIELDS = ('source_id', 'target_id', 'relationship', 'discovered_at', 'mission_id')
+
+# Compact once the WAL outgrows both this floor and the snapshot itself,
+# which keeps the amortized write cost per change constant.
+COMPACTION_MIN_WAL_BYTES = 4 * 1024 * 1024
+
+
+def encode_record(op: str, data: Dict[str, Any]) -> bytes:
+    """Encode a single WAL record as one newline-terminated line."""
+    return json.dumps({'op': op, 'data': data}, separators=(',', ':'), default=str).encode('utf-8') + b'\n'
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+class GraphLogStore:
+    """
+    Snapshot + write-ahead log storage for a single graph directory.
+
+    The store only deals with raw dict records; ExplorationGraph decides
+    what they mean. Callers hold file_lock() around load/read_tail/append
+    and commit_compaction so that concurrent processes see a consistent
+    snapshot/WAL pair.
+    """
+
+    def __init__(self, storage_path: Path):
+        self.storage_path = Path(storage_path)
+        self.generation = 0
+        self.wal_offset = 0  # Bytes of the current WAL already applied in memory
+        self.snapshot_bytes = 0
+        self._manifest_path = self.storage_path / MANIFEST_FILE
+        self._lock_path = self.storage_path / LOCK_FILE
+
+    # -------------------------------------------------------------------------
+    # Locking and paths
+    # -------------------------------------------------------------------------
+
+    @contextmanager
+    def file_lock(self, exclusive: bool = True):
+        """Cross-process lock for the graph directory (no-op if unwritable)."""
+        try:
+            handle = open(self._lock_path, 'a+')
+        except OSError as e:
+            logger.debug(f"Graph lock unavailable, continuing unlocked: {e}")
+            yield
+            return
+
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+        finally:
+            handle.close()
+
+    def wal_path(self, generation: Optional[int] = None) -> Path:
+        """Path of the WAL for a generation (default: current)."""
+        if generation is None:
+            generation = self.generation
+        return self.storage_path / WAL_FILE_TEMPLATE.format(generation=generation)
+
+    def has_snapshot(self) -> bool:
+        """Whether a snapshot (legacy or compacted) exists on disk."""
+        return (self.storage_path / SNAPSHOT_FILES['node']).exists()
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self._manifest_path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Unreadable graph manifest, assuming generation 0: {e}")
+            return {}
+
+    def _write_manifest(self, generation: int):
+        temp_file = self._manifest_path.with_suffix('.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump({'generation': generation, 'format': SNAPSHOT_FORMAT_LINES}, f)
+        temp_file.replace(self._manifest_path)
+
+    # -------------------------------------------------------------------------
+    # Reading
+    # -------------------------------------------------------------------------
+
+    def load(self) -> Tuple[Dict[str, List[dict]], List[dict]]:
+        """
+        Load the full snapshot and WAL.
+
+        Returns:
+            Tuple of ({kind: [records]}, wal_records)
+        """
+        manifest = self._read_manifest()
+        self.generation = int(manifest.get('generation', 0))
+        lines_format = manifest.get('format') == SNAPSHOT_FORMAT_LINES
+
+        snapshot = {}
+        self.snapshot_bytes = 0
+        for kind, filename in SNAPSHOT_FILES.items():
+            path = self.storage_path / filename
+            snapshot[kind] = self._read_snapshot(path, lines_format)
+            try:
+                self.snapshot_bytes += path.stat().st_size
+            except OSError:
+                pass
+
+        records, self.wal_offset = self._read_wal(self.wal_path(), 0)
+        return snapshot, records
+
+    def exists(self) -> bool:
+        """Whether the directory holds a graph (snapshot or WAL)."""
+        return self.has_snapshot() or any(self.storage_path.glob(WAL_FILE_TEMPLATE.format(generation='*')))
+
+    def last_modified(self) -> float:
+        """Newest mtime of the snapshot, manifest and WAL files (0 if none)."""
+        paths = [self.storage_path / filename for filename in SNAPSHOT_FILES.values()]
+        paths.append(self._manifest_path)
+        paths.extend(self.storage_path.glob(WAL_FILE_TEMPLATE.format(generation='*')))
+        mtimes = []
+        for path in paths:
+            try:
+                mtimes.append(path.stat().st_mtime)
+            except OSError:
+                pass
+        return max(mtimes, default=0.0)
+
+    def read_records(self) -> Dict[str, List[dict]]:
+        """
+        Current records with the WAL replayed onto the snapshot (read-only).
+
+        For callers that need the graph's contents without building an
+        ExplorationGraph, e.g. stats of other missions' graphs.
+
+        Returns:
+            {kind: [records]}, nodes and insights upserted by id and edges
+            deduplicated
+        """
+        with self.file_lock(exclusive=False):
+            snapshot, records = self.load()
+
+        items: Dict[str, Dict[Any, dict]] = {kind: {} for kind in SNAPSHOT_FILES}
+        for kind, snapshot_records in snapshot.items():
+            for data in snapshot_records:
+                items[kind][self._record_key(kind, data)] = data
+        for record in records:
+            kind = record.get('op')
+            data = record.get('data')
+            if kind in items and isinstance(data, dict):
+                items[kind][self._record_key(kind, data)] = data
+        return {kind: list(records.values()) for kind, records in items.items()}
+
+    @staticmethod
+    def _record_key(kind: str, data: dict) -> Any:
+        if kind == 'edge':
+            return tuple(str(data.get(field)) for field in EDGE_KEY_FIELDS)
+        return data.get('id')
+
+    def read_tail(self) -> Optional[List[dict]]:
+        """
+        Read WAL records appended since the last load/read/append.
+
+        Returns:
+            New records, or None if another process compacted the graph
+            (generation changed) and a full load() is required.
+        """
+        manifest = self._read_manifest()
+        if int(manifest.get('generation', 0)) != self.generation:
+            return None
+
+        records, self.wal_offset = self._read_wal(self.wal_path(), self.wal_offset)
+        return records
+
+    def _read_snapshot(self, path: Path, lines_format: bool) -> List[dict]:
+        """Read one snapshot file, scanning line by line when possible."""
+        if not path.exists():
+            return []
+
+        if lines_format:
+            try:
+                return self._read_snapshot_lines(path)
+            except (ValueError, OSError):
+                # Written by an older version with indent=2; parse as a whole
+                pass
+
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            return data if isinstance(data, list) else []
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse {path.name}: {e}")
+        except Exception as e:
+            logger.error(f"Failed to load {path.name}: {e}")
+        return []
+
+    @staticmethod
+    def _read_snapshot_lines(path: Path) -> List[dict]:
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                records = []
+                for line in iter(mm.readline, b''):
+                    line = line.strip().lstrip(b',')
+                    if line in (b'', b'[', b']'):
+                        continue
+                    records.append(json.loads(line))
+                return records
+
+    @staticmethod
+    def _read_wal(path: Path, offset: int) -> Tuple[List[dict], int]:
+        """
+        Read complete WAL lines starting at a byte offset.
+
+        A trailing line without a newline is a torn write and is left for
+        the next writer to truncate.
+
+        Returns:
+            Tuple of (records, new_offset)
+        """
+        try:
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], offset
+
+        end = data.rfind(b'\n') + 1
+        records = []
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                logger.warning(f"Skipping malformed WAL record: {e}")
+        return records, offset + end
+
+    # -------------------------------------------------------------------------
+    # Writing
+    # -------------------------------------------------------------------------
+
+    def append(self, lines: List[bytes]):
+        """
+        Append encoded records to the current WAL.
+
+        Must be called under file_lock() right after read_tail(), so any
+        bytes past wal_offset can only be a torn write and are discarded.
+        """
+        if not lines:
+            return
+
+        payload = b''.join(lines)
+        with open(self.wal_path(), 'ab') as f:
+            if f.tell() > self.wal_offset:
+                f.truncate(self.wal_offset)
+                f.seek(self.wal_offset)
+            f.write(payload)
+            f.flush()
+        self.wal_offset += len(payload)
+
+    def should_compact(self) -> bool:
+        """Whether the WAL has grown enough to be folded into the snapshot."""
+        return self.wal_offset >= max(COMPACTION_MIN_WAL_BYTES, self.snapshot_bytes)
+
+    def write_snapshot(self, snapshot: Dict[str, Iterable[str]], generation: int) -> Dict[str, Path]:
+        """
+        Write snapshot files to temp paths, ready for commit_compaction().
+
+        Args:
+            snapshot: {kind: iterable of JSON-encoded records}
+            generation: Generation the snapshot is based on
+
+        Returns:
+            {kind: temp_path}
+        """
+        temp_files = {}
+        try:
+            for kind, filename in SNAPSHOT_FILES.items():
+                temp_file = self.storage_path / f"{filename}.{os.getpid()}.{generation}.tmp"
+                temp_files[kind] = temp_file
+                with open(temp_file, 'w') as f:
+                    f.write('[')
+                    first = True
+                    for line in snapshot.get(kind, ()):
+                        f.write('\n' if first else ',\n')
+                        f.write(line)
+                        first = False
+                    f.write('\n]\n')
+        except Exception:
+            self.discard_snapshot(temp_files)
+            raise
+        return temp_files
+
+    @staticmethod
+    def discard_snapshot(temp_files: Dict[str, Path]):
+        for temp_file in temp_files.values():
+            try:
+                temp_file.unlink()
+            except OSError:
+                pass
+
+    def commit_compaction(self, temp_files: Dict[str, Path], generation: int, cutoff: int) -> bool:
+        """
+        Swap in a snapshot and rotate the WAL. Call under file_lock().
+
+        WAL bytes past `cutoff` (written after the snapshot was captured)
+        carry over into the next generation's WAL. Every intermediate state
+        replays correctly because WAL replay is idempotent.
+
+        Returns:
+            False if another process compacted first (snapshot discarded)
+        """
+        if int(self._read_manifest().get('generation', 0)) != generation:
+            self.discard_snapshot(temp_files)
+            return False
+
+        old_wal = self.wal_path(generation)
+        new_wal = self.wal_path(generation + 1)
+
+        try:
+            with open(old_wal, 'rb') as f:
+                f.seek(cutoff)
+                tail = f.read()
+        except FileNotFoundError:
+            tail = b''
+        tail = tail[:tail.rfind(b'\n') + 1]
+
+        temp_wal = new_wal.with_suffix('.tmp')
+        with open(temp_wal, 'wb') as f:
+            f.write(tail)
+        temp_wal.replace(new_wal)
+
+        snapshot_bytes = 0
+        for kind, temp_file in temp_files.items():
+            snapshot_bytes += temp_file.stat().st_size
+            temp_file.replace(self.storage_path / SNAPSHOT_FILES[kind])
+
+        self._write_manifest(generation + 1)
+
+        try:
+            old_wal.unlink()
+        except FileNotFoundError:
+            pass
+
+        self.generation = generation + 1
+        self.wal_offset = max(0, self.wal_offset - cutoff)
+        self.snapshot_bytes = snapshot_bytes
+        return True
@@ -24,8 +24,10 @@ import numpy as np
 
 try:
     from .exploration_graph import ExplorationGraph, ExplorationNode, ExplorationInsight, EmbeddingModel
+    from .graph_storage import GraphLogStore
 except ImportError:
     from exploration_graph import ExplorationGraph, ExplorationNode, ExplorationInsight, EmbeddingModel
+    from graph_storage import GraphLogStore
 
 
 @dataclass
@@ -160,27 +162,17 @@ class KnowledgeTransfer:
 
             # Check for exploration data
             exploration_path = mission_dir / "workspace" / "atlasforge_data" / "exploration"
-            nodes_file = exploration_path / "nodes.json"
+            store = GraphLogStore(exploration_path)
 
-            if not nodes_file.exists():
+            if not store.exists():
                 continue
 
             try:
-                # Load basic stats
-                with open(nodes_file, 'r') as f:
-                    nodes_data = json.load(f)
-
-                edges_file = exploration_path / "edges.json"
-                edges_count = 0
-                if edges_file.exists():
-                    with open(edges_file, 'r') as f:
-                        edges_count = len(json.load(f))
-
-                insights_file = exploration_path / "insights.json"
-                insights_count = 0
-                if insights_file.exists():
-                    with open(insights_file, 'r') as f:
-                        insights_count = len(json.load(f))
+                # Load basic stats (snapshot plus WAL: saves only append to the WAL)
+                records = store.read_records()
+                nodes_data = records['node']
+                edges_count = len(records['edge'])
+                insights_count = len(records['insight'])
 
                 # Extract top tags
                 tag_counts: Dict[str, int] = {}
@@ -190,8 +182,11 @@ class KnowledgeTransfer:
                 top_tags = sorted(tag_counts.keys(), key=lambda t: tag_counts[t], reverse=True)[:5]
 
                 # Get modification times
-                created_at = datetime.fromtimestamp(nodes_file.stat().st_ctime).isoformat()
-                last_modified = datetime.fromtimestamp(nodes_file.stat().st_mtime).isoformat()
+                nodes_file = exploration_path / "nodes.json"
+                last_modified_ts = store.last_modified()
+                created_ts = nodes_file.stat().st_ctime if nodes_file.exists() else last_modified_ts
+                created_at = datetime.fromtimestamp(created_ts).isoformat()
+                last_modified = datetime.fromtimestamp(last_modified_ts).isoformat()
 
                 # Try to get mission name from mission.json
                 mission_name = mission_id
@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+"""
+Vector Index - Persistent NumPy similarity index for the Exploration Graph
+
+A pure-NumPy replacement for rebuilding an embedding matrix from Python
+lists on every search:
+
+- <name>_vectors.f32: contiguous float32 matrix of L2-normalized rows,
+  memory-mapped with np.memmap and grown by doubling
+- <name>_ids.txt: append-only id map (line i is the id of row i)
+- <name>_index.json: index metadata (dimension)
+- <name>_ivf.npz: optional coarse quantizer (k-means centroids and row
+  assignments) trained once the index passes a size threshold
+
+Adds and updates write a single row in place. Removal zeroes the row (a
+zero row is the on-disk tombstone, since live rows are unit length), and
+the files are rewritten (written aside, then renamed) once dead rows make
+up a large share of the index, checked on open and on sync(). Other
+processes' appends are picked up by tailing the id map, the same way
+graph_storage tails its WAL. The quantizer is trained on a background
+thread, so inserts never wait for k-means.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+INITIAL_CAPACITY = 1024  # Rows allocated when the index is created
+IVF_THRESHOLD = 20000  # Live rows before the coarse quantizer is trained
+IVF_NPROBE = 8  # Centroid lists scanned per query
+IVF_TRAIN_SAMPLE = 20000  # Rows sampled for k-means training
+IVF_TRAIN_ITERATIONS = 10
+DEAD_ROW_RATIO = 0.25  # Rewrite files once this share of rows is removed
+ASSIGN_CHUNK_SIZE = 8192  # Rows scored per chunk when assigning centroids
+
+
+def _normalize(vector: Sequence[float]) -> Optional[np.ndarray]:
+    vec = np.asarray(vector, dtype=np.float32).ravel()
+    norm = float(np.linalg.norm(vec))
+    if norm == 0.0 or not np.isfinite(norm):
+        return None
+    return vec / norm
+
+
+class VectorIndex:
+    """
+    Persistent cosine-similarity index over string ids.
+
+    Thread-safe within a process; appends from other processes are
+    serialized by an flock on the id map.
+    """
+
+    def __init__(self, directory: Path, name: str, ivf_threshold: int = IVF_THRESHOLD):
+        """
+        Open (or lazily create) an index.
+
+        Args:
+            directory: Directory holding the index files
+            name: File prefix, e.g. 'node' or 'insight'
+            ivf_threshold: Live rows before the coarse quantizer is used
+        """
+        self.directory = Path(directory)
+        self.name = name
+        self.ivf_threshold = ivf_threshold
+        self._lock = threading.RLock()
+
+        self._vectors_path = self.directory / f"{name}_vectors.f32"
+        self._ids_path = self.directory / f"{name}_ids.txt"
+        self._meta_path = self.directory / f"{name}_index.json"
+        self._ivf_path = self.directory / f"{name}_ivf.npz"
+
+        self.dim: Optional[int] = None
+        self._matrix: Optional[np.memmap] = None
+        self._ids: List[str] = []
+        self._id_to_row: Dict[str, int] = {}
+        self._dead: set = set()  # Rows zeroed by remove()
+        self._ids_offset = 0  # Bytes of the id map already read
+        self._ids_inode: Optional[int] = None  # Detects rewrites by other processes
+
+        # Coarse quantizer
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._trained_count = 0
+        self._train_thread: Optional[threading.Thread] = None
+
+        self._open()
+        if self._ids and len(self._dead) > len(self._ids) * DEAD_ROW_RATIO:
+            self._rewrite()
+
+    # -------------------------------------------------------------------------
+    # Opening and growing
+    # -------------------------------------------------------------------------
+
+    def _reset_state(self):
+        self.dim = None
+        self._matrix = None
+        self._ids = []
+        self._id_to_row = {}
+        self._dead = set()
+        self._ids_offset = 0
+        self._ids_inode = None
+        self._centroids = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._trained_count = 0
+
+    def _open(self):
+        """(Re)open the index from disk, dropping in-memory state."""
+        with self._lock:
+            self._reset_state()
+            try:
+                with open(self._meta_path, 'r') as f:
+                    dim = int(json.load(f)['dim'])
+                self._ids_inode = self._ids_path.stat().st_ino
+                self._vectors_path.stat()
+            except (OSError, ValueError, KeyError):
+                return  # Created on first add()
+
+            self.dim = dim
+            self._map_matrix()
+            self._catch_up()
+            self._load_ivf()
+
+    def _create(self, dim: int, vectors: Optional[np.ndarray] = None, ids: Optional[List[str]] = None):
+        """
+        Replace the index files, optionally seeded with rows.
+
+        Files are written aside and renamed into place, so other processes
+        keep a valid mapping of the old files until they notice the new
+        id map inode and reopen.
+        """
+        rows = 0 if vectors is None else len(vectors)
+        capacity = INITIAL_CAPACITY
+        while capacity < rows:
+            capacity *= 2
+
+        temp_vectors = self._vectors_path.with_suffix('.tmp')
+        with open(temp_vectors, 'wb') as f:
+            if rows:
+                f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+            f.truncate(capacity * dim * 4)
+        temp_ids = self._ids_path.with_suffix('.tmp')
+        with open(temp_ids, 'wb') as f:
+            f.write(b''.join(item_id.encode('utf-8') + b'\n' for item_id in (ids or [])))
+        with open(self._meta_path, 'w') as f:
+            json.dump({'dim': dim, 'version': 1}, f)
+        try:
+            self._ivf_path.unlink()
+        except FileNotFoundError:
+            pass
+
+        self._matrix = None
+        temp_vectors.replace(self._vectors_path)
+        temp_ids.replace(self._ids_path)
+        self._open()
+
+    def _map_matrix(self):
+        """(Re)map the vectors file, e.g. after it was grown."""
+        row_bytes = self.dim * 4
+        capacity = self._vectors_path.stat().st_size // row_bytes
+        self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode='r+',
+                                 shape=(capacity, self.dim))
+
+    def _ensure_capacity(self, rows: int):
+        if rows <= self._matrix.shape[0]:
+            return
+        capacity = self._matrix.shape[0]
+        while capacity < rows:
+            capacity *= 2
+        self._matrix.flush()
+        self._matrix = None
+        with open(self._vectors_path, 'r+b') as f:
+            f.truncate(capacity * self.dim * 4)
+        self._map_matrix()
+
+    def _catch_up(self):
+        """Pick up rows appended by other processes."""
+        try:
+            stat = self._ids_path.stat()
+        except FileNotFoundError:
+            return
+        if stat.st_ino != self._ids_inode:
+            self._open()  # Rewritten by another process
+            return
+        if stat.st_size <= self._ids_offset:
+            return
+
+        with open(self._ids_path, 'rb') as f:
+            f.seek(self._ids_offset)
+            data = f.read()
+        end = data.rfind(b'\n') + 1
+        start = len(self._ids)
+        for line in data[:end].splitlines():
+            item_id = line.decode('utf-8')
+            self._id_to_row[item_id] = len(self._ids)
+            self._ids.append(item_id)
+        self._ids_offset += end
+
+        if len(self._ids) > self._matrix.shape[0]:
+            self._map_matrix()
+        self._find_tombstones(start)
+        self._assign_new_rows()
+
+    def _find_tombstones(self, start: int):
+        """Mark zeroed rows from start on as dead (removed before they were read)."""
+        for i in range(start, len(self._ids), ASSIGN_CHUNK_SIZE):
+            stop = min(i + ASSIGN_CHUNK_SIZE, len(self._ids))
+            zero = ~np.any(self._matrix[i:stop], axis=1)
+            self._dead.update(int(row) + i for row in np.flatnonzero(zero))
+
+    # -------------------------------------------------------------------------
+    # Mutation
+    # -------------------------------------------------------------------------
+
+    def add(self, item_id: str, vector: Sequence[float]):
+        """Insert or update the vector for an id."""
+        self.add_many([(item_id, vector)])
+
+    def add_many(self, items: Iterable[Tuple[str, Sequence[float]]]):
+        """
+        Insert or update several vectors.
+
+        Existing ids are overwritten in place; new ids are appended under a
+        single lock of the id map.
+        """
+        with self._lock:
+            if self.dim is None:
+                self._open()  # Another process may have created the index
+            appended: Dict[str, np.ndarray] = {}
+            for item_id, vector in items:
+                vec = _normalize(vector)
+                if vec is None:
+                    continue
+                if self.dim != vec.shape[0]:
+                    if self.dim is not None:
+                        logger.info(f"[VectorIndex] Dimension changed for {self.name}, resetting index")
+                    self._create(vec.shape[0])
+                    appended.clear()
+
+                row = self._id_to_row.get(item_id)
+                if row is None:
+                    appended[item_id] = vec
+                    continue
+                self._matrix[row] = vec
+                self._dead.discard(row)
+                if self._centroids is not None and row < len(self._assignments):
+                    self._assignments[row] = int(np.argmax(self._centroids @ vec))
+
+            if appended:
+                self._append_rows(appended)
+                self._maybe_train()
+
+    def _append_rows(self, vectors: Dict[str, np.ndarray]):
+        while True:
+            with open(self._ids_path, 'ab') as f:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    if os.fstat(f.fileno()).st_ino != self._ids_path.stat().st_ino:
+                        continue  # Rewritten while we waited; retry on the new file
+                    self._catch_up()
+                    # An id another process just appended becomes an update
+                    for item_id in [i for i in vectors if i in self._id_to_row]:
+                        self._matrix[self._id_to_row[item_id]] = vectors.pop(item_id)
+                    if not vectors:
+                        return
+
+                    start = len(self._ids)
+                    new_ids = list(vectors)
+                    self._ensure_capacity(start + len(new_ids))
+                    # Vectors first, so readers never see an id without its row
+                    self._matrix[start:start + len(new_ids)] = np.stack(list(vectors.values()))
+                    payload = b''.join(item_id.encode('utf-8') + b'\n' for item_id in new_ids)
+                    f.write(payload)
+                    f.flush()
+
+                    for offset, item_id in enumerate(new_ids):
+                        self._id_to_row[item_id] = start + offset
+                    self._ids.extend(new_ids)
+                    self._ids_offset += len(payload)
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+            self._assign_new_rows()
+            return
+
+    def remove(self, item_id: str):
+        """Remove an id (its row is zeroed until the next rewrite)."""
+        with self._lock:
+            row = self._id_to_row.get(item_id)
+            if row is None or row in self._dead:
+                return
+            self._matrix[row] = 0.0
+            self._dead.add(row)
+
+    def sync(self, embeddings: Dict[str, Sequence[float]]):
+        """
+        Make the index hold exactly the given ids.
+
+        Missing embeddings are added and ids the caller no longer knows are
+        removed. The files are then compacted if dead rows make up a large
+        share of the index.
+
+        Args:
+            embeddings: {id: embedding} for every item that has one
+        """
+        with self._lock:
+            self.add_many(
+                (item_id, vector) for item_id, vector in embeddings.items()
+                if item_id not in self
+            )
+            for row, item_id in enumerate(self._ids):
+                if item_id not in embeddings and row not in self._dead:
+                    self._matrix[row] = 0.0
+                    self._dead.add(row)
+            if self._ids and len(self._dead) > len(self._ids) * DEAD_ROW_RATIO:
+                self._rewrite()
+
+    def _rewrite(self):
+        """Rewrite the index files with live rows only."""
+        logger.info(f"[VectorIndex] Rewriting {self.name} index ({len(self._dead)} dead rows)")
+        live_rows = [row for row in range(len(self._ids)) if row not in self._dead]
+        vectors = np.asarray(self._matrix[live_rows])
+        ids = [self._ids[row] for row in live_rows]
+        self._create(self.dim, vectors, ids)
+
+    # -------------------------------------------------------------------------
+    # Coarse quantizer
+    # -------------------------------------------------------------------------
+
+    def _load_ivf(self):
+        try:
+            data = np.load(self._ivf_path)
+        except (OSError, ValueError):
+            return
+        centroids = data['centroids']
+        if centroids.ndim != 2 or centroids.shape[1] != self.dim:
+            return
+        self._centroids = centroids.astype(np.float32)
+        self._assignments = data['assignments'].astype(np.int32)[:len(self._ids)]
+        self._trained_count = int(data['trained_count'])
+        self._assign_new_rows()
+
+    def _assign_new_rows(self):
+        """Assign rows added since training to their nearest centroid."""
+        if self._centroids is None:
+            return
+        start = len(self._assignments)
+        end = len(self._ids)
+        if end <= start:
+            return
+        new = np.empty(end - start, dtype=np.int32)
+        for i in range(start, end, ASSIGN_CHUNK_SIZE):
+            stop = min(i + ASSIGN_CHUNK_SIZE, end)
+            new[i - start:stop - start] = np.argmax(self._matrix[i:stop] @ self._centroids.T, axis=1)
+        self._assignments = np.concatenate([self._assignments, new])
+
+    def _maybe_train(self):
+        """Start training the quantizer in the background once the index has grown enough."""
+        live = len(self._ids) - len(self._dead)
+        if live < self.ivf_threshold:
+            return
+        if self._centroids is not None and live < self._trained_count * 2:
+            return
+        if self._train_thread is not None and self._train_thread.is_alive():
+            return
+        self._train_thread = threading.Thread(
+            target=self.train_quantizer, name=f"vector-index-train-{self.name}", daemon=True
+        )
+        self._train_thread.start()
+
+    def train_quantizer(self, nlist: Optional[int] = None):
+        """
+        Train the k-means coarse quantizer over the current rows.
+
+        Only sampling and installing the centroids hold the index lock;
+        adds and searches go on during k-means.
+
+        Args:
+            nlist: Number of centroids (default: sqrt of row count)
+        """
+        with self._lock:
+            n = len(self._ids)
+            if n == 0:
+                return
+            dim = self.dim
+            nlist = nlist or max(1, int(np.sqrt(n)))
+            rng = np.random.default_rng(0)
+
+            live_rows = np.array([row for row in range(n) if row not in self._dead], dtype=np.int64)
+            if len(live_rows) == 0:
+                return
+            sample_rows = rng.choice(live_rows, size=min(len(live_rows), IVF_TRAIN_SAMPLE), replace=False)
+            sample = np.array(self._matrix[np.sort(sample_rows)])
+        nlist = min(nlist, len(sample))
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+
+        # Spherical k-means: vectors and centroids stay unit length
+        for _ in range(IVF_TRAIN_ITERATIONS):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            occupied = norms[:, 0] > 0
+            centroids[occupied] = sums[occupied] / norms[occupied]
+
+        with self._lock:
+            if self.dim != dim or self._matrix is None:
+                return  # Reset to another dimension meanwhile
+            n = len(self._ids)
+            self._centroids = centroids.astype(np.float32)
+            self._assignments = np.zeros(0, dtype=np.int32)
+            self._assign_new_rows()
+            self._trained_count = n - len(self._dead)
+
+            with open(self._ivf_path, 'wb') as f:
+                np.savez(f, centroids=self._centroids, assignments=self._assignments,
+                         trained_count=self._trained_count)
+            logger.info(f"[VectorIndex] Trained {nlist}-list quantizer for {self.name} ({n} rows)")
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ids) - len(self._dead)
+
+    def __contains__(self, item_id: str) -> bool:
+        with self._lock:
+            row = self._id_to_row.get(item_id)
+            return row is not None and row not in self._dead
+
+    def search(
+        self,
+        query: Sequence[float],
+        top_k: int = 10,
+        min_score: float = -1.0,
+        exhaustive: bool = False
+    ) -> List[Tuple[str, float]]:
+        """
+        Find the ids most similar to a query vector.
+
+        Args:
+            query: Query embedding (normalized internally)
+            top_k: Maximum number of results
+            min_score: Minimum cosine similarity
+            exhaustive: Scan every row even if the quantizer is trained
+
+        Returns:
+            List of (id, cosine_similarity), most similar first
+        """
+        q = _normalize(query)
+        with self._lock:
+            if self.dim is None:
+                self._open()
+            if q is None or self._matrix is None or q.shape[0] != self.dim or top_k <= 0:
+                return []
+            self._catch_up()
+            n = len(self._ids)
+            if n == 0:
+                return []
+
+            use_ivf = (not exhaustive and self._centroids is not None
+                       and n - len(self._dead) >= self.ivf_threshold)
+            if use_ivf:
+                nprobe = min(IVF_NPROBE, len(self._centroids))
+                probes = np.argpartition(-(self._centroids @ q), nprobe - 1)[:nprobe]
+                rows = np.nonzero(np.isin(self._assignments[:n], probes))[0]
+                scores = self._matrix[rows] @ q
+            else:
+                rows = None
+                scores = self._matrix[:n] @ q
+
+            if len(scores) == 0:
+                return []
+            k = min(top_k + len(self._dead), len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+
+            results = []
+            for i in top:
+                row = int(rows[i]) if rows is not None else int(i)
+                score = float(scores[i])
+                if score < min_score:
+                    break
+                if row in self._dead:
+                    continue
+                results.append((self._ids[row], score))
+                if len(results) >= top_k:
+                    break
+            return results
+
+    def get_stats(self) -> Dict:
+        """Index size and quantizer status."""
+        with self._lock:
+            return {
+                'name': self.name,
+                'dim': self.dim,
+                'rows': len(self._ids),
+                'live_rows': len(self._ids) - len(self._dead),
+                'capacity': int(self._matrix.shape[0]) if self._matrix is not None else 0,
+                'ivf_trained': self._centroids is not None,
+                'ivf_lists': int(len(self._centroids)) if self._centroids is not None else 0,
+                'ivf_threshold': self.ivf_threshold,
+            }
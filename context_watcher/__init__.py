@@ -26,6 +26,12 @@ from .context_watcher import (
     TIME_BASED_HANDOFF_ENABLED,
     TIME_BASED_HANDOFF_MINUTES,
 )
+from .transcript_tailer import (
+    TranscriptTailer,
+    TranscriptSubscription,
+    get_transcript_tailer,
+    read_jsonl_records,
+)
 
 __all__ = [
     "ContextWatcher",
@@ -48,4 +54,8 @@ __all__ = [
     "CONTEXT_WATCHER_ENABLED",
     "TIME_BASED_HANDOFF_ENABLED",
     "TIME_BASED_HANDOFF_MINUTES",
+    "TranscriptTailer",
+    "TranscriptSubscription",
+    "get_transcript_tailer",
+    "read_jsonl_records",
 ]
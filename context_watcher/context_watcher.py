@@ -49,6 +49,13 @@ from pathlib import Path
 from typing import Callable, Dict, List, Optional, Any, Set, Tuple
 import uuid
 
+from .transcript_tailer import (
+    CLAUDE_USAGE_PATTERNS,
+    CODEX_USAGE_PATTERNS,
+    TranscriptSubscription,
+    get_transcript_tailer,
+)
+
 # Try to import watchdog for efficient file monitoring
 try:
     from watchdog.observers import Observer
@@ -103,6 +110,9 @@ TIME_BASED_HANDOFF_MINUTES = int(os.environ.get(
     "TIME_BASED_HANDOFF_MINUTES", "55"
 ))
 
+# Claude transcript directory index (full re-stat backstop for missed events)
+TRANSCRIPT_INDEX_RESCAN_SECONDS = 30.0
+
 # Codex scanning
 CODEX_SCAN_INTERVAL_SECONDS = 10.0
 CODEX_MAX_CANDIDATE_FILES = 500
@@ -504,34 +514,152 @@ class TimeBasedHandoffMonitor:
 # SESSION CLASSIFICATION
 # =============================================================================
 
-def is_p_mode_session(jsonl_path: Path) -> bool:
+def _classify_session(jsonl_path: Path) -> Tuple[bool, bool]:
     """
-    Return True if this is a -p mode session (no progress events).
-
-    -p mode jsonl is clean: user, assistant, tool_use, tool_result
-    Interactive mode has: progress, hook_progress, bash_progress, etc.
-
-    Args:
-        jsonl_path: Path to the JSONL transcript file
+    Classify a transcript as -p mode or interactive.
 
     Returns:
-        True if -p mode (should be watched), False if interactive (skip)
+        (is_p_mode, settled) - settled is True when appending to the file
+        can no longer change the answer (an interactive marker was found,
+        or the classification window is already full)
     """
     try:
         with open(jsonl_path, 'r', encoding='utf-8') as f:
             for i, line in enumerate(f):
                 if i > 50:
-                    break
+                    return True, True
                 # Check for interactive mode markers
                 if '"type":"progress"' in line or '"type":"hook_progress"' in line:
-                    return False  # Interactive mode - skip
+                    return False, True  # Interactive mode - skip
                 if '"type":"bash_progress"' in line:
-                    return False
+                    return False, True
                 if '"type":"file-history-snapshot"' in line:
-                    return False
-        return True  # -p mode - watch it
+                    return False, True
+        return True, False  # -p mode - watch it
     except (IOError, OSError, UnicodeDecodeError):
-        return False
+        return False, False
+
+
+def is_p_mode_session(jsonl_path: Path) -> bool:
+    """
+    Return True if this is a -p mode session (no progress events).
+
+    -p mode jsonl is clean: user, assistant, tool_use, tool_result
+    Interactive mode has: progress, hook_progress, bash_progress, etc.
+
+    Args:
+        jsonl_path: Path to the JSONL transcript file
+
+    Returns:
+        True if -p mode (should be watched), False if interactive (skip)
+    """
+    return _classify_session(jsonl_path)[0]
+
+
+@dataclass
+class _IndexedTranscript:
+    """Cached stat and classification of one transcript file."""
+    mtime_ns: int
+    size: int
+    p_mode: bool
+    settled: bool
+
+
+class TranscriptDirectoryIndex:
+    """
+    Cached index of a Claude transcript directory.
+
+    Remembers each JSONL file's mtime, size and -p mode classification, so
+    finding the active transcript only stats and re-reads files that
+    changed. The listing is refreshed when the directory mtime changes
+    (files created or removed); file changes come from watchdog events via
+    mark_changed(), and the current active file is always re-checked. A full
+    re-stat runs every TRANSCRIPT_INDEX_RESCAN_SECONDS as a backstop.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._entries: Dict[str, _IndexedTranscript] = {}
+        self._dir_mtime_ns: Optional[int] = None
+        self._changed: Set[str] = set()
+        self._active: Optional[str] = None
+        self._last_full_scan: float = 0.0
+        self._lock = threading.Lock()
+
+    def mark_changed(self, file_path: Optional[str] = None):
+        """Record a file change event (None = re-check every file)."""
+        with self._lock:
+            if file_path is None:
+                self._last_full_scan = 0.0
+            elif file_path.endswith('.jsonl'):
+                self._changed.add(str(Path(file_path)))
+
+    def _update(self, path: str) -> bool:
+        """Re-stat one file and reclassify it if needed. Returns False if it is gone."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._entries.pop(path, None)
+            return False
+
+        entry = self._entries.get(path)
+        if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            return True
+        if entry is not None and entry.settled:
+            entry.mtime_ns, entry.size = stat.st_mtime_ns, stat.st_size
+            return True
+
+        p_mode, settled = _classify_session(Path(path))
+        self._entries[path] = _IndexedTranscript(stat.st_mtime_ns, stat.st_size, p_mode, settled)
+        return True
+
+    def active_jsonl(self) -> Optional[Path]:
+        """Return the most recently modified -p mode transcript."""
+        with self._lock:
+            try:
+                dir_mtime_ns = os.stat(self.directory).st_mtime_ns
+            except OSError:
+                self._entries.clear()
+                self._dir_mtime_ns = None
+                self._active = None
+                return None
+
+            now = time.time()
+            full_scan = (now - self._last_full_scan) >= TRANSCRIPT_INDEX_RESCAN_SECONDS
+
+            if full_scan or dir_mtime_ns != self._dir_mtime_ns:
+                self._dir_mtime_ns = dir_mtime_ns
+                try:
+                    listed = {str(p) for p in self.directory.glob("*.jsonl")}
+                except OSError:
+                    listed = set()
+                for path in set(self._entries) - listed:
+                    del self._entries[path]
+                to_check = listed if full_scan else listed - set(self._entries)
+                to_check |= self._changed & listed
+                if full_scan:
+                    self._last_full_scan = now
+            else:
+                to_check = {path for path in self._changed if path in self._entries}
+            if self._active:
+                to_check.add(self._active)
+            self._changed.clear()
+
+            for path in to_check:
+                self._update(path)
+
+            candidates = [(entry.mtime_ns, path) for path, entry in self._entries.items() if entry.p_mode]
+            self._active = max(candidates)[1] if candidates else None
+            return Path(self._active) if self._active else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics."""
+        with self._lock:
+            return {
+                "files": len(self._entries),
+                "p_mode_files": sum(1 for e in self._entries.values() if e.p_mode),
+                "active": self._active,
+            }
 
 
 def _workspace_paths_match(expected_workspace: str, candidate_workspace: str) -> bool:
@@ -689,8 +817,8 @@ class SessionMonitor:
 
         # File tracking
         self.current_jsonl: Optional[Path] = None
-        self.file_offset: int = 0
         self.file_mtime: float = 0
+        self._subscription: Optional[TranscriptSubscription] = None
 
         # Token state
         self.last_tokens: Optional[TokenState] = None
@@ -699,6 +827,7 @@ class SessionMonitor:
         self._codex_file_match_cache: Dict[str, Tuple[float, int, bool]] = {}
         self._codex_candidates: List[Path] = []
         self._codex_last_scan: float = 0.0
+        self._dir_index: Optional[TranscriptDirectoryIndex] = None
 
         # Handoff state
         self.handoff_triggered = False
@@ -775,19 +904,21 @@ class SessionMonitor:
             except OSError:
                 return None
 
-        jsonl_files = list(self.transcript_dir.glob("*.jsonl"))
-        if not jsonl_files:
-            return None
-
-        valid_files = [f for f in jsonl_files if is_p_mode_session(f)]
-        if not valid_files:
-            return None
+        if self._dir_index is None or self._dir_index.directory != self.transcript_dir:
+            self._dir_index = TranscriptDirectoryIndex(self.transcript_dir)
+        return self._dir_index.active_jsonl()
 
-        return max(valid_files, key=lambda p: p.stat().st_mtime)
+    def note_file_change(self, file_path: str):
+        """Record a watchdog event for a file in the transcript directory."""
+        if self._dir_index is not None:
+            self._dir_index.mark_changed(file_path)
 
     def _read_new_entries(self) -> List[Dict[str, Any]]:
         """
-        Read new JSONL entries since last read.
+        Read new usage records since last read.
+
+        Reading goes through the shared transcript tailer, so a transcript
+        also tailed by the token watcher is read and parsed once.
 
         Returns:
             List of new parsed JSON records
@@ -800,66 +931,29 @@ class SessionMonitor:
         # Handle file rotation (new session file)
         if self.current_jsonl != active_jsonl:
             logger.info(f"Session {self.session_id}: New JSONL file: {active_jsonl.name}")
+            self.stop_tailing()
             self.current_jsonl = active_jsonl
-            self.file_offset = 0
             self.file_mtime = 0
+            patterns = CODEX_USAGE_PATTERNS if self.provider == "codex" else CLAUDE_USAGE_PATTERNS
+            self._subscription = get_transcript_tailer().subscribe(active_jsonl, patterns)
 
         # Check if file has been modified
         try:
             current_mtime = active_jsonl.stat().st_mtime
-            current_size = active_jsonl.stat().st_size
         except OSError:
             return []
 
-        if current_mtime <= self.file_mtime and current_size <= self.file_offset:
-            return []  # No changes
-
-        self.file_mtime = current_mtime
+        if current_mtime > self.file_mtime:
+            self.file_mtime = current_mtime
+            self.last_activity = datetime.now()
 
-        # Read new content
-        entries = []
-        try:
-            with open(active_jsonl, 'r', encoding='utf-8') as f:
-                f.seek(self.file_offset)
-                content = f.read()
+        return self._subscription.read()
 
-            # Process lines from content
-            lines = content.split('\n')
-            processed_bytes = 0
-            is_last_line = lambda i: i == len(lines) - 1
-
-            for i, line in enumerate(lines):
-                line_bytes = len(line.encode('utf-8')) + (1 if i < len(lines) - 1 else 0)  # +1 for newline
-                stripped = line.strip()
-
-                if not stripped:
-                    processed_bytes += line_bytes
-                    continue
-
-                try:
-                    record = json.loads(stripped)
-                    entries.append(record)
-                    processed_bytes += line_bytes
-                except json.JSONDecodeError:
-                    # Only consider as partial line if it's the LAST line AND
-                    # doesn't look like it ends properly AND the content doesn't end with newline
-                    if is_last_line(i) and not content.endswith('\n'):
-                        # Likely a partial line at EOF - don't advance offset past this line
-                        logger.debug(f"Partial JSON line at EOF, will retry on next read")
-                        break
-                    else:
-                        # Malformed JSON - skip it but log for debugging
-                        logger.debug(f"Malformed JSON line skipped: {stripped[:100]}...")
-                        processed_bytes += line_bytes
-                        continue
-
-            # Update offset based on successfully processed bytes
-            self.file_offset += processed_bytes
-
-        except (IOError, OSError, UnicodeDecodeError) as e:
-            logger.debug(f"Error reading JSONL: {e}")
-
-        return entries
+    def stop_tailing(self):
+        """Release the transcript subscription."""
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
 
     def _extract_token_state(self, record: Dict[str, Any]) -> Optional[TokenState]:
         """Extract TokenState from JSONL record if it has usage data."""
@@ -1012,9 +1106,6 @@ class SessionMonitor:
 
             entries = self._read_new_entries()
 
-            if entries:
-                self.last_activity = datetime.now()
-
             for entry in entries:
                 tokens = self._extract_token_state(entry)
                 if tokens:
@@ -1276,6 +1367,7 @@ class ContextWatcher:
                 with self._lock:
                     for sid, mon in self._sessions.items():
                         if mon.transcript_dir and str(mon.transcript_dir) == dir_path:
+                            mon.note_file_change(file_path)
                             mon.process_updates()
 
             handler = TranscriptEventHandler(on_file_change)
@@ -1404,6 +1496,7 @@ class ContextWatcher:
                 # This was missing before, causing timers to fire after session cleanup
                 monitor.stop_time_handoff_monitor()
                 logger.info(f"Stopped time handoff monitor for stale session {session_id}")
+                monitor.stop_tailing()
 
                 # Update metrics before deletion
                 self._metrics.sessions_completed += 1
@@ -1447,6 +1540,7 @@ class ContextWatcher:
 
                 # Stop time-based handoff monitor if running
                 monitor.stop_time_handoff_monitor()
+                monitor.stop_tailing()
 
                 del self._sessions[session_id]
 
@@ -1493,6 +1587,8 @@ class ContextWatcher:
             self._observers.clear()
 
             # Clear sessions
+            for monitor in self._sessions.values():
+                monitor.stop_tailing()
             self._sessions.clear()
 
             # Stop monitor thread
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the cached transcript directory index
+
+Tests cover:
+- Active transcript selection matches the uncached glob + classify pass
+- Unchanged files are neither re-read nor re-classified
+- New, removed and reclassified files are picked up
+"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from context_watcher import context_watcher as cw
+from context_watcher.context_watcher import TranscriptDirectoryIndex
+
+P_MODE_LINE = '{"type":"user","message":{"content":"hi"}}\n'
+INTERACTIVE_LINE = '{"type":"progress"}\n'
+
+
+class TestTranscriptDirectoryIndex(unittest.TestCase):
+    """Tests for TranscriptDirectoryIndex."""
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.directory = Path(self._tmpdir.name)
+        self.clock = 1_000_000_000
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def write(self, name: str, text: str, mode: str = 'w') -> Path:
+        path = self.directory / name
+        with open(path, mode, encoding='utf-8') as f:
+            f.write(text)
+        # Distinct, increasing mtimes regardless of filesystem resolution
+        self.clock += 10
+        os.utime(path, (self.clock, self.clock))
+        return path
+
+    def test_active_file_and_cached_classification(self):
+        for i in range(20):
+            self.write(f"old_{i}.jsonl", P_MODE_LINE * 60)
+        self.write("interactive.jsonl", INTERACTIVE_LINE)
+        latest = self.write("latest.jsonl", P_MODE_LINE)
+
+        index = TranscriptDirectoryIndex(self.directory)
+        self.assertEqual(index.active_jsonl(), latest)
+
+        with patch.object(cw, "_classify_session", wraps=cw._classify_session) as classify:
+            self.assertEqual(index.active_jsonl(), latest)
+            self.write("latest.jsonl", P_MODE_LINE, mode='a')
+            self.assertEqual(index.active_jsonl(), latest)
+        # Only the growing, not yet settled active file was re-read
+        self.assertEqual(classify.call_count, 1)
+
+    def test_new_removed_and_reclassified_files(self):
+        first = self.write("first.jsonl", P_MODE_LINE)
+        index = TranscriptDirectoryIndex(self.directory)
+        self.assertEqual(index.active_jsonl(), first)
+
+        second = self.write("second.jsonl", P_MODE_LINE)
+        self.assertEqual(index.active_jsonl(), second)
+
+        # The active session turns out to be interactive
+        self.write("second.jsonl", INTERACTIVE_LINE, mode='a')
+        self.assertEqual(index.active_jsonl(), first)
+
+        first.unlink()
+        time.sleep(0.01)
+        self.assertIsNone(index.active_jsonl())
+
+    def test_watchdog_event_marks_file(self):
+        first = self.write("first.jsonl", P_MODE_LINE)
+        second = self.write("second.jsonl", P_MODE_LINE)
+        index = TranscriptDirectoryIndex(self.directory)
+        self.assertEqual(index.active_jsonl(), second)
+
+        # Appending to an older session does not touch the directory mtime
+        self.write("first.jsonl", P_MODE_LINE, mode='a')
+        index.mark_changed(str(first))
+        self.assertEqual(index.active_jsonl(), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
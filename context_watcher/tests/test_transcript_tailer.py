@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared transcript tailer
+
+Tests cover:
+- Byte-pattern pre-filtering and malformed line handling
+- Partial trailing lines are held back until complete
+- One read fans records out to every subscriber
+- Late subscribers are caught up; truncated files are re-read
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from context_watcher.transcript_tailer import (
+    CLAUDE_USAGE_PATTERNS,
+    TranscriptTailer,
+    read_jsonl_records,
+)
+
+
+def usage_entry(request_id: str, tokens: int = 100) -> str:
+    return json.dumps({
+        "type": "assistant",
+        "requestId": request_id,
+        "message": {"usage": {"input_tokens": tokens, "output_tokens": 1}}
+    })
+
+
+class TestTranscriptTailer(unittest.TestCase):
+    """Tests for read_jsonl_records() and TranscriptTailer."""
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmpdir.name) / "session.jsonl"
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def append(self, text: str):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(text)
+
+    def test_prefilter_and_partial_lines(self):
+        self.append('{"type": "user", "message": "hi"}\n')
+        self.append('{"usage": broken\n')
+        self.append(usage_entry("req1") + "\n")
+        self.append(usage_entry("req2")[:20])
+
+        records, offset = read_jsonl_records(self.path, patterns=CLAUDE_USAGE_PATTERNS)
+        self.assertEqual([r["requestId"] for r in records], ["req1"])
+
+        self.append(usage_entry("req2")[20:] + "\n")
+        records, offset = read_jsonl_records(self.path, offset, patterns=CLAUDE_USAGE_PATTERNS)
+        self.assertEqual([r["requestId"] for r in records], ["req2"])
+        self.assertEqual(offset, self.path.stat().st_size)
+
+    def test_fan_out_and_catch_up(self):
+        tailer = TranscriptTailer()
+        self.append(usage_entry("req1") + "\n")
+
+        first = tailer.subscribe(self.path, CLAUDE_USAGE_PATTERNS)
+        self.assertEqual(len(first.read()), 1)
+
+        # A late subscriber still sees the records read before it joined
+        second = tailer.subscribe(self.path, None)
+        self.append('{"type": "user"}\n' + usage_entry("req2") + "\n")
+        self.assertEqual(tailer.poll(self.path), 2)
+        self.assertEqual([r["requestId"] for r in first.drain()], ["req2"])
+        self.assertEqual([r.get("requestId") for r in second.drain()], ["req1", None, "req2"])
+
+        first.close()
+        second.close()
+        self.assertEqual(tailer.get_stats()["files"], 0)
+
+    def test_truncated_file_is_reread(self):
+        tailer = TranscriptTailer()
+        subscription = tailer.subscribe(self.path, CLAUDE_USAGE_PATTERNS)
+        self.append(usage_entry("req1") + "\n" + usage_entry("req2") + "\n")
+        self.assertEqual(len(subscription.read()), 2)
+
+        self.path.write_text(usage_entry("req3") + "\n", encoding='utf-8')
+        self.assertEqual([r["requestId"] for r in subscription.read()], ["req3"])
+
+
+if __name__ == "__main__":
+    unittest.main()
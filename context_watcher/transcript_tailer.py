@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Transcript Tailer: shared, byte-offset JSONL tailing for transcript watchers
+
+SessionMonitor (context watcher), the real-time token watcher and
+MissionAnalytics all read the same Claude/Codex JSONL transcripts. This
+module reads each file once and fans the parsed records out to every
+subscriber:
+
+- Files are read in binary through a buffered reader, starting at a byte
+  offset, so no text decoding or re-reading of already-seen bytes happens.
+- Lines are pre-filtered on byte patterns (e.g. b'"usage"') and only the
+  matching lines are passed to json.loads().
+- A trailing line without a newline is held back until it parses (the
+  writer may still be appending to it).
+
+Usage:
+    from context_watcher.transcript_tailer import get_transcript_tailer
+
+    tailer = get_transcript_tailer()
+    subscription = tailer.subscribe(path, patterns=(b'"usage"',))
+
+    tailer.poll(path)  # Reads new bytes once, for all subscribers
+    for record in subscription.drain():
+        ...
+
+    subscription.close()
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+READ_CHUNK_SIZE = 1 << 20  # Bytes per read() call
+READ_BUFFER_SIZE = 1 << 16  # Buffered reader size
+
+# Byte patterns of the records carrying token usage
+CLAUDE_USAGE_PATTERNS = (b'"usage"',)
+CODEX_USAGE_PATTERNS = (b'"token_count"',)
+USAGE_PATTERNS = CLAUDE_USAGE_PATTERNS + CODEX_USAGE_PATTERNS
+
+PathLike = Union[str, Path]
+
+
+# =============================================================================
+# LINE READER
+# =============================================================================
+
+def _matches(line: bytes, patterns: Optional[Sequence[bytes]]) -> bool:
+    """True if the line contains any of the patterns (None matches everything)."""
+    if patterns is None:
+        return True
+    for pattern in patterns:
+        if pattern in line:
+            return True
+    return False
+
+
+def _read_lines(
+    path: PathLike,
+    offset: int,
+    patterns: Optional[Sequence[bytes]],
+    end: Optional[int]
+) -> Tuple[List[Tuple[bytes, Any]], int]:
+    """Parse matching lines from offset; returns ((line, record) pairs, resume offset)."""
+    parsed: List[Tuple[bytes, Any]] = []
+    with open(path, 'rb', buffering=READ_BUFFER_SIZE) as f:
+        f.seek(offset)
+        remaining = None if end is None else max(0, end - offset)
+        pending = b''
+        position = offset  # Offset of the start of pending
+
+        while remaining is None or remaining > 0:
+            size = READ_CHUNK_SIZE if remaining is None else min(READ_CHUNK_SIZE, remaining)
+            chunk = f.read(size)
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+
+            lines = (pending + chunk).split(b'\n')
+            pending = lines.pop()
+            for line in lines:
+                position += len(line) + 1
+                if not _matches(line, patterns):
+                    continue
+                try:
+                    parsed.append((line, json.loads(line)))
+                except ValueError:
+                    # Malformed JSON or invalid UTF-8
+                    logger.debug(f"Malformed JSONL line skipped: {line[:100]!r}...")
+
+    if pending.strip() and _matches(pending, patterns):
+        try:
+            parsed.append((pending, json.loads(pending)))
+            position += len(pending)
+        except ValueError:
+            # Likely a partial line at EOF - retry on the next read
+            logger.debug("Partial JSON line at EOF, will retry on next read")
+    return parsed, position
+
+
+def read_jsonl_records(
+    path: PathLike,
+    offset: int = 0,
+    patterns: Optional[Sequence[bytes]] = None,
+    end: Optional[int] = None
+) -> Tuple[List[Any], int]:
+    """
+    Read complete JSONL records from a byte offset.
+
+    Lines not containing any of the patterns are skipped without being
+    decoded, and malformed lines are skipped. A trailing line without a
+    newline is only consumed if it parses.
+
+    Args:
+        path: JSONL file
+        offset: Byte offset to start from (must be a line boundary)
+        patterns: Byte patterns a line must contain (None = all lines)
+        end: Stop at this byte offset (default: end of file)
+
+    Returns:
+        (parsed records, offset to resume from)
+    """
+    parsed, resume_at = _read_lines(path, offset, patterns, end)
+    return [record for _, record in parsed], resume_at
+
+
+# =============================================================================
+# SHARED TAILER
+# =============================================================================
+
+class TranscriptSubscription:
+    """
+    One consumer of a tailed transcript.
+
+    Records matching the subscription's patterns are queued by
+    TranscriptTailer.poll() until drained.
+    """
+
+    def __init__(self, tailer: "TranscriptTailer", path: str,
+                 patterns: Optional[Sequence[bytes]]):
+        self.tailer = tailer
+        self.path = path
+        self.patterns = tuple(patterns) if patterns is not None else None
+        self._queue: Deque[Any] = deque()
+        self._lock = threading.Lock()
+
+    def _deliver(self, records: List[Any]):
+        with self._lock:
+            self._queue.extend(records)
+
+    def drain(self) -> List[Any]:
+        """Return and clear the queued records."""
+        with self._lock:
+            records = list(self._queue)
+            self._queue.clear()
+        return records
+
+    def read(self) -> List[Any]:
+        """Poll the file for new data, then drain."""
+        self.tailer.poll(self.path)
+        return self.drain()
+
+    def close(self):
+        """Stop receiving records."""
+        self.tailer.unsubscribe(self)
+
+
+class _TailState:
+    """Read position and subscribers of one file."""
+
+    def __init__(self):
+        self.offset = 0
+        self.inode: Optional[int] = None
+        self.size = 0
+        self.mtime = 0.0
+        self.subscribers: List[TranscriptSubscription] = []
+        self.lock = threading.Lock()
+
+    def patterns(self) -> Optional[Tuple[bytes, ...]]:
+        """Union of the subscribers' patterns (None if any wants every line)."""
+        union: List[bytes] = []
+        for subscriber in self.subscribers:
+            if subscriber.patterns is None:
+                return None
+            union.extend(p for p in subscriber.patterns if p not in union)
+        return tuple(union)
+
+
+class TranscriptTailer:
+    """
+    Tails JSONL transcripts once and fans records out to subscribers.
+
+    Each file keeps one byte offset shared by all of its subscribers; a
+    subscriber joining later is first caught up privately on the bytes
+    already read. Truncated or replaced files are re-read from the start.
+    """
+
+    def __init__(self):
+        self._files: Dict[str, _TailState] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, path: PathLike,
+                  patterns: Optional[Sequence[bytes]] = USAGE_PATTERNS) -> TranscriptSubscription:
+        """
+        Subscribe to the records of a file, from its beginning.
+
+        Args:
+            path: JSONL transcript
+            patterns: Byte patterns a line must contain (None = all lines)
+
+        Returns:
+            Subscription to drain records from
+        """
+        key = os.path.abspath(str(path))
+        subscription = TranscriptSubscription(self, key, patterns)
+
+        with self._lock:
+            state = self._files.setdefault(key, _TailState())
+            with state.lock:
+                if state.offset > 0:
+                    try:
+                        records, _ = read_jsonl_records(key, 0, subscription.patterns, end=state.offset)
+                        subscription._deliver(records)
+                    except OSError as e:
+                        logger.debug(f"Error catching up on transcript {key}: {e}")
+                state.subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: TranscriptSubscription):
+        """Remove a subscription; files without subscribers are forgotten."""
+        with self._lock:
+            state = self._files.get(subscription.path)
+            if state is None:
+                return
+            with state.lock:
+                if subscription in state.subscribers:
+                    state.subscribers.remove(subscription)
+                if not state.subscribers:
+                    del self._files[subscription.path]
+
+    def poll(self, path: PathLike) -> int:
+        """
+        Read bytes appended to a file since the last poll and queue the
+        parsed records on its subscribers.
+
+        Args:
+            path: JSONL transcript
+
+        Returns:
+            Number of records read
+        """
+        key = os.path.abspath(str(path))
+        with self._lock:
+            state = self._files.get(key)
+        if state is None:
+            return 0
+
+        with state.lock:
+            try:
+                stat = os.stat(key)
+            except OSError:
+                return 0
+
+            if stat.st_ino != state.inode or stat.st_size < state.offset:
+                if state.inode is not None:
+                    logger.debug(f"Transcript {key} was replaced or truncated, re-reading")
+                state.inode = stat.st_ino
+                state.offset = 0
+            elif stat.st_size == state.size and stat.st_mtime == state.mtime:
+                return 0  # No changes
+            state.size = stat.st_size
+            state.mtime = stat.st_mtime
+
+            try:
+                lines, state.offset = _read_lines(key, state.offset, state.patterns(), None)
+            except OSError as e:
+                logger.debug(f"Error reading transcript {key}: {e}")
+                return 0
+
+            if lines:
+                for subscriber in state.subscribers:
+                    subscriber._deliver([record for line, record in lines
+                                         if _matches(line, subscriber.patterns)])
+            return len(lines)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get tailing statistics."""
+        with self._lock:
+            return {
+                "files": len(self._files),
+                "subscribers": sum(len(s.subscribers) for s in self._files.values()),
+                "bytes_read": sum(s.offset for s in self._files.values()),
+            }
+
+
+# =============================================================================
+# GLOBAL INSTANCE
+# =============================================================================
+
+_tailer_instance: Optional[TranscriptTailer] = None
+_tailer_lock = threading.Lock()
+
+
+def get_transcript_tailer() -> TranscriptTailer:
+    """Get the process-wide transcript tailer."""
+    global _tailer_instance
+    with _tailer_lock:
+        if _tailer_instance is None:
+            _tailer_instance = TranscriptTailer()
+        return _tailer_instance
@@ -6,6 +6,7 @@ Contains routes for:
 - Per-mission analytics
 - Current mission cost tracking
 - Historical spending charts
+- Integration handler latency profile
 """
 
 from flask import Blueprint, jsonify, request
@@ -86,7 +87,7 @@ def api_analytics_daily():
     try:
         from mission_analytics import get_daily_aggregates
         days = request.args.get('days', 30, type=int)
-        data = get_daily_aggregates(days)
+        data = get_daily_aggregates(days, request.args.get('start_date'), request.args.get('end_date'))
         return jsonify(data)
     except Exception as e:
         return jsonify({"error": str(e), "daily": []})
@@ -98,7 +99,7 @@ def api_analytics_by_stage():
     try:
         from mission_analytics import get_stage_aggregates
         days = request.args.get('days', 30, type=int)
-        data = get_stage_aggregates(days)
+        data = get_stage_aggregates(days, request.args.get('start_date'), request.args.get('end_date'))
         return jsonify(data)
     except Exception as e:
         return jsonify({"error": str(e), "stages": {}})
@@ -110,7 +111,7 @@ def api_analytics_by_model():
     try:
         from mission_analytics import get_model_aggregates
         days = request.args.get('days', 30, type=int)
-        data = get_model_aggregates(days)
+        data = get_model_aggregates(days, request.args.get('start_date'), request.args.get('end_date'))
         return jsonify(data)
     except Exception as e:
         return jsonify({"error": str(e), "models": {}})
@@ -188,3 +189,20 @@ def api_watcher_stop():
         return jsonify({"error": "Watcher module not available", "stopped": False})
     except Exception as e:
         return jsonify({"error": str(e), "stopped": False})
+
+
+@analytics_bp.route('/integrations/profile')
+def api_integrations_profile():
+    """Get per-handler and per-event integration latency (p50/p95/p99, error rates)."""
+    try:
+        from af_engine.integration_profile import PROFILE_FILENAME, slowest_handlers
+        profile = io_utils.atomic_read_json(Path(MISSION_PATH).parent / PROFILE_FILENAME, None)
+        if not profile:
+            return jsonify({"error": "No integration profile recorded yet", "handlers": {}, "events": {}})
+        top = request.args.get('top', None, type=int)
+        profile["slowest_handlers"] = slowest_handlers(profile, top)
+        return jsonify(profile)
+    except ImportError:
+        return jsonify({"error": "af_engine not available", "handlers": {}, "events": {}})
+    except Exception as e:
+        return jsonify({"error": str(e), "handlers": {}, "events": {}})
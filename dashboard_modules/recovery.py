@@ -18,6 +18,8 @@ recovery_bp = Blueprint('recovery', __name__)
 MISSION_PATH = None
 io_utils = None
 
+MAX_GRAPH_PAGE_SIZE = 5000  # Largest decision graph page a client may request
+
 
 def init_recovery_blueprint(mission_path, io_utils_module):
     """Initialize the recovery blueprint with required dependencies."""
@@ -26,6 +28,14 @@ def init_recovery_blueprint(mission_path, io_utils_module):
     io_utils = io_utils_module
 
 
+def _graph_page_args():
+    """Pagination arguments of decision graph requests (?after=<sequence>&limit=<n>)."""
+    from decision_graph import DEFAULT_GRAPH_PAGE_SIZE
+    after = max(request.args.get('after', 0, type=int), 0)
+    limit = request.args.get('limit', DEFAULT_GRAPH_PAGE_SIZE, type=int)
+    return after, min(max(limit, 1), MAX_GRAPH_PAGE_SIZE)
+
+
 # =============================================================================
 # CRASH RECOVERY ROUTES
 # =============================================================================
@@ -136,7 +146,8 @@ def api_decision_graph(mission_id):
     try:
         from decision_graph import get_decision_logger
         logger = get_decision_logger()
-        graph = logger.get_mission_graph(mission_id)
+        after, limit = _graph_page_args()
+        graph = logger.get_mission_graph(mission_id, after_sequence=after, limit=limit)
         return jsonify(graph)
     except Exception as e:
         return jsonify({"error": str(e), "nodes": [], "edges": []})
@@ -198,14 +209,15 @@ def api_decision_graph_current():
     try:
         from decision_graph import get_decision_logger
         logger = get_decision_logger()
+        after, limit = _graph_page_args()
 
         # Try current mission first
         mission = io_utils.atomic_read_json(MISSION_PATH, {})
         mission_id = mission.get("mission_id")
 
         if mission_id:
-            graph = logger.get_mission_graph(mission_id)
-            if graph.get('nodes'):
+            graph = logger.get_mission_graph(mission_id, after_sequence=after, limit=limit)
+            if graph['stats']['total']:
                 graph['mission_id'] = mission_id
                 graph['is_current'] = True
                 return jsonify(graph)
@@ -215,7 +227,7 @@ def api_decision_graph_current():
         if missions:
             best_mission = max(missions, key=lambda m: m.get('total_invocations', 0))
             fallback_id = best_mission['mission_id']
-            graph = logger.get_mission_graph(fallback_id)
+            graph = logger.get_mission_graph(fallback_id, after_sequence=after, limit=limit)
             graph['mission_id'] = fallback_id
             graph['is_current'] = False
             graph['note'] = f"Showing data from {fallback_id} (current mission has no decision data yet)"
@@ -237,7 +249,17 @@ def api_decision_graph_export(mission_id):
     try:
         from decision_graph import get_decision_logger
         logger = get_decision_logger()
-        graph = logger.get_mission_graph(mission_id)
+
+        # Every page, so large missions are exported in full
+        graph = logger.get_mission_graph(mission_id, limit=MAX_GRAPH_PAGE_SIZE)
+        page = graph.pop('page')
+        while page['has_more']:
+            next_page = logger.get_mission_graph(
+                mission_id, after_sequence=page['next_after_sequence'], limit=MAX_GRAPH_PAGE_SIZE
+            )
+            graph['nodes'].extend(next_page['nodes'])
+            graph['edges'].extend(next_page['edges'])
+            page = next_page['page']
 
         export_format = request.args.get('format', 'json').lower()
 
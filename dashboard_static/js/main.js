@@ -4915,20 +4915,56 @@ async function applyRecovery() {
 
 let decisionGraphData = null;
 let decisionGraphNodes = [];
+let decisionGraphLoading = false;
 
-async function refreshDecisionGraph() {
-    try {
-        const data = await api('/api/decision-graph/current');
-        decisionGraphData = data;
+// Pages requested when catching up with a large mission (server max: 5000)
+const DECISION_GRAPH_PAGE_SIZE = 2000;
 
-        // Update stats
-        document.getElementById('decision-invocation-count').textContent = data.stats?.total || 0;
-        document.getElementById('decision-error-count').textContent = data.stats?.errors || 0;
+function updateDecisionStats(stats) {
+    document.getElementById('decision-invocation-count').textContent = stats?.total || 0;
+    document.getElementById('decision-error-count').textContent = stats?.errors || 0;
+}
 
-        // Render graph
-        renderDecisionGraph(data);
+function appendDecisionPage(page) {
+    decisionGraphData.nodes.push(...(page.nodes || []));
+    decisionGraphData.edges.push(...(page.edges || []));
+    decisionGraphData.stats = page.stats || decisionGraphData.stats;
+    decisionGraphData.page = page.page;
+}
+
+async function refreshDecisionGraph() {
+    // Loaded invocations are kept: only those after the last loaded
+    // sequence are requested, following the pages to the end of the mission
+    if (decisionGraphLoading) return;
+    decisionGraphLoading = true;
+    try {
+        const after = decisionGraphData?.page?.next_after_sequence || 0;
+        let data = await api(`/api/decision-graph/current?after=${after}`);
+        if (!decisionGraphData || data.mission_id !== decisionGraphData.mission_id || after === 0) {
+            // First load, or another mission: start over
+            if (after !== 0) data = await api('/api/decision-graph/current');
+            decisionGraphData = { ...data, nodes: data.nodes || [], edges: data.edges || [] };
+        } else {
+            appendDecisionPage(data);
+        }
+        updateDecisionStats(decisionGraphData.stats);
+        renderDecisionGraph(decisionGraphData);
+
+        const missionId = decisionGraphData.mission_id;
+        while (missionId && decisionGraphData.page?.has_more) {
+            const next = decisionGraphData.page.next_after_sequence;
+            const page = await api(
+                `/api/decision-graph/${encodeURIComponent(missionId)}?after=${next}&limit=${DECISION_GRAPH_PAGE_SIZE}`
+            );
+            if (page.error || !page.page) break;
+            appendDecisionPage(page);
+            updateDecisionStats(decisionGraphData.stats);
+            renderDecisionGraph(decisionGraphData);
+        }
     } catch (e) {
         console.error('Decision graph error:', e);
+    } finally {
+        decisionGraphLoading = false;
     }
 }
 
@@ -4957,10 +4993,11 @@ function renderDecisionGraph(data) {
 
     // Position nodes in a grid/flow layout
     const padding = 20;
-    const nodeRadius = 8;
     const nodesPerRow = Math.ceil(Math.sqrt(nodes.length));
     const spacingX = (w - padding * 2) / (nodesPerRow + 1);
     const spacingY = (h - padding * 2) / (Math.ceil(nodes.length / nodesPerRow) + 1);
+    // Shrink nodes so large missions still fit the canvas
+    const nodeRadius = Math.max(1.5, Math.min(8, Math.min(spacingX, spacingY) / 3));
 
     decisionGraphNodes = nodes.map((node, i) => {
         const row = Math.floor(i / nodesPerRow);
@@ -4975,9 +5012,10 @@ function renderDecisionGraph(data) {
     // Draw edges
     ctx.strokeStyle = '#30363d';
     ctx.lineWidth = 1;
+    const nodesById = new Map(decisionGraphNodes.map(n => [n.id, n]));
     edges.forEach(edge => {
-        const source = decisionGraphNodes.find(n => n.id === edge.source);
-        const target = decisionGraphNodes.find(n => n.id === edge.target);
+        const source = nodesById.get(edge.source);
+        const target = nodesById.get(edge.target);
         if (source && target) {
             ctx.beginPath();
             ctx.moveTo(source.x, source.y);
@@ -13,25 +13,68 @@ import { api } from './api.js';
 
 let decisionGraphData = null;
 let decisionGraphNodes = [];
+let decisionGraphLoading = false;
+
+// Pages requested when catching up with a large mission (server max: 5000)
+const DECISION_GRAPH_PAGE_SIZE = 2000;
 
 // =============================================================================
 // DECISION GRAPH FUNCTIONS
 // =============================================================================
 
-export async function refreshDecisionGraph() {
-    try {
-        const data = await api('/api/decision-graph/current');
-        decisionGraphData = data;
+function updateDecisionStats(stats) {
+    const invocationCount = document.getElementById('decision-invocation-count');
+    const errorCount = document.getElementById('decision-error-count');
 
-        const invocationCount = document.getElementById('decision-invocation-count');
-        const errorCount = document.getElementById('decision-error-count');
+    if (invocationCount) invocationCount.textContent = stats?.total || 0;
+    if (errorCount) errorCount.textContent = stats?.errors || 0;
+}
 
-        if (invocationCount) invocationCount.textContent = data.stats?.total || 0;
-        if (errorCount) errorCount.textContent = data.stats?.errors || 0;
+function appendDecisionPage(page) {
+    decisionGraphData.nodes.push(...(page.nodes || []));
+    decisionGraphData.edges.push(...(page.edges || []));
+    decisionGraphData.stats = page.stats || decisionGraphData.stats;
+    decisionGraphData.page = page.page;
+}
 
-        renderDecisionGraph(data);
+/**
+ * Load the decision graph page by page.
+ *
+ * Invocations already loaded are kept between refreshes: each refresh only
+ * asks for those after the last loaded sequence, and follows the pages
+ * until the mission is complete, rendering after each page.
+ */
+export async function refreshDecisionGraph() {
+    if (decisionGraphLoading) return;
+    decisionGraphLoading = true;
+    try {
+        const after = decisionGraphData?.page?.next_after_sequence || 0;
+        let data = await api(`/api/decision-graph/current?after=${after}`);
+        if (!decisionGraphData || data.mission_id !== decisionGraphData.mission_id || after === 0) {
+            // First load, or another mission: start over
+            if (after !== 0) data = await api('/api/decision-graph/current');
+            decisionGraphData = { ...data, nodes: data.nodes || [], edges: data.edges || [] };
+        } else {
+            appendDecisionPage(data);
+        }
+        updateDecisionStats(decisionGraphData.stats);
+        renderDecisionGraph(decisionGraphData);
+
+        const missionId = decisionGraphData.mission_id;
+        while (missionId && decisionGraphData.page?.has_more) {
+            const next = decisionGraphData.page.next_after_sequence;
+            const page = await api(
+                `/api/decision-graph/${encodeURIComponent(missionId)}?after=${next}&limit=${DECISION_GRAPH_PAGE_SIZE}`
+            );
+            if (page.error || !page.page) break;
+            appendDecisionPage(page);
+            updateDecisionStats(decisionGraphData.stats);
+            renderDecisionGraph(decisionGraphData);
+        }
     } catch (e) {
         console.error('Decision graph error:', e);
+    } finally {
+        decisionGraphLoading = false;
     }
 }
 
@@ -58,10 +101,11 @@ function renderDecisionGraph(data) {
     }
 
     const padding = 20;
-    const nodeRadius = 8;
     const nodesPerRow = Math.ceil(Math.sqrt(nodes.length));
     const spacingX = (w - padding * 2) / (nodesPerRow + 1);
     const spacingY = (h - padding * 2) / (Math.ceil(nodes.length / nodesPerRow) + 1);
+    // Shrink nodes so large missions still fit the canvas
+    const nodeRadius = Math.max(1.5, Math.min(8, Math.min(spacingX, spacingY) / 3));
 
     decisionGraphNodes = nodes.map((node, i) => {
         const row = Math.floor(i / nodesPerRow);
@@ -76,9 +120,10 @@ function renderDecisionGraph(data) {
     // Draw edges
     ctx.strokeStyle = '#30363d';
     ctx.lineWidth = 1;
+    const nodesById = new Map(decisionGraphNodes.map(n => [n.id, n]));
     edges.forEach(edge => {
-        const source = decisionGraphNodes.find(n => n.id === edge.source);
-        const target = decisionGraphNodes.find(n => n.id === edge.target);
+        const source = nodesById.get(edge.source);
+        const target = nodesById.get(edge.target);
         if (source && target) {
             ctx.beginPath();
             ctx.moveTo(source.x, source.y);
@@ -26,12 +26,25 @@ Usage:
     # Get graph for visualization
     graph = logger.get_mission_graph("mission_abc")
     failures = logger.get_failure_points("mission_abc")
+
+Invocations are written behind: log_invocation() only queues the row, and
+a background thread inserts queued rows in one transaction every
+FLUSH_INTERVAL_SECONDS (or as soon as MAX_PENDING_INVOCATIONS are queued).
+Queries include rows not written yet, and flush() / process exit drain the
+queue.
+
+Per-mission aggregates (totals, stage/tool counts, edited files, runs of
+consecutive errors) are updated in the same transaction, so summaries and
+patterns never rescan a mission. Mission graphs are paginated by sequence
+number (get_mission_graph(after_sequence=...)).
 """
 
+import atexit
 import json
 import sqlite3
 import logging
 import hashlib
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, Optional, List, Tuple
@@ -42,9 +55,29 @@ logger = logging.getLogger(__name__)
 
 # Paths - use centralized configuration
 from atlasforge_config import AF_DATA_DIR
+from sqlite_pool import get_pool
 DECISION_GRAPH_DIR = AF_DATA_DIR / "decision_graphs"
 DECISION_GRAPH_DIR.mkdir(parents=True, exist_ok=True)
 
+FLUSH_INTERVAL_SECONDS = 1.0  # Max delay before a logged invocation is written
+MAX_PENDING_INVOCATIONS = 500  # Write right away once this many are queued
+
+SCHEMA_VERSION = 1  # 1: per-mission aggregate tables
+DEFAULT_GRAPH_PAGE_SIZE = 500  # Invocations per get_mission_graph() page
+MIN_FAILURE_RUN = 3  # Consecutive errors on one tool reported as a pattern
+MIN_EXCESSIVE_EDITS = 5  # Edits of one file reported as a pattern
+MAX_RUN_IDS = 50  # Invocation IDs kept per error run
+MAX_EDIT_IDS = 10  # Invocation IDs kept per edited file
+TOOL_SWITCH_WINDOW = 20  # Recent invocations checked for tool switching
+EDIT_TOOLS = ("Edit", "Write")
+
+# Column order of tool_invocations (and of queued rows)
+INVOCATION_COLUMNS = [
+    "invocation_id", "mission_id", "stage", "tool_name", "timestamp",
+    "duration_ms", "input_summary", "output_summary", "status",
+    "error_message", "parent_id", "sequence_number", "token_usage"
+]
+
 
 class InvocationStatus(Enum):
     """Status of a tool invocation"""
@@ -79,6 +112,15 @@ class ToolInvocation:
     def from_dict(cls, data: dict) -> 'ToolInvocation':
         return cls(**data)
 
+    @classmethod
+    def from_row(cls, row: Tuple) -> 'ToolInvocation':
+        """Build from a tool_invocations row (JSON columns still encoded)."""
+        data = dict(zip(INVOCATION_COLUMNS, row))
+        data["input_summary"] = json.loads(data["input_summary"] or "{}")
+        data["output_summary"] = json.loads(data["output_summary"] or "{}")
+        data["token_usage"] = json.loads(data["token_usage"] or "{}")
+        return cls(**data)
+
 
 @dataclass
 class GraphNode:
@@ -110,24 +152,38 @@ class DecisionGraphLogger:
     - Querying invocation history
     - Building graph structures for visualization
     - Detecting failure patterns
+
+    Invocations are queued and written in batches by a background thread
+    (see flush()); queries merge in the queued rows.
     """
 
-    def __init__(self, storage_path: Optional[Path] = None):
+    def __init__(self, storage_path: Optional[Path] = None, flush_interval: float = FLUSH_INTERVAL_SECONDS):
         """
         Initialize the decision graph logger.
 
         Args:
             storage_path: Path to store database (default: DECISION_GRAPH_DIR)
+            flush_interval: Seconds between batch writes (0 = write each
+                invocation immediately)
         """
         self.storage_path = storage_path or DECISION_GRAPH_DIR
         self.storage_path.mkdir(parents=True, exist_ok=True)
         self.db_path = self.storage_path / "decision_graph.db"
+        self.flush_interval = flush_interval
+        self._pool = get_pool(self.db_path)
         self._init_db()
         self._sequence_counters = {}  # mission_id -> counter
 
+        # Write-behind queue: rows are moved to _writing while being inserted
+        self._cond = threading.Condition()
+        self._pending: List[Tuple] = []
+        self._writing: List[Tuple] = []
+        self._flush_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+
     def _init_db(self):
         """Initialize SQLite database schema"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
 
             # Tool invocations table
@@ -156,6 +212,51 @@ class DecisionGraphLogger:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_invocations_status ON tool_invocations(status)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_invocations_timestamp ON tool_invocations(timestamp)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_invocations_sequence ON tool_invocations(mission_id, sequence_number)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_invocations_mission_status ON tool_invocations(mission_id, status, sequence_number)")
+
+            # Per-mission aggregates, maintained by flush(); the open run of
+            # consecutive errors is kept in streak_* until it ends
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS mission_graph_stats (
+                    mission_id TEXT PRIMARY KEY,
+                    total INTEGER NOT NULL DEFAULT 0,
+                    errors INTEGER NOT NULL DEFAULT 0,
+                    total_duration_ms INTEGER NOT NULL DEFAULT 0,
+                    first_timestamp TEXT,
+                    last_timestamp TEXT,
+                    max_sequence INTEGER NOT NULL DEFAULT 0,
+                    streak_tool TEXT,
+                    streak_start INTEGER,
+                    streak_count INTEGER NOT NULL DEFAULT 0,
+                    streak_ids TEXT
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_graph_stats_last ON mission_graph_stats(last_timestamp)")
+
+            # Invocation counts per mission by kind: 'stage', 'tool' or 'edit_file'
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS mission_graph_counts (
+                    mission_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    first_sequence INTEGER,
+                    invocation_ids TEXT,
+                    PRIMARY KEY (mission_id, kind, key)
+                )
+            """)
+
+            # Ended runs of at least MIN_FAILURE_RUN consecutive errors on one tool
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS mission_error_runs (
+                    mission_id TEXT NOT NULL,
+                    start_sequence INTEGER NOT NULL,
+                    tool_name TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    invocation_ids TEXT,
+                    PRIMARY KEY (mission_id, start_sequence)
+                )
+            """)
 
             # Patterns table for storing detected patterns
             cursor.execute("""
@@ -170,13 +271,21 @@ class DecisionGraphLogger:
                 )
             """)
 
-            conn.commit()
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                # Aggregate invocations logged before the tables existed
+                missions = [row[0] for row in cursor.execute("SELECT DISTINCT mission_id FROM tool_invocations")]
+                for mission_id in missions:
+                    self._rebuild_aggregates(conn, mission_id)
+                cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                if missions:
+                    logger.info(f"Built decision graph aggregates for {len(missions)} missions")
 
     def _get_next_sequence(self, mission_id: str) -> int:
-        """Get next sequence number for a mission"""
+        """Get next sequence number for a mission (assumes _cond held)"""
         if mission_id not in self._sequence_counters:
             # Load from database
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     "SELECT MAX(sequence_number) FROM tool_invocations WHERE mission_id = ?",
@@ -219,37 +328,227 @@ class DecisionGraphLogger:
 
         Returns:
             Invocation ID
+
+        The row is queued and written by the next flush.
         """
         timestamp = datetime.now().isoformat()
-        sequence_number = self._get_next_sequence(mission_id)
-
-        # Generate deterministic ID
-        id_string = f"{mission_id}_{stage}_{tool_name}_{timestamp}_{sequence_number}"
-        invocation_id = hashlib.sha256(id_string.encode()).hexdigest()[:16]
 
         # Truncate input/output summaries for storage
         input_str = json.dumps(self._truncate_dict(input_summary or {}))
         output_str = json.dumps(self._truncate_dict(output_summary or {}))
         token_str = json.dumps(token_usage or {})
 
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO tool_invocations
-                (invocation_id, mission_id, stage, tool_name, timestamp, duration_ms,
-                 input_summary, output_summary, status, error_message, parent_id,
-                 sequence_number, token_usage)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+        with self._cond:
+            sequence_number = self._get_next_sequence(mission_id)
+
+            # Generate deterministic ID
+            id_string = f"{mission_id}_{stage}_{tool_name}_{timestamp}_{sequence_number}"
+            invocation_id = hashlib.sha256(id_string.encode()).hexdigest()[:16]
+
+            self._pending.append((
                 invocation_id, mission_id, stage, tool_name, timestamp, duration_ms,
                 input_str, output_str, status, error_message, parent_id,
                 sequence_number, token_str
             ))
-            conn.commit()
+            write_now = self.flush_interval <= 0
+            if not write_now:
+                self._start_flusher()
+                if len(self._pending) >= MAX_PENDING_INVOCATIONS:
+                    self._cond.notify_all()
+
+        if write_now:
+            self.flush()
 
         logger.debug(f"Logged invocation: {tool_name} ({status}) for {mission_id}")
         return invocation_id
 
+    # =========================================================================
+    # WRITE-BEHIND QUEUE
+    # =========================================================================
+
+    def _start_flusher(self):
+        """Start the background writer if it is not running (assumes _cond held)."""
+        if self._flusher is None or not self._flusher.is_alive():
+            # Also restarts it in a forked child, where the thread is gone
+            first = self._flusher is None
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True, name="DecisionGraphFlusher")
+            self._flusher.start()
+            if first:
+                atexit.register(self.flush)
+
+    def _flush_loop(self):
+        """Write queued invocations every flush_interval, or sooner when many are queued."""
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: len(self._pending) >= MAX_PENDING_INVOCATIONS, self.flush_interval)
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write all queued invocations in one transaction.
+
+        Returns:
+            Number of invocations written (0 if the write failed; the rows
+            stay queued and are retried by the next flush)
+        """
+        with self._flush_lock:
+            with self._cond:
+                rows, self._pending = self._pending, []
+                self._writing = rows
+            if not rows:
+                return 0
+
+            try:
+                with self._pool.connection() as conn:
+                    # Ignore rows already written (e.g. by a forked child's copy of the queue)
+                    conn.executemany(f"""
+                        INSERT OR IGNORE INTO tool_invocations ({', '.join(INVOCATION_COLUMNS)})
+                        VALUES ({', '.join('?' * len(INVOCATION_COLUMNS))})
+                    """, rows)
+                    self._update_aggregates(conn, rows)
+                written = len(rows)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to write {len(rows)} decision graph invocations: {e}")
+                with self._cond:
+                    self._pending[:0] = rows
+                written = 0
+
+            with self._cond:
+                self._writing = []
+            return written
+
+    # =========================================================================
+    # MATERIALIZED AGGREGATES
+    # =========================================================================
+
+    def _update_aggregates(self, conn: sqlite3.Connection, rows: List[Tuple]):
+        """Fold just-inserted rows into their missions' aggregates (same transaction)."""
+        by_mission: Dict[str, List[Tuple]] = {}
+        for row in rows:
+            by_mission.setdefault(row[1], []).append(row)
+
+        for mission_id, mission_rows in by_mission.items():
+            mission_rows.sort(key=lambda row: row[11])
+            stored = conn.execute(
+                "SELECT max_sequence FROM mission_graph_stats WHERE mission_id = ?", (mission_id,)
+            ).fetchone()
+            if stored and stored[0] >= mission_rows[0][11]:
+                # Older than what is aggregated (another process, or rows
+                # already written): count the mission again
+                self._rebuild_aggregates(conn, mission_id)
+            else:
+                self._fold_rows(conn, mission_id, mission_rows)
+
+    def _rebuild_aggregates(self, conn: sqlite3.Connection, mission_id: str):
+        """Recompute a mission's aggregates from tool_invocations."""
+        for table in ("mission_graph_stats", "mission_graph_counts", "mission_error_runs"):
+            conn.execute(f"DELETE FROM {table} WHERE mission_id = ?", (mission_id,))
+        cursor = conn.execute(
+            "SELECT * FROM tool_invocations WHERE mission_id = ? ORDER BY sequence_number",
+            (mission_id,)
+        )
+        while True:
+            chunk = cursor.fetchmany(5000)
+            if not chunk:
+                break
+            self._fold_rows(conn, mission_id, chunk)
+
+    def _fold_rows(self, conn: sqlite3.Connection, mission_id: str, rows: List[Tuple]):
+        """Add rows (in sequence order, after everything aggregated) to a mission's aggregates."""
+        stored = conn.execute("""
+            SELECT total, errors, total_duration_ms, first_timestamp, last_timestamp, max_sequence,
+                   streak_tool, streak_start, streak_count, streak_ids
+            FROM mission_graph_stats WHERE mission_id = ?
+        """, (mission_id,)).fetchone()
+        (total, errors, duration, first_ts, last_ts, max_sequence,
+         streak_tool, streak_start, streak_count, streak_ids) = stored or (0, 0, 0, None, None, 0, None, None, 0, None)
+        streak_ids = json.loads(streak_ids or "[]")
+
+        counts: Dict[Tuple[str, str], List] = {}  # (kind, key) -> [count, first_sequence, ids]
+        ended_runs = []
+
+        def count(kind: str, key: str, sequence: int, invocation_id: str = None):
+            entry = counts.setdefault((kind, key), [0, sequence, []])
+            entry[0] += 1
+            if invocation_id is not None:
+                entry[2].append(invocation_id)
+
+        for (invocation_id, _, stage, tool_name, timestamp, duration_ms, input_str, _,
+             status, _, _, sequence, _) in rows:
+            total += 1
+            duration += duration_ms or 0
+            first_ts = timestamp if first_ts is None else min(first_ts, timestamp)
+            last_ts = timestamp if last_ts is None else max(last_ts, timestamp)
+            max_sequence = max(max_sequence, sequence)
+            count("stage", stage, sequence)
+            count("tool", tool_name, sequence)
+            if tool_name in EDIT_TOOLS:
+                file_path = json.loads(input_str or "{}").get("file_path", "")
+                if file_path:
+                    count("edit_file", file_path, sequence, invocation_id)
+
+            # Runs of consecutive errors on the same tool
+            if status == "error":
+                errors += 1
+                if tool_name == streak_tool:
+                    streak_count += 1
+                    if len(streak_ids) < MAX_RUN_IDS:
+                        streak_ids.append(invocation_id)
+                    continue
+                if streak_count >= MIN_FAILURE_RUN:
+                    ended_runs.append((mission_id, streak_start, streak_tool, streak_count, json.dumps(streak_ids)))
+                streak_tool, streak_start, streak_count, streak_ids = tool_name, sequence, 1, [invocation_id]
+            elif streak_count:
+                if streak_count >= MIN_FAILURE_RUN:
+                    ended_runs.append((mission_id, streak_start, streak_tool, streak_count, json.dumps(streak_ids)))
+                streak_tool, streak_start, streak_count, streak_ids = None, None, 0, []
+
+        conn.execute("""
+            INSERT OR REPLACE INTO mission_graph_stats
+            (mission_id, total, errors, total_duration_ms, first_timestamp, last_timestamp, max_sequence,
+             streak_tool, streak_start, streak_count, streak_ids)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (mission_id, total, errors, duration, first_ts, last_ts, max_sequence,
+              streak_tool, streak_start, streak_count, json.dumps(streak_ids)))
+
+        if ended_runs:
+            conn.executemany("""
+                INSERT OR REPLACE INTO mission_error_runs
+                (mission_id, start_sequence, tool_name, count, invocation_ids)
+                VALUES (?, ?, ?, ?, ?)
+            """, ended_runs)
+
+        # Edited files keep their first invocation IDs
+        edited = [key for kind, key in counts if kind == "edit_file"]
+        if edited:
+            stored_ids = dict(conn.execute(
+                f"SELECT key, invocation_ids FROM mission_graph_counts "
+                f"WHERE mission_id = ? AND kind = 'edit_file' AND key IN ({', '.join('?' * len(edited))})",
+                [mission_id] + edited
+            ).fetchall())
+            for key in edited:
+                entry = counts[("edit_file", key)]
+                entry[2] = (json.loads(stored_ids.get(key) or "[]") + entry[2])[:MAX_EDIT_IDS]
+
+        conn.executemany("""
+            INSERT INTO mission_graph_counts (mission_id, kind, key, count, first_sequence, invocation_ids)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (mission_id, kind, key) DO UPDATE SET
+                count = count + excluded.count,
+                invocation_ids = excluded.invocation_ids
+        """, [
+            (mission_id, kind, key, n, first_sequence, json.dumps(ids) if kind == "edit_file" else None)
+            for (kind, key), (n, first_sequence, ids) in counts.items()
+        ])
+
+    def _queued_rows(self, mission_id: Optional[str] = None) -> List[Tuple]:
+        """Rows logged but not written yet, oldest first."""
+        with self._cond:
+            rows = self._writing + self._pending
+        if mission_id is not None:
+            rows = [row for row in rows if row[1] == mission_id]
+        return rows
+
     def _truncate_dict(self, d: dict, max_str_len: int = 500) -> dict:
         """Truncate string values in dict for storage"""
         result = {}
@@ -270,7 +569,8 @@ class DecisionGraphLogger:
         stage: str = None,
         tool_name: str = None,
         status: str = None,
-        limit: int = 100
+        limit: int = 100,
+        after_sequence: int = 0
     ) -> List[ToolInvocation]:
         """
         Get tool invocations with optional filtering.
@@ -281,15 +581,23 @@ class DecisionGraphLogger:
             tool_name: Filter by tool name (optional)
             status: Filter by status (optional)
             limit: Maximum number of results
+            after_sequence: Only invocations with a higher sequence number
 
         Returns:
             List of ToolInvocation objects
         """
-        with sqlite3.connect(self.db_path) as conn:
+        # Read before querying: rows written in between show up in both and are deduplicated
+        queued = [
+            row for row in self._queued_rows(mission_id)
+            if (not stage or row[2] == stage) and (not tool_name or row[3] == tool_name)
+            and (not status or row[8] == status) and row[11] > after_sequence
+        ]
+
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
 
-            query = "SELECT * FROM tool_invocations WHERE mission_id = ?"
-            params = [mission_id]
+            query = "SELECT * FROM tool_invocations WHERE mission_id = ? AND sequence_number > ?"
+            params = [mission_id, after_sequence]
 
             if stage:
                 query += " AND stage = ?"
@@ -307,42 +615,54 @@ class DecisionGraphLogger:
             cursor.execute(query, params)
             rows = cursor.fetchall()
 
-        columns = [
-            "invocation_id", "mission_id", "stage", "tool_name", "timestamp",
-            "duration_ms", "input_summary", "output_summary", "status",
-            "error_message", "parent_id", "sequence_number", "token_usage"
-        ]
+        if queued:
+            stored = {row[0] for row in rows}
+            rows = rows + [row for row in queued if row[0] not in stored]
+            rows.sort(key=lambda row: row[11])
+            rows = rows[:limit]
 
-        invocations = []
-        for row in rows:
-            data = dict(zip(columns, row))
-            data["input_summary"] = json.loads(data["input_summary"] or "{}")
-            data["output_summary"] = json.loads(data["output_summary"] or "{}")
-            data["token_usage"] = json.loads(data["token_usage"] or "{}")
-            invocations.append(ToolInvocation.from_dict(data))
+        return [ToolInvocation.from_row(row) for row in rows]
 
-        return invocations
-
-    def get_mission_graph(self, mission_id: str) -> Dict[str, Any]:
+    def get_mission_graph(
+        self,
+        mission_id: str,
+        after_sequence: int = 0,
+        limit: int = DEFAULT_GRAPH_PAGE_SIZE
+    ) -> Dict[str, Any]:
         """
         Get graph data for a mission suitable for visualization.
 
+        Nodes are paginated by sequence number; stats cover the whole mission.
+
         Args:
             mission_id: Mission identifier
+            after_sequence: Start after this sequence number (the previous
+                page's page.next_after_sequence)
+            limit: Maximum number of nodes
 
         Returns:
-            Dict with nodes and edges for graph rendering
+            Dict with nodes and edges for graph rendering, stats and page info
         """
-        invocations = self.get_invocations(mission_id, limit=500)
-
-        if not invocations:
-            return {"nodes": [], "edges": [], "stats": {"total": 0, "errors": 0}}
+        self.flush()  # Stats and pages over everything logged
+        # One extra row tells whether another page follows
+        invocations = self.get_invocations(mission_id, limit=limit + 1, after_sequence=after_sequence)
+        has_more = len(invocations) > limit
+        invocations = invocations[:limit]
 
         nodes = []
         edges = []
         prev_id = None
+        if invocations and after_sequence > 0:
+            # Link the page to the last node of the previous one
+            with self._pool.connection() as conn:
+                row = conn.execute("""
+                    SELECT invocation_id FROM tool_invocations
+                    WHERE mission_id = ? AND sequence_number <= ?
+                    ORDER BY sequence_number DESC LIMIT 1
+                """, (mission_id, after_sequence)).fetchone()
+            prev_id = row[0] if row else None
 
-        for i, inv in enumerate(invocations):
+        for inv in invocations:
             # Create node
             node = {
                 "id": inv.invocation_id,
@@ -376,37 +696,38 @@ class DecisionGraphLogger:
 
             prev_id = inv.invocation_id
 
-        # Calculate statistics
-        error_count = sum(1 for n in nodes if n.get("has_error"))
-        stage_counts = {}
-        tool_counts = {}
-
-        for inv in invocations:
-            stage_counts[inv.stage] = stage_counts.get(inv.stage, 0) + 1
-            tool_counts[inv.tool_name] = tool_counts.get(inv.tool_name, 0) + 1
+        summary = self.get_mission_summary(mission_id, flush=False, top_tools=None)
 
         return {
             "nodes": nodes,
             "edges": edges,
             "stats": {
-                "total": len(nodes),
-                "errors": error_count,
-                "by_stage": stage_counts,
-                "by_tool": tool_counts
+                "total": summary["total_invocations"],
+                "errors": summary["error_count"],
+                "by_stage": summary["by_stage"],
+                "by_tool": summary["by_tool"]
+            },
+            "page": {
+                "after_sequence": after_sequence,
+                "limit": limit,
+                "has_more": has_more,
+                "next_after_sequence": invocations[-1].sequence_number if invocations else after_sequence
             }
         }
 
-    def get_failure_points(self, mission_id: str) -> List[Dict[str, Any]]:
+    def get_failure_points(self, mission_id: str, after_sequence: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
         """
-        Get all invocations that failed for a mission.
+        Get the invocations that failed for a mission.
 
         Args:
             mission_id: Mission identifier
+            after_sequence: Only failures with a higher sequence number
+            limit: Maximum number of failures
 
         Returns:
             List of failure details with context
         """
-        invocations = self.get_invocations(mission_id, status="error", limit=100)
+        invocations = self.get_invocations(mission_id, status="error", limit=limit, after_sequence=after_sequence)
 
         failures = []
         for inv in invocations:
@@ -427,11 +748,10 @@ class DecisionGraphLogger:
         """
         Detect unusual patterns in tool invocations.
 
-        Patterns detected:
+        Patterns detected (over the whole mission, from its aggregates):
         - Repeated failures on same tool
         - Same file edited many times
-        - Long sequences without progress
-        - Rapid tool switching
+        - Rapid tool switching in the latest invocations
 
         Args:
             mission_id: Mission identifier
@@ -439,78 +759,73 @@ class DecisionGraphLogger:
         Returns:
             List of detected patterns
         """
-        invocations = self.get_invocations(mission_id, limit=500)
-
-        if len(invocations) < 5:
-            return []
+        self.flush()  # Aggregates over everything logged
+        with self._pool.connection() as conn:
+            stats = conn.execute("""
+                SELECT total, streak_tool, streak_start, streak_count, streak_ids
+                FROM mission_graph_stats WHERE mission_id = ?
+            """, (mission_id,)).fetchone()
+            if not stats or stats[0] < 5:
+                return []
+
+            runs = conn.execute("""
+                SELECT tool_name, count, invocation_ids FROM mission_error_runs
+                WHERE mission_id = ? ORDER BY start_sequence
+            """, (mission_id,)).fetchall()
+            edited = conn.execute(f"""
+                SELECT key, count, invocation_ids FROM mission_graph_counts
+                WHERE mission_id = ? AND kind = 'edit_file' AND count >= {MIN_EXCESSIVE_EDITS}
+                ORDER BY first_sequence
+            """, (mission_id,)).fetchall()
+            recent = conn.execute("""
+                SELECT invocation_id, tool_name FROM tool_invocations
+                WHERE mission_id = ? ORDER BY sequence_number DESC LIMIT ?
+            """, (mission_id, TOOL_SWITCH_WINDOW)).fetchall()[::-1]
 
         patterns = []
 
-        # Pattern 1: Repeated failures on same tool
-        error_streaks = {}
-        current_streak = {"tool": None, "count": 0, "ids": []}
-
-        for inv in invocations:
-            if inv.status == "error":
-                if inv.tool_name == current_streak["tool"]:
-                    current_streak["count"] += 1
-                    current_streak["ids"].append(inv.invocation_id)
-                else:
-                    if current_streak["count"] >= 3:
-                        patterns.append({
-                            "type": "repeated_failure",
-                            "description": f"{current_streak['count']} consecutive failures on {current_streak['tool']}",
-                            "severity": "warning" if current_streak["count"] < 5 else "error",
-                            "invocation_ids": current_streak["ids"]
-                        })
-                    current_streak = {"tool": inv.tool_name, "count": 1, "ids": [inv.invocation_id]}
-            else:
-                if current_streak["count"] >= 3:
-                    patterns.append({
-                        "type": "repeated_failure",
-                        "description": f"{current_streak['count']} consecutive failures on {current_streak['tool']}",
-                        "severity": "warning" if current_streak["count"] < 5 else "error",
-                        "invocation_ids": current_streak["ids"]
-                    })
-                current_streak = {"tool": None, "count": 0, "ids": []}
+        # Pattern 1: Repeated failures on same tool (including a run still going on)
+        _, streak_tool, _, streak_count, streak_ids = stats
+        if streak_count >= MIN_FAILURE_RUN:
+            runs.append((streak_tool, streak_count, streak_ids))
+        for tool, count, ids in runs:
+            patterns.append({
+                "type": "repeated_failure",
+                "description": f"{count} consecutive failures on {tool}",
+                "severity": "warning" if count < 5 else "error",
+                "invocation_ids": json.loads(ids or "[]")
+            })
 
         # Pattern 2: Same file edited many times
-        file_edits = {}
-        for inv in invocations:
-            if inv.tool_name in ("Edit", "Write"):
-                file_path = inv.input_summary.get("file_path", "")
-                if file_path:
-                    if file_path not in file_edits:
-                        file_edits[file_path] = []
-                    file_edits[file_path].append(inv.invocation_id)
-
-        for file_path, ids in file_edits.items():
-            if len(ids) >= 5:
-                patterns.append({
-                    "type": "excessive_edits",
-                    "description": f"File edited {len(ids)} times: {file_path}",
-                    "severity": "info" if len(ids) < 10 else "warning",
-                    "invocation_ids": ids[:10]
-                })
+        for file_path, count, ids in edited:
+            patterns.append({
+                "type": "excessive_edits",
+                "description": f"File edited {count} times: {file_path}",
+                "severity": "info" if count < 10 else "warning",
+                "invocation_ids": json.loads(ids or "[]")
+            })
 
         # Pattern 3: Tool switching (high entropy in tool sequence)
-        recent_window = min(20, len(invocations))
-        recent_tools = [inv.tool_name for inv in invocations[-recent_window:]]
-        unique_tools = len(set(recent_tools))
+        recent_window = len(recent)
+        unique_tools = len({tool for _, tool in recent})
 
         if recent_window >= 10 and unique_tools >= recent_window * 0.8:
             patterns.append({
                 "type": "tool_switching",
                 "description": f"High tool variety in recent {recent_window} invocations ({unique_tools} unique tools)",
                 "severity": "info",
-                "invocation_ids": [inv.invocation_id for inv in invocations[-recent_window:]]
+                "invocation_ids": [invocation_id for invocation_id, _ in recent]
             })
 
         return patterns
 
     def get_invocation_details(self, invocation_id: str) -> Optional[ToolInvocation]:
         """Get full details for a specific invocation"""
-        with sqlite3.connect(self.db_path) as conn:
+        for row in self._queued_rows():
+            if row[0] == invocation_id:
+                return ToolInvocation.from_row(row)
+
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 "SELECT * FROM tool_invocations WHERE invocation_id = ?",
@@ -521,32 +836,17 @@ class DecisionGraphLogger:
         if not row:
             return None
 
-        columns = [
-            "invocation_id", "mission_id", "stage", "tool_name", "timestamp",
-            "duration_ms", "input_summary", "output_summary", "status",
-            "error_message", "parent_id", "sequence_number", "token_usage"
-        ]
-
-        data = dict(zip(columns, row))
-        data["input_summary"] = json.loads(data["input_summary"] or "{}")
-        data["output_summary"] = json.loads(data["output_summary"] or "{}")
-        data["token_usage"] = json.loads(data["token_usage"] or "{}")
-
-        return ToolInvocation.from_dict(data)
+        return ToolInvocation.from_row(row)
 
     def get_missions_with_graphs(self, limit: int = 20) -> List[Dict[str, Any]]:
         """Get list of missions that have decision graph data"""
-        with sqlite3.connect(self.db_path) as conn:
+        self.flush()  # Aggregates over everything logged
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT mission_id,
-                       MIN(timestamp) as first_invocation,
-                       MAX(timestamp) as last_invocation,
-                       COUNT(*) as total_invocations,
-                       SUM(CASE WHEN status = 'error' THEN 1 ELSE 0 END) as error_count
-                FROM tool_invocations
-                GROUP BY mission_id
-                ORDER BY last_invocation DESC
+                SELECT mission_id, first_timestamp, last_timestamp, total, errors
+                FROM mission_graph_stats
+                ORDER BY last_timestamp DESC
                 LIMIT ?
             """, (limit,))
             rows = cursor.fetchall()
@@ -563,46 +863,48 @@ class DecisionGraphLogger:
 
         return missions
 
-    def get_mission_summary(self, mission_id: str) -> Dict[str, Any]:
-        """Get summary statistics for a mission's decision graph"""
-        with sqlite3.connect(self.db_path) as conn:
+    def get_mission_summary(
+        self,
+        mission_id: str,
+        flush: bool = True,
+        top_tools: Optional[int] = 10
+    ) -> Dict[str, Any]:
+        """
+        Get summary statistics for a mission's decision graph.
+
+        Args:
+            mission_id: Mission identifier
+            flush: Write queued invocations first
+            top_tools: Number of most used tools in by_tool (None = all)
+        """
+        if flush:
+            self.flush()  # Aggregates over everything logged
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
 
-            # Total stats
             cursor.execute("""
-                SELECT COUNT(*),
-                       SUM(CASE WHEN status = 'error' THEN 1 ELSE 0 END),
-                       SUM(duration_ms),
-                       MIN(timestamp),
-                       MAX(timestamp)
-                FROM tool_invocations
-                WHERE mission_id = ?
+                SELECT total, errors, total_duration_ms, first_timestamp, last_timestamp
+                FROM mission_graph_stats WHERE mission_id = ?
             """, (mission_id,))
-            row = cursor.fetchone()
+            row = cursor.fetchone() or (0, 0, 0, None, None)
 
-            # By stage
             cursor.execute("""
-                SELECT stage, COUNT(*) FROM tool_invocations
-                WHERE mission_id = ?
-                GROUP BY stage
+                SELECT kind, key, count FROM mission_graph_counts
+                WHERE mission_id = ? AND kind IN ('stage', 'tool')
+                ORDER BY count DESC, first_sequence
             """, (mission_id,))
-            by_stage = dict(cursor.fetchall())
+            counts = cursor.fetchall()
 
-            # By tool
-            cursor.execute("""
-                SELECT tool_name, COUNT(*) FROM tool_invocations
-                WHERE mission_id = ?
-                GROUP BY tool_name
-                ORDER BY COUNT(*) DESC
-                LIMIT 10
-            """, (mission_id,))
-            by_tool = dict(cursor.fetchall())
+        by_stage = {key: count for kind, key, count in counts if kind == "stage"}
+        by_tool = {key: count for kind, key, count in counts if kind == "tool"}
+        if top_tools is not None:
+            by_tool = dict(list(by_tool.items())[:top_tools])
 
         return {
             "mission_id": mission_id,
-            "total_invocations": row[0] or 0,
-            "error_count": row[1] or 0,
-            "total_duration_ms": row[2] or 0,
+            "total_invocations": row[0],
+            "error_count": row[1],
+            "total_duration_ms": row[2],
             "first_invocation": row[3],
             "last_invocation": row[4],
             "by_stage": by_stage,
@@ -1398,6 +1398,10 @@ def populate_from_transcript(transcript_path: Path, mission_id: str = None) -> D
     except Exception as e:
         stats["errors"].append(f"Parse error: {str(e)}")
 
+    if logger is not None:
+        # Write the imported invocations before returning
+        logger.flush()
+
     return stats
 
 
@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Graph Tiles - Viewport tiling and level-of-detail for the exploration graph.
+
+Splits the laid-out graph into a quadtree of tiles so the dashboard only
+fetches what is on screen:
+
+1. Nodes are bucketed once by the Z-order (Morton) code of their position,
+   so every tile at every zoom level is a contiguous range of the sorted
+   nodes
+2. Tiles holding few nodes (or at the deepest zoom) are sent in full
+3. Denser tiles are sent as super-nodes: one cluster per cell of an 8x8
+   grid inside the tile, with edges aggregated between clusters
+4. Every payload carries an ETag derived from its content, so a tile that
+   did not change is answered with 304 Not Modified
+
+Zoom 0 is a single tile covering the canvas; zoom z has 2^z x 2^z tiles.
+"""
+
+import hashlib
+import json
+import math
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from interactive_graph import EDGE_TYPES, NODE_TYPES
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+MAX_ZOOM = 8               # Deepest tile level: always full detail
+CLUSTER_BITS = 3           # Cluster tiles hold up to 2^3 x 2^3 super-nodes
+DETAIL_MAX_NODES = 300     # Tiles with at most this many nodes are sent in full
+CELL_BITS = MAX_ZOOM + CLUSTER_BITS  # Resolution of the spatial buckets (per axis)
+
+# Keys that change on every call and are left out of ETags
+VOLATILE_KEYS = ('generated_at',)
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def _spread_bits(v: np.ndarray) -> np.ndarray:
+    """Insert a zero bit after each of the low 16 bits of v."""
+    v = v.astype(np.uint64) & np.uint64(0xFFFF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x00FF00FF)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x0F0F0F0F)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x33333333)
+    v = (v | (v << np.uint64(1))) & np.uint64(0x55555555)
+    return v
+
+
+def morton_key(cx: np.ndarray, cy: np.ndarray) -> np.ndarray:
+    """Z-order key of integer cell coordinates."""
+    return _spread_bits(cx) | (_spread_bits(cy) << np.uint64(1))
+
+
+def content_etag(payload: Dict) -> str:
+    """ETag of a JSON payload, ignoring timestamps."""
+    stable = {k: v for k, v in payload.items() if k not in VOLATILE_KEYS}
+    if isinstance(stable.get('metadata'), dict):
+        stable['metadata'] = {k: v for k, v in stable['metadata'].items() if k not in VOLATILE_KEYS}
+    encoded = json.dumps(stable, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+def zoom_for_viewport(
+    bbox: Tuple[float, float, float, float],
+    width: float,
+    height: float
+) -> int:
+    """Zoom level at which a tile is about the size of the viewport."""
+    x0, y0, x1, y1 = bbox
+    ratio = min(width / max(x1 - x0, 1e-9), height / max(y1 - y0, 1e-9))
+    return int(min(max(math.floor(math.log2(max(ratio, 1.0))), 0), MAX_ZOOM))
+
+
+# =============================================================================
+# TILE INDEX
+# =============================================================================
+
+class TileIndex:
+    """Spatial buckets over laid-out nodes, answering tile and viewport queries."""
+
+    def __init__(self, nodes: List[Dict], edges: List[Dict], width: float = 800, height: float = 600):
+        """
+        Args:
+            nodes: Visualization nodes with 'x'/'y' canvas positions
+            edges: Visualization edges ('source'/'target' node IDs)
+            width: Canvas width the positions refer to
+            height: Canvas height the positions refer to
+        """
+        self.width = float(width)
+        self.height = float(height)
+        resolution = 1 << CELL_BITS
+
+        xy = np.array(
+            [(n.get('x', width / 2), n.get('y', height / 2)) for n in nodes], dtype=np.float64
+        ).reshape(-1, 2)
+        cells = np.floor(xy / [self.width, self.height] * resolution)
+        cells = np.clip(cells, 0, resolution - 1).astype(np.uint64)
+        keys = morton_key(cells[:, 0], cells[:, 1])
+
+        # Nodes sorted by key: each tile is the slice between two searchsorted bounds
+        order = np.argsort(keys, kind='stable')
+        self.nodes = [nodes[i] for i in order]
+        self.keys = keys[order]
+        self.xy = xy[order]
+        self.counts = np.array([n.get('exploration_count', 1) for n in self.nodes], dtype=np.float64)
+
+        position = {n['id']: i for i, n in enumerate(self.nodes)}
+        self.edges = [e for e in edges if e.get('source') in position and e.get('target') in position]
+        self.edge_src = np.array([position[e['source']] for e in self.edges], dtype=np.int64)
+        self.edge_dst = np.array([position[e['target']] for e in self.edges], dtype=np.int64)
+        self.edge_strength = np.array([e.get('strength', 1.0) for e in self.edges], dtype=np.float64)
+
+        self._levels: Dict[int, Dict[str, np.ndarray]] = {}
+        self._tiles: Dict[Tuple[int, int, int], Dict] = {}
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    # -------------------------------------------------------------------------
+    # Buckets
+    # -------------------------------------------------------------------------
+
+    def _range(self, level: int, tx: int, ty: int) -> Tuple[int, int]:
+        """Slice of the sorted nodes inside cell (tx, ty) of a level."""
+        shift = np.uint64(2 * (CELL_BITS - level))
+        prefix = morton_key(np.array([tx]), np.array([ty]))[0]
+        lo = int(np.searchsorted(self.keys, prefix << shift, side='left'))
+        hi = int(np.searchsorted(self.keys, (prefix + np.uint64(1)) << shift, side='left'))
+        return lo, hi
+
+    def _level(self, level: int) -> Dict[str, np.ndarray]:
+        """Per-cell node counts and centroids of a level, for every node."""
+        if level not in self._levels:
+            shift = np.uint64(2 * (CELL_BITS - level))
+            cell_keys, cell_of, sizes = np.unique(self.keys >> shift, return_inverse=True, return_counts=True)
+            centroid = np.column_stack([
+                np.bincount(cell_of, weights=self.xy[:, axis], minlength=len(cell_keys)) / sizes
+                for axis in (0, 1)
+            ]) if len(cell_keys) else np.zeros((0, 2))
+            self._levels[level] = {'keys': cell_keys, 'cell_of': cell_of, 'sizes': sizes, 'centroid': centroid}
+        return self._levels[level]
+
+    def tile_bounds(self, z: int, x: int, y: int) -> List[float]:
+        """Canvas rectangle [x0, y0, x1, y1] covered by a tile."""
+        tile_w = self.width / (1 << z)
+        tile_h = self.height / (1 << z)
+        return [round(x * tile_w, 2), round(y * tile_h, 2), round((x + 1) * tile_w, 2), round((y + 1) * tile_h, 2)]
+
+    # -------------------------------------------------------------------------
+    # Tiles
+    # -------------------------------------------------------------------------
+
+    def tile(self, z: int, x: int, y: int) -> Dict:
+        """
+        Get one tile.
+
+        Args:
+            z: Zoom level (0 to MAX_ZOOM)
+            x: Tile column (0 to 2^z - 1)
+            y: Tile row (0 to 2^z - 1)
+
+        Returns:
+            Dict with 'level' ('detail' or 'cluster'), 'nodes', 'clusters',
+            'edges', 'metadata' and its 'etag'
+
+        Raises:
+            ValueError: If the tile coordinates are out of range
+        """
+        if not 0 <= z <= MAX_ZOOM or not (0 <= x < (1 << z) and 0 <= y < (1 << z)):
+            raise ValueError(f"Tile {z}/{x}/{y} is out of range (zoom 0-{MAX_ZOOM})")
+
+        if (z, x, y) not in self._tiles:
+            lo, hi = self._range(z, x, y)
+            if hi - lo <= DETAIL_MAX_NODES or z == MAX_ZOOM:
+                payload = self._detail_tile(lo, hi)
+            else:
+                payload = self._cluster_tile(z + CLUSTER_BITS, lo, hi)
+            payload['tile'] = {'z': z, 'x': x, 'y': y, 'bounds': self.tile_bounds(z, x, y)}
+            # Nothing about the rest of the graph: its ETag only changes with its content
+            payload['metadata'] = {
+                'tile_nodes': hi - lo,
+                'width': self.width,
+                'height': self.height,
+                'max_zoom': MAX_ZOOM
+            }
+            payload['etag'] = content_etag(payload)
+            self._tiles[(z, x, y)] = payload
+        return self._tiles[(z, x, y)]
+
+    def _incident_edges(self, lo: int, hi: int) -> np.ndarray:
+        """Indexes of edges with at least one endpoint in nodes[lo:hi]."""
+        inside = ((self.edge_src >= lo) & (self.edge_src < hi)) | ((self.edge_dst >= lo) & (self.edge_dst < hi))
+        return np.flatnonzero(inside)
+
+    def _detail_tile(self, lo: int, hi: int) -> Dict:
+        edges = []
+        for i in self._incident_edges(lo, hi):
+            edge = dict(self.edges[i])
+            # Endpoint positions let the client draw edges that leave the tile
+            edge['x1'], edge['y1'] = (round(float(v), 2) for v in self.xy[self.edge_src[i]])
+            edge['x2'], edge['y2'] = (round(float(v), 2) for v in self.xy[self.edge_dst[i]])
+            edges.append(edge)
+        return {'level': 'detail', 'nodes': self.nodes[lo:hi], 'clusters': [], 'edges': edges}
+
+    def _cluster_tile(self, level: int, lo: int, hi: int) -> Dict:
+        stats = self._level(level)
+        cell_of, sizes, centroid = stats['cell_of'], stats['sizes'], stats['centroid']
+
+        def representative(i: int) -> str:
+            """ID a node is drawn as: itself when alone in its cell, else its cluster."""
+            cell = cell_of[i]
+            return self.nodes[i]['id'] if sizes[cell] == 1 else f"cluster:{level}:{int(stats['keys'][cell])}"
+
+        def position(i: int) -> Tuple[float, float]:
+            return tuple(round(float(v), 2) for v in (self.xy[i] if sizes[cell_of[i]] == 1 else centroid[cell_of[i]]))
+
+        nodes, clusters = [], []
+        max_size = max(int(sizes[cell_of[lo:hi]].max()), 1)
+        cells = cell_of[lo:hi]
+        # Nodes of one cell are contiguous in key order
+        starts = np.flatnonzero(np.r_[True, cells[1:] != cells[:-1]]) + lo
+        for start, end in zip(starts, np.r_[starts[1:], hi]):
+            start, end = int(start), int(end)
+            if end - start == 1:
+                nodes.append(self.nodes[start])
+                continue
+            members = self.nodes[start:end]
+            types = Counter(n.get('type', 'file') for n in members)
+            node_type = types.most_common(1)[0][0]
+            top = start + int(np.argmax(self.counts[start:end]))
+            x, y = position(start)
+            clusters.append({
+                'id': representative(start),
+                'x': x,
+                'y': y,
+                'count': end - start,
+                'exploration_count': int(self.counts[start:end].sum()),
+                'label': self.nodes[top].get('name'),
+                'type': node_type,
+                'node_types': dict(types),
+                'size': round(10 + math.sqrt((end - start) / max_size) * 30, 2),
+                'color': NODE_TYPES.get(node_type, {}).get('color', '#8b949e')
+            })
+
+        # Aggregate edges between the drawn nodes/clusters
+        aggregated: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for i in self._incident_edges(lo, hi):
+            src, dst = int(self.edge_src[i]), int(self.edge_dst[i])
+            source, target = representative(src), representative(dst)
+            if source == target:
+                continue
+            if source > target:
+                source, target, src, dst = target, source, dst, src
+            entry = aggregated.get((source, target))
+            if entry is None:
+                (x1, y1), (x2, y2) = position(src), position(dst)
+                entry = aggregated[(source, target)] = {
+                    'source': source, 'target': target, 'count': 0, 'strength': 0.0,
+                    'relationships': Counter(), 'x1': x1, 'y1': y1, 'x2': x2, 'y2': y2
+                }
+            entry['count'] += 1
+            entry['strength'] += float(self.edge_strength[i])
+            entry['relationships'][self.edges[i].get('relationship', 'related')] += 1
+
+        edges = []
+        for entry in aggregated.values():
+            relationship = entry['relationships'].most_common(1)[0][0]
+            entry['relationships'] = dict(entry['relationships'])
+            entry['strength'] = round(entry['strength'], 4)
+            entry['relationship'] = relationship
+            entry['color'] = EDGE_TYPES.get(relationship, {}).get('color', '#8b949e')
+            edges.append(entry)
+
+        return {'level': 'cluster', 'nodes': nodes, 'clusters': clusters, 'edges': edges}
+
+    # -------------------------------------------------------------------------
+    # Viewports
+    # -------------------------------------------------------------------------
+
+    def viewport(
+        self,
+        bbox: Tuple[float, float, float, float],
+        zoom: Optional[int] = None
+    ) -> Dict:
+        """
+        Get the tiles covering a viewport, merged.
+
+        Args:
+            bbox: Visible canvas rectangle (x0, y0, x1, y1)
+            zoom: Tile zoom level (default: picked from the viewport size)
+
+        Returns:
+            Dict with the merged 'nodes', 'clusters' and 'edges', and the
+            covering 'tiles' with their ETags (to fetch them individually)
+        """
+        x0, y0, x1, y1 = bbox
+        if zoom is None:
+            zoom = zoom_for_viewport(bbox, self.width, self.height)
+        zoom = min(max(int(zoom), 0), MAX_ZOOM)
+        side = 1 << zoom
+
+        def tile_span(lo: float, hi: float, extent: float) -> range:
+            first = min(max(int(math.floor(lo / extent * side)), 0), side - 1)
+            last = min(max(int(math.ceil(hi / extent * side)) - 1, first), side - 1)
+            return range(first, last + 1)
+
+        tiles, nodes, clusters, edges = [], [], [], {}
+        for ty in tile_span(min(y0, y1), max(y0, y1), self.height):
+            for tx in tile_span(min(x0, x1), max(x0, x1), self.width):
+                tile = self.tile(zoom, tx, ty)
+                tiles.append({'z': zoom, 'x': tx, 'y': ty, 'level': tile['level'], 'etag': tile['etag']})
+                nodes.extend(tile['nodes'])
+                clusters.extend(tile['clusters'])
+                for edge in tile['edges']:
+                    # Edges crossing tiles appear in both
+                    edges.setdefault((edge['source'], edge['target'], edge.get('relationship')), edge)
+
+        return {
+            'zoom': zoom,
+            'bbox': [x0, y0, x1, y1],
+            'tiles': tiles,
+            'nodes': nodes,
+            'clusters': clusters,
+            'edges': list(edges.values()),
+            'metadata': {
+                'total_nodes': len(self.nodes),
+                'total_edges': len(self.edges),
+                'width': self.width,
+                'height': self.height,
+                'max_zoom': MAX_ZOOM
+            }
+        }
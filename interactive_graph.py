@@ -767,6 +767,10 @@ def generate_d3_visualization_data(
             'size': size,
             'color': NODE_TYPES.get(node.get('type', 'file'), {}).get('color', '#8b949e')
         })
+        # Keep layout positions when the graph was laid out
+        if 'x' in node and 'y' in node:
+            viz_nodes[-1]['x'] = node['x']
+            viz_nodes[-1]['y'] = node['y']
 
     viz_edges = []
     for edge in edges:
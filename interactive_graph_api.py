@@ -35,6 +35,55 @@ from interactive_graph import (
     EDGE_TYPES,
     NODE_TYPES
 )
+from graph_tiles import TileIndex, content_etag
+
+
+def _conditional_json(payload, etag=None):
+    """
+    JSON response with an ETag; 304 Not Modified when the client has it.
+
+    The ETag ignores 'generated_at' timestamps, so unchanged data is not
+    sent again.
+    """
+    response = jsonify(payload)
+    response.set_etag(etag or content_etag(payload))
+    return response.make_conditional(request)
+
+
+def _parse_graph_filters():
+    """Filter keyword arguments for get_filtered_visualization_data from the query string."""
+    edge_types = request.args.get('edge_types', '')
+    node_types = request.args.get('node_types', '')
+    return {
+        'edge_types': [e.strip() for e in edge_types.split(',') if e.strip()] or None,
+        'node_types': [n.strip() for n in node_types.split(',') if n.strip()] or None,
+        'time_start': request.args.get('time_start'),
+        'time_end': request.args.get('time_end'),
+        'min_exploration_count': request.args.get('min_count', 0, type=int)
+    }
+
+
+def _parse_bbox(value):
+    """Parse an 'x0,y0,x1,y1' viewport rectangle (None if absent)."""
+    if not value:
+        return None
+    parts = [float(p) for p in value.split(',')]
+    if len(parts) != 4:
+        raise ValueError("bbox must be x0,y0,x1,y1")
+    return tuple(parts)
+
+
+def _load_exploration_graph():
+    """The current mission's exploration graph, else the global one (None if neither has data)."""
+    import exploration_hooks
+    from atlasforge_enhancements import ExplorationGraph
+
+    enhancer = exploration_hooks.get_current_enhancer(force_reload=True)
+    if enhancer and len(enhancer.exploration_graph.nodes) > 0:
+        return enhancer.exploration_graph
+    if EXPLORATION_DIR.exists():
+        return ExplorationGraph(storage_path=EXPLORATION_DIR)
+    return None
 
 
 def register_interactive_graph_routes(app):
@@ -57,57 +106,43 @@ def register_interactive_graph_routes(app):
         - time_start: ISO timestamp for start of time range
         - time_end: ISO timestamp for end of time range
         - min_count: Minimum exploration count (default: 0)
+        - bbox: Visible canvas rectangle 'x0,y0,x1,y1'. When given, only the
+          tiles covering it are returned (see /api/atlasforge/graph-tiles):
+          clusters when zoomed out, full detail when zoomed in
+        - zoom: Tile zoom level for bbox (default: picked from the bbox size)
+
+        Responses carry an ETag; unchanged data is answered with 304.
         """
         try:
-            import exploration_hooks
-            from atlasforge_enhancements import ExplorationGraph
-
             # Parse parameters
             width = request.args.get('width', 800, type=float)
             height = request.args.get('height', 600, type=float)
+            filters = _parse_graph_filters()
+            try:
+                bbox = _parse_bbox(request.args.get('bbox'))
+            except ValueError as e:
+                return jsonify({"error": str(e), "nodes": [], "edges": []}), 400
 
-            edge_types = request.args.get('edge_types', '')
-            edge_types = [e.strip() for e in edge_types.split(',') if e.strip()] or None
-
-            node_types = request.args.get('node_types', '')
-            node_types = [n.strip() for n in node_types.split(',') if n.strip()] or None
-
-            time_start = request.args.get('time_start')
-            time_end = request.args.get('time_end')
-
-            min_count = request.args.get('min_count', 0, type=int)
+            # Get graph with fresh data
+            graph = _load_exploration_graph()
+            if graph is None:
+                return jsonify({
+                    "error": "No exploration data available",
+                    "nodes": [],
+                    "edges": [],
+                    "metadata": {"total_nodes": 0, "total_edges": 0}
+                })
 
-            # Get enhancer with fresh data
-            enhancer = exploration_hooks.get_current_enhancer(force_reload=True)
+            # Get filtered visualization data
+            data = get_filtered_visualization_data(graph, width=width, height=height, **filters)
 
-            if not enhancer or len(enhancer.exploration_graph.nodes) == 0:
-                # Try global graph
-                global_graph_path = EXPLORATION_DIR
-                if global_graph_path.exists():
-                    graph = ExplorationGraph(storage_path=global_graph_path)
-                else:
-                    return jsonify({
-                        "error": "No exploration data available",
-                        "nodes": [],
-                        "edges": [],
-                        "metadata": {"total_nodes": 0, "total_edges": 0}
-                    })
-            else:
-                graph = enhancer.exploration_graph
+            if bbox is not None:
+                index = TileIndex(data['nodes'], data['edges'], width, height)
+                view = index.viewport(bbox, zoom=request.args.get('zoom', type=int))
+                view['filters_applied'] = data['filters_applied']
+                return _conditional_json(view)
 
-            # Get filtered visualization data
-            data = get_filtered_visualization_data(
-                graph,
-                width=width,
-                height=height,
-                edge_types=edge_types,
-                node_types=node_types,
-                time_start=time_start,
-                time_end=time_end,
-                min_exploration_count=min_count
-            )
-
-            return jsonify(data)
+            return _conditional_json(data)
 
         except Exception as e:
             import traceback
@@ -211,8 +246,8 @@ def register_interactive_graph_routes(app):
             else:
                 graph = enhancer.exploration_graph
 
-            # Get visualization data (includes nodes and edges)
-            viz_data = graph.export_for_visualization(800, 600)
+            # Get nodes and edges (exports don't need positions)
+            viz_data = graph.export_for_visualization(800, 600, include_layout=False)
             nodes = viz_data.get('nodes', [])
             edges = viz_data.get('edges', [])
 
@@ -310,8 +345,8 @@ def register_interactive_graph_routes(app):
             else:
                 graph = enhancer.exploration_graph
 
-            # Get base visualization data
-            base_data = graph.export_for_visualization(800, 600)
+            # Get base visualization data (the D3 view lays out the subgraph itself)
+            base_data = graph.export_for_visualization(800, 600, include_layout=False)
             nodes = base_data.get('nodes', [])
             edges = base_data.get('edges', [])
 
@@ -332,7 +367,7 @@ def register_interactive_graph_routes(app):
             result['center_node'] = node_id
             result['depth'] = depth
 
-            return jsonify(result)
+            return _conditional_json(result)
 
         except Exception as e:
             import traceback
@@ -344,6 +379,46 @@ def register_interactive_graph_routes(app):
                 "metadata": {"total_nodes": 0, "total_edges": 0}
             })
 
+    @app.route('/api/atlasforge/graph-tiles/<int:z>/<int:x>/<int:y>')
+    def api_atlasforge_graph_tile(z, x, y):
+        """
+        Get one tile of the laid-out exploration graph.
+
+        Zoom 0 is one tile covering the canvas; zoom z splits it into
+        2^z x 2^z tiles. Dense tiles are returned as clusters (super-nodes
+        with aggregated edges), sparse ones and the deepest zoom in full
+        detail. Edges carry both endpoint positions (x1/y1, x2/y2).
+
+        Path parameters:
+        - z, x, y: Tile zoom level, column and row
+
+        Query parameters: width, height and the filters of
+        /api/atlasforge/exploration-graph-enhanced
+
+        The ETag only depends on the tile's content: tiles the client
+        already has are answered with 304.
+        """
+        try:
+            width = request.args.get('width', 800, type=float)
+            height = request.args.get('height', 600, type=float)
+
+            graph = _load_exploration_graph()
+            if graph is None:
+                return jsonify({"error": "No exploration data available"}), 404
+
+            data = get_filtered_visualization_data(graph, width=width, height=height, **_parse_graph_filters())
+            try:
+                tile = TileIndex(data['nodes'], data['edges'], width, height).tile(z, x, y)
+            except ValueError as e:
+                return jsonify({"error": str(e)}), 400
+
+            return _conditional_json(tile, etag=tile['etag'])
+
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            return jsonify({"error": str(e)}), 500
+
     @app.route('/api/atlasforge/file-preview')
     def api_atlasforge_file_preview():
         """
@@ -1942,5 +2017,6 @@ if __name__ == "__main__":
     print("  /api/atlasforge/exploration-graph-enhanced")
     print("  /api/atlasforge/exploration-journey")
     print("  /api/atlasforge/export/<format>")
+    print("  /api/atlasforge/graph-tiles/<z>/<x>/<y>")
     print("  /api/atlasforge/edge-types")
     print("  /api/atlasforge/graph-stats")
@@ -1,200 +1,511 @@
 """
 Atomic File I/O Utilities
 
-Provides safe, atomic file operations using fcntl locking to prevent race conditions
-in the file-based message bus.
+Provides safe, atomic JSON file operations for the file-based message bus.
+
+Writes go to a temp file in the same directory that is then renamed over
+the target, so readers never see a partially written file and need no
+lock. Writers and updaters of a file serialize on an flock of its sidecar
+lock file (.<name>.lock next to it), waiting up to LOCK_TIMEOUT_SECONDS, so
+writes to different files in one directory never contend.
+
+A process-wide JSONStateStore also:
+- caches parsed files, validated by inode/mtime/size, so reading an
+  unchanged file skips both the read and the JSON parse
+- optionally coalesces repeated writes/updates to the same path within
+  COALESCE_WINDOW_SECONDS into a single write (coalesce=True)
+
+Environment:
+    AF_STATE_FSYNC=1                 fsync each write before the rename
+    AF_STATE_COALESCE_WINDOW=<secs>  coalescing window (default 0.1)
+    AF_STATE_LOCK_TIMEOUT=<secs>     max wait for a file's writer lock (default 10)
 """
 
+import atexit
 import json
 import fcntl
+import marshal
 import os
+import stat
+import tempfile
+import threading
 import time
 import logging
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Callable, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 logger = logging.getLogger("io_utils")
 
+# fsync each write (rename alone already keeps files consistent after a crash
+# of the process; fsync additionally protects against power loss)
+FSYNC_WRITES = os.environ.get("AF_STATE_FSYNC", "0").strip().lower() in ("1", "true", "yes")
+
+# Writes with coalesce=True are delayed at most this long
+COALESCE_WINDOW_SECONDS = float(os.environ.get("AF_STATE_COALESCE_WINDOW", "0.1"))
+
+# Writers wait at most this long for a file's lock
+LOCK_TIMEOUT_SECONDS = float(os.environ.get("AF_STATE_LOCK_TIMEOUT", "10"))
+
+# Parsed files kept in the read cache
+READ_CACHE_SIZE = 128
+
+# Mode for newly created files (umask applied, like open(path, 'w'))
+_umask = os.umask(0)
+os.umask(_umask)
+NEW_FILE_MODE = 0o666 & ~_umask
+
+
+def _serialize(data: Any) -> bytes:
+    """Compact JSON encoding used for all writes."""
+    return json.dumps(data, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def _default(default: Any) -> Any:
+    return default if default is not None else {}
+
+
+class _CachedFile:
+    """Parsed content of a file as of a (inode, mtime, size) signature."""
+
+    __slots__ = ("signature", "raw", "snapshot")
+
+    def __init__(self, signature: Tuple[int, int, int], raw: bytes):
+        self.signature = signature
+        self.raw = raw
+        self.snapshot: Optional[bytes] = None  # marshal dump of the parsed data
+
+    def load(self) -> Any:
+        """Return a fresh copy of the data (parses on first use)."""
+        if self.snapshot is None:
+            data = json.loads(self.raw)
+            self.snapshot = marshal.dumps(data)
+            self.raw = b''
+            return data
+        return marshal.loads(self.snapshot)
+
+
+class _Pending:
+    """Coalesced operations on one path, not yet written."""
+
+    __slots__ = ("deadline", "base", "updates")
+
+    def __init__(self, deadline: float):
+        self.deadline = deadline
+        self.base: Optional[bytes] = None  # Last full write, if any
+        self.updates: List[Tuple[Callable[[Any], Any], Any]] = []  # Applied after base
+
+
+class JSONStateStore:
+    """
+    Process-wide JSON file store with a validated read cache and
+    write coalescing.
+
+    Cached data is kept as a marshal snapshot so every read returns an
+    independent copy that callers may mutate.
+    """
+
+    def __init__(self, coalesce_window: float = COALESCE_WINDOW_SECONDS,
+                 fsync: bool = FSYNC_WRITES, cache_size: int = READ_CACHE_SIZE,
+                 lock_timeout: float = LOCK_TIMEOUT_SECONDS):
+        self.coalesce_window = coalesce_window
+        self.fsync = fsync
+        self.cache_size = cache_size
+        self.lock_timeout = lock_timeout
+
+        self._lock = threading.RLock()
+        self._cache: "OrderedDict[str, _CachedFile]" = OrderedDict()
+        self._pending: Dict[str, _Pending] = {}
+        self._flushing: Set[str] = set()  # Paths being written by _flush_key()
+        self._cond = threading.Condition(self._lock)
+        self._flusher: Optional[threading.Thread] = None
+
+        self._stats = {
+            "reads": 0,
+            "cache_hits": 0,
+            "writes": 0,
+            "coalesced": 0,
+        }
+
+    # === LOCKING ===
+
+    def _lock_file(self, key: str) -> Optional[int]:
+        """Take the writer lock of a file (its sidecar .<name>.lock); returns the fd or None on timeout."""
+        directory, name = os.path.split(key)
+        lock_path = os.path.join(directory, f".{name}.lock")
+        try:
+            fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, NEW_FILE_MODE)
+        except OSError as e:
+            logger.error(f"Cannot open lock file {lock_path}: {e}")
+            return None
+        # flock has no timeout: poll with a growing (capped) delay
+        deadline = time.monotonic() + self.lock_timeout
+        delay = 0.001
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return fd
+            except BlockingIOError:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    os.close(fd)
+                    return None
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, 0.05)
+
+    @staticmethod
+    def _unlock(fd: int) -> None:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    # === DISK I/O ===
+
+    def _load(self, key: str) -> Tuple[bool, Any]:
+        """Read a file through the cache; returns (exists and non-empty, data)."""
+        try:
+            st = os.stat(key)
+        except FileNotFoundError:
+            with self._lock:
+                self._cache.pop(key, None)
+            return False, None
+        signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            self._stats["reads"] += 1
+            entry = self._cache.get(key)
+            if entry is not None and entry.signature == signature:
+                self._stats["cache_hits"] += 1
+                self._cache.move_to_end(key)
+                return True, entry.load()
+
+        with open(key, 'rb') as f:
+            raw = f.read()
+            # Signature of what was actually read (the file may have been replaced)
+            st = os.fstat(f.fileno())
+        if not raw.strip():
+            return False, None
+
+        entry = _CachedFile((st.st_ino, st.st_mtime_ns, st.st_size), raw)
+        data = entry.load()  # Raises ValueError on invalid JSON (not cached)
+        self._remember(key, entry)
+        return True, data
+
+    def _remember(self, key: str, entry: _CachedFile) -> None:
+        with self._lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _replace(self, key: str, payload: bytes) -> None:
+        """Write payload to a temp file and rename it over key (file lock held)."""
+        directory, name = os.path.split(key)
+        try:
+            mode = stat.S_IMODE(os.stat(key).st_mode)
+        except FileNotFoundError:
+            mode = NEW_FILE_MODE
+
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+                os.fchmod(f.fileno(), mode)
+            os.replace(tmp_path, key)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        st = os.stat(key)
+        self._remember(key, _CachedFile((st.st_ino, st.st_mtime_ns, st.st_size), payload))
+        with self._lock:
+            self._stats["writes"] += 1
+
+    def _apply_pending(self, key: str, pending: _Pending) -> bool:
+        """Write one path's coalesced operations."""
+        fd = self._lock_file(key)
+        if fd is None:
+            logger.error(f"Could not acquire write lock on {key}")
+            return False
+        try:
+            if pending.base is not None:
+                payload = pending.base
+                if pending.updates:
+                    data = json.loads(payload)
+                    for update_fn, _ in pending.updates:
+                        data = update_fn(data)
+                    payload = _serialize(data)
+            else:
+                try:
+                    exists, data = self._load(key)
+                except ValueError:
+                    exists, data = False, None
+                if not exists:
+                    data = _default(pending.updates[0][1])
+                for update_fn, _ in pending.updates:
+                    data = update_fn(data)
+                payload = _serialize(data)
+            self._replace(key, payload)
+            return True
+        except Exception as e:
+            logger.error(f"Error writing {key}: {e}")
+            return False
+        finally:
+            self._unlock(fd)
+
+    # === COALESCING ===
+
+    def _defer(self, key: str) -> _Pending:
+        """Get the pending entry of a path and make sure the flusher runs (assumes _lock held)."""
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = _Pending(time.monotonic() + self.coalesce_window)
+            self._pending[key] = pending
+        else:
+            self._stats["coalesced"] += 1
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True, name="JSONStateFlusher")
+            self._flusher.start()
+            atexit.register(self.flush)
+        self._cond.notify_all()
+        return pending
+
+    def _flush_loop(self) -> None:
+        """Write pending paths once their coalescing window has passed."""
+        while True:
+            with self._cond:
+                now = time.monotonic()
+                due = [key for key, p in self._pending.items() if p.deadline <= now]
+                if not due:
+                    timeout = None
+                    if self._pending:
+                        timeout = min(p.deadline for p in self._pending.values()) - now
+                    self._cond.wait(timeout)
+                    continue
+            for key in due:
+                self._flush_key(key)
+
+    def _take_pending(self, key: str) -> Optional[_Pending]:
+        """
+        Remove a path's pending operations, waiting for an in-progress flush
+        of it to finish first (assumes _lock held).
+        """
+        while key in self._flushing:
+            self._cond.wait()
+        return self._pending.pop(key, None)
+
+    def _flush_key(self, key: str) -> bool:
+        """Write a path's pending operations now."""
+        with self._cond:
+            pending = self._take_pending(key)
+            if pending is None:
+                return True
+            self._flushing.add(key)
+        try:
+            return self._apply_pending(key, pending)
+        finally:
+            with self._cond:
+                self._flushing.discard(key)
+                self._cond.notify_all()
+
+    def flush(self, path: Optional[Union[str, Path]] = None) -> bool:
+        """
+        Write pending coalesced operations now.
+
+        Args:
+            path: Only this path (default: all paths)
+
+        Returns:
+            True if everything was written
+        """
+        if path is not None:
+            return self._flush_key(os.path.abspath(path))
+        with self._lock:
+            keys = list(self._pending)
+        return all([self._flush_key(key) for key in keys])
+
+    # === PUBLIC API ===
+
+    def read(self, path: Union[str, Path], default: Any = None, max_retries: int = 5) -> Any:
+        """See atomic_read_json()."""
+        key = os.path.abspath(path)
+        self._flush_key(key)  # Read-your-writes for coalesced operations
+        for attempt in range(max_retries):
+            try:
+                exists, data = self._load(key)
+                return data if exists else _default(default)
+            except ValueError:
+                logger.warning(f"Invalid JSON in {path}")
+                return _default(default)
+            except Exception as e:
+                logger.error(f"Error reading {path}: {e}")
+                if attempt < max_retries - 1:
+                    time.sleep(0.1)
+        return _default(default)
+
+    def write(self, path: Union[str, Path], data: Any, max_retries: int = 5,
+              coalesce: bool = False) -> bool:
+        """See atomic_write_json()."""
+        key = os.path.abspath(path)
+        try:
+            payload = _serialize(data)
+        except Exception as e:
+            logger.error(f"Error serializing {path}: {e}")
+            return False
+
+        with self._cond:
+            if coalesce:
+                pending = self._defer(key)
+                pending.base = payload
+                pending.updates = []
+                return True
+            self._take_pending(key)  # Superseded by this write
+
+        fd = self._lock_file(key)
+        if fd is None:
+            logger.error(f"Could not acquire write lock on {path}")
+            return False
+        try:
+            self._replace(key, payload)
+            return True
+        except Exception as e:
+            logger.error(f"Error writing {path}: {e}")
+            return False
+        finally:
+            self._unlock(fd)
+
+    def update(self, path: Union[str, Path], update_fn: Callable[[Any], Any],
+               default: Any = None, max_retries: int = 5, coalesce: bool = False) -> Any:
+        """See atomic_update_json()."""
+        key = os.path.abspath(path)
+        if coalesce:
+            with self._cond:
+                self._defer(key).updates.append((update_fn, default))
+            return None
+        self._flush_key(key)
+
+        fd = self._lock_file(key)
+        if fd is None:
+            logger.error(f"Could not acquire lock for update on {path}")
+            return None
+        try:
+            try:
+                exists, current_data = self._load(key)
+            except ValueError:
+                exists, current_data = False, None
+            if not exists:
+                current_data = _default(default)
+
+            new_data = update_fn(current_data)
+            self._replace(key, _serialize(new_data))
+            return new_data
+        except Exception as e:
+            logger.error(f"Error updating {path}: {e}")
+            return None
+        finally:
+            self._unlock(fd)
+
+    def invalidate(self, path: Optional[Union[str, Path]] = None) -> None:
+        """Drop cached content (of one path, or all)."""
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(os.path.abspath(path), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache and write statistics."""
+        with self._lock:
+            return {
+                **self._stats,
+                "cached_files": len(self._cache),
+                "pending_paths": len(self._pending),
+            }
+
+
+_store = JSONStateStore()
+
+
+def get_state_store() -> JSONStateStore:
+    """Get the process-wide JSON state store."""
+    return _store
+
+
 def atomic_read_json(path: Union[str, Path], default: Any = None, max_retries: int = 5) -> Any:
     """
-    Atomically read a JSON file using a shared lock.
-    
+    Atomically read a JSON file.
+
+    Unchanged files (same inode, mtime and size as the last read or write
+    in this process) are served from the cache without being parsed.
+
     Args:
         path: Path to the JSON file
         default: Value to return if file doesn't exist or is invalid
-        max_retries: Number of times to retry if lock fails
-        
+        max_retries: Number of times to retry if the read fails
+
     Returns:
         Parsed JSON content or default value
     """
-    file_path = Path(path)
-    if not file_path.exists():
-        return default if default is not None else {}
+    return _store.read(path, default, max_retries)
 
-    for attempt in range(max_retries):
-        try:
-            with open(file_path, 'r') as f:
-                try:
-                    # Acquire shared lock (non-blocking)
-                    # Use flock instead of lockf for better compatibility with some systems
-                    # but lockf is standard POSIX. Let's use flock logic via fcntl module.
-                    fcntl.flock(f, fcntl.LOCK_SH)
-                    try:
-                        content = f.read()
-                        if not content.strip():
-                            return default if default is not None else {}
-                        return json.loads(content)
-                    finally:
-                        fcntl.flock(f, fcntl.LOCK_UN)
-                except IOError as e:
-                    # If locked by another process
-                    if attempt < max_retries - 1:
-                        time.sleep(0.1 * (attempt + 1))
-                        continue
-                    logger.warning(f"Could not acquire read lock on {file_path}: {e}")
-                    # Fallback: try reading without lock if desperate? No, return default
-                    return default if default is not None else {}
-                except json.JSONDecodeError:
-                    logger.warning(f"Invalid JSON in {file_path}")
-                    return default if default is not None else {}
-        except Exception as e:
-            logger.error(f"Error reading {file_path}: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(0.1)
-                continue
-            return default if default is not None else {}
-            
-    return default if default is not None else {}
 
-def atomic_write_json(path: Union[str, Path], data: Any, max_retries: int = 5) -> bool:
+def atomic_write_json(path: Union[str, Path], data: Any, max_retries: int = 5,
+                      coalesce: bool = False) -> bool:
     """
-    Atomically write a JSON file using an exclusive lock.
-    
+    Atomically write a JSON file (write to temp file, then rename).
+
     Args:
         path: Path to the JSON file
         data: Data to serialize and write
-        max_retries: Number of times to retry if lock fails
-        
+        max_retries: Unused, kept for compatibility (writers wait up to
+            LOCK_TIMEOUT_SECONDS for the file's lock)
+        coalesce: Delay the write by up to COALESCE_WINDOW_SECONDS so that
+            later writes/updates to the same path are merged into one. Reads
+            in this process flush first; other processes see the previous
+            content until then.
+
     Returns:
-        True if successful, False otherwise
+        True if successful (or queued, with coalesce), False otherwise
     """
-    file_path = Path(path)
-    
-    # Create temp file first to ensure we don't corrupt main file if write fails
-    # However, for flock we need the actual file descriptor. 
-    # Strategy: Open main file with 'a+' (append/read) to get handle, lock it, 
-    # then truncate and write.
-    
-    for attempt in range(max_retries):
-        try:
-            # Open for update (read+write) to preserve file if lock fails
-            # Using 'w' truncates immediately, which is bad if we can't get lock.
-            # So we use 'a+' or 'r+' if exists, 'w' if not.
-            
-            mode = 'r+' if file_path.exists() else 'w+'
-            
-            with open(file_path, mode) as f:
-                try:
-                    # Acquire exclusive lock (blocking with timeout simulation)
-                    # We use non-blocking and retry loop to avoid deadlocks
-                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
-                    
-                    # Lock acquired!
-                    try:
-                        f.seek(0)
-                        f.truncate()
-                        json.dump(data, f, indent=2, default=str)
-                        f.flush()
-                        os.fsync(f.fileno()) # Ensure write to disk
-                        return True
-                    finally:
-                        fcntl.flock(f, fcntl.LOCK_UN)
-                        
-                except BlockingIOError:
-                    # Locked by someone else
-                    if attempt < max_retries - 1:
-                        time.sleep(0.1 * (attempt + 1))
-                        continue
-                    else:
-                        logger.error(f"Could not acquire write lock on {file_path}")
-                        return False
-                        
-        except Exception as e:
-            logger.error(f"Error writing {file_path}: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(0.1)
-                continue
-            return False
-            
-    return False
+    return _store.write(path, data, max_retries, coalesce)
+
 
-def atomic_update_json(path: Union[str, Path], update_fn: Callable[[Any], Any], default: Any = None, max_retries: int = 5) -> Any:
+def atomic_update_json(path: Union[str, Path], update_fn: Callable[[Any], Any], default: Any = None,
+                       max_retries: int = 5, coalesce: bool = False) -> Any:
     """
     Atomically update a JSON file: read -> transform -> write.
     Ensures no other process modifies the file between read and write.
-    
+
     Args:
         path: Path to the JSON file
         update_fn: Function that takes current data and returns new data
         default: Default value if file doesn't exist
-        
+        max_retries: Unused, kept for compatibility (see atomic_write_json)
+        coalesce: Defer the update (see atomic_write_json); update_fn is
+            then applied when the path is flushed, to the content current
+            at that time
+
     Returns:
-        The new data returned by update_fn
+        The new data returned by update_fn (None if coalesced or on failure)
     """
-    file_path = Path(path)
-    
-    for attempt in range(max_retries):
-        try:
-            # Open for update
-            mode = 'r+' if file_path.exists() else 'w+'
-            
-            with open(file_path, mode) as f:
-                try:
-                    # Acquire exclusive lock
-                    fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
-                    
-                    # Read current data
-                    f.seek(0)
-                    content = f.read()
-                    if not content.strip():
-                        current_data = default if default is not None else {}
-                    else:
-                        try:
-                            current_data = json.loads(content)
-                        except json.JSONDecodeError:
-                            current_data = default if default is not None else {}
-                    
-                    # Apply update function
-                    new_data = update_fn(current_data)
-                    
-                    # Write new data
-                    f.seek(0)
-                    f.truncate()
-                    json.dump(new_data, f, indent=2, default=str)
-                    f.flush()
-                    os.fsync(f.fileno())
-                    
-                    return new_data
-                    
-                except BlockingIOError:
-                    if attempt < max_retries - 1:
-                        time.sleep(0.1 * (attempt + 1))
-                        continue
-                    else:
-                        logger.error(f"Could not acquire lock for update on {file_path}")
-                        return None
-                finally:
-                    # Always try to unlock, even if inner logic failed (but file was opened)
-                    try:
-                        fcntl.flock(f, fcntl.LOCK_UN)
-                    except:
-                        pass
-                        
-        except Exception as e:
-            logger.error(f"Error updating {file_path}: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(0.1)
-                continue
-            return None
-            
-    return None
+    return _store.update(path, update_fn, default, max_retries, coalesce)
+
+
+def flush_json(path: Optional[Union[str, Path]] = None) -> bool:
+    """
+    Write coalesced writes/updates now.
+
+    Args:
+        path: Only this path (default: all paths)
+
+    Returns:
+        True if everything was written
+    """
+    return _store.flush(path)
@@ -26,16 +26,27 @@ Usage:
     transfer_rate = analytics.get_transfer_rate()
 """
 
+import hashlib
 import json
+import os
 import sqlite3
 import logging
 import functools
+import threading
 import time
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
 from collections import Counter, defaultdict
 
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+from sparse_similarity import row_neighbors, similarity_graph
+from sqlite_pool import get_pool, in_placeholders
+from streaming_tfidf import StreamingTfidf
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -132,25 +143,35 @@ def get_cache_stats() -> Dict[str, Any]:
 
 class FastChainComputer:
     """
-    Optimized learning chain computation using pre-computed similarity matrix.
+    Learning chain computation over a sparse top-k similarity graph.
 
-    Algorithm: Union-Find (Disjoint Set Union)
-    -----------------------------------------
-    This class uses the Union-Find algorithm for fast connected component
-    detection. Instead of O(n^2) similarity lookups per chain computation,
-    we pre-compute the full similarity matrix once (O(n^2) space) and then
-    use Union-Find operations which are O(n * alpha(n)) where alpha is the
-    inverse Ackermann function (effectively constant).
+    Algorithm: Connected components over a k-NN graph
+    -------------------------------------------------
+    Learnings are vectorized with a streaming TF-IDF model and joined into a
+    sparse neighbour graph (sparse_similarity.similarity_graph): rows are
+    scored in blocks sized from a memory budget, pairs below
+    GRAPH_MIN_SIMILARITY are dropped and each learning keeps its
+    GRAPH_TOP_K strongest neighbours. Chains are the connected components
+    of the cross-mission edges at or above the requested threshold.
 
     Performance Trade-offs:
-    - Memory: O(n^2) for similarity matrix (~21MB for 2313 learnings)
-    - Time: ~0.5s for chain computation vs ~5s previously
-    - Speedup: 10-20x faster than per-learning similarity lookups
+    - Memory: O(n * k) for the graph instead of O(n^2) for a dense matrix
+    - Time: chain computation is linear in the number of edges; coherence
+      (average pairwise similarity) comes from the TF-IDF rows in O(nnz)
+    - Accuracy: a learning with more than GRAPH_TOP_K strong neighbours
+      may lose its weakest links; chain coherence is exact
 
     Caching Strategy:
-    - Similarity matrix is computed once and cached until invalidated
+    - The TF-IDF model and the graph are persisted next to the database and
+      reloaded by the next process
+    - New learnings are tokenized and scored against the existing rows only;
+      the graph is rebuilt once the rows added since the last build reach
+      REBUILD_THRESHOLD of the corpus (IDF weights drift as it grows)
+    - A hash of each learning's title and description is kept with the
+      model; learnings whose text changed are removed and tokenized again
     - Chains are cached for 10 minutes (CHAIN_CACHE_TTL_SECONDS)
-    - Call invalidate() when learnings are added/modified/deleted
+    - invalidate() drops the chain cache; the next call picks up
+      learnings added/modified/deleted in the database
 
     Implementation Notes:
     - Uses TF-IDF vectorization with (1,2)-gram features for text similarity
@@ -169,77 +190,238 @@ class FastChainComputer:
         chain_computer.invalidate()
     """
 
+    # Neighbour graph (see sparse_similarity)
+    GRAPH_MIN_SIMILARITY = 0.3  # Lower chain thresholds rebuild the graph at that threshold
+    GRAPH_TOP_K = 50  # Neighbours kept per learning
+    GRAPH_MEMORY_MB = 256  # Memory budget for one block of scores
+
+    # Rebuild the graph once this share of rows was added since the last build
+    REBUILD_THRESHOLD = 0.2
+
     _instance = None
-    _similarity_matrix = None
-    _learning_ids = None
-    _learning_missions = None
-    _chains_cache = None
-    _chains_cache_time = 0
 
     def __new__(cls, db_path: Path = None):
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance.db_path = db_path or KB_DB_PATH
+            instance = super().__new__(cls)
+            instance.db_path = Path(db_path or KB_DB_PATH)
+            instance._init_state()
+            cls._instance = instance
         return cls._instance
 
-    def _ensure_matrix(self) -> bool:
-        """Build or reuse the similarity matrix."""
-        if self._similarity_matrix is not None:
-            return True
-
+    def _init_state(self):
+        self._lock = threading.RLock()
+        self._vectorizer = StreamingTfidf(
+            min_df=1,
+            max_df=0.95,
+            ngram_range=(1, 2),
+            stop_words='english',
+            max_features=3000  # Reduced for speed
+        )
+        self._tfidf_path = self.db_path.with_name(f"{self.db_path.stem}_chains_tfidf.npz")
+        self._graph_path = self.db_path.with_name(f"{self.db_path.stem}_chains_graph.npz")
+        self._learning_ids: List[str] = []
+        self._text_hashes: Dict[str, str] = {}  # id -> hash of the vectorized text
+        self._learning_missions: Dict[str, str] = {}
+        self._learning_info: Dict[str, Tuple[str, str, str]] = {}  # id -> (timestamp, domain, title)
+        self._graph = None
+        self._graph_floor = self.GRAPH_MIN_SIMILARITY
+        self._graph_built_rows = 0  # Rows at the last full build
+        self._loaded = False
+        self._chains_cache: Dict[Tuple[int, float], Tuple[float, List[Dict[str, Any]]]] = {}
+
+    # -------------------------------------------------------------------------
+    # Graph maintenance
+    # -------------------------------------------------------------------------
+
+    def _ensure_graph(self, min_similarity: float) -> bool:
+        """Bring the model and graph in line with the database."""
         try:
-            from sklearn.feature_extraction.text import TfidfVectorizer
-            from sklearn.metrics.pairwise import cosine_similarity
-            import numpy as np
-
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT learning_id, mission_id, title, description, timestamp
-                FROM learnings
-                ORDER BY timestamp ASC
-            """)
-            rows = cursor.fetchall()
-            conn.close()
-
-            if len(rows) < 3:
-                return False
+            with get_pool(self.db_path).connection() as conn:
+                # Texts are hashed while streaming, not kept
+                rows, hashes = [], {}
+                for lid, mission_id, timestamp, domain, title, description in conn.execute("""
+                    SELECT learning_id, mission_id, timestamp, problem_domain, title, description
+                    FROM learnings
+                """):
+                    rows.append((lid, mission_id, timestamp, domain, title))
+                    hashes[lid] = self._text_hash(self._learning_text(title, description))
+
+                if len(rows) < 3:
+                    return False
+
+                if not self._loaded:
+                    self._load_state()
+                    self._loaded = True
+
+                self._learning_missions = {r[0]: r[1] for r in rows}
+                self._learning_info = {r[0]: (r[2] or '', r[3], r[4]) for r in rows}
+
+                # Deleted learnings, and edited ones (tokenized again below)
+                stale = [i for i, lid in enumerate(self._learning_ids)
+                         if hashes.get(lid) != self._text_hashes.get(lid)]
+                if stale:
+                    self._remove_rows(stale)
+
+                known = set(self._learning_ids)
+                missing = [r[0] for r in rows if r[0] not in known]
+                if missing:
+                    self._add_rows(missing, self._fetch_texts(conn, missing))
+                    self._text_hashes.update((lid, hashes[lid]) for lid in missing)
+
+            if (self._graph is None or min_similarity < self._graph_floor or
+                    self._graph.shape[0] != len(self._learning_ids)):
+                self._build_graph(min(min_similarity, self.GRAPH_MIN_SIMILARITY))
+            elif stale or missing:
+                self._save_state()
+            return True
 
-            # Store learning metadata
-            self._learning_ids = [r[0] for r in rows]
-            self._learning_missions = {r[0]: r[1] for r in rows}
+        except Exception as e:
+            logger.error(f"Failed to build similarity graph: {e}")
+            return False
 
-            # Build texts for TF-IDF
-            texts = [f"{r[2] or ''} {r[3] or ''}" for r in rows]
+    @staticmethod
+    def _learning_text(title: Optional[str], description: Optional[str]) -> str:
+        """Text a learning is vectorized from."""
+        return f"{title or ''} {description or ''}"
+
+    @staticmethod
+    def _text_hash(text: str) -> str:
+        return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+    @classmethod
+    def _fetch_texts(cls, conn: sqlite3.Connection, learning_ids: List[str]) -> List[str]:
+        """Texts for TF-IDF, in the order of learning_ids."""
+        texts = {}
+        for i in range(0, len(learning_ids), 500):
+            placeholders, params = in_placeholders(learning_ids[i:i + 500])
+            for lid, title, description in conn.execute(
+                f"SELECT learning_id, title, description FROM learnings WHERE learning_id IN ({placeholders})",
+                params
+            ):
+                texts[lid] = cls._learning_text(title, description)
+        return [texts.get(lid, '') for lid in learning_ids]
+
+    def _add_rows(self, learning_ids: List[str], texts: List[str]):
+        """Tokenize new learnings and link them into the graph."""
+        start = len(self._learning_ids)
+        self._vectorizer.add_documents(texts)
+        self._learning_ids.extend(learning_ids)
 
-            # Vectorize
-            vectorizer = TfidfVectorizer(
-                min_df=1,
-                max_df=0.95,
-                ngram_range=(1, 2),
-                stop_words='english',
-                max_features=3000  # Reduced for speed
-            )
-            tfidf_matrix = vectorizer.fit_transform(texts)
+        n = len(self._learning_ids)
+        if self._graph is None or n - self._graph_built_rows > self.REBUILD_THRESHOLD * n:
+            self._graph = None  # Rebuilt by _ensure_graph
+            return
+
+        graph = self._graph.tocoo()
+        graph = csr_matrix((graph.data, (graph.row, graph.col)), shape=(n, n))
+        added = row_neighbors(
+            self._vectorizer.matrix,
+            np.arange(start, n),
+            min_similarity=self._graph_floor,
+            top_k=self.GRAPH_TOP_K,
+            memory_mb=self.GRAPH_MEMORY_MB
+        )
+        self._graph = graph.maximum(added).maximum(added.T).tocsr()
+        logger.info(f"FastChainComputer: Linked {n - start} new learnings into the similarity graph")
+
+    def _remove_rows(self, rows: List[int]):
+        """Drop deleted learnings from the model and the graph."""
+        self._vectorizer.remove_documents(rows)
+        drop = set(rows)
+        keep = np.array([i not in drop for i in range(len(self._learning_ids))])
+        for i in drop:
+            self._text_hashes.pop(self._learning_ids[i], None)
+        self._learning_ids = [lid for i, lid in enumerate(self._learning_ids) if i not in drop]
+        if self._graph is not None and self._graph.shape[0] == len(keep):
+            self._graph = self._graph[keep][:, keep].tocsr()
+            self._graph_built_rows = min(self._graph_built_rows, len(self._learning_ids))
+        else:
+            self._graph = None
+
+    def _build_graph(self, min_similarity: float):
+        """Rebuild the whole graph from the current TF-IDF matrix."""
+        self._graph = similarity_graph(
+            self._vectorizer.matrix,
+            min_similarity=min_similarity,
+            top_k=self.GRAPH_TOP_K,
+            memory_mb=self.GRAPH_MEMORY_MB
+        )
+        self._graph_floor = min_similarity
+        self._graph_built_rows = len(self._learning_ids)
+        self._save_state()
+        logger.info(f"FastChainComputer: Built similarity graph for {len(self._learning_ids)} learnings "
+                   f"({self._graph.nnz // 2} pairs >= {min_similarity:.2f})")
+
+    def _load_state(self):
+        """Restore the persisted model and graph, if they match each other."""
+        metadata = self._vectorizer.load(self._tfidf_path)
+        learning_ids = (metadata or {}).get('learning_ids', [])
+        text_hashes = (metadata or {}).get('text_hashes', [])
+        if (metadata is None or len(learning_ids) != self._vectorizer.n_docs
+                or len(text_hashes) != len(learning_ids)):
+            # Missing, inconsistent, or saved before text hashes existed
+            self._vectorizer.clear()
+            return
+        self._learning_ids = list(learning_ids)
+        self._text_hashes = dict(zip(learning_ids, text_hashes))
 
-            # Pre-compute full similarity matrix (this is the key optimization!)
-            # For 2313 learnings, this is ~21MB but computed once
-            self._similarity_matrix = cosine_similarity(tfidf_matrix)
+        try:
+            with np.load(self._graph_path) as state:
+                meta = json.loads(state['meta'].tobytes().decode('utf-8'))
+                graph = csr_matrix((state['data'], state['indices'], state['indptr']),
+                                   shape=(len(learning_ids), len(learning_ids)))
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Failed to load chain graph from {self._graph_path}: {e}")
+            return
 
-            logger.info(f"FastChainComputer: Built {len(rows)}x{len(rows)} similarity matrix")
-            return True
+        if meta.get('learning_ids') == learning_ids:
+            self._graph = graph
+            self._graph_floor = meta.get('min_similarity', self.GRAPH_MIN_SIMILARITY)
+            self._graph_built_rows = meta.get('built_rows', len(learning_ids))
 
+    def _save_state(self):
+        """Persist the model and graph next to the database."""
+        try:
+            self._vectorizer.save(self._tfidf_path, {
+                'learning_ids': self._learning_ids,
+                'text_hashes': [self._text_hashes.get(lid, '') for lid in self._learning_ids],
+            })
+            if self._graph is None:
+                return
+            meta = {
+                'learning_ids': self._learning_ids,
+                'min_similarity': self._graph_floor,
+                'built_rows': self._graph_built_rows,
+            }
+            temp_file = self._graph_path.with_name(f"{self._graph_path.name}.{os.getpid()}.tmp")
+            with open(temp_file, 'wb') as f:
+                np.savez(
+                    f,
+                    meta=np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8),
+                    data=self._graph.data,
+                    indices=self._graph.indices,
+                    indptr=self._graph.indptr,
+                )
+            temp_file.replace(self._graph_path)
         except Exception as e:
-            logger.error(f"Failed to build similarity matrix: {e}")
-            return False
+            logger.warning(f"Failed to persist chain graph: {e}")
 
     def invalidate(self):
-        """Invalidate cached data (call when learnings change)."""
-        self._similarity_matrix = None
-        self._learning_ids = None
-        self._learning_missions = None
-        self._chains_cache = None
-        self._chains_cache_time = 0
+        """
+        Drop cached chains (call when learnings are added/modified/deleted).
+
+        The next call re-reads the learnings: added ones are linked in,
+        deleted ones dropped, and ones whose title or description changed
+        are tokenized again.
+        """
+        with self._lock:
+            self._chains_cache = {}
+
+    # -------------------------------------------------------------------------
+    # Chains
+    # -------------------------------------------------------------------------
 
     def get_learning_chains_fast(
         self,
@@ -247,9 +429,7 @@ class FastChainComputer:
         similarity_threshold: float = 0.5
     ) -> List[Dict[str, Any]]:
         """
-        Get learning chains using pre-computed similarity matrix.
-
-        This is 10-20x faster than the original implementation.
+        Get learning chains from the sparse similarity graph.
 
         Args:
             min_chain_length: Minimum learnings in a chain
@@ -258,134 +438,108 @@ class FastChainComputer:
         Returns:
             List of chain dicts with theme, coherence, learnings, missions
         """
-        import numpy as np
-
-        # Check cache first
-        now = time.time()
-        cache_key = f"chains_{min_chain_length}_{similarity_threshold}"
-        if (self._chains_cache is not None and
-            now - self._chains_cache_time < CHAIN_CACHE_TTL_SECONDS):
-            return self._chains_cache
-
-        if not self._ensure_matrix():
-            return []
-
-        n = len(self._learning_ids)
-        if n < min_chain_length:
-            return []
+        with self._lock:
+            # Check cache first
+            now = time.time()
+            cache_key = (min_chain_length, similarity_threshold)
+            cached = self._chains_cache.get(cache_key)
+            if cached is not None and now - cached[0] < CHAIN_CACHE_TTL_SECONDS:
+                return cached[1]
 
-        # Use Union-Find for fast connected components
-        parent = list(range(n))
-
-        def find(x):
-            if parent[x] != x:
-                parent[x] = find(parent[x])
-            return parent[x]
-
-        def union(x, y):
-            px, py = find(x), find(y)
-            if px != py:
-                parent[px] = py
-
-        # Build chains by connecting similar learnings from different missions
-        for i in range(n):
-            for j in range(i + 1, n):
-                if self._similarity_matrix[i, j] >= similarity_threshold:
-                    # Only connect if from different missions (cross-mission chains)
-                    if self._learning_missions[self._learning_ids[i]] != \
-                       self._learning_missions[self._learning_ids[j]]:
-                        union(i, j)
-
-        # Group by connected component
-        components = defaultdict(list)
-        for i in range(n):
-            components[find(i)].append(i)
-
-        # Filter chains by size and cross-mission requirement
-        chains = []
-        for component_id, indices in components.items():
-            if len(indices) < min_chain_length:
-                continue
-
-            # Get missions in this chain
-            chain_missions = set(
-                self._learning_missions[self._learning_ids[i]]
-                for i in indices
-            )
+            if not self._ensure_graph(similarity_threshold):
+                return []
 
-            # Only keep chains spanning 2+ missions
-            if len(chain_missions) < 2:
-                continue
+            n = len(self._learning_ids)
+            if n < min_chain_length:
+                return []
 
-            # Compute coherence (average pairwise similarity)
-            if len(indices) > 1:
-                sub_matrix = self._similarity_matrix[np.ix_(indices, indices)]
-                # Get upper triangle (exclude diagonal)
-                upper = np.triu_indices(len(indices), k=1)
-                coherence = float(np.mean(sub_matrix[upper]))
-            else:
-                coherence = 1.0
+            # Cross-mission edges at or above the threshold
+            graph = self._graph.tocoo()
+            mission_codes = {}
+            missions = np.array([
+                mission_codes.setdefault(self._learning_missions[lid], len(mission_codes))
+                for lid in self._learning_ids
+            ])
+            keep = ((graph.row < graph.col) & (graph.data >= similarity_threshold) &
+                    (missions[graph.row] != missions[graph.col]))
+            edges = csr_matrix((np.ones(int(keep.sum())), (graph.row[keep], graph.col[keep])), shape=(n, n))
+            _, labels = connected_components(edges, directed=False)
+
+            # Group by connected component
+            components = defaultdict(list)
+            for i, label in enumerate(labels.tolist()):
+                components[label].append(i)
+
+            matrix = self._vectorizer.matrix
+            chains = []
+            for indices in components.values():
+                if len(indices) < min_chain_length:
+                    continue
 
-            # Generate theme from top terms
-            theme = self._generate_theme(indices)
+                # Get missions in this chain
+                chain_missions = set(
+                    self._learning_missions[self._learning_ids[i]]
+                    for i in indices
+                )
 
-            chains.append({
-                'chain_id': len(chains),
-                'theme': theme,
-                'coherence': round(coherence, 3),
-                'length': len(indices),
-                'learning_ids': [self._learning_ids[i] for i in indices],
-                'missions': list(chain_missions)
-            })
+                # Only keep chains spanning 2+ missions
+                if len(chain_missions) < 2:
+                    continue
 
-        # Sort by length (longest first)
-        chains.sort(key=lambda x: x['length'], reverse=True)
+                # Chronological order
+                indices.sort(key=lambda i: self._learning_info[self._learning_ids[i]][0])
 
-        # Cache results
-        self._chains_cache = chains
-        self._chains_cache_time = now
+                chains.append({
+                    'chain_id': len(chains),
+                    'theme': self._generate_theme(indices),
+                    'coherence': round(self._coherence(matrix, indices), 3),
+                    'length': len(indices),
+                    'learning_ids': [self._learning_ids[i] for i in indices],
+                    'missions': list(chain_missions)
+                })
 
-        return chains
+            # Sort by length (longest first)
+            chains.sort(key=lambda x: x['length'], reverse=True)
 
-    def _generate_theme(self, indices: List[int]) -> str:
-        """Generate a theme name from learning indices using similarity."""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            # Cache results
+            self._chains_cache[cache_key] = (now, chains)
 
-            # Get titles for learnings in this chain
-            placeholders = ','.join(['?' for _ in indices])
-            learning_ids = [self._learning_ids[i] for i in indices]
+            return chains
 
-            cursor.execute(f"""
-                SELECT title, problem_domain FROM learnings
-                WHERE learning_id IN ({placeholders})
-            """, learning_ids)
+    @staticmethod
+    def _coherence(matrix: csr_matrix, indices: List[int]) -> float:
+        """
+        Average pairwise cosine similarity of the given rows.
 
-            rows = cursor.fetchall()
-            conn.close()
+        Rows are L2-normalized (or empty), so the sum over pairs follows
+        from the norm of their sum.
+        """
+        m = len(indices)
+        if m < 2:
+            return 1.0
+        rows = matrix[indices]
+        total = np.asarray(rows.sum(axis=0)).ravel()
+        self_sum = float(rows.multiply(rows).sum())
+        return float((total @ total - self_sum) / (m * (m - 1)))
 
-            # Count domain occurrences
-            domain_counts = Counter()
-            for title, domain in rows:
-                if domain:
-                    domain_counts[domain] += 1
+    def _generate_theme(self, indices: List[int]) -> str:
+        """Generate a theme name from learning indices."""
+        info = [self._learning_info[self._learning_ids[i]] for i in indices]
 
-            # Use most common domain as theme
-            if domain_counts:
-                theme = domain_counts.most_common(1)[0][0]
-                return theme.replace('_', ' ').title()
+        # Count domain occurrences
+        domain_counts = Counter(domain for _, domain, _ in info if domain)
 
-            # Fallback: use first title prefix
-            if rows and rows[0][0]:
-                title = rows[0][0]
-                return title[:30] + "..." if len(title) > 30 else title
+        # Use most common domain as theme
+        if domain_counts:
+            theme = domain_counts.most_common(1)[0][0]
+            return theme.replace('_', ' ').title()
 
-            return f"Chain {len(indices)}"
+        # Fallback: use first title prefix
+        title = info[0][2] if info else None
+        if title:
+            return title[:30] + "..." if len(title) > 30 else title
 
-        except Exception as e:
-            logger.error(f"Failed to generate theme: {e}")
-            return f"Chain {len(indices)}"
+        return f"Chain {len(indices)}"
 
 
 def get_fast_chain_computer() -> FastChainComputer:
@@ -398,6 +552,127 @@ KNOWLEDGE_DIR = KNOWLEDGE_BASE_DIR
 KB_DB_PATH = KNOWLEDGE_DIR / "mission_knowledge.db"
 
 
+# =============================================================================
+# ROLLUPS - Aggregates maintained by triggers on the learnings table
+# =============================================================================
+#
+# learning_rollup: learnings counted per day x mission x source type x
+#   learning type, with the earliest timestamp of each group. The day is the
+#   timestamp's first 10 characters, so day comparisons agree with the string
+#   comparisons the raw queries use.
+# learning_facet_rollup: all-time counts per problem domain, relevance
+#   keyword and lesson source.
+#
+# Writers must not use INSERT OR REPLACE: the delete it implies does not fire
+# DELETE triggers, so the replaced row would stay counted (use an UPSERT).
+
+_LEARNING_KEY = ("COALESCE(substr({row}.timestamp, 1, 10), ''), {row}.mission_id, "
+                 "COALESCE({row}.source_type, ''), COALESCE({row}.learning_type, '')")
+
+# Keywords of a row as json_each() input ('[]' unless a JSON array)
+_KEYWORDS = ("CASE WHEN json_valid({row}.relevance_keywords) THEN CASE "
+             "WHEN json_type({row}.relevance_keywords) = 'array' THEN {row}.relevance_keywords "
+             "ELSE '[]' END ELSE '[]' END")
+
+
+def _rollup_add(row: str) -> str:
+    key = _LEARNING_KEY.format(row=row)
+    keywords = _KEYWORDS.format(row=row)
+    return f"""
+        INSERT INTO learning_rollup VALUES ({key}, 1, {row}.timestamp)
+        ON CONFLICT (day, mission_id, source_type, learning_type) DO UPDATE SET
+            learning_count = learning_count + 1,
+            first_timestamp = MIN(first_timestamp, excluded.first_timestamp);
+        INSERT INTO learning_facet_rollup
+        SELECT 'domain', {row}.problem_domain, 1
+        WHERE {row}.problem_domain IS NOT NULL AND {row}.problem_domain != ''
+        ON CONFLICT (facet, value) DO UPDATE SET learning_count = learning_count + 1;
+        INSERT INTO learning_facet_rollup
+        SELECT 'lesson_source', COALESCE({row}.lesson_source, ''), 1 WHERE 1
+        ON CONFLICT (facet, value) DO UPDATE SET learning_count = learning_count + 1;
+        INSERT INTO learning_facet_rollup
+        SELECT 'keyword', value, COUNT(*) FROM json_each({keywords})
+        WHERE type = 'text' AND length(value) > 3
+        GROUP BY value
+        ON CONFLICT (facet, value) DO UPDATE SET
+            learning_count = learning_count + excluded.learning_count;
+    """
+
+
+def _rollup_subtract(row: str) -> str:
+    key = _LEARNING_KEY.format(row=row)
+    keywords = _KEYWORDS.format(row=row)
+    return f"""
+        UPDATE learning_rollup SET learning_count = learning_count - 1
+        WHERE (day, mission_id, source_type, learning_type) = ({key});
+        UPDATE learning_rollup SET first_timestamp = (
+            SELECT MIN(l.timestamp) FROM learnings l
+            WHERE l.mission_id = {row}.mission_id
+              AND ({_LEARNING_KEY.format(row='l')}) = ({key})
+              AND l.learning_id != {row}.learning_id
+        )
+        WHERE (day, mission_id, source_type, learning_type) = ({key})
+          AND first_timestamp = {row}.timestamp;
+        UPDATE learning_facet_rollup SET learning_count = learning_count - 1
+        WHERE (facet = 'domain' AND value = {row}.problem_domain)
+           OR (facet = 'lesson_source' AND value = COALESCE({row}.lesson_source, ''));
+        UPDATE learning_facet_rollup SET learning_count = learning_count - (
+            SELECT COUNT(*) FROM json_each({keywords}) k
+            WHERE k.type = 'text' AND k.value = learning_facet_rollup.value
+        )
+        WHERE facet = 'keyword' AND value IN (SELECT value FROM json_each({keywords}));
+        DELETE FROM learning_rollup
+        WHERE (day, mission_id, source_type, learning_type) = ({key}) AND learning_count <= 0;
+        DELETE FROM learning_facet_rollup
+        WHERE learning_count <= 0 AND (
+            (facet = 'domain' AND value = {row}.problem_domain)
+            OR (facet = 'lesson_source' AND value = COALESCE({row}.lesson_source, ''))
+            OR (facet = 'keyword' AND value IN (SELECT value FROM json_each({keywords})))
+        );
+    """
+
+
+LEARNING_ROLLUP_SCHEMA = [
+    """
+    CREATE TABLE learning_rollup (
+        day TEXT NOT NULL,
+        mission_id TEXT NOT NULL,
+        source_type TEXT NOT NULL,  -- '' when NULL
+        learning_type TEXT NOT NULL,  -- '' when NULL
+        learning_count INTEGER NOT NULL,
+        first_timestamp TEXT,
+        PRIMARY KEY (day, mission_id, source_type, learning_type)
+    )
+    """,
+    """
+    CREATE TABLE learning_facet_rollup (
+        facet TEXT NOT NULL,  -- domain, keyword, lesson_source
+        value TEXT NOT NULL,
+        learning_count INTEGER NOT NULL,
+        PRIMARY KEY (facet, value)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_learnings_timestamp ON learnings(timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_learnings_mission ON learnings(mission_id, timestamp)",
+    f"""
+    CREATE TRIGGER learnings_rollup_insert AFTER INSERT ON learnings BEGIN
+        {_rollup_add('NEW')}
+    END
+    """,
+    f"""
+    CREATE TRIGGER learnings_rollup_delete AFTER DELETE ON learnings BEGIN
+        {_rollup_subtract('OLD')}
+    END
+    """,
+    f"""
+    CREATE TRIGGER learnings_rollup_update AFTER UPDATE ON learnings BEGIN
+        {_rollup_subtract('OLD')}
+        {_rollup_add('NEW')}
+    END
+    """,
+]
+
+
 class KBAnalytics:
     """
     Cross-mission analytics for the Knowledge Base.
@@ -417,6 +692,7 @@ class KBAnalytics:
             db_path: Path to knowledge base SQLite DB (default: KB_DB_PATH)
         """
         self.db_path = db_path or KB_DB_PATH
+        self._rollups_ready = False
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get a database connection with PRAGMA optimizations."""
@@ -426,8 +702,73 @@ class KBAnalytics:
         conn.execute("PRAGMA cache_size=-64000")  # 64MB cache
         conn.execute("PRAGMA temp_store=MEMORY")
         conn.execute("PRAGMA synchronous=NORMAL")
+        if not self._rollups_ready:
+            try:
+                self._ensure_rollups(conn)
+            except Exception:
+                conn.close()
+                raise
         return conn
 
+    def _ensure_rollups(self, conn: sqlite3.Connection):
+        """
+        Create the rollup tables and triggers (see LEARNING_ROLLUP_SCHEMA),
+        backfilled from the learnings table in the same transaction.
+        """
+        exists = conn.execute("""
+            SELECT 1 FROM sqlite_master
+            WHERE type = 'trigger' AND name = 'learnings_rollup_insert'
+        """).fetchone()
+        if not exists:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DROP TABLE IF EXISTS learning_rollup")
+                conn.execute("DROP TABLE IF EXISTS learning_facet_rollup")
+                for statement in LEARNING_ROLLUP_SCHEMA:
+                    conn.execute(statement)
+                conn.execute(f"""
+                    INSERT INTO learning_rollup
+                    SELECT {_LEARNING_KEY.format(row='l')}, COUNT(*), MIN(l.timestamp)
+                    FROM learnings l
+                    GROUP BY 1, 2, 3, 4
+                """)
+                conn.execute("""
+                    INSERT INTO learning_facet_rollup
+                    SELECT 'domain', problem_domain, COUNT(*) FROM learnings
+                    WHERE problem_domain IS NOT NULL AND problem_domain != ''
+                    GROUP BY problem_domain
+                """)
+                conn.execute("""
+                    INSERT INTO learning_facet_rollup
+                    SELECT 'lesson_source', COALESCE(lesson_source, ''), COUNT(*) FROM learnings
+                    GROUP BY 2
+                """)
+                conn.execute(f"""
+                    INSERT INTO learning_facet_rollup
+                    SELECT 'keyword', k.value, COUNT(*)
+                    FROM learnings l, json_each({_KEYWORDS.format(row='l')}) k
+                    WHERE k.type = 'text' AND length(k.value) > 3
+                    GROUP BY k.value
+                """)
+                conn.commit()
+                logger.info("KB analytics rollups created")
+            except Exception:
+                conn.rollback()
+                raise
+        self._rollups_ready = True
+
+    def rebuild_rollups(self):
+        """Drop and recompute the rollup tables from the learnings table."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            for name in ("insert", "delete", "update"):
+                conn.execute(f"DROP TRIGGER IF EXISTS learnings_rollup_{name}")
+            conn.commit()
+            self._ensure_rollups(conn)
+        finally:
+            conn.close()
+        clear_kb_cache()
+
     # =========================================================================
     # LEARNING ACCUMULATION OVER TIME
     # =========================================================================
@@ -452,11 +793,11 @@ class KBAnalytics:
             # Get learnings grouped by mission, ordered by timestamp
             cursor.execute("""
                 SELECT
-                    l.mission_id,
-                    MIN(l.timestamp) as first_learning,
-                    COUNT(*) as learning_count
-                FROM learnings l
-                GROUP BY l.mission_id
+                    mission_id,
+                    MIN(first_timestamp) as first_learning,
+                    SUM(learning_count) as learning_count
+                FROM learning_rollup
+                GROUP BY mission_id
                 ORDER BY first_learning ASC
             """)
 
@@ -528,8 +869,8 @@ class KBAnalytics:
             cursor = conn.cursor()
 
             cursor.execute("""
-                SELECT learning_type, COUNT(*) as count
-                FROM learnings
+                SELECT learning_type, SUM(learning_count) as count
+                FROM learning_rollup
                 GROUP BY learning_type
                 ORDER BY count DESC
             """)
@@ -607,18 +948,18 @@ class KBAnalytics:
 
             # Get domain distribution
             cursor.execute("""
-                SELECT problem_domain, COUNT(*) as count
-                FROM learnings
-                WHERE problem_domain IS NOT NULL AND problem_domain != ''
-                GROUP BY problem_domain
-                ORDER BY count DESC
+                SELECT value, learning_count
+                FROM learning_facet_rollup
+                WHERE facet = 'domain'
+                ORDER BY learning_count DESC
             """)
             domain_rows = cursor.fetchall()
 
-            # Get all relevance keywords
+            # Get relevance keyword counts (keywords longer than 3 characters)
             cursor.execute("""
-                SELECT relevance_keywords FROM learnings
-                WHERE relevance_keywords IS NOT NULL
+                SELECT value, learning_count
+                FROM learning_facet_rollup
+                WHERE facet = 'keyword'
             """)
             keyword_rows = cursor.fetchall()
             conn.close()
@@ -633,14 +974,8 @@ class KBAnalytics:
 
             # Count keyword themes
             keyword_counter = Counter()
-            for (kw_json,) in keyword_rows:
-                try:
-                    keywords = json.loads(kw_json) if kw_json else []
-                    for kw in keywords:
-                        if kw and len(kw) > 3:  # Skip very short keywords
-                            keyword_counter[kw.lower()] += 1
-                except (json.JSONDecodeError, TypeError):
-                    continue
+            for kw, count in keyword_rows:
+                keyword_counter[kw.lower()] += count
 
             # Combine for top themes (weighted: domains x3, keywords x1)
             combined = Counter()
@@ -970,10 +1305,10 @@ class KBAnalytics:
             cursor = conn.cursor()
 
             cursor.execute("""
-                SELECT lesson_source, COUNT(*) as count
-                FROM learnings
-                GROUP BY lesson_source
-                ORDER BY count DESC
+                SELECT value, learning_count
+                FROM learning_facet_rollup
+                WHERE facet = 'lesson_source'
+                ORDER BY learning_count DESC
             """)
 
             rows = cursor.fetchall()
@@ -1379,32 +1714,54 @@ class KBAnalytics:
             conn = self._get_connection()
             cursor = conn.cursor()
 
-            # Build query with optional filters
+            # Days strictly between the bounds come from the rollup; the
+            # learnings of the boundary days are filtered by full timestamp
             where_clause = ""
             params = []
+            boundary_days = []
 
             if start_date:
-                where_clause += " AND l.timestamp >= ?"
-                params.append(start_date)
+                where_clause += " AND day > ?"
+                params.append(start_date[:10])
+                boundary_days.append(start_date[:10])
             if end_date:
-                where_clause += " AND l.timestamp <= ?"
-                params.append(end_date)
+                where_clause += " AND day < ?"
+                params.append(end_date[:10])
+                boundary_days.append(end_date[:10])
             if source_type:
-                where_clause += " AND l.source_type = ?"
+                where_clause += " AND source_type = ?"
                 params.append(source_type)
 
             cursor.execute(f"""
-                SELECT
-                    l.mission_id,
-                    MIN(l.timestamp) as first_learning,
-                    COUNT(*) as learning_count
-                FROM learnings l
+                SELECT mission_id, MIN(first_timestamp), SUM(learning_count)
+                FROM learning_rollup
                 WHERE 1=1 {where_clause}
-                GROUP BY l.mission_id
-                ORDER BY first_learning ASC
+                GROUP BY mission_id
             """, params)
-
-            rows = cursor.fetchall()
+            per_mission = {mission_id: [first, count] for mission_id, first, count in cursor.fetchall()}
+
+            for day in sorted(set(boundary_days)):
+                # Every timestamp of the day sorts between these two strings
+                query = "SELECT mission_id, timestamp FROM learnings WHERE timestamp >= ? AND timestamp < ?"
+                params = [day, day + "\U0010ffff"]
+                if start_date:
+                    query += " AND timestamp >= ?"
+                    params.append(start_date)
+                if end_date:
+                    query += " AND timestamp <= ?"
+                    params.append(end_date)
+                if source_type:
+                    query += " AND source_type = ?"
+                    params.append(source_type)
+                for mission_id, timestamp in cursor.execute(query, params):
+                    entry = per_mission.setdefault(mission_id, [timestamp, 0])
+                    entry[0] = min(entry[0], timestamp)
+                    entry[1] += 1
+
+            rows = sorted(
+                ((mission_id, first, count) for mission_id, (first, count) in per_mission.items()),
+                key=lambda r: r[1]
+            )
             conn.close()
 
             if not rows:
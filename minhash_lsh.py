@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+MinHash LSH - Near-duplicate candidates for word-set Jaccard similarity
+
+Finding every pair of texts whose word sets have a Jaccard similarity
+above a threshold is quadratic when every pair is compared. MinHash
+signatures summarize a word set in NUM_PERM integers such that two
+signatures agree on a position with probability equal to the Jaccard
+similarity of the sets. LSH banding then groups signatures into buckets so
+that only texts sharing a bucket are compared:
+
+- minhash_signature(): signature of one word set (vectorized with numpy)
+- jaccard(): exact similarity, to verify candidates
+- lsh_params(): bands x rows per band for a similarity threshold, chosen so
+  that pairs at the threshold become candidates with >= 99% probability
+- MinHashLSH: in-memory bucket index answering candidate queries without
+  scanning every entry
+
+Candidates are approximate (rare misses near the threshold, plus false
+positives): callers verify them with the exact Jaccard similarity.
+
+Usage:
+    lsh = MinHashLSH(threshold=0.5)
+    for key, words in items:
+        lsh.insert(key, minhash_signature(words))
+    candidates = lsh.query(minhash_signature(query_words))
+"""
+
+import hashlib
+from collections import defaultdict
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+NUM_PERM = 128  # Signature length
+MERSENNE_PRIME = (1 << 31) - 1  # Hash values are < 2^32, so a * h + b fits in 64 bits
+MIN_RECALL = 0.99  # Candidate probability required for pairs at the threshold
+
+# Fixed permutations, so signatures stored by one process are valid in another
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, MERSENNE_PRIME, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, MERSENNE_PRIME, size=NUM_PERM, dtype=np.uint64)
+
+
+def word_set(text: str) -> Set[str]:
+    """Lowercased whitespace-separated words of a text."""
+    return set(text.lower().split())
+
+
+def jaccard(words_a: Set[str], words_b: Set[str]) -> float:
+    """Jaccard similarity of two word sets (0 if either is empty)."""
+    if not words_a or not words_b:
+        return 0.0
+    return len(words_a & words_b) / len(words_a | words_b)
+
+
+def _hash_words(words: Iterable[str]) -> np.ndarray:
+    # Stable across processes, unlike hash()
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(w.encode('utf-8'), digest_size=4).digest(), 'little') for w in words),
+        dtype=np.uint64
+    )
+
+
+def minhash_signature(words: Iterable[str]) -> Optional[np.ndarray]:
+    """
+    MinHash signature of a word set.
+
+    Args:
+        words: Words of the text (duplicates are ignored)
+
+    Returns:
+        uint32 array of NUM_PERM values, or None for an empty set
+    """
+    hashes = _hash_words(set(words))
+    if not len(hashes):
+        return None
+    permuted = (np.outer(hashes, _PERM_A) + _PERM_B) % MERSENNE_PRIME
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def signature_from_bytes(data: bytes) -> np.ndarray:
+    """Signature stored with signature.tobytes()."""
+    return np.frombuffer(data, dtype=np.uint32)
+
+
+def lsh_params(threshold: float, num_perm: int = NUM_PERM) -> Tuple[int, int]:
+    """
+    Bands and rows per band for a Jaccard threshold.
+
+    A pair with similarity s shares at least one band with probability
+    1 - (1 - s^rows)^bands. The most rows per band (fewest false
+    positives) that still reach MIN_RECALL at the threshold are used.
+
+    Args:
+        threshold: Jaccard similarity to detect
+        num_perm: Signature length
+
+    Returns:
+        (bands, rows)
+    """
+    for rows in range(num_perm, 0, -1):
+        bands = num_perm // rows
+        if 1 - (1 - threshold ** rows) ** bands >= MIN_RECALL:
+            return bands, rows
+    return num_perm, 1
+
+
+class MinHashLSH:
+    """Bucket index of MinHash signatures for one similarity threshold."""
+
+    def __init__(self, threshold: float, num_perm: int = NUM_PERM):
+        """
+        Initialize the index.
+
+        Args:
+            threshold: Jaccard similarity that candidates should reach
+            num_perm: Signature length
+        """
+        self.threshold = threshold
+        self.bands, self.rows = lsh_params(threshold, num_perm)
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [defaultdict(list) for _ in range(self.bands)]
+        self._keys: Dict[Hashable, List[bytes]] = {}
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        bands = signature[:self.bands * self.rows].reshape(self.bands, self.rows)
+        return [band.tobytes() for band in bands]
+
+    def insert(self, key: Hashable, signature: Optional[np.ndarray]) -> None:
+        """Add (or replace) an entry; entries without a signature are ignored."""
+        self.remove(key)
+        if signature is None:
+            return
+        band_keys = self._band_keys(signature)
+        for buckets, band_key in zip(self._buckets, band_keys):
+            buckets[band_key].append(key)
+        self._keys[key] = band_keys
+
+    def remove(self, key: Hashable) -> None:
+        """Remove an entry if present."""
+        band_keys = self._keys.pop(key, None)
+        if band_keys is None:
+            return
+        for buckets, band_key in zip(self._buckets, band_keys):
+            bucket = buckets[band_key]
+            bucket.remove(key)
+            if not bucket:
+                del buckets[band_key]
+
+    def query(self, signature: Optional[np.ndarray]) -> Set[Hashable]:
+        """Keys sharing at least one band with the signature."""
+        if signature is None:
+            return set()
+        candidates: Set[Hashable] = set()
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket = buckets.get(band_key)
+            if bucket:
+                candidates.update(bucket)
+        return candidates
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
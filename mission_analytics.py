@@ -40,6 +40,8 @@ from datetime import datetime
 from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass, field, asdict
 
+from context_watcher.transcript_tailer import CLAUDE_USAGE_PATTERNS, read_jsonl_records
+
 logger = logging.getLogger(__name__)
 
 # Paths - use centralized configuration
@@ -53,6 +55,9 @@ CLAUDE_PROJECTS_DIR = Path.home() / ".claude" / "projects"
 # Ensure directories exist
 ANALYTICS_DIR.mkdir(parents=True, exist_ok=True)
 
+# Transcript bytes parsed per read during ingestion (doubled for longer lines)
+INGEST_CHUNK_BYTES = 8 << 20
+
 # Model pricing (per 1M tokens) as of Dec 2025
 # Source: https://www.anthropic.com/pricing
 MODEL_PRICING = {
@@ -89,6 +94,94 @@ MODEL_PRICING = {
     }
 }
 
+# Daily token rollup: token_events summed per day x stage x model x mission,
+# kept up to date by triggers so dashboard aggregates never scan token_events.
+# The mission column keeps distinct mission counts exact.
+_ROLLUP_KEY = ("COALESCE(DATE({row}.timestamp), ''), {row}.stage, "
+               "COALESCE({row}.model, ''), {row}.mission_id")
+
+_ROLLUP_ADD = f"""
+    INSERT INTO token_rollup VALUES (
+        {_ROLLUP_KEY.format(row='NEW')},
+        NEW.input_tokens, NEW.output_tokens, NEW.cache_read_tokens, NEW.cache_write_tokens, 1
+    )
+    ON CONFLICT (day, stage, model, mission_id) DO UPDATE SET
+        input_tokens = input_tokens + excluded.input_tokens,
+        output_tokens = output_tokens + excluded.output_tokens,
+        cache_read_tokens = cache_read_tokens + excluded.cache_read_tokens,
+        cache_write_tokens = cache_write_tokens + excluded.cache_write_tokens,
+        event_count = event_count + 1;
+"""
+
+_ROLLUP_SUBTRACT = f"""
+    UPDATE token_rollup SET
+        input_tokens = input_tokens - OLD.input_tokens,
+        output_tokens = output_tokens - OLD.output_tokens,
+        cache_read_tokens = cache_read_tokens - OLD.cache_read_tokens,
+        cache_write_tokens = cache_write_tokens - OLD.cache_write_tokens,
+        event_count = event_count - 1
+    WHERE (day, stage, model, mission_id) = ({_ROLLUP_KEY.format(row='OLD')});
+    DELETE FROM token_rollup
+    WHERE (day, stage, model, mission_id) = ({_ROLLUP_KEY.format(row='OLD')})
+      AND event_count <= 0;
+"""
+
+TOKEN_ROLLUP_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS token_rollup (
+        day TEXT NOT NULL,
+        stage TEXT NOT NULL,
+        model TEXT NOT NULL,  -- '' for events without a model
+        mission_id TEXT NOT NULL,
+        input_tokens INTEGER DEFAULT 0,
+        output_tokens INTEGER DEFAULT 0,
+        cache_read_tokens INTEGER DEFAULT 0,
+        cache_write_tokens INTEGER DEFAULT 0,
+        event_count INTEGER DEFAULT 0,
+        PRIMARY KEY (day, stage, model, mission_id)
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS token_events_rollup_insert
+    AFTER INSERT ON token_events BEGIN {_ROLLUP_ADD} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS token_events_rollup_delete
+    AFTER DELETE ON token_events BEGIN {_ROLLUP_SUBTRACT} END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS token_events_rollup_update
+    AFTER UPDATE ON token_events BEGIN {_ROLLUP_SUBTRACT} {_ROLLUP_ADD} END
+    """,
+]
+
+
+def _rollup_day_filter(days: int, start_date: Optional[str] = None,
+                       end_date: Optional[str] = None) -> Tuple[str, List[Any]]:
+    """
+    WHERE clause over token_rollup.day.
+
+    Args:
+        days: Number of days to include (0 for all time)
+        start_date: Optional first day (YYYY-MM-DD, inclusive)
+        end_date: Optional last day (YYYY-MM-DD, inclusive)
+
+    Returns:
+        (clause, params); the clause is empty when nothing is filtered
+    """
+    conditions = []
+    params: List[Any] = []
+    if days > 0:
+        conditions.append("day >= date(?, '-' || ? || ' days')")
+        params += [datetime.now().isoformat()[:10], days]
+    if start_date:
+        conditions.append("day >= ?")
+        params.append(start_date[:10])
+    if end_date:
+        conditions.append("day <= ?")
+        params.append(end_date[:10])
+    return ("WHERE " + " AND ".join(conditions) if conditions else ""), params
+
 
 @dataclass
 class StageMetrics:
@@ -231,6 +324,23 @@ class MissionAnalytics:
                 )
             """)
 
+            # Ingestion progress per transcript: byte offset to resume from and
+            # the usage totals of everything before it
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS transcript_offsets (
+                    mission_id TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    file_id TEXT,
+                    byte_offset INTEGER DEFAULT 0,
+                    records INTEGER DEFAULT 0,
+                    input_tokens INTEGER DEFAULT 0,
+                    output_tokens INTEGER DEFAULT 0,
+                    cache_read_tokens INTEGER DEFAULT 0,
+                    cache_write_tokens INTEGER DEFAULT 0,
+                    PRIMARY KEY (mission_id, path)
+                )
+            """)
+
             # Create indexes for common queries
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_stage_mission ON stage_metrics(mission_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_stage_stage ON stage_metrics(stage)")
@@ -242,6 +352,9 @@ class MissionAnalytics:
             # This handles watcher restarts where in-memory deduplication resets
             self._add_deduplication_index(cursor)
 
+            # Daily token rollup maintained by triggers (see TOKEN_ROLLUP_SCHEMA)
+            self._ensure_token_rollup(cursor)
+
             conn.commit()
         finally:
             conn.close()
@@ -288,6 +401,33 @@ class MissionAnalytics:
         """)
         logger.info("Created unique index idx_events_unique_request on token_events")
 
+    def _ensure_token_rollup(self, cursor):
+        """
+        Create the token_rollup table and its triggers, backfilled from
+        token_events in the same transaction so no event is counted twice.
+        """
+        cursor.execute("""
+            SELECT name FROM sqlite_master
+            WHERE type='trigger' AND name='token_events_rollup_insert'
+        """)
+        if cursor.fetchone():
+            return  # Already exists
+
+        if not cursor.connection.in_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("DROP TABLE IF EXISTS token_rollup")
+        for statement in TOKEN_ROLLUP_SCHEMA:
+            cursor.execute(statement)
+        cursor.execute(f"""
+            INSERT INTO token_rollup
+            SELECT {_ROLLUP_KEY.format(row='token_events')},
+                   SUM(input_tokens), SUM(output_tokens),
+                   SUM(cache_read_tokens), SUM(cache_write_tokens), COUNT(*)
+            FROM token_events
+            GROUP BY 1, 2, 3, 4
+        """)
+        logger.info(f"Created token_rollup ({cursor.rowcount} rows from token_events)")
+
     # =========================================================================
     # MISSION LIFECYCLE
     # =========================================================================
@@ -560,6 +700,94 @@ class MissionAnalytics:
         finally:
             conn.close()
 
+    def record_token_events(self, mission_id: str, stage: str,
+                            events: List[Tuple[Dict[str, Any], str, Optional[str]]]) -> int:
+        """
+        Record a batch of token usage events in one transaction.
+
+        Same effect as calling record_token_usage() per event, but request IDs
+        are deduplicated in memory against the mission's recorded IDs and the
+        new events are written with a single executemany.
+
+        Args:
+            mission_id: Mission identifier
+            stage: Current stage
+            events: (usage, model, request_id) tuples
+
+        Returns:
+            Number of events recorded (duplicates excluded)
+        """
+        if not events:
+            return 0
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            recorded = self._insert_token_events(conn.cursor(), mission_id, stage, events)
+            conn.commit()
+            return recorded
+        finally:
+            conn.close()
+
+    def _insert_token_events(self, cursor, mission_id: str, stage: str,
+                             events: List[Tuple[Dict[str, Any], str, Optional[str]]]) -> int:
+        """Insert events not recorded yet and add them to the stage totals (caller commits)."""
+        cursor.execute("""
+            SELECT request_id FROM token_events
+            WHERE mission_id = ? AND request_id IS NOT NULL AND request_id != ''
+        """, (mission_id,))
+        seen = {row[0] for row in cursor}
+
+        timestamp = datetime.now().isoformat()
+        rows = []
+        tokens = [0, 0, 0, 0]
+        cost = 0.0
+        last_model = "unknown"
+        for usage, model, request_id in events:
+            if request_id:
+                if request_id in seen:
+                    continue
+                seen.add(request_id)
+            counts = (
+                usage.get("input_tokens", 0),
+                usage.get("output_tokens", 0),
+                usage.get("cache_read_input_tokens", 0),
+                usage.get("cache_creation_input_tokens", 0)
+            )
+            rows.append((mission_id, stage, timestamp, model, *counts, request_id))
+            last_model = model
+            tokens = [total + count for total, count in zip(tokens, counts)]
+            cost += self.estimate_cost(*counts, model)
+
+        if not rows:
+            logger.debug(f"Skipped {len(events)} duplicate token events for {mission_id}")
+            return 0
+
+        cursor.executemany("""
+            INSERT OR IGNORE INTO token_events
+            (mission_id, stage, timestamp, model, input_tokens, output_tokens,
+             cache_read_tokens, cache_write_tokens, request_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+
+        # Stage totals get the sum of the batch; the model is the last event's,
+        # as if the events had been recorded one by one
+        cursor.execute("""
+            UPDATE stage_metrics SET
+                input_tokens = input_tokens + ?,
+                output_tokens = output_tokens + ?,
+                cache_read_tokens = cache_read_tokens + ?,
+                cache_write_tokens = cache_write_tokens + ?,
+                total_tokens = total_tokens + ?,
+                estimated_cost_usd = estimated_cost_usd + ?,
+                model = ?
+            WHERE id = (
+                SELECT id FROM stage_metrics
+                WHERE mission_id = ? AND stage = ?
+                ORDER BY id DESC LIMIT 1
+            )
+        """, (*tokens, sum(tokens), cost, last_model, mission_id, stage))
+        return len(rows)
+
     def estimate_cost(self, input_tokens: int, output_tokens: int,
                      cache_read: int = 0, cache_write: int = 0,
                      model: str = "default") -> float:
@@ -594,17 +822,23 @@ class MissionAnalytics:
     # =========================================================================
 
     def ingest_transcript(self, transcript_path: Path, mission_id: str,
-                          stage: str = "unknown") -> Dict[str, Any]:
+                          stage: str = "unknown", incremental: bool = True) -> Dict[str, Any]:
         """
         Parse a transcript file and record all token usage.
 
+        The file is streamed in chunks and its new events are recorded in one
+        transaction (see record_token_events()). The byte offset reached is
+        stored with the usage totals so far, so the next call only parses
+        what was appended since; a replaced or truncated file is re-read.
+
         Args:
             transcript_path: Path to .jsonl transcript file
             mission_id: Mission to attribute usage to
             stage: Stage name
+            incremental: Resume from the stored offset (False re-reads the file)
 
         Returns:
-            Dict with total usage stats
+            Dict with total usage stats of the whole file
         """
         totals = {
             "input_tokens": 0,
@@ -612,35 +846,53 @@ class MissionAnalytics:
             "cache_read_tokens": 0,
             "cache_write_tokens": 0,
             "records_processed": 0,
+            "records_recorded": 0,
             "cost_usd": 0.0
         }
+        token_keys = ("input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens")
 
         try:
-            with open(transcript_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        record = json.loads(line)
-                        if record.get("type") == "assistant":
-                            msg = record.get("message", {})
-                            usage = msg.get("usage", {})
-                            model = msg.get("model", "unknown")
-                            request_id = record.get("requestId")
-
-                            if usage:
-                                self.record_token_usage(
-                                    mission_id, stage, usage,
-                                    model=model, request_id=request_id
-                                )
-                                totals["input_tokens"] += usage.get("input_tokens", 0)
-                                totals["output_tokens"] += usage.get("output_tokens", 0)
-                                totals["cache_read_tokens"] += usage.get("cache_read_input_tokens", 0)
-                                totals["cache_write_tokens"] += usage.get("cache_creation_input_tokens", 0)
-                                totals["records_processed"] += 1
-                    except json.JSONDecodeError:
-                        continue
+            path = str(Path(transcript_path).resolve())
+            st = os.stat(path)
+            file_id = f"{st.st_dev}:{st.st_ino}"
+
+            conn = sqlite3.connect(self.db_path, timeout=30.0)
+            try:
+                offset = 0
+                row = conn.execute("""
+                    SELECT file_id, byte_offset, records, input_tokens, output_tokens,
+                           cache_read_tokens, cache_write_tokens
+                    FROM transcript_offsets WHERE mission_id = ? AND path = ?
+                """, (mission_id, path)).fetchone()
+                if incremental and row and row[0] == file_id and row[1] <= st.st_size:
+                    offset = row[1]
+                    totals["records_processed"] = row[2]
+                    for key, value in zip(token_keys, row[3:]):
+                        totals[key] = value
+
+                events, resume_at = self._read_usage_events(path, offset, st.st_size)
+                for usage, _, _ in events:
+                    totals["input_tokens"] += usage.get("input_tokens", 0)
+                    totals["output_tokens"] += usage.get("output_tokens", 0)
+                    totals["cache_read_tokens"] += usage.get("cache_read_input_tokens", 0)
+                    totals["cache_write_tokens"] += usage.get("cache_creation_input_tokens", 0)
+                totals["records_processed"] += len(events)
+
+                # Events and the new offset are committed together
+                conn.execute("BEGIN IMMEDIATE")
+                totals["records_recorded"] = self._insert_token_events(
+                    conn.cursor(), mission_id, stage, events
+                )
+                conn.execute("""
+                    INSERT OR REPLACE INTO transcript_offsets
+                    (mission_id, path, file_id, byte_offset, records, input_tokens,
+                     output_tokens, cache_read_tokens, cache_write_tokens)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (mission_id, path, file_id, resume_at, totals["records_processed"],
+                      *(totals[key] for key in token_keys)))
+                conn.commit()
+            finally:
+                conn.close()
 
             totals["cost_usd"] = self.estimate_cost(
                 totals["input_tokens"], totals["output_tokens"],
@@ -652,10 +904,44 @@ class MissionAnalytics:
 
         return totals
 
+    @staticmethod
+    def _read_usage_events(path: str, offset: int,
+                           size: int) -> Tuple[List[Tuple[Dict[str, Any], str, Optional[str]]], int]:
+        """
+        Stream the usage of assistant records from a byte offset.
+
+        Returns:
+            ((usage, model, request_id) tuples, offset to resume from)
+        """
+        events = []
+        chunk = INGEST_CHUNK_BYTES
+        while offset < size:
+            # Only lines mentioning "usage" are decoded
+            records, resume_at = read_jsonl_records(
+                path, offset, patterns=CLAUDE_USAGE_PATTERNS, end=offset + chunk
+            )
+            if resume_at == offset:
+                if offset + chunk >= size:
+                    break  # Partial line at EOF, retried next time
+                chunk *= 2  # Line longer than the chunk
+                continue
+            for record in records:
+                if isinstance(record, dict) and record.get("type") == "assistant":
+                    msg = record.get("message", {})
+                    usage = msg.get("usage", {})
+                    if usage:
+                        events.append((usage, msg.get("model", "unknown"), record.get("requestId")))
+            offset = resume_at
+            chunk = INGEST_CHUNK_BYTES
+        return events, offset
+
     def ingest_mission_transcripts(self, mission_id: str) -> Dict[str, Any]:
         """
         Ingest all transcripts for a mission from the archive.
 
+        Only the part of each transcript appended since the last ingestion is
+        parsed; the totals still cover the whole transcripts.
+
         Args:
             mission_id: Mission identifier
 
@@ -724,7 +1010,8 @@ class MissionAnalytics:
         Ingest transcripts from Claude's live project directory.
 
         This method finds transcripts in ~/.claude/projects/ and ingests them
-        directly, without waiting for mission archival.
+        directly, without waiting for mission archival. As with archived
+        transcripts, only the tail appended since the last call is parsed.
 
         Args:
             mission_id: Mission identifier
@@ -972,7 +1259,7 @@ class MissionAnalytics:
                         COALESCE(SUM(cache_read_tokens), 0),
                         COALESCE(SUM(cache_write_tokens), 0),
                         COUNT(DISTINCT mission_id)
-                    FROM token_events
+                    FROM token_rollup
                 """)
                 event_row = cursor.fetchone()
                 if event_row and (event_row[0] or event_row[1]):
@@ -1267,12 +1554,15 @@ def track_tokens(mission_id: str, stage: str, usage: Dict[str, Any],
     get_analytics().record_token_usage(mission_id, stage, usage, model)
 
 
-def get_daily_aggregates(days: int = 30) -> Dict[str, Any]:
+def get_daily_aggregates(days: int = 30, start_date: Optional[str] = None,
+                         end_date: Optional[str] = None) -> Dict[str, Any]:
     """
     Get daily cost and token aggregates for the specified period.
 
     Args:
         days: Number of days to include (0 for all time)
+        start_date: Optional first day (YYYY-MM-DD, inclusive)
+        end_date: Optional last day (YYYY-MM-DD, inclusive)
 
     Returns:
         Dict with daily data points for trend charts
@@ -1282,26 +1572,20 @@ def get_daily_aggregates(days: int = 30) -> Dict[str, Any]:
     try:
         cursor = conn.cursor()
 
-        # Build date filter
-        date_filter = ""
-        params = []
-        if days > 0:
-            cutoff = datetime.now().isoformat()[:10]
-            date_filter = "WHERE DATE(timestamp) >= date(?, '-' || ? || ' days')"
-            params = [cutoff, days]
+        date_filter, params = _rollup_day_filter(days, start_date, end_date)
 
         # Group by date
         cursor.execute(f"""
             SELECT
-                DATE(timestamp) as day,
+                day,
                 SUM(input_tokens) as input_tokens,
                 SUM(output_tokens) as output_tokens,
                 SUM(cache_read_tokens) as cache_read,
                 SUM(cache_write_tokens) as cache_write,
                 COUNT(DISTINCT mission_id) as mission_count
-            FROM token_events
+            FROM token_rollup
             {date_filter}
-            GROUP BY DATE(timestamp)
+            GROUP BY day
             ORDER BY day DESC
             LIMIT 60
         """, params)
@@ -1354,12 +1638,15 @@ def get_daily_aggregates(days: int = 30) -> Dict[str, Any]:
         conn.close()
 
 
-def get_stage_aggregates(days: int = 30) -> Dict[str, Any]:
+def get_stage_aggregates(days: int = 30, start_date: Optional[str] = None,
+                         end_date: Optional[str] = None) -> Dict[str, Any]:
     """
     Get stage-level aggregates.
 
     Args:
         days: Number of days to include
+        start_date: Optional first day (YYYY-MM-DD, inclusive)
+        end_date: Optional last day (YYYY-MM-DD, inclusive)
 
     Returns:
         Dict with per-stage statistics
@@ -1369,13 +1656,7 @@ def get_stage_aggregates(days: int = 30) -> Dict[str, Any]:
     try:
         cursor = conn.cursor()
 
-        # Build date filter
-        date_filter = ""
-        params = []
-        if days > 0:
-            cutoff = datetime.now().isoformat()[:10]
-            date_filter = "WHERE DATE(timestamp) >= date(?, '-' || ? || ' days')"
-            params = [cutoff, days]
+        date_filter, params = _rollup_day_filter(days, start_date, end_date)
 
         # Group by stage
         cursor.execute(f"""
@@ -1385,9 +1666,9 @@ def get_stage_aggregates(days: int = 30) -> Dict[str, Any]:
                 SUM(output_tokens) as output_tokens,
                 SUM(cache_read_tokens) as cache_read,
                 SUM(cache_write_tokens) as cache_write,
-                COUNT(*) as event_count,
+                SUM(event_count) as event_count,
                 COUNT(DISTINCT mission_id) as mission_count
-            FROM token_events
+            FROM token_rollup
             {date_filter}
             GROUP BY stage
             ORDER BY SUM(input_tokens) + SUM(output_tokens) DESC
@@ -1432,12 +1713,15 @@ def get_stage_aggregates(days: int = 30) -> Dict[str, Any]:
         conn.close()
 
 
-def get_model_aggregates(days: int = 30) -> Dict[str, Any]:
+def get_model_aggregates(days: int = 30, start_date: Optional[str] = None,
+                         end_date: Optional[str] = None) -> Dict[str, Any]:
     """
     Get model-level aggregates.
 
     Args:
         days: Number of days to include
+        start_date: Optional first day (YYYY-MM-DD, inclusive)
+        end_date: Optional last day (YYYY-MM-DD, inclusive)
 
     Returns:
         Dict with per-model statistics
@@ -1447,13 +1731,7 @@ def get_model_aggregates(days: int = 30) -> Dict[str, Any]:
     try:
         cursor = conn.cursor()
 
-        # Build date filter
-        date_filter = ""
-        params = []
-        if days > 0:
-            cutoff = datetime.now().isoformat()[:10]
-            date_filter = "WHERE DATE(timestamp) >= date(?, '-' || ? || ' days')"
-            params = [cutoff, days]
+        date_filter, params = _rollup_day_filter(days, start_date, end_date)
 
         # Group by model
         cursor.execute(f"""
@@ -1463,9 +1741,9 @@ def get_model_aggregates(days: int = 30) -> Dict[str, Any]:
                 SUM(output_tokens) as output_tokens,
                 SUM(cache_read_tokens) as cache_read,
                 SUM(cache_write_tokens) as cache_write,
-                COUNT(*) as event_count,
+                SUM(event_count) as event_count,
                 COUNT(DISTINCT mission_id) as mission_count
-            FROM token_events
+            FROM token_rollup
             {date_filter}
             GROUP BY model
             ORDER BY SUM(input_tokens) + SUM(output_tokens) DESC
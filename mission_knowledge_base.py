@@ -22,14 +22,19 @@ import json
 import sqlite3
 import hashlib
 import logging
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field, asdict
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.cluster import AgglomerativeClustering
+
+from sparse_similarity import average_linkage_clusters, similarity_graph
+from sqlite_pool import get_pool, in_placeholders
+from streaming_tfidf import StreamingTfidf
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +77,15 @@ class MissionLearning:
         return cls(**filtered_data)
 
 
+# Column order of the learnings table (SELECT *), including migrated columns
+LEARNING_COLUMNS = [
+    "learning_id", "mission_id", "learning_type", "title", "description",
+    "problem_domain", "outcome", "relevance_keywords", "code_snippets",
+    "files_created", "timestamp", "lesson_source", "source_type",
+    "source_investigation_id", "investigation_query"
+]
+
+
 @dataclass
 class MissionSummary:
     """Summary of a completed mission for the knowledge base"""
@@ -95,14 +109,24 @@ class SemanticIndex:
     This class provides:
     - TF-IDF vectorization of learning descriptions
     - Cosine similarity-based querying
-    - Duplicate detection via similarity threshold
-    - Agglomerative clustering of learnings
-    - Incremental index updates (adds new learnings without full rebuild)
+    - Duplicate detection via a blocked sparse similarity join
+    - Agglomerative clustering of learnings over the same neighbour graph
+    - Incremental index updates (streaming TF-IDF, persisted next to the DB)
     - Hierarchical clustering with coherence scores
     """
 
-    # Threshold for triggering full rebuild vs incremental update
-    REBUILD_THRESHOLD = 0.2  # Rebuild if more than 20% new learnings
+    # Pending additions are applied eagerly once they reach this share of the index
+    REBUILD_THRESHOLD = 0.2
+
+    # The persisted state is rewritten once unsaved changes reach this share
+    # of the index; fit() re-reads learnings missing from an older state
+    CHECKPOINT_RATIO = 0.2
+
+    # Neighbour graph used for duplicates and clustering (see sparse_similarity)
+    SIMILARITY_TOP_K = 50  # Neighbours kept per learning
+    SIMILARITY_BLOCK_SIZE: Optional[int] = None  # Rows per block (None = from memory budget)
+    SIMILARITY_MEMORY_MB = 256  # Memory budget for one block of scores
+    CLUSTER_FLOOR_RATIO = 0.5  # Graph keeps pairs down to this share of the merge similarity
 
     def __init__(self, db_path: Path):
         """Initialize the semantic index.
@@ -111,15 +135,17 @@ class SemanticIndex:
             db_path: Path to the SQLite database containing learnings
         """
         self.db_path = db_path
-        self.vectorizer = TfidfVectorizer(
+        self._pool = get_pool(db_path)
+        # Same settings the TfidfVectorizer used; rows are always L2-normalized
+        self.vectorizer = StreamingTfidf(
             min_df=1,  # Include terms that appear in at least 1 document (small corpus)
             max_df=0.95,  # Exclude terms in > 95% of documents
             ngram_range=(1, 2),  # Include unigrams and bigrams
             stop_words='english',  # Remove common English words
             sublinear_tf=True,  # Apply sublinear TF scaling
-            norm='l2',  # L2 normalize for cosine similarity via dot product
             max_features=5000  # Limit vocabulary size
         )
+        self._state_path = Path(db_path).with_name(f"{Path(db_path).stem}_tfidf.npz")
         self.tfidf_matrix = None
         self.learning_ids: List[str] = []
         self.learning_descriptions: List[str] = []
@@ -127,15 +153,22 @@ class SemanticIndex:
         self._cluster_cache: Optional[Dict[int, List[str]]] = None
         self._cluster_threshold: Optional[float] = None
         self._pending_additions: List[Tuple[str, str]] = []  # (learning_id, text) pairs
+        self._unsaved_changes = 0  # Rows added or removed since the state was saved
         self._hierarchical_cache: Optional[Dict[str, Any]] = None
         self._coherence_cache: Dict[int, float] = {}
+        self._row_of: Optional[Dict[str, int]] = None  # learning_id -> matrix row
+        self._graph = None  # (tfidf_matrix, min_similarity, neighbour graph)
 
     def fit(self) -> bool:
         """
-        Load all learnings from database and fit the TF-IDF vectorizer.
+        Bring the index in line with the learnings in the database.
 
-        This performs a full rebuild from the database. Any pending additions
-        are cleared since they're already stored in the database.
+        Resumes from the TF-IDF state persisted next to the database and
+        only tokenizes learnings it has not seen or whose text changed (the
+        state keeps each row's text); learnings deleted from the database
+        are dropped. After invalidate() the state is discarded and every
+        learning is re-read. Any pending additions are cleared since
+        they're already stored in the database.
 
         Returns:
             True if successfully fitted, False otherwise
@@ -144,38 +177,39 @@ class SemanticIndex:
             # Clear pending additions - they're already in the database
             self._pending_additions = []
 
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT learning_id, title, description, problem_domain
-                    FROM learnings
-                """)
-                rows = cursor.fetchall()
+                cursor.execute("SELECT learning_id, title, description, problem_domain FROM learnings")
+                db_texts = {row[0]: self._combined_text(*row[1:]) for row in cursor.fetchall()}
 
-            if not rows:
-                logger.warning("No learnings found in database for SemanticIndex")
-                self._fitted = False
-                return False
+                if not db_texts:
+                    logger.warning("No learnings found in database for SemanticIndex")
+                    self._fitted = False
+                    return False
 
-            # Combine title, description, and domain for richer representation
-            self.learning_ids = []
-            self.learning_descriptions = []
+            if not self._fitted:
+                self._load_state()
+
+            # Deleted or edited learnings are dropped, then re-added with their new text
+            stale_rows = [i for i, (lid, text) in enumerate(zip(self.learning_ids, self.learning_descriptions))
+                          if db_texts.get(lid) != text]
+            if stale_rows:
+                self._remove_rows(stale_rows)
 
-            for learning_id, title, description, domain in rows:
-                self.learning_ids.append(learning_id)
-                # Combine fields for better TF-IDF representation
-                combined_text = f"{title or ''} {description or ''} {domain or ''}".strip()
-                self.learning_descriptions.append(combined_text if combined_text else "empty")
+            known = set(self.learning_ids)
+            missing = [lid for lid in db_texts if lid not in known]
+            if missing:
+                self._add_rows([(lid, db_texts[lid]) for lid in missing])
 
-            # Fit and transform
-            self.tfidf_matrix = self.vectorizer.fit_transform(self.learning_descriptions)
+            self.tfidf_matrix = self.vectorizer.matrix
             self._fitted = True
             self._cluster_cache = None  # Invalidate cluster cache
             self._hierarchical_cache = None
             self._coherence_cache = {}
+            self._checkpoint()
 
-            logger.info(f"SemanticIndex fitted with {len(self.learning_ids)} learnings, "
-                       f"vocabulary size: {len(self.vectorizer.vocabulary_)}")
+            logger.info(f"SemanticIndex fitted with {len(self.learning_ids)} learnings "
+                       f"({len(missing)} new), vocabulary size: {len(self.vectorizer.vocabulary_)}")
             return True
 
         except Exception as e:
@@ -183,6 +217,123 @@ class SemanticIndex:
             self._fitted = False
             return False
 
+    @staticmethod
+    def _combined_text(title: Optional[str], description: Optional[str], domain: Optional[str]) -> str:
+        """Text vectorized for a learning (same as _store_learning passes in)."""
+        # Combine fields for better TF-IDF representation
+        combined_text = f"{title or ''} {description or ''} {domain or ''}".strip()
+        return combined_text if combined_text else "empty"
+
+    def _add_rows(self, additions: List[Tuple[str, str]]):
+        """Append learnings to the streaming TF-IDF model."""
+        self.vectorizer.add_documents(text for _, text in additions)
+        self.learning_ids.extend(lid for lid, _ in additions)
+        self.learning_descriptions.extend(text for _, text in additions)
+        self._unsaved_changes += len(additions)
+        self._row_of = None
+
+    def _remove_rows(self, rows: List[int]):
+        """Drop learnings (by row position) from the model."""
+        self.vectorizer.remove_documents(rows)
+        drop = set(rows)
+        self.learning_ids = [lid for i, lid in enumerate(self.learning_ids) if i not in drop]
+        self.learning_descriptions = [d for i, d in enumerate(self.learning_descriptions) if i not in drop]
+        self._unsaved_changes += len(drop)
+        self._row_of = None
+
+    def _load_state(self) -> bool:
+        """Restore the persisted TF-IDF model. Returns False if none is usable."""
+        self.learning_ids = []
+        self.learning_descriptions = []
+        self._row_of = None
+        self._unsaved_changes = 0
+        metadata = self.vectorizer.load(self._state_path)
+        if metadata is None:
+            self.vectorizer.clear()
+            return False
+
+        learning_ids = metadata.get('learning_ids', [])
+        descriptions = metadata.get('learning_descriptions', [])
+        if len(learning_ids) != self.vectorizer.n_docs or len(descriptions) != len(learning_ids):
+            logger.warning("Persisted TF-IDF state does not match its learning ids, rebuilding")
+            self.vectorizer.clear()
+            return False
+
+        self.learning_ids = list(learning_ids)
+        self.learning_descriptions = list(descriptions)
+        return True
+
+    def _checkpoint(self):
+        """Save the state once enough changes are unsaved (each save rewrites it whole)."""
+        if self._unsaved_changes and self._unsaved_changes >= self.CHECKPOINT_RATIO * len(self.learning_ids):
+            self._save_state()
+
+    def _save_state(self):
+        """Persist the TF-IDF model next to the database."""
+        try:
+            self.vectorizer.save(self._state_path, {
+                'learning_ids': self.learning_ids,
+                'learning_descriptions': self.learning_descriptions,
+            })
+            self._unsaved_changes = 0
+        except Exception as e:
+            logger.warning(f"Failed to persist SemanticIndex state: {e}")
+
+    def _discard_state(self):
+        try:
+            self._state_path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove SemanticIndex state: {e}")
+
+    def _rows_for(self, learning_ids: List[str]) -> List[int]:
+        """Matrix rows of the given learnings (unknown ids are skipped)."""
+        if self._row_of is None or len(self._row_of) != len(self.learning_ids):
+            self._row_of = {lid: i for i, lid in enumerate(self.learning_ids)}
+        return [self._row_of[lid] for lid in learning_ids if lid in self._row_of]
+
+    def _neighbor_graph(self, min_similarity: float):
+        """
+        Sparse similarity graph over all learnings, pairs >= min_similarity.
+
+        Built with a blocked sparse join (bounded memory) and cached until
+        the TF-IDF matrix changes; a cached graph built for a lower
+        similarity is reused for higher ones.
+        """
+        if self._graph is not None:
+            matrix, floor, graph = self._graph
+            if matrix is self.tfidf_matrix and floor <= min_similarity:
+                return graph
+
+        graph = similarity_graph(
+            self.tfidf_matrix,
+            min_similarity=min_similarity,
+            top_k=self.SIMILARITY_TOP_K,
+            block_size=self.SIMILARITY_BLOCK_SIZE,
+            memory_mb=self.SIMILARITY_MEMORY_MB
+        )
+        self._graph = (self.tfidf_matrix, min_similarity, graph)
+        logger.info(f"Built similarity graph for {len(self.learning_ids)} learnings "
+                   f"({graph.nnz // 2} pairs >= {min_similarity:.2f})")
+        return graph
+
+    def _average_pairwise_similarity(self, indices: List[int]) -> Optional[float]:
+        """
+        Mean cosine similarity over all pairs of the given rows.
+
+        Rows are L2-normalized, so the sum over pairs follows from the norm
+        of their sum in O(nnz) instead of a pairwise matrix.
+        """
+        n = len(indices)
+        if n < 2:
+            return None
+        subset_matrix = self.tfidf_matrix[indices]
+        total = np.asarray(subset_matrix.sum(axis=0)).ravel()
+        self_sims = subset_matrix.multiply(subset_matrix).sum()
+        pair_sum = (float(total @ total) - float(self_sims)) / 2.0
+        return pair_sum / (n * (n - 1) / 2.0)
+
     def query(self, text: str, top_k: int = 10) -> List[Tuple[str, float]]:
         """
         Query the index and return similar learnings with scores.
@@ -244,10 +395,7 @@ class SemanticIndex:
             return []
 
         try:
-            # Compute pairwise similarities
-            sim_matrix = cosine_similarity(self.tfidf_matrix)
-
-            # Find groups using union-find approach
+            graph = self._neighbor_graph(threshold)
             n = len(self.learning_ids)
             visited = set()
             groups = []
@@ -257,23 +405,19 @@ class SemanticIndex:
                     continue
 
                 # Find all learnings similar to this one
-                similar_indices = []
-                for j in range(n):
-                    if i != j and sim_matrix[i, j] >= threshold:
-                        similar_indices.append(j)
+                row = slice(graph.indptr[i], graph.indptr[i + 1])
+                similar_indices = sorted(
+                    int(j) for j, sim in zip(graph.indices[row], graph.data[row]) if sim >= threshold
+                )
 
                 if similar_indices:
                     group_indices = [i] + similar_indices
                     group_ids = [self.learning_ids[idx] for idx in group_indices]
 
                     # Calculate average similarity within group
-                    total_sim = 0
-                    count = 0
-                    for gi in range(len(group_indices)):
-                        for gj in range(gi + 1, len(group_indices)):
-                            total_sim += sim_matrix[group_indices[gi], group_indices[gj]]
-                            count += 1
-                    avg_sim = total_sim / count if count > 0 else threshold
+                    avg_sim = self._average_pairwise_similarity(group_indices)
+                    if avg_sim is None:
+                        avg_sim = threshold
 
                     # Mark all as visited
                     for idx in group_indices:
@@ -323,19 +467,9 @@ class SemanticIndex:
             return self._cluster_cache
 
         try:
-            # Convert sparse matrix to dense for clustering
-            # Use cosine distance = 1 - cosine_similarity
-            dense_matrix = self.tfidf_matrix.toarray()
-
-            # Agglomerative clustering with cosine affinity
-            clustering = AgglomerativeClustering(
-                n_clusters=None,
-                distance_threshold=distance_threshold,
-                metric='cosine',
-                linkage='average'
-            )
-
-            labels = clustering.fit_predict(dense_matrix)
+            # Average-linkage clustering (cosine distance) over the sparse neighbour graph
+            graph = self._neighbor_graph((1.0 - distance_threshold) * self.CLUSTER_FLOOR_RATIO)
+            labels = average_linkage_clusters(graph, distance_threshold)
 
             # Group learning IDs by cluster
             clusters: Dict[int, List[str]] = {}
@@ -374,8 +508,7 @@ class SemanticIndex:
 
         try:
             # Get indices for the learning IDs
-            indices = [self.learning_ids.index(lid) for lid in learning_ids
-                      if lid in self.learning_ids]
+            indices = self._rows_for(learning_ids)
 
             if not indices:
                 return []
@@ -417,28 +550,13 @@ class SemanticIndex:
 
         try:
             # Get indices
-            indices = [self.learning_ids.index(lid) for lid in learning_ids
-                      if lid in self.learning_ids]
+            indices = self._rows_for(learning_ids)
 
             if len(indices) < 2:
                 return 1.0
 
-            # Get subset of TF-IDF matrix
-            subset_matrix = self.tfidf_matrix[indices]
-
-            # Compute pairwise similarities within cluster
-            sim_matrix = cosine_similarity(subset_matrix)
-
-            # Extract upper triangle (excluding diagonal)
-            n = len(indices)
-            total_sim = 0.0
-            count = 0
-            for i in range(n):
-                for j in range(i + 1, n):
-                    total_sim += sim_matrix[i, j]
-                    count += 1
-
-            return total_sim / count if count > 0 else 0.0
+            # Mean pairwise similarity within cluster
+            return max(0.0, self._average_pairwise_similarity(indices))
 
         except Exception as e:
             logger.error(f"Failed to compute cluster coherence: {e}")
@@ -464,18 +582,16 @@ class SemanticIndex:
             return learning_ids[0] if learning_ids else None
 
         try:
-            indices = [self.learning_ids.index(lid) for lid in learning_ids
-                      if lid in self.learning_ids]
+            indices = self._rows_for(learning_ids)
 
             if len(indices) < 2:
                 return learning_ids[0]
 
+            # Similarity to the cluster sum ranks learnings by their average
+            # similarity to the others (rows are L2-normalized)
             subset_matrix = self.tfidf_matrix[indices]
-            sim_matrix = cosine_similarity(subset_matrix)
-
-            # Find learning with highest average similarity to others
-            avg_similarities = sim_matrix.sum(axis=1) / (len(indices) - 1)
-            best_idx = np.argmax(avg_similarities)
+            total = np.asarray(subset_matrix.sum(axis=0)).ravel()
+            best_idx = int(np.argmax(subset_matrix @ total))
 
             return self.learning_ids[indices[best_idx]]
 
@@ -578,16 +694,12 @@ class SemanticIndex:
             return {'clusters': []}
 
         try:
-            dense_matrix = self.tfidf_matrix.toarray()
+            # One neighbour graph serves both levels (sub-clusters need closer pairs)
+            lowest_similarity = 1.0 - max(top_level_threshold, sub_level_threshold)
+            graph = self._neighbor_graph(lowest_similarity * self.CLUSTER_FLOOR_RATIO)
 
             # Top-level clustering
-            top_clustering = AgglomerativeClustering(
-                n_clusters=None,
-                distance_threshold=top_level_threshold,
-                metric='cosine',
-                linkage='average'
-            )
-            top_labels = top_clustering.fit_predict(dense_matrix)
+            top_labels = average_linkage_clusters(graph, top_level_threshold)
 
             # Group by top-level cluster
             top_clusters: Dict[int, List[int]] = {}
@@ -609,16 +721,9 @@ class SemanticIndex:
 
                 # Sub-cluster if large enough
                 if len(indices) >= 4:
-                    # Get subset matrix for sub-clustering
-                    subset_matrix = dense_matrix[indices]
-
-                    sub_clustering = AgglomerativeClustering(
-                        n_clusters=None,
-                        distance_threshold=sub_level_threshold,
-                        metric='cosine',
-                        linkage='average'
-                    )
-                    sub_labels = sub_clustering.fit_predict(subset_matrix)
+                    # Get subgraph for sub-clustering
+                    subgraph = graph[indices][:, indices]
+                    sub_labels = average_linkage_clusters(subgraph, sub_level_threshold)
 
                     # Group sub-clusters
                     sub_groups: Dict[int, List[str]] = {}
@@ -677,9 +782,13 @@ class SemanticIndex:
         """Mark the index as needing a rebuild.
 
         Args:
-            full: If True, forces full rebuild. If False, allows incremental update.
+            full: If True, forces full rebuild (the persisted state is
+                discarded, e.g. after learnings were edited). If False,
+                allows incremental update.
         """
         if full:
+            self._discard_state()
+            self.vectorizer.clear()
             self._fitted = False
             self._cluster_cache = None
             self._cluster_threshold = None
@@ -689,6 +798,7 @@ class SemanticIndex:
             self.learning_ids = []
             self.learning_descriptions = []
             self._pending_additions = []
+            self._unsaved_changes = 0
         else:
             # Just invalidate caches, keep core data for incremental update
             self._cluster_cache = None
@@ -701,7 +811,8 @@ class SemanticIndex:
         Add a single learning to the index incrementally (deferred).
 
         The learning is queued for the next index update. If too many learnings
-        are pending, triggers a full rebuild instead.
+        are pending, they are applied right away. A learning already in the
+        index is replaced if its text changed.
 
         Args:
             learning_id: The learning ID to add
@@ -710,7 +821,8 @@ class SemanticIndex:
         Returns:
             True if learning was queued successfully
         """
-        if learning_id in self.learning_ids:
+        rows = self._rows_for([learning_id])
+        if rows and self.learning_descriptions[rows[0]] == (text if text else "empty"):
             return False  # Already in index
 
         self._pending_additions.append((learning_id, text))
@@ -718,11 +830,11 @@ class SemanticIndex:
         # Invalidate caches but not the core index
         self.invalidate(full=False)
 
-        # Check if we should trigger full rebuild due to too many pending
+        # Apply eagerly once the queue grows large relative to the index
         if self._fitted and len(self.learning_ids) > 0:
             pending_ratio = len(self._pending_additions) / len(self.learning_ids)
             if pending_ratio > self.REBUILD_THRESHOLD:
-                logger.info(f"Triggering full rebuild: {len(self._pending_additions)} pending additions")
+                logger.info(f"Applying {len(self._pending_additions)} pending additions")
                 return self._apply_pending_additions()
 
         return True
@@ -731,7 +843,9 @@ class SemanticIndex:
         """
         Apply all pending additions to the index.
 
-        Uses incremental transform if possible, otherwise triggers full rebuild.
+        New learnings are tokenized into the streaming TF-IDF model and the
+        IDF weights are recomputed; the existing corpus is not refitted.
+        Learnings whose text changed are removed and added again.
 
         Returns:
             True if successful
@@ -740,35 +854,37 @@ class SemanticIndex:
             return True
 
         if not self._fitted or self.tfidf_matrix is None:
-            # Need full rebuild
+            # fit() picks the pending learnings up from the database
             self._pending_additions = []
             return self.fit()
 
         try:
-            # Transform pending additions using existing vocabulary
-            new_texts = [text for _, text in self._pending_additions]
-            new_ids = [lid for lid, _ in self._pending_additions]
-
-            # Transform new texts using fitted vectorizer
-            new_vectors = self.vectorizer.transform(new_texts)
-
-            # Append to existing matrix
-            from scipy.sparse import vstack
-            self.tfidf_matrix = vstack([self.tfidf_matrix, new_vectors])
-
-            # Update ID and description lists
-            self.learning_ids.extend(new_ids)
-            self.learning_descriptions.extend(new_texts)
-
-            # Clear pending
+            additions = {}
+            for learning_id, text in self._pending_additions:
+                additions[learning_id] = text if text else "empty"
             self._pending_additions = []
+            replaced = []
+            for row in self._rows_for(list(additions)):
+                learning_id = self.learning_ids[row]
+                if self.learning_descriptions[row] == additions[learning_id]:
+                    del additions[learning_id]
+                else:
+                    replaced.append(row)
+            if not additions:
+                return True
+
+            if replaced:
+                self._remove_rows(replaced)
+            self._add_rows(list(additions.items()))
+            self.tfidf_matrix = self.vectorizer.matrix
+            self._checkpoint()
 
-            logger.info(f"Incrementally added {len(new_ids)} learnings to index")
+            logger.info(f"Incrementally added {len(additions)} learnings to index")
             return True
 
         except Exception as e:
             logger.warning(f"Incremental update failed, triggering full rebuild: {e}")
-            self._pending_additions = []
+            self.invalidate()
             return self.fit()
 
     def ensure_up_to_date(self) -> bool:
@@ -811,6 +927,12 @@ class MissionKnowledgeBase:
     for improved semantic search quality.
     """
 
+    # Decoded learnings kept by _get_learnings_by_ids()
+    LEARNING_CACHE_SIZE = 2048
+
+    # Learnings fetched per bulk query
+    FETCH_CHUNK_SIZE = 500
+
     def __init__(self, storage_path: Optional[Path] = None, use_hybrid: bool = True, fast_mode: bool = False):
         """
         Initialize the knowledge base.
@@ -823,6 +945,10 @@ class MissionKnowledgeBase:
         self.storage_path = storage_path or KNOWLEDGE_DIR
         self.storage_path.mkdir(parents=True, exist_ok=True)
         self.db_path = self.storage_path / "mission_knowledge.db"
+        self._pool = get_pool(self.db_path)
+        self._learning_cache: "OrderedDict[str, MissionLearning]" = OrderedDict()
+        self._learning_cache_signature: Optional[Tuple] = None
+        self._learning_cache_lock = threading.Lock()
         self._init_db()
 
         # Initialize semantic index based on configuration
@@ -856,7 +982,7 @@ class MissionKnowledgeBase:
 
     def _init_db(self):
         """Initialize SQLite database schema"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
 
             # Mission summaries table
@@ -1450,7 +1576,7 @@ class MissionKnowledgeBase:
 
     def _store_summary(self, summary: MissionSummary):
         """Store mission summary in database"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT OR REPLACE INTO mission_summaries
@@ -1474,16 +1600,36 @@ class MissionKnowledgeBase:
             conn.commit()
 
     def _store_learning(self, learning: MissionLearning):
-        """Store learning in database and update semantic index incrementally."""
-        with sqlite3.connect(self.db_path) as conn:
+        """
+        Store learning in database and update semantic index incrementally.
+
+        Existing learnings are updated in place (not INSERT OR REPLACE) so
+        that the analytics rollup triggers see the change, see kb_analytics.
+        """
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                INSERT OR REPLACE INTO learnings
+                INSERT INTO learnings
                 (learning_id, mission_id, learning_type, title, description,
                  problem_domain, outcome, relevance_keywords, code_snippets,
                  files_created, timestamp, lesson_source, source_type,
                  source_investigation_id, investigation_query)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (learning_id) DO UPDATE SET
+                    mission_id = excluded.mission_id,
+                    learning_type = excluded.learning_type,
+                    title = excluded.title,
+                    description = excluded.description,
+                    problem_domain = excluded.problem_domain,
+                    outcome = excluded.outcome,
+                    relevance_keywords = excluded.relevance_keywords,
+                    code_snippets = excluded.code_snippets,
+                    files_created = excluded.files_created,
+                    timestamp = excluded.timestamp,
+                    lesson_source = excluded.lesson_source,
+                    source_type = excluded.source_type,
+                    source_investigation_id = excluded.source_investigation_id,
+                    investigation_query = excluded.investigation_query
             """, (
                 learning.learning_id,
                 learning.mission_id,
@@ -1502,6 +1648,7 @@ class MissionKnowledgeBase:
                 learning.investigation_query
             ))
             conn.commit()
+        self._forget_learnings([learning.learning_id])
 
         # Use incremental index update instead of full invalidation
         if hasattr(self, '_semantic_index') and self._semantic_index is not None:
@@ -1547,9 +1694,10 @@ class MissionKnowledgeBase:
                 )
 
                 if hybrid_results:
+                    learnings = self._get_learnings_by_ids([r[0] for r in hybrid_results])
                     results = []
                     for learning_id, hybrid_score, breakdown in hybrid_results:
-                        learning = self._get_learning_by_id(learning_id)
+                        learning = learnings.get(learning_id)
                         if learning is None:
                             continue
 
@@ -1586,9 +1734,10 @@ class MissionKnowledgeBase:
             # Ultimate fallback to keyword-based
             return self._query_relevant_learnings_fallback(problem_statement, top_k, learning_types, source_type)
 
+        learnings = self._get_learnings_by_ids([learning_id for learning_id, _ in tfidf_results])
         results = []
         for learning_id, tfidf_score in tfidf_results:
-            learning = self._get_learning_by_id(learning_id)
+            learning = learnings.get(learning_id)
             if learning is None:
                 continue
 
@@ -1636,7 +1785,7 @@ class MissionKnowledgeBase:
         target_domain = self._infer_domain(problem_statement)
         target_keywords = set(self._extract_keywords(problem_statement))
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
 
             query = "SELECT * FROM learnings WHERE 1=1"
@@ -1658,16 +1807,9 @@ class MissionKnowledgeBase:
             cursor.execute(query, params)
             rows = cursor.fetchall()
 
-        columns = [
-            "learning_id", "mission_id", "learning_type", "title", "description",
-            "problem_domain", "outcome", "relevance_keywords", "code_snippets",
-            "files_created", "timestamp", "lesson_source", "source_type",
-            "source_investigation_id", "investigation_query"
-        ]
-
         scored_results = []
         for row in rows:
-            data = dict(zip(columns, row))
+            data = dict(zip(LEARNING_COLUMNS, row))
             data["relevance_keywords"] = json.loads(data["relevance_keywords"] or "[]")
             data["code_snippets"] = json.loads(data["code_snippets"] or "[]")
             data["files_created"] = json.loads(data["files_created"] or "[]")
@@ -1735,24 +1877,88 @@ class MissionKnowledgeBase:
 
     def _get_learning_by_id(self, learning_id: str) -> Optional[MissionLearning]:
         """Retrieve a single learning by ID."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM learnings WHERE learning_id = ?", (learning_id,))
-            row = cursor.fetchone()
+        return self._get_learnings_by_ids([learning_id]).get(learning_id)
 
-        if not row:
-            return None
+    def _get_learnings_by_ids(self, learning_ids: List[str]) -> Dict[str, MissionLearning]:
+        """
+        Retrieve learnings by ID with one bulk query.
 
-        columns = [
-            "learning_id", "mission_id", "learning_type", "title", "description",
-            "problem_domain", "outcome", "relevance_keywords", "code_snippets",
-            "files_created", "timestamp", "lesson_source", "source_type",
-            "source_investigation_id", "investigation_query"
-        ]
+        Decoded learnings are served from a bounded LRU cache, which is
+        dropped whenever the database files change (a write by this or any
+        other process). The returned objects are shared with the cache and
+        must not be modified.
 
+        Args:
+            learning_ids: IDs to fetch
+
+        Returns:
+            Dict of learning_id -> MissionLearning (unknown IDs are left out)
+        """
+        found: Dict[str, MissionLearning] = {}
+        missing: List[str] = []
+        with self._learning_cache_lock:
+            signature = self._db_signature()
+            if signature != self._learning_cache_signature:
+                self._learning_cache.clear()
+                self._learning_cache_signature = signature
+            for learning_id in dict.fromkeys(learning_ids):
+                learning = self._learning_cache.get(learning_id)
+                if learning is None:
+                    missing.append(learning_id)
+                else:
+                    self._learning_cache.move_to_end(learning_id)
+                    found[learning_id] = learning
+
+        if not missing:
+            return found
+
+        rows = []
+        with self._pool.connection() as conn:
+            for i in range(0, len(missing), self.FETCH_CHUNK_SIZE):
+                placeholders, params = in_placeholders(missing[i:i + self.FETCH_CHUNK_SIZE])
+                rows.extend(conn.execute(
+                    f"SELECT * FROM learnings WHERE learning_id IN ({placeholders})", params
+                ).fetchall())
+
+        fetched = {}
+        for row in rows:
+            learning = self._decode_learning(row)
+            fetched[learning.learning_id] = learning
+
+        with self._learning_cache_lock:
+            # Rows read after a concurrent write are newer than the signature,
+            # which only makes the next lookup drop them
+            if self._learning_cache_signature == signature:
+                self._learning_cache.update(fetched)
+                while len(self._learning_cache) > self.LEARNING_CACHE_SIZE:
+                    self._learning_cache.popitem(last=False)
+
+        found.update(fetched)
+        return found
+
+    def _forget_learnings(self, learning_ids: List[str]):
+        """Drop learnings written by this process from the decoded cache."""
+        with self._learning_cache_lock:
+            for learning_id in learning_ids:
+                self._learning_cache.pop(learning_id, None)
+
+    def _db_signature(self) -> Tuple:
+        """File identity of the database and its WAL, which change on every commit."""
+        signature = []
+        for path in (self.db_path, Path(f"{self.db_path}-wal")):
+            try:
+                st = os.stat(path)
+                signature.append((st.st_ino, st.st_mtime_ns, st.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    @staticmethod
+    def _decode_learning(row: Tuple) -> MissionLearning:
+        """Build a MissionLearning from a learnings row."""
         # Handle case where row might have fewer columns (old DB schema)
         data = {}
-        for i, col in enumerate(columns):
+        for i, col in enumerate(LEARNING_COLUMNS):
             if i < len(row):
                 data[col] = row[i]
             else:
@@ -1782,7 +1988,7 @@ class MissionKnowledgeBase:
         target_domain = self._infer_domain(problem_statement)
         target_keywords = set(self._extract_keywords(problem_statement))
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM mission_summaries")
             rows = cursor.fetchall()
@@ -2273,7 +2479,7 @@ Use this context to inform your planning. Avoid repeating past failures.
         Returns:
             List of learning dicts
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
 
             if investigation_id:
@@ -2294,17 +2500,10 @@ Use this context to inform your planning. Avoid repeating past failures.
 
             rows = cursor.fetchall()
 
-        columns = [
-            "learning_id", "mission_id", "learning_type", "title", "description",
-            "problem_domain", "outcome", "relevance_keywords", "code_snippets",
-            "files_created", "timestamp", "lesson_source", "source_type",
-            "source_investigation_id", "investigation_query"
-        ]
-
         learnings = []
         for row in rows:
             data = {}
-            for i, col in enumerate(columns):
+            for i, col in enumerate(LEARNING_COLUMNS):
                 if i < len(row):
                     data[col] = row[i]
                 else:
@@ -2324,7 +2523,7 @@ Use this context to inform your planning. Avoid repeating past failures.
         Returns:
             Dict with investigation statistics
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
 
             # Count investigation learnings
@@ -2425,11 +2624,12 @@ Use this context to inform your planning. Avoid repeating past failures.
         all_snippets = list(keep_learning.code_snippets)
         merged_count = 0
 
+        merge_learnings = self._get_learnings_by_ids(merge_ids)
         for merge_id in merge_ids:
             if merge_id == keep_id:
                 continue
 
-            merge_learning = self._get_learning_by_id(merge_id)
+            merge_learning = merge_learnings.get(merge_id)
             if merge_learning is None:
                 continue
 
@@ -2445,7 +2645,7 @@ Use this context to inform your planning. Avoid repeating past failures.
             return {"status": "error", "message": "No valid learnings to merge"}
 
         # Update the kept learning with combined data
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
 
             # Update kept learning
@@ -2461,6 +2661,7 @@ Use this context to inform your planning. Avoid repeating past failures.
             ))
 
             conn.commit()
+        self._forget_learnings([keep_id])
 
         # Invalidate semantic index
         self._semantic_index.invalidate()
@@ -2510,11 +2711,8 @@ Use this context to inform your planning. Avoid repeating past failures.
                 continue
 
             # Get full learning data
-            learnings = []
-            for lid in learning_ids:
-                learning = self._get_learning_by_id(lid)
-                if learning:
-                    learnings.append(learning.to_dict())
+            found = self._get_learnings_by_ids(learning_ids)
+            learnings = [found[lid].to_dict() for lid in learning_ids if lid in found]
 
             # Generate theme from top terms
             theme = self._generate_cluster_theme(learning_ids)
@@ -2616,12 +2814,13 @@ Use this context to inform your planning. Avoid repeating past failures.
             return []
 
         # Get source learning's mission_id for filtering
-        source_learning = self._get_learning_by_id(learning_id)
+        found = self._get_learnings_by_ids([learning_id] + [rid for rid, _ in related])
+        source_learning = found.get(learning_id)
         source_mission = source_learning.mission_id if source_learning else None
 
         results = []
         for related_id, similarity in related:
-            learning = self._get_learning_by_id(related_id)
+            learning = found.get(related_id)
             if learning is None:
                 continue
 
@@ -2664,7 +2863,7 @@ Use this context to inform your planning. Avoid repeating past failures.
             - missions: List of unique mission IDs in the chain
         """
         # Get learnings, optionally filtered by domain
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
             if domain:
                 cursor.execute("""
@@ -2727,11 +2926,8 @@ Use this context to inform your planning. Avoid repeating past failures.
         results = []
         for i, (chain_ids, missions) in enumerate(chains):
             # Get full learning data
-            learnings = []
-            for lid in chain_ids:
-                learning = self._get_learning_by_id(lid)
-                if learning:
-                    learnings.append(learning.to_dict())
+            found = self._get_learnings_by_ids(chain_ids)
+            learnings = [found[lid].to_dict() for lid in chain_ids if lid in found]
 
             # Sort by timestamp
             learnings.sort(key=lambda x: x.get('timestamp', ''))
@@ -2814,7 +3010,7 @@ Use this context to inform your planning. Avoid repeating past failures.
             True if linked successfully
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._pool.connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     INSERT OR REPLACE INTO github_links
@@ -2839,9 +3035,9 @@ Use this context to inform your planning. Avoid repeating past failures.
             List of GitHub link dictionaries
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self._pool.connection() as conn:
                 cursor = conn.cursor()
+                cursor.row_factory = sqlite3.Row
                 cursor.execute('''
                     SELECT * FROM github_links WHERE mission_id = ?
                     ORDER BY created_at DESC
@@ -2854,7 +3050,7 @@ Use this context to inform your planning. Avoid repeating past failures.
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get statistics about the knowledge base"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._pool.connection() as conn:
             cursor = conn.cursor()
 
             # Count missions
@@ -14,11 +14,14 @@ Dependencies:
 - datetime for scheduling
 """
 
+import hashlib
 import json
 import logging
+import re
+from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 import uuid as uuid_module
@@ -107,6 +110,25 @@ class DependencyStatus(Enum):
     NOT_FOUND = "not_found"   # Dependency mission doesn't exist
 
 
+@dataclass
+class _DescriptionFeatures:
+    """Dependency signals of one lowercased mission description (see suggest_dependencies)."""
+    text: str
+    creates: set  # Nouns after create verbs
+    uses: set  # Nouns after use verbs
+    nouns: set  # Words of 5+ letters
+    files: set  # File references
+    modules: set  # snake_case identifiers
+    foundational: bool
+    dependent: bool
+    markers: List[Tuple[str, str]]  # (dependency phrase, what it depends on)
+
+    def tokens(self) -> Set[str]:
+        """Tokens shared by any two descriptions that can score a dependency."""
+        return (self.creates | self.uses | self.files | self.modules |
+                {noun for noun in self.nouns if len(noun) >= 6})
+
+
 @dataclass
 class QueueItem:
     """Extended queue item with priority and scheduling."""
@@ -280,6 +302,8 @@ class MissionQueueScheduler:
     def __init__(self, io_utils_module=None):
         """Initialize scheduler with optional io_utils module."""
         self.io_utils = io_utils_module
+        # Description hash -> extracted dependency signals (current queue only)
+        self._feature_cache: Dict[str, _DescriptionFeatures] = {}
         if not self.io_utils:
             try:
                 import io_utils as _io
@@ -969,6 +993,21 @@ class MissionQueueScheduler:
     USE_VERBS = {"use", "extend", "modify", "update", "integrate", "enhance", "improve", "refactor", "fix", "test", "validate"}
     DEPEND_PATTERNS = {"depends on", "requires", "needs", "after", "following", "builds on", "extends", "based on"}
 
+    # Precompiled extraction patterns
+    _STOP_WORDS = {"a", "an", "the", "to", "for", "and", "or", "new", "with", "in", "on", "at", "by", "of"}
+    _CREATE_PATTERNS = [re.compile(rf'\b{verb}\s+(?:a\s+|an\s+|the\s+|new\s+)?(\w+)') for verb in CREATE_VERBS]
+    _USE_PATTERNS = [re.compile(rf'\b{verb}\s+(?:a\s+|an\s+|the\s+|new\s+)?(\w+)') for verb in USE_VERBS]
+    _DEPEND_PATTERNS = [(pattern, re.compile(rf'{pattern}\s+(?:the\s+)?(\w+(?:\s+\w+)?)'))
+                        for pattern in DEPEND_PATTERNS]
+    _NOUN_PATTERN = re.compile(r'\b([A-Za-z]{5,})\b')
+    _FILE_PATTERN = re.compile(r'\b[\w/]+\.(?:py|js|ts|tsx|jsx|css|html|json|md)\b', re.IGNORECASE)
+    _MODULE_PATTERN = re.compile(r'\b(?:[A-Z][a-zA-Z]+|[a-z]+_[a-z]+(?:_[a-z]+)*)\b')
+    _REFERENCE_NOISE = {"that", "this", "with", "from", "into", "which", "their", "there", "should", "could", "would"}
+    _FOUNDATIONAL_KEYWORDS = ["setup", "initial", "foundation", "base", "core",
+                              "create", "implement", "add new", "introduce", "establish"]
+    _DEPENDENT_KEYWORDS = ["extend", "build on", "enhance", "improve", "after",
+                           "follow up", "continuation", "based on", "using the"]
+
     def suggest_dependencies(self) -> List[Dict]:
         """
         Analyze queue items to suggest dependency ordering with confidence scoring.
@@ -981,6 +1020,11 @@ class MissionQueueScheduler:
 
         Only returns suggestions with confidence >= CONFIDENCE_THRESHOLD (0.6)
 
+        Each description's signals are extracted once and cached by hash.
+        Only pairs that share a token (entity, file or module) or where one
+        names what the other contains in an explicit dependency marker are
+        scored: any other pair scores at most 0.2 (sequential keywords).
+
         Returns:
             List of suggestion dicts with mission pairs, reasons, and confidence scores
         """
@@ -992,38 +1036,73 @@ class MissionQueueScheduler:
 
         # Build a map of queue items by ID
         queue_items = [QueueItem.from_dict(q) for q in state.queue]
-
-        # Analyze each pair for potential dependencies
-        for i, item_a in enumerate(queue_items):
-            for j, item_b in enumerate(queue_items):
-                if i >= j:
-                    continue
-
-                # Calculate confidence that A should come before B
-                confidence, reasons = self._calculate_dependency_confidence(
-                    item_a.mission_description,
-                    item_b.mission_description
-                )
-
-                # Only include if above threshold
-                if confidence >= self.CONFIDENCE_THRESHOLD:
-                    suggestions.append({
-                        "mission_a": item_a.id,
-                        "mission_a_title": item_a.mission_title,
-                        "mission_b": item_b.id,
-                        "mission_b_title": item_b.mission_title,
-                        "reason": "; ".join(reasons) if reasons else "Detected dependency pattern",
-                        "confidence": round(confidence, 2),
-                        "confidence_label": self._get_confidence_label(confidence),
-                        "suggested_order": [item_a.id, item_b.id],
-                        "suggestion_type": "algorithm"
-                    })
+        features = self._get_queue_features(queue_items)
+
+        # Analyze candidate pairs for potential dependencies
+        for i, j in self._candidate_pairs(features):
+            item_a, item_b = queue_items[i], queue_items[j]
+
+            # Calculate confidence that A should come before B
+            confidence, reasons = self._score_dependency(features[i], features[j])
+
+            # Only include if above threshold
+            if confidence >= self.CONFIDENCE_THRESHOLD:
+                suggestions.append({
+                    "mission_a": item_a.id,
+                    "mission_a_title": item_a.mission_title,
+                    "mission_b": item_b.id,
+                    "mission_b_title": item_b.mission_title,
+                    "reason": "; ".join(reasons) if reasons else "Detected dependency pattern",
+                    "confidence": round(confidence, 2),
+                    "confidence_label": self._get_confidence_label(confidence),
+                    "suggested_order": [item_a.id, item_b.id],
+                    "suggestion_type": "algorithm"
+                })
 
         # Sort by confidence (highest first)
         suggestions.sort(key=lambda x: x["confidence"], reverse=True)
 
         return suggestions
 
+    def _get_queue_features(self, queue_items: List[QueueItem]) -> List[_DescriptionFeatures]:
+        """Features of each queue item, from the cache when the description is unchanged."""
+        cache = {}
+        features = []
+        for item in queue_items:
+            description = item.mission_description or ""
+            key = hashlib.sha1(description.encode("utf-8")).hexdigest()
+            item_features = cache.get(key) or self._feature_cache.get(key)
+            if item_features is None:
+                item_features = self._extract_features(description)
+            cache[key] = item_features
+            features.append(item_features)
+        # Descriptions no longer queued are dropped
+        self._feature_cache = cache
+        return features
+
+    def _candidate_pairs(self, features: List[_DescriptionFeatures]) -> List[Tuple[int, int]]:
+        """(i, j) pairs with i < j that can reach CONFIDENCE_THRESHOLD, in order."""
+        n = len(features)
+        if self.CONFIDENCE_THRESHOLD <= 0.2:
+            return [(i, j) for i in range(n) for j in range(i + 1, n)]
+
+        pairs = set()
+        index: Dict[str, List[int]] = defaultdict(list)
+        for i, item_features in enumerate(features):
+            for token in item_features.tokens():
+                index[token].append(i)
+        for postings in index.values():
+            for x, i in enumerate(postings):
+                for j in postings[x + 1:]:
+                    pairs.add((i, j))
+
+        for j, item_features in enumerate(features):
+            for _, dependent_item in item_features.markers:
+                for i in range(j):
+                    if dependent_item in features[i].text:
+                        pairs.add((i, j))
+        return sorted(pairs)
+
     def _calculate_dependency_confidence(self, mission_a: str, mission_b: str) -> Tuple[float, List[str]]:
         """
         Calculate confidence score for A→B dependency.
@@ -1031,76 +1110,89 @@ class MissionQueueScheduler:
         Returns:
             Tuple of (confidence_score, list_of_reasons)
         """
+        return self._score_dependency(self._extract_features(mission_a), self._extract_features(mission_b))
+
+    def _score_dependency(self, a: _DescriptionFeatures, b: _DescriptionFeatures) -> Tuple[float, List[str]]:
+        """Confidence score and reasons for A→B dependency from extracted features."""
         score = 0.0
         reasons = []
 
-        a_lower = mission_a.lower()
-        b_lower = mission_b.lower()
-
         # 1. Check for create→use relationship (high weight: 0.5)
-        create_use_score, create_use_items = self._check_create_use_relationship(a_lower, b_lower)
+        create_use_score, create_use_items = self._check_create_use_relationship(a, b)
         if create_use_score > 0:
             score += create_use_score
             reasons.append(f"A creates what B uses: {', '.join(list(create_use_items)[:2])}")
 
         # 2. Check shared entity/file references (medium weight: up to 0.3)
-        shared_refs = self._find_shared_references(a_lower, b_lower)
+        shared_refs = self._find_shared_references(a, b)
         if shared_refs:
             ref_score = min(0.3, len(shared_refs) * 0.1)
             score += ref_score
             reasons.append(f"Shared references: {', '.join(list(shared_refs)[:3])}")
 
         # 3. Check for sequential keyword patterns (low weight: 0.2)
-        if self._has_sequential_keywords(a_lower, b_lower):
+        if a.foundational and b.dependent:
             score += 0.2
             reasons.append("Sequential pattern detected (setup→extend)")
 
         # 4. Check for explicit dependency markers (high weight: 0.4)
-        explicit_dep = self._check_explicit_dependency_markers(a_lower, b_lower)
+        explicit_dep = self._check_explicit_dependency_markers(a, b)
         if explicit_dep:
             score += 0.4
             reasons.append(f"Explicit dependency: {explicit_dep}")
 
         return min(1.0, score), reasons
 
-    def _check_create_use_relationship(self, text_a: str, text_b: str) -> Tuple[float, set]:
+    def _extract_features(self, description: str) -> _DescriptionFeatures:
+        """Extract the dependency signals of one mission description."""
+        text = description.lower()
+
+        # What the mission creates / uses: nouns after create and use verbs
+        creates = set()
+        for pattern in self._CREATE_PATTERNS:
+            creates.update(m.lower() for m in pattern.findall(text)
+                           if len(m) > 2 and m.lower() not in self._STOP_WORDS)
+        uses = set()
+        for pattern in self._USE_PATTERNS:
+            uses.update(m.lower() for m in pattern.findall(text)
+                        if len(m) > 2 and m.lower() not in self._STOP_WORDS)
+
+        # Explicit dependency phrases and what they depend on
+        markers = []
+        for phrase, pattern in self._DEPEND_PATTERNS:
+            if phrase in text:
+                match = pattern.search(text)
+                if match:
+                    markers.append((phrase, match.group(1).lower()))
+
+        return _DescriptionFeatures(
+            text=text,
+            creates=creates,
+            uses=uses,
+            nouns=set(m.lower() for m in self._NOUN_PATTERN.findall(text) if m.lower() not in self._STOP_WORDS),
+            files=set(self._FILE_PATTERN.findall(text)),
+            modules=set(m for m in self._MODULE_PATTERN.findall(text) if len(m) > 3),
+            # Foundational (setup/create/init) vs dependent (extend/build upon/after) wording
+            foundational=any(kw in text for kw in self._FOUNDATIONAL_KEYWORDS),
+            dependent=any(kw in text for kw in self._DEPENDENT_KEYWORDS),
+            markers=markers
+        )
+
+    def _check_create_use_relationship(self, a: _DescriptionFeatures,
+                                       b: _DescriptionFeatures) -> Tuple[float, set]:
         """
         Check if A creates something that B uses.
 
         Returns:
             Tuple of (score, set of shared items)
         """
-        import re
-
-        # Extract key nouns (removing common words)
-        stop_words = {"a", "an", "the", "to", "for", "and", "or", "new", "with", "in", "on", "at", "by", "of"}
-
-        # Extract what A creates - look for nouns after create verbs
-        a_creates = set()
-        for verb in self.CREATE_VERBS:
-            # Match: verb + optional article + noun
-            pattern = rf'\b{verb}\s+(?:a\s+|an\s+|the\s+|new\s+)?(\w+)'
-            matches = re.findall(pattern, text_a)
-            a_creates.update(m.lower() for m in matches if len(m) > 2 and m.lower() not in stop_words)
-
-        # Extract what B uses/modifies
-        b_uses = set()
-        for verb in self.USE_VERBS:
-            pattern = rf'\b{verb}\s+(?:a\s+|an\s+|the\s+|new\s+)?(\w+)'
-            matches = re.findall(pattern, text_b)
-            b_uses.update(m.lower() for m in matches if len(m) > 2 and m.lower() not in stop_words)
-
         # Find direct overlap
-        common = a_creates & b_uses
+        common = a.creates & b.uses
         if common:
             return 0.5, common
 
         # Also check for significant noun overlap (longer words more likely meaningful)
-        noun_pattern = r'\b([A-Za-z]{5,})\b'
-        a_nouns = set(m.lower() for m in re.findall(noun_pattern, text_a) if m.lower() not in stop_words)
-        b_nouns = set(m.lower() for m in re.findall(noun_pattern, text_b) if m.lower() not in stop_words)
-
-        overlap = a_nouns & b_nouns
+        overlap = a.nouns & b.nouns
         # Filter to more significant words
         significant_overlap = set(w for w in overlap if len(w) >= 6)
 
@@ -1109,66 +1201,24 @@ class MissionQueueScheduler:
 
         return 0.0, set()
 
-    def _find_shared_references(self, text_a: str, text_b: str) -> set:
+    def _find_shared_references(self, a: _DescriptionFeatures, b: _DescriptionFeatures) -> set:
         """
-        Find shared file/module/component references between two texts.
+        Find shared file/module/component references between two descriptions.
         """
-        import re
-
-        # Extract file references
-        file_pattern = r'\b[\w/]+\.(?:py|js|ts|tsx|jsx|css|html|json|md)\b'
-        files_a = set(re.findall(file_pattern, text_a, re.IGNORECASE))
-        files_b = set(re.findall(file_pattern, text_b, re.IGNORECASE))
-
-        # Extract module/component names (CamelCase or snake_case identifiers)
-        module_pattern = r'\b(?:[A-Z][a-zA-Z]+|[a-z]+_[a-z]+(?:_[a-z]+)*)\b'
-        modules_a = set(m for m in re.findall(module_pattern, text_a) if len(m) > 3)
-        modules_b = set(m for m in re.findall(module_pattern, text_b) if len(m) > 3)
-
-        # Common noise words to filter
-        noise = {"that", "this", "with", "from", "into", "which", "their", "there", "should", "could", "would"}
-
-        shared_files = files_a & files_b
-        shared_modules = (modules_a & modules_b) - noise
+        shared_files = a.files & b.files
+        shared_modules = (a.modules & b.modules) - self._REFERENCE_NOISE
 
         return shared_files | shared_modules
 
-    def _has_sequential_keywords(self, text_a: str, text_b: str) -> bool:
-        """
-        Check if A and B have keywords suggesting sequential execution.
-
-        E.g., A has "setup/create/init" and B has "extend/build upon/after"
-        """
-        # A should be foundational
-        a_is_foundational = any(kw in text_a for kw in [
-            "setup", "initial", "foundation", "base", "core",
-            "create", "implement", "add new", "introduce", "establish"
-        ])
-
-        # B should be dependent
-        b_is_dependent = any(kw in text_b for kw in [
-            "extend", "build on", "enhance", "improve", "after",
-            "follow up", "continuation", "based on", "using the"
-        ])
-
-        return a_is_foundational and b_is_dependent
-
-    def _check_explicit_dependency_markers(self, text_a: str, text_b: str) -> Optional[str]:
+    def _check_explicit_dependency_markers(self, a: _DescriptionFeatures,
+                                           b: _DescriptionFeatures) -> Optional[str]:
         """
         Check if B explicitly mentions depending on something A creates.
         """
-        import re
-
-        # Look for explicit dependency phrases in B
-        for pattern in self.DEPEND_PATTERNS:
-            if pattern in text_b:
-                # See if what it depends on is mentioned in A
-                # Pattern: "depends on X" - check if X is in A
-                match = re.search(rf'{pattern}\s+(?:the\s+)?(\w+(?:\s+\w+)?)', text_b)
-                if match:
-                    dependent_item = match.group(1).lower()
-                    if dependent_item in text_a:
-                        return f"'{dependent_item}' in A, B {pattern} it"
+        # "depends on X" in B - check if X is in A
+        for phrase, dependent_item in b.markers:
+            if dependent_item in a.text:
+                return f"'{dependent_item}' in A, B {phrase} it"
 
         return None
 
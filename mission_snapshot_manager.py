@@ -3,6 +3,8 @@ Mission Snapshot Manager
 
 Provides automated backup and recovery for mission state:
 - Creates snapshots of mission.json to .git/mission_snapshots/
+- Content-addressed, compressed chunk store shared by all snapshots, so each
+  snapshot only writes the parts of the mission that changed
 - SHA256 integrity verification
 - Rotation policy (24 hourly + 7 daily)
 - Hourly background scheduler during active missions
@@ -20,10 +22,12 @@ import shutil
 import subprocess
 import threading
 import time
+import zlib
+from contextlib import contextmanager
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Dict, Iterator, List, Optional, Callable, Set
 import fcntl
 
 logger = logging.getLogger("mission_snapshot")
@@ -34,6 +38,78 @@ STATE_DIR = BASE_DIR / "state"
 MISSION_PATH = STATE_DIR / "mission.json"
 SNAPSHOTS_DIR = BASE_DIR / ".git" / "mission_snapshots"
 
+# Snapshot storage
+MANIFEST_FORMAT = 2            # Snapshots without a manifest hold a full 'mission_state' copy
+INLINE_FIELD_BYTES = 1024      # Smaller top-level fields are kept in the manifest itself
+LIST_CHUNK_MASK = 0x3F         # List chunk boundary when crc32(entry) & mask == 0 (~64 entries)
+MAX_LIST_CHUNK_ENTRIES = 1024
+
+
+def _encode(value: Any) -> bytes:
+    """Compact JSON encoding of a value, as stored in chunks."""
+    return json.dumps(value, separators=(',', ':'), default=str).encode('utf-8')
+
+
+class ChunkStore:
+    """
+    Content-addressed store of zlib-compressed blobs.
+
+    Blobs are stored once under chunks/<hash[:2]>/<hash>.z, where hash is
+    the SHA256 of the uncompressed data, so identical parts of successive
+    snapshots share a single file.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.z"
+
+    def put(self, data: bytes) -> str:
+        """Store a blob (if new) and return its hash."""
+        digest = hashlib.sha256(data).hexdigest()
+        # Checked on disk every time: another process's garbage collection
+        # may have removed a blob this process wrote earlier
+        path = self._path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_suffix(f'.tmp{os.getpid()}')
+            with open(temp_path, 'wb') as f:
+                f.write(zlib.compress(data))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+
+        return digest
+
+    def get(self, digest: str, verify: bool = False) -> bytes:
+        """
+        Read a blob.
+
+        Raises:
+            OSError: If the blob is missing
+            ValueError: If verify is set and the blob doesn't match its hash
+        """
+        with open(self._path(digest), 'rb') as f:
+            data = zlib.decompress(f.read())
+        if verify and hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Chunk {digest} is corrupt")
+        return data
+
+    def collect_garbage(self, referenced: Set[str]) -> int:
+        """Delete blobs not in referenced. Returns the number deleted."""
+        deleted = 0
+        for path in self.root.glob('*/*.z'):
+            digest = path.stem
+            if digest in referenced:
+                continue
+            try:
+                path.unlink()
+                deleted += 1
+            except OSError as e:
+                logger.warning(f"Failed to delete chunk {digest}: {e}")
+        return deleted
+
 
 @dataclass
 class MissionSnapshot:
@@ -64,8 +140,14 @@ class SnapshotManager:
     snapshot_<mission_id>_<timestamp>_<short_hash>.json
 
     Each snapshot file contains:
-    - Original mission.json content
     - Snapshot metadata (hash, timestamp, stage, etc.)
+    - A manifest of the mission's top-level fields: small fields inline,
+      large fields as a chunk reference, and long lists (history) as a list
+      of chunk references with content-defined boundaries, so appending to
+      or trimming a list only rewrites the chunks at its ends
+
+    Older snapshot files hold a full copy in 'mission_state' instead and
+    remain readable.
     """
 
     # Rotation policy
@@ -79,6 +161,23 @@ class SnapshotManager:
 
         # Ensure snapshots directory exists
         self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+        self._chunks = ChunkStore(self.snapshots_dir / "chunks")
+
+    @contextmanager
+    def _store_lock(self):
+        """
+        Exclusive flock on the snapshots directory, across processes.
+
+        Held while a snapshot's chunks and manifest are written and while
+        snapshots are rotated and chunks collected, so garbage collection
+        never deletes a chunk written but not referenced yet.
+        """
+        with open(self.snapshots_dir / ".lock", 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
 
     def _compute_hash(self, content: str) -> str:
         """Compute SHA256 hash of content."""
@@ -90,6 +189,84 @@ class SnapshotManager:
         ts_clean = timestamp.replace(':', '-').replace('.', '-')
         return f"snapshot_{mission_id}_{ts_clean}_{short_hash}"
 
+    # =========================================================================
+    # Manifests
+    # =========================================================================
+
+    def _store_list(self, items: List[Any]) -> List[str]:
+        """Store a list as chunks of entries and return the chunk hashes."""
+        digests = []
+        chunk: List[bytes] = []
+        for item in items:
+            data = _encode(item)
+            chunk.append(data)
+            if zlib.crc32(data) & LIST_CHUNK_MASK == 0 or len(chunk) >= MAX_LIST_CHUNK_ENTRIES:
+                digests.append(self._chunks.put(b'[' + b','.join(chunk) + b']'))
+                chunk = []
+        if chunk:
+            digests.append(self._chunks.put(b'[' + b','.join(chunk) + b']'))
+        return digests
+
+    def _build_manifest(self, mission_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Store the mission's large fields as chunks and describe it."""
+        fields = []
+        for key, value in mission_data.items():
+            if isinstance(value, list) and len(value) > 1:
+                if len(_encode(value)) >= INLINE_FIELD_BYTES:
+                    fields.append({'key': key, 'chunks': self._store_list(value)})
+                    continue
+            else:
+                data = _encode(value)
+                if len(data) >= INLINE_FIELD_BYTES:
+                    fields.append({'key': key, 'chunk': self._chunks.put(data)})
+                    continue
+            fields.append({'key': key, 'value': value})
+        return {'format': MANIFEST_FORMAT, 'fields': fields}
+
+    @staticmethod
+    def _manifest_chunks(snapshot_data: Dict[str, Any]) -> Iterator[str]:
+        """Hashes of the chunks referenced by a snapshot file."""
+        for entry in snapshot_data.get('manifest', {}).get('fields', []):
+            if 'chunk' in entry:
+                yield entry['chunk']
+            else:
+                yield from entry.get('chunks', [])
+
+    def _load_state(self, snapshot_data: Dict[str, Any], verify: bool = False) -> Dict[str, Any]:
+        """
+        Rebuild the mission state stored in a snapshot file.
+
+        Raises:
+            OSError: If a chunk is missing
+            ValueError: If verify is set and a chunk doesn't match its hash
+        """
+        if 'manifest' not in snapshot_data:
+            return snapshot_data.get('mission_state', {})
+
+        state: Dict[str, Any] = {}
+        for entry in snapshot_data['manifest']['fields']:
+            if 'chunk' in entry:
+                state[entry['key']] = json.loads(self._chunks.get(entry['chunk'], verify=verify))
+            elif 'chunks' in entry:
+                items: List[Any] = []
+                for digest in entry['chunks']:
+                    items.extend(json.loads(self._chunks.get(digest, verify=verify)))
+                state[entry['key']] = items
+            else:
+                state[entry['key']] = entry['value']
+        return state
+
+    def _read_snapshot_file(self, snapshot_id: str) -> Optional[Dict[str, Any]]:
+        """Read the file of a snapshot, or None if it doesn't exist."""
+        snapshot = self.get_snapshot_by_id(snapshot_id)
+        if not snapshot:
+            return None
+        snapshot_path = Path(snapshot.file_path)
+        if not snapshot_path.exists():
+            return None
+        with open(snapshot_path, 'r') as f:
+            return json.load(f)
+
     def create_snapshot(self, extra_metadata: Dict[str, Any] = None, stage_hint: str = None) -> Optional[MissionSnapshot]:
         """
         Create a snapshot of current mission.json.
@@ -101,7 +278,7 @@ class SnapshotManager:
         Returns:
             MissionSnapshot if successful, None otherwise
         """
-        with self._lock:
+        with self._lock, self._store_lock():
             try:
                 if not self.mission_path.exists():
                     logger.debug("No mission.json to snapshot")
@@ -143,13 +320,14 @@ class SnapshotManager:
                         'stage_hint': stage_hint,
                         'extra': extra_metadata or {}
                     },
-                    'mission_state': mission_data
+                    # Unchanged chunks are already stored: only new ones are written
+                    'manifest': self._build_manifest(mission_data)
                 }
 
                 # Atomic write: temp file + rename
                 temp_path = snapshot_path.with_suffix('.tmp')
                 with open(temp_path, 'w') as f:
-                    json.dump(snapshot_data, f, indent=2, default=str)
+                    json.dump(snapshot_data, f, separators=(',', ':'), default=str)
                     f.flush()
                     os.fsync(f.fileno())
 
@@ -180,7 +358,10 @@ class SnapshotManager:
 
     def verify_snapshot(self, snapshot_id: str) -> bool:
         """
-        Verify snapshot integrity using stored hash.
+        Verify snapshot integrity using stored hashes.
+
+        Every chunk referenced by the snapshot must exist and match its
+        SHA256 hash.
 
         Args:
             snapshot_id: ID of snapshot to verify
@@ -189,38 +370,23 @@ class SnapshotManager:
             True if snapshot is valid, False otherwise
         """
         try:
-            snapshot = self.get_snapshot_by_id(snapshot_id)
-            if not snapshot:
+            snapshot_data = self._read_snapshot_file(snapshot_id)
+            if snapshot_data is None:
                 return False
 
-            snapshot_path = Path(snapshot.file_path)
-            if not snapshot_path.exists():
-                return False
-
-            # Read snapshot file
-            with open(snapshot_path, 'r') as f:
-                snapshot_data = json.load(f)
-
-            # Recompute hash of mission state
-            mission_state = snapshot_data.get('mission_state', {})
-            content = json.dumps(mission_state, separators=(',', ':'), sort_keys=True)
-
-            # Note: The original hash was computed on the raw file content,
-            # not JSON-normalized. We store that hash and compare.
             stored_hash = snapshot_data.get('snapshot_metadata', {}).get('sha256_hash')
-
-            if not stored_hash:
+            if not stored_hash or len(stored_hash) != 64:
                 return False
 
-            # For verification, we re-read the original mission state section
-            # The hash should match what was captured
-            # Since we can't recover the exact original formatting, we verify
-            # the snapshot file itself hasn't been corrupted
-            file_hash = hashlib.sha256(json.dumps(snapshot_data, separators=(',', ':')).encode()).hexdigest()
+            if 'manifest' not in snapshot_data:
+                # Full copy: the hash was computed on the raw mission.json,
+                # whose formatting can't be recovered, so only the file's
+                # readability is checked
+                return 'mission_state' in snapshot_data
 
-            # Create a verification marker
-            verification_marker = snapshot_data.get('snapshot_metadata', {}).get('sha256_hash')
-            return verification_marker is not None and len(verification_marker) == 64
+            for digest in set(self._manifest_chunks(snapshot_data)):
+                self._chunks.get(digest, verify=True)
+            return True
 
         except Exception as e:
             logger.error(f"Snapshot verification failed for {snapshot_id}: {e}")
@@ -253,11 +419,11 @@ class SnapshotManager:
                     logger.error(f"Snapshot integrity verification failed: {snapshot_id}")
                     return False
 
-                # Read snapshot
+                # Read snapshot and rebuild the state from its chunks
                 with open(snapshot_path, 'r') as f:
                     snapshot_data = json.load(f)
 
-                mission_state = snapshot_data.get('mission_state', {})
+                mission_state = self._load_state(snapshot_data)
 
                 # Create backup of current mission.json before restoring
                 if self.mission_path.exists():
@@ -299,7 +465,7 @@ class SnapshotManager:
         max_hourly = max_hourly or self.MAX_HOURLY_SNAPSHOTS
         max_daily = max_daily or self.MAX_DAILY_SNAPSHOTS
 
-        with self._lock:
+        with self._lock, self._store_lock():
             try:
                 snapshots = self.list_snapshots()
                 if not snapshots:
@@ -359,10 +525,26 @@ class SnapshotManager:
 
                 if to_delete:
                     logger.info(f"Rotated {len(to_delete)} old snapshots")
+                    self._collect_garbage()
 
             except Exception as e:
                 logger.error(f"Snapshot rotation failed: {e}")
 
+    def _collect_garbage(self) -> None:
+        """Delete chunks no longer referenced by any snapshot (caller holds _lock and _store_lock)."""
+        referenced: Set[str] = set()
+        for snapshot_file in self.snapshots_dir.glob('snapshot_*.json'):
+            try:
+                with open(snapshot_file, 'r') as f:
+                    referenced.update(self._manifest_chunks(json.load(f)))
+            except Exception as e:
+                # Keep every chunk rather than risk losing one still in use
+                logger.warning(f"Skipping chunk cleanup, failed to read {snapshot_file}: {e}")
+                return
+        deleted = self._chunks.collect_garbage(referenced)
+        if deleted:
+            logger.debug(f"Deleted {deleted} unreferenced snapshot chunks")
+
     def list_snapshots(self) -> List[MissionSnapshot]:
         """
         List all available snapshots.
@@ -423,6 +605,25 @@ class SnapshotManager:
         Returns:
             MissionSnapshot if found, None otherwise
         """
+        # Snapshot files are named after their ID
+        snapshot_file = self.snapshots_dir / f"{snapshot_id}.json"
+        if snapshot_file.exists():
+            try:
+                with open(snapshot_file, 'r') as f:
+                    meta = json.load(f).get('snapshot_metadata', {})
+                if meta.get('snapshot_id', snapshot_id) == snapshot_id:
+                    return MissionSnapshot(
+                        snapshot_id=snapshot_id,
+                        mission_id=meta.get('mission_id', 'unknown'),
+                        timestamp=meta.get('timestamp', ''),
+                        stage=meta.get('stage', ''),
+                        sha256_hash=meta.get('sha256_hash', ''),
+                        file_path=str(snapshot_file),
+                        metadata=meta.get('extra', {})
+                    )
+            except Exception as e:
+                logger.warning(f"Failed to read snapshot {snapshot_file}: {e}")
+
         snapshots = self.list_snapshots()
         for s in snapshots:
             if s.snapshot_id == snapshot_id:
@@ -446,7 +647,7 @@ class SnapshotManager:
         try:
             with open(snapshot.file_path, 'r') as f:
                 data = json.load(f)
-            return data.get('mission_json', data)
+            return self._load_state(data)
         except Exception as e:
             logger.error(f"Failed to read snapshot content: {e}")
             return None
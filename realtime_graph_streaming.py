@@ -11,6 +11,9 @@ via WebSockets. Features include:
 4. Live statistics overlay (nodes/min, coverage, depth)
 5. Audio feedback hooks for new discoveries
 6. Time-lapse recording that can be exported as video
+7. Resumable streams: events carry sequence numbers and are kept in a
+   ring buffer, so a reconnecting client only receives what it missed
+8. Micro-batching: events are sent as one 'graph_batch' frame per tick
 
 Part of the Interactive Exploration Graph Enhancement mission.
 """
@@ -19,12 +22,21 @@ import json
 import time
 import threading
 import queue
+import uuid
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field, asdict
 from typing import Dict, List, Optional, Callable, Any, Set
 from pathlib import Path
 from collections import deque
 
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+EVENT_LOG_SIZE = 5000   # Graph events kept for resuming clients
+BATCH_INTERVAL = 0.1    # Seconds events are collected before a frame is sent
+
+
 # =============================================================================
 # DATA STRUCTURES
 # =============================================================================
@@ -81,6 +93,12 @@ class ExplorationStreamManager:
 
     Thread-safe singleton that buffers events and broadcasts
     them to connected WebSocket clients.
+
+    Graph events get consecutive sequence numbers and are kept in a ring
+    buffer of EVENT_LOG_SIZE. Clients hold a resume token
+    ('<stream_id>:<sequence>'); get_changes_since() returns only the events
+    after it, or a snapshot of the current state when the token is from
+    another stream (server restart, reset) or too old.
     """
 
     _instance = None
@@ -99,10 +117,15 @@ class ExplorationStreamManager:
 
         self._initialized = True
 
-        # Event tracking
+        # Event tracking: serialized graph events, oldest first
         self.event_queue = queue.Queue(maxsize=1000)
-        self.recent_events = deque(maxlen=100)
+        self.recent_events: deque = deque(maxlen=EVENT_LOG_SIZE)
         self.sequence_counter = 0
+        self.stream_id = uuid.uuid4().hex[:12]
+
+        # Events waiting for the next batch frame
+        self._pending_events: List[Dict] = []
+        self._flush_timer: Optional[threading.Timer] = None
 
         # Statistics tracking
         self.stats = LiveStatistics()
@@ -291,6 +314,8 @@ class ExplorationStreamManager:
             self._update_node_rate()
             self._update_depth_stats()
 
+            # Stats are not graph changes: they carry the current sequence
+            # and are not kept for resuming clients
             event = StreamEvent(
                 event_type='stats_update',
                 timestamp=datetime.now().isoformat(),
@@ -298,27 +323,62 @@ class ExplorationStreamManager:
                 sequence=self.sequence_counter
             )
 
-            self._emit_event(event)
+            self._emit_event(event, log=False)
 
-    def _emit_event(self, event: StreamEvent):
-        """Internal method to emit an event."""
-        # Add to recent events
-        self.recent_events.append(event)
+    def _emit_event(self, event: StreamEvent, log: bool = True):
+        """Internal method to emit an event (called with the state lock held)."""
+        # Serialized once, shared by the log, the queue and the batch frame
+        payload = event.to_dict()
+
+        if log:
+            self.recent_events.append(payload)
 
         # Add to queue for processing
         try:
-            self.event_queue.put_nowait(event.to_dict())
+            self.event_queue.put_nowait(payload)
         except queue.Full:
             # Drop oldest event and try again
             try:
                 self.event_queue.get_nowait()
-                self.event_queue.put_nowait(event.to_dict())
+                self.event_queue.put_nowait(payload)
             except queue.Empty:
                 pass
 
-        # Broadcast via callback
+        # Broadcast with the next batch frame
         if self.broadcast_callback:
-            self.broadcast_callback('graph_update', event.to_dict())
+            self._pending_events.append(payload)
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(BATCH_INTERVAL, self.flush_events)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush_events(self) -> int:
+        """
+        Broadcast pending events as one 'graph_batch' frame.
+
+        Called by a timer BATCH_INTERVAL after the first pending event.
+
+        Returns:
+            Number of events sent
+        """
+        with self._state_lock:
+            events = self._pending_events
+            self._pending_events = []
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            frame = {
+                'events': events,
+                'sequence': self.sequence_counter,
+                'resume_token': self._resume_token()
+            }
+
+        if events and self.broadcast_callback:
+            self.broadcast_callback('graph_batch', frame)
+        return len(events)
+
+    def _resume_token(self) -> str:
+        return f"{self.stream_id}:{self.sequence_counter}"
 
     def _update_node_rate(self):
         """Update the nodes-per-minute calculation."""
@@ -450,18 +510,57 @@ class ExplorationStreamManager:
     def get_current_state(self) -> Dict:
         """Get the current graph state for new connections."""
         with self._state_lock:
-            return {
-                'nodes': list(self.current_nodes.values()),
-                'edges': list(self.current_edges.values()),
-                'stats': self.stats.to_dict(),
-                'sequence': self.sequence_counter
-            }
+            return self._snapshot()
+
+    def _snapshot(self) -> Dict:
+        return {
+            'nodes': list(self.current_nodes.values()),
+            'edges': list(self.current_edges.values()),
+            'stats': self.stats.to_dict(),
+            'sequence': self.sequence_counter,
+            'resume_token': self._resume_token()
+        }
+
+    def get_changes_since(self, resume_token: Optional[str] = None) -> Dict:
+        """
+        Get what a client missed since its resume token.
+
+        Args:
+            resume_token: Token from the client's last frame or state (None
+                for a new client)
+
+        Returns:
+            Dict with 'mode': 'delta' and the missed 'events', or
+            'snapshot' and the current state; both with a new 'resume_token'
+        """
+        with self._state_lock:
+            since = None
+            if resume_token:
+                stream_id, _, sequence = resume_token.rpartition(':')
+                if stream_id == self.stream_id and sequence.isdigit():
+                    since = int(sequence)
+
+            # Logged events have consecutive sequences: the missed ones are a
+            # suffix of the log, if it reaches back far enough
+            first = self.recent_events[0]['sequence'] if self.recent_events else self.sequence_counter + 1
+            if since is not None and first - 1 <= since <= self.sequence_counter:
+                missed = self.sequence_counter - since
+                events = list(self.recent_events)[len(self.recent_events) - missed:] if missed else []
+                return {
+                    'mode': 'delta',
+                    'events': events,
+                    'sequence': self.sequence_counter,
+                    'resume_token': self._resume_token()
+                }
+
+            state = self._snapshot()
+            state['mode'] = 'snapshot'
+            return state
 
     def get_recent_events(self, limit: int = 50) -> List[Dict]:
         """Get recent events."""
         with self._state_lock:
-            events = list(self.recent_events)[-limit:]
-            return [e.to_dict() for e in events]
+            return list(self.recent_events)[-limit:] if limit > 0 else []
 
     def reset(self):
         """Reset the stream manager state."""
@@ -473,6 +572,9 @@ class ExplorationStreamManager:
             self.recent_events.clear()
             self.node_timestamps.clear()
             self.sequence_counter = 0
+            # Tokens of the old stream now get a snapshot
+            self.stream_id = uuid.uuid4().hex[:12]
+            self._pending_events = []
             self.stats = LiveStatistics()
             self.stats.session_start = datetime.now().isoformat()
             self.recording = False
@@ -511,16 +613,13 @@ def register_streaming_routes(app, socketio):
     # WebSocket event handlers
     @socketio.on('connect', namespace='/graph')
     def handle_connect():
-        """Handle new WebSocket connection."""
-        stream_manager.stats.active_connections += 1
-
-        # Send current state to new connection
-        state = stream_manager.get_current_state()
-        socketio.emit('initial_state', state, namespace='/graph')
+        """
+        Handle new WebSocket connection.
 
-        # Send recent events
-        recent = stream_manager.get_recent_events(20)
-        socketio.emit('recent_events', {'events': recent}, namespace='/graph')
+        The client follows up with 'request_state' and its resume token,
+        so nothing is sent here.
+        """
+        stream_manager.stats.active_connections += 1
 
     @socketio.on('disconnect', namespace='/graph')
     def handle_disconnect():
@@ -530,10 +629,20 @@ def register_streaming_routes(app, socketio):
         )
 
     @socketio.on('request_state', namespace='/graph')
-    def handle_request_state():
-        """Handle request for current state."""
-        state = stream_manager.get_current_state()
-        socketio.emit('current_state', state, namespace='/graph')
+    def handle_request_state(data=None):
+        """
+        Handle request for current state, sent to the requesting client only.
+
+        With {'resume_token': ...} from a previous frame, only the missed
+        events are sent ('state_delta'); otherwise, or when the token is too
+        old, the full state ('current_state').
+        """
+        token = data.get('resume_token') if isinstance(data, dict) else None
+        changes = stream_manager.get_changes_since(token)
+        if changes['mode'] == 'delta':
+            socketio.emit('state_delta', changes, namespace='/graph', to=request.sid)
+        else:
+            socketio.emit('current_state', changes, namespace='/graph', to=request.sid)
 
     @socketio.on('request_stats', namespace='/graph')
     def handle_request_stats():
@@ -570,7 +679,15 @@ def register_streaming_routes(app, socketio):
 
     @app.route('/api/graph/stream/events')
     def api_graph_stream_events():
-        """Get recent events."""
+        """
+        Get recent events.
+
+        With ?resume_token=..., get the events missed since that token (or
+        a snapshot if it is too old), as in the 'request_state' event.
+        """
+        token = request.args.get('resume_token')
+        if token is not None:
+            return jsonify(stream_manager.get_changes_since(token))
         limit = request.args.get('limit', 50, type=int)
         return jsonify({'events': stream_manager.get_recent_events(limit)})
 
@@ -726,6 +843,12 @@ class RealtimeGraphStream {
         this.recording = false;
         this.recordedFrames = [];
 
+        // Resume position: after a reconnect only missed events are sent
+        this.resumeToken = null;
+        this.lastSequence = 0;
+        this.synced = false;
+        this.pendingFrames = [];  // Frames received before the resume reply
+
         // Physics simulation for smooth animations
         this.physics = {
             nodes: new Map(),  // nodeId -> {vx, vy, targetX, targetY}
@@ -749,8 +872,11 @@ class RealtimeGraphStream {
 
         this.socket.on('connect', () => {
             this.connected = true;
+            this.synced = false;
+            this.pendingFrames = [];
             this.updateConnectionStatus(true);
             console.log('Connected to graph stream');
+            this.socket.emit('request_state', {resume_token: this.resumeToken});
         });
 
         this.socket.on('disconnect', () => {
@@ -759,19 +885,27 @@ class RealtimeGraphStream {
             console.log('Disconnected from graph stream');
         });
 
-        this.socket.on('initial_state', (data) => {
+        this.socket.on('current_state', (data) => {
             this.handleInitialState(data);
+            this.markSynced(data);
+            this.applyPendingFrames();
         });
 
-        this.socket.on('graph_update', (event) => {
-            this.handleGraphUpdate(event);
+        this.socket.on('state_delta', (data) => {
+            // Catch up on the events missed while disconnected
+            this.applyEvents(data.events || [], false);
+            this.markSynced(data);
+            this.applyPendingFrames();
         });
 
-        this.socket.on('recent_events', (data) => {
-            // Process recent events for catch-up
-            if (data.events) {
-                data.events.forEach(event => this.handleGraphUpdate(event, false));
+        this.socket.on('graph_batch', (frame) => {
+            // Held until the resume reply: it may or may not cover the frame
+            if (!this.synced) {
+                this.pendingFrames.push(frame);
+                return;
             }
+            this.applyEvents(frame.events || [], true);
+            this.markSynced(frame);
         });
 
         this.socket.on('recording_started', () => {
@@ -795,6 +929,39 @@ class RealtimeGraphStream {
         this.updateConnectionStatus(false);
     }
 
+    markSynced(data) {
+        const sequence = data.sequence || 0;
+        // A snapshot replaces everything, even after a server restart; the
+        // token of a frame older than what was applied would resume too early
+        if (data.mode === 'snapshot' || sequence >= this.lastSequence) {
+            this.resumeToken = data.resume_token || this.resumeToken;
+        }
+        this.lastSequence = data.mode === 'snapshot' ? sequence : Math.max(this.lastSequence, sequence);
+        this.synced = true;
+    }
+
+    applyPendingFrames() {
+        // Events the resume reply already covered are skipped by sequence
+        const frames = this.pendingFrames;
+        this.pendingFrames = [];
+        frames.forEach(frame => {
+            this.applyEvents(frame.events || [], true);
+            this.markSynced(frame);
+        });
+    }
+
+    applyEvents(events, playSound) {
+        let played = false;
+        events.forEach(event => {
+            // Stats carry the current sequence; graph events are applied once
+            if (event.event_type !== 'stats_update' && event.sequence <= this.lastSequence) return;
+            if (event.event_type !== 'stats_update') this.lastSequence = event.sequence;
+            // One sound per frame
+            this.handleGraphUpdate(event, playSound && !played);
+            played = played || event.event_type === 'node_added';
+        });
+    }
+
     handleInitialState(state) {
         if (!enhancedGraphRenderer) return;
 
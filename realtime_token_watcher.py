@@ -10,7 +10,8 @@ until the mission completes.
 Architecture:
   - Uses watchdog library with inotify backend (Linux native, efficient)
   - Falls back to polling if watchdog unavailable
-  - Tracks file offsets for incremental JSONL reading (no re-parsing)
+  - Reads transcripts through the shared transcript tailer (byte offsets,
+    usage lines only), so files the context watcher also tails are parsed once
   - Records via mission_analytics.record_token_usage()
   - Pushes updates via existing SocketIO broadcast
 
@@ -28,7 +29,6 @@ Usage:
     watcher.stop()
 """
 
-import json
 import logging
 import os
 import threading
@@ -38,6 +38,11 @@ from pathlib import Path
 from typing import Dict, Any, Optional, Set, Callable
 
 from atlasforge_config import ANALYTICS_DIR
+from context_watcher.transcript_tailer import (
+    CLAUDE_USAGE_PATTERNS,
+    TranscriptSubscription,
+    get_transcript_tailer,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -63,10 +68,10 @@ REALTIME_TOKEN_WATCHER_ENABLED = os.environ.get(
 
 class TranscriptFileTracker:
     """
-    Tracks file offsets for incremental JSONL reading.
+    Tracks transcript subscriptions for incremental JSONL reading.
 
-    Maintains the last read position for each file so we only
-    process new entries, not re-parse the entire file.
+    Holds one subscription per file on the shared transcript tailer, so
+    only new usage entries are processed, not the entire file.
     """
 
     def __init__(self, max_seen_ids: int = 10000):
@@ -77,7 +82,7 @@ class TranscriptFileTracker:
             max_seen_ids: Maximum number of request IDs to remember
                           for deduplication (older ones are dropped)
         """
-        self._file_offsets: Dict[str, int] = {}
+        self._subscriptions: Dict[str, TranscriptSubscription] = {}
         self._seen_request_ids: Set[str] = set()
         self._max_seen_ids = max_seen_ids
         self._lock = threading.Lock()
@@ -85,7 +90,9 @@ class TranscriptFileTracker:
     def reset(self):
         """Reset all tracking state (call when mission changes)."""
         with self._lock:
-            self._file_offsets.clear()
+            for subscription in self._subscriptions.values():
+                subscription.close()
+            self._subscriptions.clear()
             self._seen_request_ids.clear()
 
     def preload_seen_ids_from_db(self, mission_id: str):
@@ -128,49 +135,24 @@ class TranscriptFileTracker:
 
     def get_new_entries(self, file_path: str):
         """
-        Read and yield new JSONL entries from a file.
+        Read and yield new usage entries from a file.
 
         Args:
             file_path: Path to the JSONL transcript file
 
         Yields:
-            Parsed JSON records that haven't been seen before
+            Parsed JSON records carrying usage data
         """
         path = str(file_path)
 
         with self._lock:
-            offset = self._file_offsets.get(path, 0)
+            subscription = self._subscriptions.get(path)
+            if subscription is None:
+                subscription = get_transcript_tailer().subscribe(path, CLAUDE_USAGE_PATTERNS)
+                self._subscriptions[path] = subscription
 
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                # Seek to last known position
-                f.seek(offset)
-
-                new_entries = []
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        record = json.loads(line)
-                        new_entries.append(record)
-                    except json.JSONDecodeError as e:
-                        logger.debug(f"Skipping malformed JSON line: {e}")
-                        continue
-
-                # Update offset
-                new_offset = f.tell()
-                with self._lock:
-                    self._file_offsets[path] = new_offset
-
-                for entry in new_entries:
-                    yield entry
-
-        except UnicodeDecodeError as e:
-            # Handle binary files or files with invalid UTF-8
-            logger.debug(f"Skipping file with encoding error {path}: {e}")
-        except (IOError, OSError) as e:
-            logger.debug(f"Error reading transcript file {path}: {e}")
+        for entry in subscription.read():
+            yield entry
 
     def is_seen(self, request_id: str) -> bool:
         """Check if a request ID has been seen (for deduplication)."""
@@ -558,6 +540,7 @@ class RealTimeTokenWatcher:
             logger.info(f"Stopped real-time token watching for {self._mission_id} "
                        f"({self._events_recorded} events recorded)")
 
+        self._tracker.reset()
         self._mission_id = None
         self._workspace_path = None
         self._transcript_dir = None
@@ -12,7 +12,8 @@ Features:
 - Path-based routing with glob pattern matching
 - Priority-based conflict resolution
 - Integration with existing git_checkpoint and git_push_manager
-- Multi-repo commit and sync operations
+- Multi-repo commit and sync operations, run concurrently across repos
+  (bounded worker pool, one operation at a time per repo)
 - CLI interface for manual operations
 
 Usage:
@@ -35,8 +36,10 @@ import subprocess
 import fnmatch
 import json
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict, Tuple, Set, Any
+from typing import Optional, List, Dict, Tuple, Set, Any, Callable, TypeVar
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from enum import Enum
@@ -50,6 +53,11 @@ except ImportError:
 
 logger = logging.getLogger("repo_router")
 
+# Max repos operated on concurrently (settings.git_workers overrides)
+DEFAULT_GIT_WORKERS = 4
+
+T = TypeVar("T")
+
 
 # =============================================================================
 # Error Classes
@@ -411,10 +419,60 @@ class ChangeDispatcher:
     Manages staging, committing, and pushing operations.
     """
 
-    def __init__(self, registry: RepoRegistry, atlasforge_root: str):
-        """Initialize with registry and AtlasForge root path."""
+    def __init__(self, registry: RepoRegistry, atlasforge_root: str, max_workers: Optional[int] = None):
+        """
+        Initialize with registry and AtlasForge root path.
+
+        Args:
+            registry: Configured repositories
+            atlasforge_root: Root path of AtlasForge installation
+            max_workers: Max repos operated on concurrently (1 = serial)
+        """
         self.registry = registry
         self.atlasforge_root = os.path.abspath(atlasforge_root)
+        self.max_workers = max(1, max_workers or DEFAULT_GIT_WORKERS)
+        # Per-repo locks: git operations on one repo never overlap
+        self._repo_locks: Dict[str, threading.RLock] = {}
+        self._repo_locks_guard = threading.Lock()
+
+    def _repo_lock(self, repo: RepoConfig) -> threading.RLock:
+        """Get the lock serializing operations on a repository."""
+        key = os.path.realpath(repo.path)
+        with self._repo_locks_guard:
+            lock = self._repo_locks.get(key)
+            if lock is None:
+                lock = self._repo_locks[key] = threading.RLock()
+            return lock
+
+    def map_repos(self, repos: List[RepoConfig], operation: Callable[[RepoConfig], T]) -> List[T]:
+        """
+        Run an operation on each repository, concurrently across repos.
+
+        Each call holds the repo's lock, so two operations (or two entries
+        for the same path) never run git in one repo at the same time.
+
+        Args:
+            repos: Repositories to operate on
+            operation: Called with each repository
+
+        Returns:
+            Results in the order of repos
+
+        Raises:
+            The first exception raised by an operation (in repo order),
+            after every operation has finished
+        """
+        def run(repo: RepoConfig) -> T:
+            with self._repo_lock(repo):
+                return operation(repo)
+
+        workers = min(self.max_workers, len(repos))
+        if workers <= 1:
+            return [run(repo) for repo in repos]
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="repo-git") as executor:
+            futures = [executor.submit(run, repo) for repo in repos]
+        return [future.result() for future in futures]
 
     def _run_git(
         self,
@@ -510,35 +568,55 @@ class ChangeDispatcher:
         return subprocess.CompletedProcess(cmd, -1, "", "Unknown error")
 
     def get_repo_status(self, repo: RepoConfig) -> Dict:
-        """Get git status for a repository."""
-        result = self._run_git(repo.path, "status", "--porcelain", check=False)
+        """
+        Get git status for a repository.
+
+        Changes, branch and ahead/behind counts come from a single
+        "git status --porcelain=v2 --branch" call.
+        """
+        result = self._run_git(repo.path, "status", "--porcelain=v2", "--branch", check=False)
 
         if result.returncode != 0:
             return {"error": result.stderr, "changes": []}
 
         changes = []
-        for line in result.stdout.strip().split("\n"):
-            if line:
-                status = line[:2]
-                filepath = line[3:]
-                changes.append({"status": status, "file": filepath})
-
-        # Get remote status
-        result = self._run_git(
-            repo.path, "rev-list", "--count", "@{upstream}..HEAD", check=False
-        )
-        ahead = int(result.stdout.strip()) if result.returncode == 0 else 0
-
-        result = self._run_git(
-            repo.path, "rev-list", "--count", "HEAD..@{upstream}", check=False
-        )
-        behind = int(result.stdout.strip()) if result.returncode == 0 else 0
+        branch = None
+        upstream = None
+        ahead = 0
+        behind = 0
+        for line in result.stdout.split("\n"):
+            if not line:
+                continue
+            if line.startswith("# "):
+                header = line[2:].split(" ")
+                if header[0] == "branch.head" and header[1] != "(detached)":
+                    branch = header[1]
+                elif header[0] == "branch.upstream":
+                    upstream = header[1]
+                elif header[0] == "branch.ab":
+                    ahead = int(header[1])
+                    behind = -int(header[2])
+            elif line[0] in "?!":
+                changes.append({"status": line[0] * 2, "file": line[2:]})
+            elif line[0] == "1":
+                parts = line.split(" ", 8)
+                changes.append({"status": parts[1].replace(".", " "), "file": parts[8]})
+            elif line[0] == "2":
+                # Renamed or copied: "<path>\t<original path>"
+                parts = line.split(" ", 9)
+                path, original = parts[9].split("\t", 1)
+                changes.append({"status": parts[1].replace(".", " "), "file": f"{original} -> {path}"})
+            elif line[0] == "u":
+                parts = line.split(" ", 10)
+                changes.append({"status": parts[1], "file": parts[10]})
 
         return {
             "changes": changes,
             "has_changes": len(changes) > 0,
             "ahead": ahead,
-            "behind": behind
+            "behind": behind,
+            "branch": branch,
+            "upstream": upstream
         }
 
     def stage_files(
@@ -667,38 +745,35 @@ class ChangeDispatcher:
 
     def sync_all(self, repos: List[RepoConfig]) -> List[Dict]:
         """
-        Sync (push) all repos with changes.
+        Sync (push) all repos with changes, concurrently across repos.
 
         Returns:
-            List of sync results
+            List of sync results, in the order of repos
         """
-        results = []
-
-        for repo in repos:
-            if not repo.remote:
-                results.append({
-                    "repo": repo.name,
-                    "success": False,
-                    "message": "No remote configured"
-                })
-                continue
+        return self.map_repos(repos, self._push_if_ahead)
 
-            status = self.get_repo_status(repo)
-            if status.get("ahead", 0) > 0:
-                success, message = self.push(repo)
-                results.append({
-                    "repo": repo.name,
-                    "success": success,
-                    "message": message
-                })
-            else:
-                results.append({
-                    "repo": repo.name,
-                    "success": True,
-                    "message": "Already up to date"
-                })
+    def _push_if_ahead(self, repo: RepoConfig) -> Dict:
+        """Push a repository if it has unpushed commits."""
+        if not repo.remote:
+            return {
+                "repo": repo.name,
+                "success": False,
+                "message": "No remote configured"
+            }
 
-        return results
+        status = self.get_repo_status(repo)
+        if status.get("ahead", 0) > 0:
+            success, message = self.push(repo)
+            return {
+                "repo": repo.name,
+                "success": success,
+                "message": message
+            }
+        return {
+            "repo": repo.name,
+            "success": True,
+            "message": "Already up to date"
+        }
 
     def fetch(self, repo: RepoConfig) -> Tuple[bool, str, bool]:
         """
@@ -927,8 +1002,10 @@ class RepoRouter:
         # Initialize components
         self.registry = RepoRegistry(self.config["repos"])
         self.matcher = PathMatcher(self.config["rules"])
-        self.dispatcher = ChangeDispatcher(self.registry, self.atlasforge_root)
         self.settings = self.config.get("settings", {})
+        self.dispatcher = ChangeDispatcher(
+            self.registry, self.atlasforge_root, max_workers=self.settings.get("git_workers")
+        )
 
     def _load_config(self) -> Dict:
         """
@@ -1206,8 +1283,9 @@ class RepoRouter:
         Returns:
             List of CommitResults
         """
-        results = []
         per_repo_messages = per_repo_messages or {}
+        repos = []
+        files_by_repo: Dict[str, List[str]] = {}
 
         for repo_id, routed_files in route_result.files_by_repo.items():
             repo = self.registry.get(repo_id)
@@ -1222,13 +1300,16 @@ class RepoRouter:
                 else:
                     files.append(rf.file_path)
 
-            # Use repo-specific message or default
-            commit_msg = per_repo_messages.get(repo_id, message)
+            repos.append(repo)
+            files_by_repo[repo_id] = files
 
-            result = self.dispatcher.commit(repo, commit_msg, files)
-            results.append(result)
-
-        return results
+        # Commit to each repo concurrently, with the repo-specific message or default
+        return self.dispatcher.map_repos(
+            repos,
+            lambda repo: self.dispatcher.commit(
+                repo, per_repo_messages.get(repo.id, message), files_by_repo[repo.id]
+            )
+        )
 
     def sync_all(self) -> List[Dict]:
         """Push all repos with pending changes to their remotes."""
@@ -1249,9 +1330,16 @@ class RepoRouter:
         is_valid, issues = self.registry.validate()
         status["validation_issues"] = issues
 
+        # Query git repos concurrently
+        git_repos = [repo for repo in self.registry.repos.values() if repo.exists() and repo.has_git()]
+        repo_statuses = dict(zip(
+            [repo.id for repo in git_repos],
+            self.dispatcher.map_repos(git_repos, self.dispatcher.get_repo_status)
+        ))
+
         # Get per-repo status
         for repo_id, repo in self.registry.repos.items():
-            if not repo.exists() or not repo.has_git():
+            if repo_id not in repo_statuses:
                 status["repos"][repo_id] = {
                     "name": repo.name,
                     "path": repo.path,
@@ -1262,7 +1350,7 @@ class RepoRouter:
                 }
                 continue
 
-            repo_status = self.dispatcher.get_repo_status(repo)
+            repo_status = repo_statuses[repo_id]
             status["repos"][repo_id] = {
                 "name": repo.name,
                 "path": repo.path,
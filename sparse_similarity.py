@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Sparse Similarity - Blocked similarity joins over L2-normalized sparse rows
+
+Replaces dense all-pairs cosine similarity (O(n^2) memory) with:
+
+- similarity_graph(): a blocked sparse self-join. Rows are processed in
+  blocks sized from a memory budget; candidate pairs come from a
+  prefix-filtered join (frequent terms that cannot lift a pair over the
+  threshold are left out), are bounded, scored exactly, thresholded and
+  cut to the top-k neighbours per row before the next block is computed,
+  so peak memory stays bounded regardless of corpus size.
+- row_neighbors(): the same scores for a subset of rows against all rows,
+  to extend a graph with new rows without rebuilding it.
+- average_linkage_clusters(): average-linkage agglomerative clustering on
+  that neighbour graph. Pairs missing from the graph count as similarity 0,
+  so the result is exact when the graph holds every positive similarity
+  and a close approximation under a top-k cutoff.
+
+Rows are expected to be L2-normalized (as TF-IDF rows are), so dot products
+are cosine similarities.
+"""
+
+import heapq
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+DEFAULT_MEMORY_MB = 256  # Budget for one block of similarity scores
+DEFAULT_TOP_K = 50  # Neighbours kept per row
+BYTES_PER_SCORE = 16  # Sparse score entry (value + index) plus headroom
+MIN_BLOCK_SIZE = 16
+MAX_BLOCK_SIZE = 8192
+
+# Index prefixes for a slightly lower threshold than requested: more
+# candidates, but a much tighter bound to discard them before exact scoring
+PREFIX_FILTER_RATIO = 0.8
+
+
+def auto_block_size(n_rows: int, memory_mb: float = DEFAULT_MEMORY_MB) -> int:
+    """
+    Rows per block so that a fully dense block fits the memory budget.
+
+    Args:
+        n_rows: Number of rows in the matrix being joined
+        memory_mb: Memory budget for one block of scores
+
+    Returns:
+        Block size in rows
+    """
+    budget = int(memory_mb * 1024 * 1024)
+    block = budget // max(1, n_rows * BYTES_PER_SCORE)
+    return int(min(MAX_BLOCK_SIZE, max(MIN_BLOCK_SIZE, block)))
+
+
+def _top_k_per_row(block: csr_matrix, top_k: Optional[int]) -> csr_matrix:
+    """Keep the top_k largest entries of each row (vectorized)."""
+    if top_k is None:
+        return block
+    row_nnz = np.diff(block.indptr)
+    if len(row_nnz) == 0 or row_nnz.max() <= top_k:
+        return block
+
+    rows = np.repeat(np.arange(block.shape[0]), row_nnz)
+    # Scores are cosine similarities in (0, 1], so this sorts by row, then score descending
+    order = np.argsort(rows * 2.0 - block.data)
+    rank = np.arange(len(order)) - block.indptr[rows[order]]
+    keep = order[rank < top_k]
+    return csr_matrix((block.data[keep], (rows[keep], block.indices[keep])), shape=block.shape)
+
+
+def _merge_top_k(kept: csr_matrix, pending, top_k: Optional[int]) -> csr_matrix:
+    """Add pending (rows, cols, scores) entries to kept and re-apply top_k."""
+    if not pending:
+        return kept
+    kept = kept.tocoo()
+    rows = np.concatenate([kept.row] + [p[0] for p in pending])
+    cols = np.concatenate([kept.col] + [p[1] for p in pending])
+    data = np.concatenate([kept.data] + [p[2] for p in pending])
+    merged = csr_matrix((data, (rows, cols)), shape=kept.shape)
+    return _top_k_per_row(merged, top_k)
+
+
+def _prefix_filtered(matrix: csr_matrix, min_similarity: float) -> csr_matrix:
+    """
+    Drop each row's most frequent features while their norm stays below
+    min_similarity.
+
+    With features ordered frequent-first, any pair of unit rows with
+    similarity >= min_similarity shares at least one feature that survives
+    in both rows (the all-pairs prefix filter with an L2 bound), so the
+    filtered rows generate every candidate pair while the common terms
+    that make a full product dense are left out.
+    """
+    df = np.bincount(matrix.indices, minlength=matrix.shape[1])
+    rank = np.empty(matrix.shape[1], dtype=np.int64)
+    rank[np.argsort(-df, kind='stable')] = np.arange(matrix.shape[1])
+
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    order = np.lexsort((rank[matrix.indices], rows))  # By row, frequent features first
+    cumulative = np.cumsum(matrix.data[order] ** 2)
+    row_start = np.concatenate([[0.0], cumulative])[matrix.indptr[rows[order]]]
+    prefix_norm_sq = cumulative - row_start  # Includes the entry itself
+
+    keep = np.zeros(len(order), dtype=bool)
+    keep[order] = prefix_norm_sq >= min_similarity ** 2
+    filtered = csr_matrix((matrix.data * keep, matrix.indices.copy(), matrix.indptr.copy()),
+                          shape=matrix.shape)
+    filtered.eliminate_zeros()
+    return filtered
+
+
+def _pair_scores(matrix: csr_matrix, rows: np.ndarray, cols: np.ndarray, chunk_size: int) -> np.ndarray:
+    """Exact dot products for (row, col) pairs, gathered chunk_size pairs at a time."""
+    scores = np.empty(len(rows))
+    for i in range(0, len(rows), chunk_size):
+        pair_rows, pair_cols = rows[i:i + chunk_size], cols[i:i + chunk_size]
+        scores[i:i + chunk_size] = np.asarray(
+            matrix[pair_rows].multiply(matrix[pair_cols]).sum(axis=1)
+        ).ravel()
+    return scores
+
+
+def similarity_graph(
+    matrix: csr_matrix,
+    min_similarity: float = 0.0,
+    top_k: Optional[int] = DEFAULT_TOP_K,
+    block_size: Optional[int] = None,
+    memory_mb: float = DEFAULT_MEMORY_MB
+) -> csr_matrix:
+    """
+    Build a sparse, symmetric cosine-similarity neighbour graph.
+
+    With min_similarity > 0, candidates come from a prefix-filtered join
+    and are then scored exactly, so no pair at or above min_similarity is
+    missed. Each pair is scored once; a pair stays in the graph if it is
+    among the top_k of either of its rows.
+
+    Args:
+        matrix: L2-normalized rows (n x features)
+        min_similarity: Drop pairs with a lower similarity
+        top_k: Neighbours kept per row (None = all)
+        block_size: Rows per block (default: derived from memory_mb)
+        memory_mb: Memory budget for one block of scores
+
+    Returns:
+        n x n CSR matrix of similarities, without the diagonal
+    """
+    matrix = csr_matrix(matrix, dtype=np.float64)
+    n = matrix.shape[0]
+    if n == 0:
+        return csr_matrix((0, 0))
+
+    block_size = block_size or auto_block_size(n, memory_mb)
+    if min_similarity > 0:
+        probe = _prefix_filtered(matrix, min_similarity * PREFIX_FILTER_RATIO)
+        # Norm of the dropped prefix bounds what it can add to a pair's score
+        probe_sq = np.asarray(probe.multiply(probe).sum(axis=1)).ravel()
+        dropped_norm = np.sqrt(np.maximum(0.0, 1.0 - probe_sq))
+    else:
+        probe = matrix
+    probe_t = probe.T.tocsr()
+    floor = max(min_similarity, np.finfo(np.float64).tiny)
+
+    # Gathering a pair touches both rows' entries (value + index each)
+    row_nnz = matrix.nnz / n
+    pair_chunk = max(1024, int(memory_mb * 1024 * 1024 // (BYTES_PER_SCORE + 2 * 12 * max(row_nnz, 1.0))))
+
+    # Scored pairs in both orientations, cut back to top_k per row whenever
+    # the pending share outgrows the graph itself
+    kept = csr_matrix((n, n))
+    pending = []
+    pending_nnz = 0
+    compact_at = max(1 << 20, 2 * n * top_k) if top_k is not None else None
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        candidates = (probe[start:stop] @ probe_t).tocoo()
+        rows, cols, partial = candidates.row + start, candidates.col, candidates.data
+
+        # Score each pair once (upper triangle)
+        keep = cols > rows
+        if probe is not matrix:
+            keep &= partial + np.maximum(dropped_norm[rows], dropped_norm[cols]) >= floor
+        rows, cols, partial = rows[keep], cols[keep], partial[keep]
+        scores = partial if probe is matrix else _pair_scores(matrix, rows, cols, pair_chunk)
+
+        keep = scores >= floor
+        rows, cols, scores = rows[keep], cols[keep], scores[keep]
+        pending.append((np.concatenate([rows, cols]), np.concatenate([cols, rows]),
+                        np.concatenate([scores, scores])))
+        pending_nnz += 2 * len(scores)
+        if compact_at is not None and pending_nnz > compact_at:
+            kept = _merge_top_k(kept, pending, top_k)
+            pending, pending_nnz = [], 0
+
+    graph = _merge_top_k(kept, pending, top_k)
+    graph = graph.maximum(graph.T).tocsr()  # Keep a pair if either side ranked it
+    logger.debug(f"Similarity graph: {n} rows, {graph.nnz} edges, block size {block_size}")
+    return graph
+
+
+def row_neighbors(
+    matrix: csr_matrix,
+    rows,
+    min_similarity: float = 0.0,
+    top_k: Optional[int] = DEFAULT_TOP_K,
+    block_size: Optional[int] = None,
+    memory_mb: float = DEFAULT_MEMORY_MB
+) -> csr_matrix:
+    """
+    Neighbours of some rows against every row, for updating a graph when
+    rows are added.
+
+    Args:
+        matrix: L2-normalized rows (n x features)
+        rows: Row positions to score
+        min_similarity: Drop pairs with a lower similarity
+        top_k: Neighbours kept per row (None = all)
+        block_size: Rows per block (default: derived from memory_mb)
+        memory_mb: Memory budget for one block of scores
+
+    Returns:
+        n x n CSR matrix with only the given rows filled, without the
+        diagonal; merge with graph.maximum(result).maximum(result.T)
+    """
+    matrix = csr_matrix(matrix, dtype=np.float64)
+    n = matrix.shape[0]
+    rows = np.asarray(rows, dtype=np.int64)
+    if n == 0 or len(rows) == 0:
+        return csr_matrix((n, n))
+
+    block_size = block_size or auto_block_size(n, memory_mb)
+    matrix_t = matrix.T.tocsr()
+    floor = max(min_similarity, np.finfo(np.float64).tiny)
+
+    pending = []
+    for start in range(0, len(rows), block_size):
+        block_rows = rows[start:start + block_size]
+        scores = (matrix[block_rows] @ matrix_t).tocoo()
+        pair_rows, cols = block_rows[scores.row], scores.col
+        keep = (scores.data >= floor) & (pair_rows != cols)
+        pending.append((pair_rows[keep], cols[keep], scores.data[keep]))
+
+    return _merge_top_k(csr_matrix((n, n)), pending, top_k)
+
+
+def average_linkage_clusters(graph: csr_matrix, distance_threshold: float) -> np.ndarray:
+    """
+    Average-linkage clustering over a sparse similarity graph.
+
+    Clusters merge while their average cosine distance (1 - average pairwise
+    similarity) is below distance_threshold, matching
+    AgglomerativeClustering(metric='cosine', linkage='average').
+
+    Args:
+        graph: Symmetric similarity graph from similarity_graph()
+        distance_threshold: Stop merging at this average distance
+
+    Returns:
+        Cluster label per row
+    """
+    n = graph.shape[0]
+    min_similarity = 1.0 - distance_threshold
+    coo = graph.tocoo()
+    upper = coo.row < coo.col
+
+    size = {i: 1 for i in range(n)}
+    links: Dict[int, Dict[int, float]] = {i: {} for i in range(n)}  # Summed similarities
+    heap = []
+    for a, b, sim in zip(coo.row[upper].tolist(), coo.col[upper].tolist(), coo.data[upper].tolist()):
+        links[a][b] = sim
+        links[b][a] = sim
+        if sim > min_similarity:
+            heap.append((-sim, a, b))
+    heapq.heapify(heap)
+
+    parent = list(range(n))  # Merged cluster -> surviving cluster
+    while heap:
+        neg_avg, a, b = heapq.heappop(heap)
+        if a not in size or b not in size:
+            continue  # Stale entry for a merged cluster
+        avg = links[a].get(b, 0.0) / (size[a] * size[b])
+        if abs(avg + neg_avg) > 1e-12:
+            continue  # Superseded by a later entry for the same pair
+
+        # Merge the smaller cluster into the larger one
+        if len(links[a]) < len(links[b]):
+            a, b = b, a
+        del links[a][b]
+        size[a] += size.pop(b)
+        parent[b] = a
+        for other, total in links.pop(b).items():
+            if other == a:
+                continue
+            del links[other][b]
+            merged = links[a].get(other, 0.0) + total
+            links[a][other] = merged
+            links[other][a] = merged
+        for other, total in links[a].items():
+            avg = total / (size[a] * size[other])
+            if avg > min_similarity:
+                heapq.heappush(heap, (-avg, a, other))
+
+    labels = np.empty(n, dtype=np.int64)
+    roots: Dict[int, int] = {}
+    for i in range(n):
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        parent[i] = root
+        labels[i] = roots.setdefault(root, len(roots))
+    return labels
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+SQLite Pool - Shared, thread-safe connection pool per database file
+
+Opening a connection per query costs a file open, schema parse and (in WAL
+mode) a checkpoint when the last connection closes, and throws away the
+connection's prepared statement cache. SQLitePool keeps a small set of
+connections open per database instead:
+
+- connections are checked out for one transaction (committed on success,
+  rolled back on error) and returned to the pool
+- every connection runs in WAL mode so readers never block the writer
+- each connection keeps a prepared statement cache, so repeated queries
+  skip SQL compilation (see in_placeholders() for IN lists)
+- idle connections are dropped when the database file is replaced or
+  deleted, and after a fork
+
+Usage:
+    pool = get_pool(db_path)
+    with pool.connection() as conn:
+        conn.execute("SELECT ...")
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Generator, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+DEFAULT_POOL_SIZE = 4  # Idle connections kept per database
+STATEMENT_CACHE_SIZE = 256  # Prepared statements cached per connection
+BUSY_TIMEOUT_SECONDS = 30.0
+MIN_IN_BUCKET = 8  # Smallest IN list size (see in_placeholders)
+
+
+def in_placeholders(values: Sequence) -> Tuple[str, List]:
+    """
+    Placeholders and parameters for an "IN (...)" clause.
+
+    The list is padded (by repeating its last value) to the next power of
+    two, so queries over differently sized lists share a handful of SQL
+    strings and stay in the prepared statement cache.
+
+    Args:
+        values: Non-empty values to match
+
+    Returns:
+        ("?, ?, ...", padded parameter list)
+    """
+    size = MIN_IN_BUCKET
+    while size < len(values):
+        size *= 2
+    params = list(values) + [values[-1]] * (size - len(values))
+    return ", ".join("?" * size), params
+
+
+class SQLitePool:
+    """Pool of open connections to one SQLite database."""
+
+    def __init__(self, db_path: Union[str, Path], max_idle: int = DEFAULT_POOL_SIZE):
+        """
+        Initialize the pool.
+
+        Args:
+            db_path: SQLite database file
+            max_idle: Max number of idle connections kept open
+        """
+        self.db_path = Path(db_path)
+        self.max_idle = max_idle
+        self._lock = threading.Lock()
+        self._idle: List[sqlite3.Connection] = []
+        self._pid = os.getpid()
+        self._inherited: List[sqlite3.Connection] = []  # From the parent process, never used
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._stats = {"opened": 0, "reused": 0}
+
+    def _current_file_id(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.db_path)
+        except OSError:
+            return None
+        return (st.st_dev, st.st_ino)
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=BUSY_TIMEOUT_SECONDS,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        file_id = self._current_file_id()
+        with self._lock:
+            if self._pid != os.getpid():
+                # Connections must not be shared with a forked child. Keep
+                # them referenced: closing them here would affect the parent
+                self._inherited.extend(self._idle)
+                self._idle = []
+                self._pid = os.getpid()
+            elif file_id != self._file_id:
+                # Database replaced or deleted: idle connections point at the old file
+                self._close_all(self._idle)
+                self._idle = []
+            self._file_id = file_id
+            if self._idle:
+                self._stats["reused"] += 1
+                return self._idle.pop()
+        conn = self._open()
+        with self._lock:
+            self._stats["opened"] += 1
+            if file_id is None:
+                # The connection just created the file
+                self._file_id = self._current_file_id()
+        return conn
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            if self._pid == os.getpid() and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def connection(self) -> Generator[sqlite3.Connection, None, None]:
+        """
+        Check out a connection for one transaction.
+
+        Commits when the block exits normally and rolls back on error. The
+        connection's row_factory is reset on return; set it per cursor
+        instead.
+        """
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                conn.close()
+                raise
+            conn.row_factory = None
+            self._release(conn)
+            raise
+        conn.row_factory = None
+        self._release(conn)
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        self._close_all(idle)
+
+    @staticmethod
+    def _close_all(connections: List[sqlite3.Connection]) -> None:
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.debug(f"Error closing pooled connection: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get pool statistics."""
+        with self._lock:
+            return dict(self._stats, idle=len(self._idle))
+
+
+# Pools shared by every user of the same database file
+_pools: Dict[str, SQLitePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: Union[str, Path]) -> SQLitePool:
+    """Get the shared pool for a database file."""
+    key = os.path.abspath(str(db_path))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = SQLitePool(key)
+        return pool
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Streaming TF-IDF - Incremental TF-IDF with persisted document frequencies
+
+A drop-in alternative to TfidfVectorizer for corpora that only grow (the
+mission knowledge base gains learnings every mission):
+
+- Documents are tokenized once, with the same analyzer TfidfVectorizer
+  would build, and stored as a CSR matrix of sublinear term frequencies.
+- Document-frequency and corpus term counts are kept per term, so adding
+  documents costs O(new docs) and never re-tokenizes the corpus.
+- IDF weights (smooth IDF, as in scikit-learn), max_df and max_features are
+  applied as a column reweight over the stored matrix, which is a single
+  vectorized pass over its non-zeros.
+- The vocabulary only grows; terms that fall outside max_df/max_features
+  keep their column with a zero weight.
+
+State is saved to a single .npz file (written aside, then renamed) so that
+a new process resumes where the last one stopped.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+STATE_VERSION = 1
+INITIAL_NNZ_CAPACITY = 4096
+INITIAL_ROW_CAPACITY = 256
+
+
+class StreamingTfidf:
+    """
+    Incrementally updated TF-IDF model over an append-mostly corpus.
+
+    Mirrors the parts of the TfidfVectorizer API that SemanticIndex uses
+    (transform, vocabulary_, get_feature_names_out) so it can stand in for
+    a fitted vectorizer.
+    """
+
+    def __init__(
+        self,
+        min_df: int = 1,
+        max_df: float = 1.0,
+        ngram_range: Tuple[int, int] = (1, 1),
+        stop_words: Optional[str] = None,
+        sublinear_tf: bool = False,
+        max_features: Optional[int] = None
+    ):
+        """
+        Initialize an empty model.
+
+        Args:
+            min_df: Minimum document count (int) or ratio (float) for a term
+            max_df: Maximum document count (int) or ratio (float) for a term
+            ngram_range: Word n-gram range passed to the analyzer
+            stop_words: Stop word list passed to the analyzer
+            sublinear_tf: Use 1 + log(tf) instead of raw counts
+            max_features: Keep only the most frequent terms (None = all)
+        """
+        self.min_df = min_df
+        self.max_df = max_df
+        self.ngram_range = tuple(ngram_range)
+        self.stop_words = stop_words
+        self.sublinear_tf = sublinear_tf
+        self.max_features = max_features
+        self._analyzer = TfidfVectorizer(
+            ngram_range=self.ngram_range,
+            stop_words=stop_words
+        ).build_analyzer()
+        self.clear()
+
+    def clear(self):
+        """Drop all documents and the vocabulary."""
+        self._terms: List[str] = []
+        self._vocabulary: Dict[str, int] = {}
+        self._df = np.zeros(0, dtype=np.int64)
+        self._term_counts = np.zeros(0, dtype=np.int64)
+
+        # Raw (sublinear) term-frequency rows, CSR buffers grown by doubling
+        self._data = np.zeros(INITIAL_NNZ_CAPACITY, dtype=np.float64)
+        self._indices = np.zeros(INITIAL_NNZ_CAPACITY, dtype=np.int32)
+        self._indptr = np.zeros(INITIAL_ROW_CAPACITY + 1, dtype=np.int64)
+        self._n_docs = 0
+        self._nnz = 0
+
+        self._weights: Optional[np.ndarray] = None
+        self._matrix: Optional[csr_matrix] = None
+        self._feature_names: Optional[np.ndarray] = None
+
+    # -------------------------------------------------------------------------
+    # Properties
+    # -------------------------------------------------------------------------
+
+    @property
+    def n_docs(self) -> int:
+        return self._n_docs
+
+    @property
+    def vocabulary_(self) -> Dict[str, int]:
+        """Term -> column mapping (includes zero-weighted terms)."""
+        return self._vocabulary
+
+    def get_feature_names_out(self) -> np.ndarray:
+        # Cached: callers look up a few terms per cluster
+        if self._feature_names is None or len(self._feature_names) != len(self._terms):
+            self._feature_names = np.asarray(self._terms, dtype=object)
+        return self._feature_names
+
+    @property
+    def matrix(self) -> csr_matrix:
+        """L2-normalized TF-IDF matrix of all documents, in insertion order."""
+        if self._matrix is None:
+            self._matrix = self._weighted(self._raw_matrix())
+        return self._matrix
+
+    # -------------------------------------------------------------------------
+    # Updates
+    # -------------------------------------------------------------------------
+
+    def add_documents(self, texts: Iterable[str]) -> int:
+        """
+        Tokenize and append documents, growing the vocabulary as needed.
+
+        Args:
+            texts: Documents to add
+
+        Returns:
+            Number of documents added
+        """
+        rows = [self._count_terms(text, grow=True) for text in texts]
+        if not rows:
+            return 0
+
+        n_terms = len(self._terms)
+        if len(self._df) < n_terms:
+            grow = n_terms - len(self._df)
+            self._df = np.concatenate([self._df, np.zeros(grow, dtype=np.int64)])
+            self._term_counts = np.concatenate([self._term_counts, np.zeros(grow, dtype=np.int64)])
+
+        new_nnz = sum(len(cols) for cols, _ in rows)
+        self._reserve(self._n_docs + len(rows), self._nnz + new_nnz)
+
+        for cols, counts in rows:
+            end = self._nnz + len(cols)
+            self._indices[self._nnz:end] = cols
+            self._data[self._nnz:end] = self._tf(counts)
+            self._df[cols] += 1
+            self._term_counts[cols] += counts
+            self._nnz = end
+            self._n_docs += 1
+            self._indptr[self._n_docs] = end
+
+        self._weights = None
+        self._matrix = None
+        return len(rows)
+
+    def remove_documents(self, rows: Iterable[int]):
+        """
+        Drop documents by row position (later rows shift up).
+
+        Args:
+            rows: Row positions to drop
+        """
+        drop = np.zeros(self._n_docs, dtype=bool)
+        drop[list(rows)] = True
+        if not drop.any():
+            return
+
+        raw = self._raw_matrix()
+        removed = raw[np.nonzero(drop)[0]]
+        self._df -= np.bincount(removed.indices, minlength=len(self._df))
+        if self.sublinear_tf:
+            counts = np.rint(np.exp(removed.data - 1.0)).astype(np.int64)
+        else:
+            counts = np.rint(removed.data).astype(np.int64)
+        self._term_counts -= np.bincount(removed.indices, weights=counts,
+                                         minlength=len(self._term_counts)).astype(np.int64)
+
+        kept = raw[np.nonzero(~drop)[0]]
+        self._set_raw(kept.data, kept.indices, kept.indptr, kept.shape[0])
+
+    def transform(self, texts: Iterable[str]) -> csr_matrix:
+        """
+        Vectorize texts with the current vocabulary and weights.
+
+        Unknown terms are ignored; the corpus is not modified.
+        """
+        data, indices, indptr = [], [], [0]
+        for text in texts:
+            cols, counts = self._count_terms(text, grow=False)
+            indices.append(cols)
+            data.append(self._tf(counts))
+            indptr.append(indptr[-1] + len(cols))
+        raw = csr_matrix(
+            (np.concatenate(data) if data else np.zeros(0),
+             np.concatenate(indices) if indices else np.zeros(0, dtype=np.int32),
+             np.asarray(indptr)),
+            shape=(len(indptr) - 1, len(self._terms))
+        )
+        return self._weighted(raw)
+
+    # -------------------------------------------------------------------------
+    # Internals
+    # -------------------------------------------------------------------------
+
+    def _count_terms(self, text: str, grow: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """Analyze a text into (sorted column ids, term counts)."""
+        counts: Dict[int, int] = {}
+        for term in self._analyzer(text or ''):
+            col = self._vocabulary.get(term)
+            if col is None:
+                if not grow:
+                    continue
+                col = len(self._terms)
+                self._vocabulary[term] = col
+                self._terms.append(term)
+            counts[col] = counts.get(col, 0) + 1
+        cols = np.fromiter(sorted(counts), dtype=np.int32, count=len(counts))
+        return cols, np.asarray([counts[c] for c in cols], dtype=np.int64)
+
+    def _tf(self, counts: np.ndarray) -> np.ndarray:
+        if self.sublinear_tf:
+            return 1.0 + np.log(counts)
+        return counts.astype(np.float64)
+
+    def _reserve(self, n_docs: int, nnz: int):
+        if nnz > len(self._data):
+            capacity = len(self._data)
+            while capacity < nnz:
+                capacity *= 2
+            self._data = np.resize(self._data, capacity)
+            self._indices = np.resize(self._indices, capacity)
+        if n_docs + 1 > len(self._indptr):
+            capacity = len(self._indptr)
+            while capacity < n_docs + 1:
+                capacity *= 2
+            self._indptr = np.resize(self._indptr, capacity)
+
+    def _set_raw(self, data: np.ndarray, indices: np.ndarray, indptr: np.ndarray, n_docs: int):
+        self._data = np.zeros(max(INITIAL_NNZ_CAPACITY, len(data)), dtype=np.float64)
+        self._indices = np.zeros(len(self._data), dtype=np.int32)
+        self._indptr = np.zeros(max(INITIAL_ROW_CAPACITY, n_docs) + 1, dtype=np.int64)
+        self._data[:len(data)] = data
+        self._indices[:len(indices)] = indices
+        self._indptr[:n_docs + 1] = indptr
+        self._n_docs = n_docs
+        self._nnz = len(data)
+        self._weights = None
+        self._matrix = None
+
+    def _raw_matrix(self) -> csr_matrix:
+        return csr_matrix(
+            (self._data[:self._nnz], self._indices[:self._nnz], self._indptr[:self._n_docs + 1]),
+            shape=(self._n_docs, len(self._terms))
+        )
+
+    def _column_weights(self) -> np.ndarray:
+        """Smooth IDF per column, zeroed for terms pruned by df/max_features."""
+        if self._weights is not None and len(self._weights) == len(self._terms):
+            return self._weights
+
+        n = self._n_docs
+        df = self._df
+        weights = np.log((1.0 + n) / (1.0 + df)) + 1.0
+
+        min_count = self.min_df * n if isinstance(self.min_df, float) else self.min_df
+        max_count = self.max_df * n if isinstance(self.max_df, float) else self.max_df
+        keep = (df >= max(min_count, 1)) & (df <= max_count)
+        if self.max_features is not None and keep.sum() > self.max_features:
+            candidates = np.nonzero(keep)[0]
+            top = candidates[np.argsort(-self._term_counts[candidates], kind='stable')[:self.max_features]]
+            keep = np.zeros_like(keep)
+            keep[top] = True
+
+        weights[~keep] = 0.0
+        self._weights = weights
+        return weights
+
+    def _weighted(self, raw: csr_matrix) -> csr_matrix:
+        """Apply column weights and L2-normalize rows."""
+        weights = self._column_weights()
+        matrix = csr_matrix((raw.data * weights[raw.indices], raw.indices.copy(), raw.indptr.copy()),
+                            shape=raw.shape)
+        matrix.eliminate_zeros()
+        return normalize(matrix, norm='l2', copy=False)
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def _params(self) -> Dict[str, Any]:
+        return {
+            'min_df': self.min_df,
+            'max_df': self.max_df,
+            'ngram_range': list(self.ngram_range),
+            'stop_words': self.stop_words,
+            'sublinear_tf': self.sublinear_tf,
+            'max_features': self.max_features,
+        }
+
+    def save(self, path: Path, metadata: Optional[Dict[str, Any]] = None):
+        """
+        Persist the model, with caller metadata, to a single .npz file.
+
+        Args:
+            path: Destination path
+            metadata: JSON-serializable data stored alongside (e.g. doc ids)
+        """
+        path = Path(path)
+        meta = {
+            'version': STATE_VERSION,
+            'params': self._params(),
+            'terms': self._terms,
+            'metadata': metadata or {},
+        }
+        temp_file = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with open(temp_file, 'wb') as f:
+                np.savez(
+                    f,
+                    meta=np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8),
+                    data=self._data[:self._nnz],
+                    indices=self._indices[:self._nnz],
+                    indptr=self._indptr[:self._n_docs + 1],
+                    df=self._df,
+                    term_counts=self._term_counts,
+                )
+            temp_file.replace(path)
+        except Exception:
+            try:
+                temp_file.unlink()
+            except OSError:
+                pass
+            raise
+
+    def load(self, path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Restore a model saved with save().
+
+        Args:
+            path: Path of the .npz file
+
+        Returns:
+            The stored metadata, or None if the file is missing, unreadable,
+            or was written with different parameters (model left empty)
+        """
+        try:
+            with np.load(Path(path)) as state:
+                meta = json.loads(state['meta'].tobytes().decode('utf-8'))
+                if meta.get('version') != STATE_VERSION or meta.get('params') != self._params():
+                    logger.info(f"Ignoring TF-IDF state with different parameters: {path}")
+                    return None
+                data = state['data']
+                indices = state['indices']
+                indptr = state['indptr']
+                df = state['df']
+                term_counts = state['term_counts']
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to load TF-IDF state from {path}: {e}")
+            return None
+
+        terms = meta['terms']
+        if len(df) != len(terms) or len(term_counts) != len(terms) or len(indptr) == 0:
+            logger.warning(f"Inconsistent TF-IDF state in {path}, ignoring")
+            return None
+
+        self.clear()
+        self._terms = list(terms)
+        self._vocabulary = {term: col for col, term in enumerate(self._terms)}
+        self._df = df.astype(np.int64)
+        self._term_counts = term_counts.astype(np.int64)
+        self._set_raw(data, indices, indptr, len(indptr) - 1)
+        return meta.get('metadata', {})
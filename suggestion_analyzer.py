@@ -6,7 +6,8 @@ Provides:
 1. Auto-tagging of suggestions based on content analysis
 2. Priority scoring algorithm with weighted factors
 3. Health indicators (stale, orphaned, needs review)
-4. Similarity-based merge suggestions
+4. Similarity-based merge suggestions (MinHash/LSH candidates, see
+   MergeCandidateIndex)
 
 Usage:
     from suggestion_analyzer import SuggestionAnalyzer
@@ -15,6 +16,7 @@ Usage:
     result = analyzer.analyze_all()  # Returns prioritized, tagged, health-checked list
 """
 
+import hashlib
 import json
 import re
 import logging
@@ -23,6 +25,9 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple, Set
 from dataclasses import dataclass, field, asdict
 
+from minhash_lsh import MinHashLSH, jaccard, minhash_signature, word_set
+from suggestion_storage import similarity_text
+
 logger = logging.getLogger(__name__)
 
 # Import paths from centralized config
@@ -351,6 +356,73 @@ class Prioritizer:
         return round(total, 1)
 
 
+# =============================================================================
+# MERGE CANDIDATE INDEX
+# =============================================================================
+
+class MergeCandidateIndex:
+    """
+    LSH index of a suggestion list, for get_merge_candidates().
+
+    Comparing every suggestion with every other is quadratic; the index
+    only compares suggestions sharing an LSH bucket, then checks them with
+    the exact Jaccard similarity (so results match the full scan, except
+    for rare misses of pairs very close to the threshold).
+    """
+
+    def __init__(
+        self,
+        suggestions: List[Dict[str, Any]],
+        threshold: float = 0.5,
+        signatures: Dict[str, Tuple[str, Any]] = None
+    ):
+        """
+        Build the index.
+
+        Args:
+            suggestions: Suggestions to index
+            threshold: Jaccard similarity of merge candidates
+            signatures: Stored signatures (SQLiteSuggestionStorage.get_minhash_signatures()),
+                reused for suggestions whose text is unchanged
+        """
+        self.threshold = threshold
+        self._lsh = MinHashLSH(threshold)
+        self._ids: List[Optional[str]] = []
+        self._words: List[Set[str]] = []
+        self._signatures: Dict[str, Any] = {}
+        signatures = signatures or {}
+
+        for position, suggestion in enumerate(suggestions):
+            text = similarity_text(suggestion)
+            words = word_set(text)
+            suggestion_id = suggestion.get('id')
+            stored = signatures.get(suggestion_id)
+            if stored and stored[0] == hashlib.sha1(text.encode('utf-8')).hexdigest():
+                signature = stored[1]
+            else:
+                signature = minhash_signature(words)
+            self._lsh.insert(position, signature)
+            self._ids.append(suggestion_id)
+            self._words.append(words)
+            if suggestion_id is not None:
+                self._signatures[suggestion_id] = (text, signature)
+
+    def candidates(self, suggestion: Dict[str, Any]) -> List[str]:
+        """IDs of indexed suggestions similar to this one, in list order."""
+        suggestion_id = suggestion.get('id')
+        text = similarity_text(suggestion)
+        words = word_set(text)
+        indexed = self._signatures.get(suggestion_id)
+        signature = indexed[1] if indexed and indexed[0] == text else minhash_signature(words)
+
+        return [
+            self._ids[position]
+            for position in sorted(self._lsh.query(signature))
+            if self._ids[position] != suggestion_id
+            and jaccard(words, self._words[position]) >= self.threshold
+        ]
+
+
 # =============================================================================
 # HEALTH ANALYZER
 # =============================================================================
@@ -434,13 +506,20 @@ class HealthAnalyzer:
         self,
         suggestion: Dict[str, Any],
         all_suggestions: List[Dict[str, Any]],
-        threshold: float = 0.5
+        threshold: float = 0.5,
+        index: MergeCandidateIndex = None
     ) -> List[str]:
         """
         Find suggestions that are similar enough to consider merging.
 
+        Pass an index of all_suggestions (with the same threshold) to avoid
+        comparing against every suggestion.
+
         Returns list of suggestion IDs that are similar to this one.
         """
+        if index is not None and index.threshold == threshold:
+            return index.candidates(suggestion)
+
         candidates = []
 
         suggestion_id = suggestion.get('id')
@@ -476,11 +555,15 @@ class HealthAnalyzer:
         self,
         suggestion: Dict[str, Any],
         all_suggestions: List[Dict[str, Any]] = None,
-        archived_missions: List[Dict[str, Any]] = None
+        archived_missions: List[Dict[str, Any]] = None,
+        merge_index: MergeCandidateIndex = None
     ) -> str:
         """
         Get overall health status of a suggestion.
 
+        merge_index, if given, indexes all_suggestions for the merge
+        candidate check.
+
         Returns one of:
         - 'healthy': No issues
         - 'stale': Old and untouched
@@ -524,7 +607,7 @@ class HealthAnalyzer:
 
         # Check for merge candidates
         if all_suggestions:
-            candidates = self.get_merge_candidates(suggestion, all_suggestions)
+            candidates = self.get_merge_candidates(suggestion, all_suggestions, index=merge_index)
             if len(candidates) >= 1:
                 return 'needs_review'
 
@@ -631,6 +714,15 @@ class SuggestionAnalyzer:
         suggestions = self._load_recommendations()
         recent_missions = self._load_recent_missions()
 
+        # Index once for the merge candidate checks, reusing stored signatures
+        storage = _get_storage()
+        try:
+            signatures = storage.get_minhash_signatures() if storage else None
+        except Exception as e:
+            logger.warning(f"Stored MinHash signatures unavailable: {e}")
+            signatures = None
+        merge_index = MergeCandidateIndex(suggestions, signatures=signatures)
+
         # Analyze each suggestion
         for suggestion in suggestions:
             # Add auto-tags
@@ -645,7 +737,8 @@ class SuggestionAnalyzer:
             suggestion['health_status'] = self.health_analyzer.get_health_status(
                 suggestion,
                 all_suggestions=suggestions,
-                archived_missions=recent_missions
+                archived_missions=recent_missions,
+                merge_index=merge_index
             )
 
             # Track last analysis time
@@ -685,7 +778,8 @@ class SuggestionAnalyzer:
 
         Args:
             suggestion: The new suggestion
-            all_suggestions: Existing suggestions (loads from file if None)
+            all_suggestions: Existing suggestions (queries the storage's
+                similarity index if None)
 
         Returns:
             Modified suggestion with:
@@ -693,8 +787,18 @@ class SuggestionAnalyzer:
             - priority_score
             - similar_to (list of IDs of similar suggestions)
         """
+        similar_ids = None
         if all_suggestions is None:
-            all_suggestions = self._load_recommendations()
+            storage = _get_storage()
+            if storage:
+                try:
+                    similar_ids = storage.find_similar(
+                        similarity_text(suggestion), threshold=0.4, exclude_id=suggestion.get('id')
+                    )
+                except Exception as e:
+                    logger.warning(f"Similarity index query failed: {e}")
+            if similar_ids is None:
+                all_suggestions = self._load_recommendations()
 
         recent_missions = self._load_recent_missions(5)
 
@@ -707,9 +811,10 @@ class SuggestionAnalyzer:
         )
 
         # Check for merge candidates
-        similar_ids = self.health_analyzer.get_merge_candidates(
-            suggestion, all_suggestions, threshold=0.4  # Lower threshold for new items
-        )
+        if similar_ids is None:
+            similar_ids = self.health_analyzer.get_merge_candidates(
+                suggestion, all_suggestions, threshold=0.4  # Lower threshold for new items
+            )
         suggestion['similar_to'] = similar_ids
 
         # Set initial health status
@@ -7,6 +7,8 @@ Provides persistent, durable storage for mission suggestions with:
 - WAL mode for concurrent read performance
 - Schema versioning for future migrations
 - Full CRUD operations with filtering
+- MinHash signatures of each suggestion's text, kept up to date on every
+  write, for near-duplicate lookups (see find_similar())
 - Migration utility from JSON
 
 Usage:
@@ -24,15 +26,21 @@ Usage:
     hot_items = storage.get_filtered(health_status="hot")
 """
 
+import hashlib
 import json
 import logging
 import sqlite3
+import threading
 import uuid
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Generator
+from typing import Any, Dict, Iterable, List, Optional, Generator, Tuple
+
+import numpy as np
+
+from minhash_lsh import MinHashLSH, jaccard, minhash_signature, signature_from_bytes, word_set
 
 logger = logging.getLogger(__name__)
 
@@ -42,7 +50,12 @@ STATE_DIR = BASE_DIR / "state"
 DB_PATH = STATE_DIR / "mission_suggestions.db"
 
 # Current schema version
-SCHEMA_VERSION = 1
+SCHEMA_VERSION = 2
+
+
+def similarity_text(suggestion: Dict[str, Any]) -> str:
+    """Text compared for near-duplicate detection: title and description."""
+    return ' '.join([suggestion.get('mission_title') or '', suggestion.get('mission_description') or ''])
 
 
 class SuggestionStorageBackend(ABC):
@@ -84,6 +97,11 @@ class SQLiteSuggestionStorage(SuggestionStorageBackend):
 
     def __init__(self, db_path: Path = None):
         self.db_path = db_path or DB_PATH
+        # Stored signatures and LSH indexes, valid for one minhash generation
+        self._similarity_lock = threading.Lock()
+        self._similarity_generation: Optional[int] = None
+        self._signatures: Dict[str, Tuple[str, Optional[np.ndarray]]] = {}
+        self._lsh_indexes: Dict[float, MinHashLSH] = {}
         self._ensure_schema()
 
     @contextmanager
@@ -158,8 +176,165 @@ class SQLiteSuggestionStorage(SuggestionStorageBackend):
                 ON mission_suggestions(created_at DESC);
             CREATE INDEX IF NOT EXISTS idx_suggestions_source_mission
                 ON mission_suggestions(source_mission_id);
+
+            -- MinHash signature of similarity_text() per suggestion
+            CREATE TABLE IF NOT EXISTS suggestion_minhash (
+                id TEXT PRIMARY KEY,
+                text_hash TEXT NOT NULL,
+                signature BLOB
+            );
+
+            -- Bumped on every signature change, to invalidate cached indexes
+            CREATE TABLE IF NOT EXISTS suggestion_minhash_meta (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                generation INTEGER NOT NULL DEFAULT 0
+            );
+            INSERT OR IGNORE INTO suggestion_minhash_meta (id, generation) VALUES (1, 0);
+
+            CREATE TRIGGER IF NOT EXISTS suggestions_minhash_delete
+            AFTER DELETE ON mission_suggestions BEGIN
+                DELETE FROM suggestion_minhash WHERE id = OLD.id;
+            END;
+            CREATE TRIGGER IF NOT EXISTS suggestion_minhash_insert
+            AFTER INSERT ON suggestion_minhash BEGIN
+                UPDATE suggestion_minhash_meta SET generation = generation + 1;
+            END;
+            CREATE TRIGGER IF NOT EXISTS suggestion_minhash_update
+            AFTER UPDATE ON suggestion_minhash BEGIN
+                UPDATE suggestion_minhash_meta SET generation = generation + 1;
+            END;
+            CREATE TRIGGER IF NOT EXISTS suggestion_minhash_delete
+            AFTER DELETE ON suggestion_minhash BEGIN
+                UPDATE suggestion_minhash_meta SET generation = generation + 1;
+            END;
         """)
 
+        # Signatures for suggestions stored before they were tracked
+        cursor = conn.execute("""
+            SELECT id, mission_title, mission_description FROM mission_suggestions
+            WHERE id NOT IN (SELECT id FROM suggestion_minhash)
+        """)
+        self._index_similarity(conn, [dict(row) for row in cursor.fetchall()])
+
+    # =========================================================================
+    # Near-duplicate index
+    # =========================================================================
+
+    def _index_similarity(self, conn: sqlite3.Connection, suggestions: Iterable[Dict[str, Any]]) -> int:
+        """
+        Store the MinHash signatures of suggestions whose text changed.
+
+        Args:
+            conn: Connection of the write transaction
+            suggestions: Dicts with id, mission_title and mission_description
+
+        Returns:
+            Number of signatures written
+        """
+        items = [(s['id'], similarity_text(s)) for s in suggestions if s.get('id')]
+        if not items:
+            return 0
+        if len(items) == 1:
+            cursor = conn.execute("SELECT id, text_hash FROM suggestion_minhash WHERE id = ?", (items[0][0],))
+        else:
+            cursor = conn.execute("SELECT id, text_hash FROM suggestion_minhash")
+        stored = {row[0]: row[1] for row in cursor.fetchall()}
+
+        rows = []
+        for suggestion_id, text in items:
+            text_hash = hashlib.sha1(text.encode('utf-8')).hexdigest()
+            if stored.get(suggestion_id) == text_hash:
+                continue
+            signature = minhash_signature(word_set(text))
+            rows.append((suggestion_id, text_hash, signature.tobytes() if signature is not None else None))
+        conn.executemany("""
+            INSERT INTO suggestion_minhash (id, text_hash, signature) VALUES (?, ?, ?)
+            ON CONFLICT (id) DO UPDATE SET text_hash = excluded.text_hash, signature = excluded.signature
+        """, rows)
+        return len(rows)
+
+    def _index_similarity_ids(self, conn: sqlite3.Connection, suggestion_ids: List[str]) -> int:
+        """Re-index suggestions by ID after a partial update."""
+        if not suggestion_ids:
+            return 0
+        placeholders = ', '.join(['?' for _ in suggestion_ids])
+        cursor = conn.execute(
+            f"SELECT id, mission_title, mission_description FROM mission_suggestions WHERE id IN ({placeholders})",
+            suggestion_ids
+        )
+        return self._index_similarity(conn, [dict(row) for row in cursor.fetchall()])
+
+    def _refresh_similarity_cache(self) -> None:
+        """Reload stored signatures if any changed (caller holds _similarity_lock)."""
+        with self._get_connection() as conn:
+            generation = conn.execute(
+                "SELECT generation FROM suggestion_minhash_meta WHERE id = 1"
+            ).fetchone()[0]
+            if generation == self._similarity_generation:
+                return
+            cursor = conn.execute("SELECT id, text_hash, signature FROM suggestion_minhash")
+            self._signatures = {
+                row[0]: (row[1], signature_from_bytes(row[2]) if row[2] is not None else None)
+                for row in cursor.fetchall()
+            }
+        self._lsh_indexes = {}
+        self._similarity_generation = generation
+
+    def get_minhash_signatures(self) -> Dict[str, Tuple[str, Optional[np.ndarray]]]:
+        """
+        Stored MinHash signatures.
+
+        Returns:
+            suggestion ID -> (SHA-1 of similarity_text(), signature or None
+            for an empty text)
+        """
+        with self._similarity_lock:
+            self._refresh_similarity_cache()
+            return self._signatures
+
+    def find_similar(self, text: str, threshold: float = 0.5,
+                     exclude_id: Optional[str] = None) -> List[str]:
+        """
+        IDs of stored suggestions whose word set is similar to a text.
+
+        Candidates come from an LSH index over the stored signatures (built
+        once per threshold and kept until a signature changes), then are
+        checked with the exact Jaccard similarity.
+
+        Args:
+            text: Title and description to compare (see similarity_text())
+            threshold: Minimum Jaccard similarity
+            exclude_id: ID to leave out (the suggestion itself)
+
+        Returns:
+            Matching suggestion IDs, most similar first
+        """
+        words = word_set(text)
+        with self._similarity_lock:
+            self._refresh_similarity_cache()
+            lsh = self._lsh_indexes.get(threshold)
+            if lsh is None:
+                lsh = MinHashLSH(threshold)
+                for suggestion_id, (_, signature) in self._signatures.items():
+                    lsh.insert(suggestion_id, signature)
+                self._lsh_indexes[threshold] = lsh
+            candidates = lsh.query(minhash_signature(words))
+        candidates.discard(exclude_id)
+        if not candidates:
+            return []
+
+        candidates = sorted(candidates)
+        placeholders = ', '.join(['?' for _ in candidates])
+        with self._get_connection() as conn:
+            cursor = conn.execute(
+                f"SELECT id, mission_title, mission_description FROM mission_suggestions WHERE id IN ({placeholders})",
+                candidates
+            )
+            scored = [(jaccard(words, word_set(similarity_text(dict(row)))), row['id'])
+                      for row in cursor.fetchall()]
+        scored.sort(key=lambda match: (-match[0], match[1]))
+        return [suggestion_id for similarity, suggestion_id in scored if similarity >= threshold]
+
     def _row_to_dict(self, row: sqlite3.Row) -> Dict[str, Any]:
         """Convert a database row to a suggestion dict."""
         if row is None:
@@ -304,6 +479,7 @@ class SQLiteSuggestionStorage(SuggestionStorageBackend):
                 f"INSERT INTO mission_suggestions ({columns}) VALUES ({placeholders})",
                 list(row.values())
             )
+            self._index_similarity(conn, [suggestion])
             logger.debug(f"Added suggestion: {suggestion_id}")
 
         return suggestion_id
@@ -326,6 +502,8 @@ class SQLiteSuggestionStorage(SuggestionStorageBackend):
             )
             updated = cursor.rowcount > 0
             if updated:
+                if updates.keys() & {'mission_title', 'mission_description'}:
+                    self._index_similarity_ids(conn, [suggestion_id])
                 logger.debug(f"Updated suggestion: {suggestion_id}")
             return updated
 
@@ -549,6 +727,7 @@ class SQLiteSuggestionStorage(SuggestionStorageBackend):
                 f"INSERT OR REPLACE INTO mission_suggestions ({columns}) VALUES ({placeholders})",
                 list(row.values())
             )
+            self._index_similarity(conn, [suggestion])
 
         return suggestion_id
 
@@ -579,6 +758,7 @@ class SQLiteSuggestionStorage(SuggestionStorageBackend):
                     list(row.values())
                 )
                 count += 1
+            self._index_similarity(conn, suggestions)
 
         logger.info(f"Upserted {count} suggestions (safe batch)")
         return count
@@ -618,6 +798,7 @@ class SQLiteSuggestionStorage(SuggestionStorageBackend):
                     f"INSERT INTO mission_suggestions ({columns}) VALUES ({placeholders})",
                     list(row.values())
                 )
+            self._index_similarity(conn, suggestions)
 
             logger.info(f"Bulk updated {len(suggestions)} suggestions")
             return len(suggestions)
@@ -625,6 +806,7 @@ class SQLiteSuggestionStorage(SuggestionStorageBackend):
     def update_batch(self, updates: List[Dict[str, Any]]) -> int:
         """Update multiple suggestions. Each dict must have 'id' field."""
         updated = 0
+        text_changed = []
         with self._get_connection() as conn:
             for update in updates:
                 suggestion_id = update.pop('id', None)
@@ -638,6 +820,9 @@ class SQLiteSuggestionStorage(SuggestionStorageBackend):
                     list(row_updates.values()) + [suggestion_id]
                 )
                 updated += cursor.rowcount
+                if update.keys() & {'mission_title', 'mission_description'}:
+                    text_changed.append(suggestion_id)
+            self._index_similarity_ids(conn, text_changed)
 
         logger.info(f"Batch updated {updated} suggestions")
         return updated
@@ -683,6 +868,7 @@ class SQLiteSuggestionStorage(SuggestionStorageBackend):
         imported = 0
         skipped = 0
         errors = []
+        imported_items = []
 
         with self._get_connection() as conn:
             for item in items:
@@ -730,12 +916,14 @@ class SQLiteSuggestionStorage(SuggestionStorageBackend):
                         list(row.values())
                     )
                     imported += 1
+                    imported_items.append(suggestion)
 
                 except Exception as e:
                     errors.append({
                         'id': item.get('id', 'unknown'),
                         'error': str(e)
                     })
+            self._index_similarity(conn, imported_items)
 
         # Verify count matches
         final_count = self.count()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests for the trigger-maintained analytics rollups
+
+Validates:
+- KB rollups are backfilled on first use and follow inserts, updates and deletes
+- Rollup-based KB analytics match aggregates computed from the learnings table
+- Date filters on accumulation keep full-timestamp semantics at the boundaries
+- Token rollups match aggregates computed from token_events
+"""
+
+import json
+import sqlite3
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+# Add AtlasForge root to path
+AF_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(AF_ROOT))
+
+import mission_analytics
+from kb_analytics import KBAnalytics, clear_kb_cache
+from mission_analytics import MissionAnalytics
+from mission_knowledge_base import MissionKnowledgeBase, MissionLearning
+
+
+def _learning(i, **overrides):
+    data = dict(
+        learning_id=f"l{i}", mission_id=f"m{i % 3}",
+        learning_type=("technique", "insight", "gotcha")[i % 3],
+        title=f"Learning {i}", description="", problem_domain=("gpu_optimization", "api", "")[i % 3],
+        outcome="success", relevance_keywords=["caching", "retry", "gpu"][: 1 + i % 3],
+        timestamp=f"2026-01-{1 + i % 5:02d}T{i:02d}:00:00",
+        lesson_source=("achievement", "issue")[i % 2],
+        source_type=("mission", "investigation")[i % 2],
+    )
+    data.update(overrides)
+    return MissionLearning(**data)
+
+
+def _raw_accumulation(db_path, start=None, end=None, source_type=None):
+    query = "SELECT mission_id, MIN(timestamp), COUNT(*) FROM learnings WHERE 1=1"
+    params = []
+    if start:
+        query += " AND timestamp >= ?"
+        params.append(start)
+    if end:
+        query += " AND timestamp <= ?"
+        params.append(end)
+    if source_type:
+        query += " AND source_type = ?"
+        params.append(source_type)
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute(query + " GROUP BY mission_id ORDER BY 2", params).fetchall()
+    conn.close()
+    return [(m, t, c) for m, t, c in rows]
+
+
+def _raw_facets(db_path):
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("SELECT problem_domain, relevance_keywords, learning_type FROM learnings").fetchall()
+    conn.close()
+    domains = Counter(d for d, _, _ in rows if d)
+    keywords = Counter(k.lower() for _, kw, _ in rows for k in json.loads(kw) if len(k) > 3)
+    types = Counter(t for _, _, t in rows)
+    return domains, keywords, types
+
+
+@pytest.fixture
+def kb(tmp_path):
+    kb = MissionKnowledgeBase(storage_path=tmp_path, use_hybrid=False)
+    for i in range(6):
+        kb._store_learning(_learning(i))
+    return kb
+
+
+def _check_kb(analytics, db_path):
+    clear_kb_cache()
+    domains, keywords, types = _raw_facets(db_path)
+
+    accumulation = analytics.get_learning_accumulation()
+    assert [(m["mission_id"], m["timestamp"], m["count"]) for m in accumulation["missions"]] == \
+        _raw_accumulation(db_path)
+    assert analytics.get_type_distribution()["distribution"] == dict(types)
+
+    themes = analytics.get_top_themes(top_n=50)
+    assert {t["theme"]: t["count"] for t in themes["keyword_themes"]} == \
+        {k.title(): c for k, c in keywords.items()}
+    assert {t["theme"]: t["count"] for t in themes["domain_themes"]} == \
+        {d.replace("_", " ").title(): c for d, c in domains.items()}
+
+
+def test_kb_rollups_follow_changes(kb):
+    analytics = KBAnalytics(kb.db_path)
+    _check_kb(analytics, kb.db_path)  # Backfilled
+
+    for i in range(6, 12):
+        kb._store_learning(_learning(i))
+    kb._store_learning(_learning(2, learning_type="template", problem_domain="api",
+                                 timestamp="2025-12-31T00:00:00"))
+    kb.merge_learnings("l0", ["l1", "l4"])
+    with sqlite3.connect(kb.db_path) as conn:
+        conn.execute("DELETE FROM learnings WHERE learning_id IN ('l3', 'l5')")
+    conn.close()
+
+    _check_kb(analytics, kb.db_path)
+
+
+def test_accumulation_date_filters(kb):
+    analytics = KBAnalytics(kb.db_path)
+    for start, end, source in [
+        ("2026-01-02", "2026-01-04", None),
+        ("2026-01-02T03:00:00", "2026-01-05T01:00:00", None),
+        ("2026-01-03", None, "investigation"),
+        (None, "2026-01-03T02", "mission"),
+    ]:
+        result = analytics.get_learning_accumulation_filtered(start, end, source)
+        assert [(m["mission_id"], m["timestamp"], m["count"]) for m in result["missions"]] == \
+            _raw_accumulation(kb.db_path, start, end, source)
+
+
+def test_token_rollups(tmp_path, monkeypatch):
+    analytics = MissionAnalytics(storage_path=tmp_path)
+    monkeypatch.setattr(mission_analytics, "_analytics_instance", analytics)
+    for i in range(20):
+        analytics.record_token_usage(
+            f"m{i % 4}", ("PLANNING", "BUILDING")[i % 2],
+            {"input_tokens": 100 + i, "output_tokens": 10 * i},
+            model=("claude-sonnet-4-20250514", "unknown")[i % 3 == 0],
+            request_id=f"r{i}"
+        )
+    # Duplicate request is ignored, deleted events are subtracted
+    analytics.record_token_usage("m0", "PLANNING", {"input_tokens": 999}, request_id="r0")
+    with sqlite3.connect(analytics.db_path) as conn:
+        conn.execute("DELETE FROM token_events WHERE request_id IN ('r1', 'r2')")
+        expected = {
+            stage: (inp, count, missions) for stage, inp, count, missions in conn.execute("""
+                SELECT stage, SUM(input_tokens), COUNT(*), COUNT(DISTINCT mission_id)
+                FROM token_events GROUP BY stage
+            """)
+        }
+    conn.close()
+
+    stages = mission_analytics.get_stage_aggregates(days=0)["stages"]
+    assert {s: (v["input_tokens"], v["event_count"], v["mission_count"]) for s, v in stages.items()} == expected
+
+    models = mission_analytics.get_model_aggregates(days=1)["models"]
+    assert sum(v["event_count"] for v in models.values()) == 18
+
+    daily = mission_analytics.get_daily_aggregates(days=0, start_date="2000-01-01")["daily"]
+    assert len(daily) == 1 and daily[0]["missions"] == 4
+    assert mission_analytics.get_daily_aggregates(days=0, end_date="2000-01-01")["daily"] == []
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests for materialized decision graph aggregates and paginated graphs
+
+Validates:
+- Mission graphs are paginated by sequence number, linked across pages
+- Stats, summaries and mission lists match a recount of the invocations
+- Rows written out of order rebuild the mission's aggregates
+- Existing databases are backfilled on open
+- Patterns are detected over the whole mission
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add AtlasForge root to path
+AF_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(AF_ROOT))
+
+from decision_graph import DecisionGraphLogger
+
+
+def log(graph_logger, tool_name="Read", status="success", mission_id="m1", stage="BUILDING", file_path="/src/a.py"):
+    return graph_logger.log_invocation(
+        mission_id=mission_id, stage=stage, tool_name=tool_name,
+        input_summary={"file_path": file_path}, status=status, duration_ms=10
+    )
+
+
+def recount(graph_logger, mission_id):
+    """Summary computed from tool_invocations directly."""
+    with sqlite3.connect(graph_logger.db_path) as conn:
+        total, errors, duration, first, last = conn.execute("""
+            SELECT COUNT(*), SUM(status = 'error'), SUM(duration_ms), MIN(timestamp), MAX(timestamp)
+            FROM tool_invocations WHERE mission_id = ?
+        """, (mission_id,)).fetchone()
+        by_stage = dict(conn.execute(
+            "SELECT stage, COUNT(*) FROM tool_invocations WHERE mission_id = ? GROUP BY stage", (mission_id,)))
+        by_tool = dict(conn.execute(
+            "SELECT tool_name, COUNT(*) FROM tool_invocations WHERE mission_id = ? GROUP BY tool_name", (mission_id,)))
+    return {"mission_id": mission_id, "total_invocations": total, "error_count": errors,
+            "total_duration_ms": duration, "first_invocation": first, "last_invocation": last,
+            "by_stage": by_stage, "by_tool": by_tool}
+
+
+def log_mixed(graph_logger, count, mission_id="m1"):
+    tools = ["Read", "Edit", "Bash", "Grep"]
+    for i in range(count):
+        log(graph_logger, tool_name=tools[i % 4], status="error" if i % 7 == 0 else "success",
+            mission_id=mission_id, stage="PLANNING" if i < count // 3 else "BUILDING")
+
+
+@pytest.fixture
+def graph_logger(tmp_path):
+    # Long interval: tests flush explicitly
+    return DecisionGraphLogger(storage_path=tmp_path, flush_interval=60)
+
+
+def test_graph_pages_cover_mission(graph_logger):
+    log_mixed(graph_logger, 1200)
+
+    nodes, edges, after = [], [], 0
+    while True:
+        graph = graph_logger.get_mission_graph("m1", after_sequence=after, limit=500)
+        assert graph["stats"]["total"] == 1200
+        nodes.extend(graph["nodes"])
+        edges.extend(graph["edges"])
+        after = graph["page"]["next_after_sequence"]
+        if not graph["page"]["has_more"]:
+            break
+
+    assert [n["sequence"] for n in nodes] == list(range(1, 1201))
+    # Sequential edges continue across page boundaries
+    assert len(edges) == 1199
+    assert [e["target"] for e in edges] == [n["id"] for n in nodes[1:]]
+    assert graph_logger.get_mission_graph("m1", after_sequence=1200)["nodes"] == []
+
+
+def test_aggregates_match_recount(graph_logger):
+    log_mixed(graph_logger, 300)
+    graph_logger.flush()
+    log_mixed(graph_logger, 50)
+    log_mixed(graph_logger, 20, mission_id="m2")
+
+    for mission_id in ("m1", "m2"):
+        summary = graph_logger.get_mission_summary(mission_id)
+        assert summary == recount(graph_logger, mission_id)
+
+    stats = graph_logger.get_mission_graph("m1", limit=10)["stats"]
+    assert (stats["total"], stats["errors"]) == (350, 51)
+    missions = {m["mission_id"]: m for m in graph_logger.get_missions_with_graphs()}
+    assert missions["m2"]["total_invocations"] == 20 and missions["m2"]["error_count"] == 3
+    assert graph_logger.get_mission_summary("missing")["total_invocations"] == 0
+
+
+def test_out_of_order_rows_rebuild(tmp_path):
+    first = DecisionGraphLogger(storage_path=tmp_path, flush_interval=60)
+    second = DecisionGraphLogger(storage_path=tmp_path, flush_interval=60)
+    log_mixed(first, 30)
+    log_mixed(second, 10)
+
+    # Written after rows with higher sequence numbers
+    second.flush()
+    first.flush()
+    assert first.get_mission_summary("m1") == recount(first, "m1")
+    assert first.get_mission_summary("m1")["total_invocations"] == 40
+
+
+def test_existing_database_is_backfilled(tmp_path):
+    graph_logger = DecisionGraphLogger(storage_path=tmp_path, flush_interval=60)
+    log_mixed(graph_logger, 40)
+    graph_logger.flush()
+
+    # A database from before the aggregate tables
+    with sqlite3.connect(graph_logger.db_path) as conn:
+        for table in ("mission_graph_stats", "mission_graph_counts", "mission_error_runs"):
+            conn.execute(f"DROP TABLE {table}")
+        conn.execute("PRAGMA user_version = 0")
+
+    reopened = DecisionGraphLogger(storage_path=tmp_path, flush_interval=60)
+    assert reopened.get_mission_summary("m1") == recount(reopened, "m1")
+
+
+def test_patterns_cover_whole_mission(graph_logger):
+    # Beyond the 500 invocations the patterns used to look at
+    for _ in range(600):
+        log(graph_logger, tool_name="Read", file_path="/src/other.py")
+    failures = [log(graph_logger, tool_name="Bash", status="error") for _ in range(4)]
+    log(graph_logger)
+    edits = [log(graph_logger, tool_name="Edit", file_path="/src/b.py") for _ in range(12)]
+    # Still failing when checked
+    ongoing = [log(graph_logger, tool_name="Grep", status="error") for _ in range(5)]
+
+    patterns = graph_logger.get_unusual_patterns("m1")
+    by_type = {}
+    for pattern in patterns:
+        by_type.setdefault(pattern["type"], []).append(pattern)
+
+    runs = by_type["repeated_failure"]
+    assert [r["invocation_ids"] for r in runs] == [failures, ongoing]
+    assert [r["severity"] for r in runs] == ["warning", "error"]
+    (edit_pattern,) = by_type["excessive_edits"]
+    assert edit_pattern["description"] == "File edited 12 times: /src/b.py"
+    assert edit_pattern["invocation_ids"] == edits[:10]
+    assert "tool_switching" not in by_type
+
+    failure_points = graph_logger.get_failure_points("m1", after_sequence=602)
+    assert [f["invocation_id"] for f in failure_points] == failures[2:] + ongoing
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for the write-behind decision graph logger
+
+Validates:
+- Logged invocations are queued, not written, until a flush
+- Queries see queued invocations merged with stored ones
+- The background writer drains the queue in batches
+- Failed writes keep the rows queued
+- Immediate mode (flush_interval=0) writes on every call
+"""
+
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add AtlasForge root to path
+AF_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(AF_ROOT))
+
+import decision_graph
+from decision_graph import DecisionGraphLogger
+
+
+def stored_count(graph_logger):
+    with sqlite3.connect(graph_logger.db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM tool_invocations").fetchone()[0]
+
+
+def log(graph_logger, tool_name="Read", status="success", mission_id="m1"):
+    return graph_logger.log_invocation(
+        mission_id=mission_id, stage="BUILDING", tool_name=tool_name,
+        input_summary={"file_path": "/src/a.py"}, status=status
+    )
+
+
+@pytest.fixture
+def graph_logger(tmp_path):
+    # Long interval: tests flush explicitly
+    return DecisionGraphLogger(storage_path=tmp_path, flush_interval=60)
+
+
+def test_queries_merge_queued_rows(graph_logger):
+    first = log(graph_logger)
+    assert graph_logger.flush() == 1
+    second = log(graph_logger, tool_name="Bash", status="error")
+    third = log(graph_logger, tool_name="Edit")
+    assert stored_count(graph_logger) == 1
+
+    invocations = graph_logger.get_invocations("m1")
+    assert [i.invocation_id for i in invocations] == [first, second, third]
+    assert [i.sequence_number for i in invocations] == [1, 2, 3]
+    assert [i.invocation_id for i in graph_logger.get_invocations("m1", limit=2)] == [first, second]
+    assert [i.invocation_id for i in graph_logger.get_invocations("m1", status="error")] == [second]
+    assert graph_logger.get_invocations("m2") == []
+    assert graph_logger.get_invocation_details(third).tool_name == "Edit"
+
+    graph = graph_logger.get_mission_graph("m1")
+    assert graph["stats"]["total"] == 3 and graph["stats"]["errors"] == 1
+    assert [e["target"] for e in graph["edges"]] == [second, third]
+
+    # Aggregate queries flush first
+    assert graph_logger.get_mission_summary("m1")["total_invocations"] == 3
+    assert stored_count(graph_logger) == 3
+    assert [i.invocation_id for i in graph_logger.get_invocations("m1")] == [first, second, third]
+
+
+def test_background_writer_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(decision_graph, "MAX_PENDING_INVOCATIONS", 50)
+    graph_logger = DecisionGraphLogger(storage_path=tmp_path, flush_interval=0.05)
+    for _ in range(20):
+        log(graph_logger)
+
+    deadline = time.monotonic() + 5
+    while stored_count(graph_logger) < 20 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert stored_count(graph_logger) == 20
+    assert graph_logger._queued_rows() == []
+
+    # A full queue is written without waiting for the interval
+    graph_logger.flush_interval = 60
+    for _ in range(50):
+        log(graph_logger)
+    deadline = time.monotonic() + 5
+    while stored_count(graph_logger) < 70 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert stored_count(graph_logger) == 70
+
+
+def test_failed_write_keeps_rows(graph_logger, monkeypatch):
+    log(graph_logger)
+
+    class BrokenPool:
+        def connection(self):
+            raise sqlite3.OperationalError("database is locked")
+
+    pool = graph_logger._pool
+    monkeypatch.setattr(graph_logger, "_pool", BrokenPool())
+    assert graph_logger.flush() == 0
+    assert len(graph_logger._queued_rows()) == 1
+
+    monkeypatch.setattr(graph_logger, "_pool", pool)
+    log(graph_logger)
+    assert graph_logger.flush() == 2
+    assert stored_count(graph_logger) == 2
+
+
+def test_immediate_mode(tmp_path):
+    graph_logger = DecisionGraphLogger(storage_path=tmp_path, flush_interval=0)
+    log(graph_logger)
+    assert stored_count(graph_logger) == 1
+    assert graph_logger._flusher is None
+
+    # Sequence numbers continue from the database
+    again = DecisionGraphLogger(storage_path=tmp_path, flush_interval=0)
+    log(again)
+    assert [i.sequence_number for i in again.get_invocations("m1")] == [1, 2]
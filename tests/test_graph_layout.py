@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for the cached, incremental exploration graph layout
+
+Validates:
+- Grid-bucketed repulsion matches exact repulsion within the cutoff
+- Layouts stay on the canvas and keep connected nodes closer together
+- Unchanged graphs reuse persisted positions without iterating
+- Added nodes only move themselves and their neighbours
+- Exports can skip the layout entirely
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add AtlasForge root to path
+AF_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(AF_ROOT))
+
+from atlasforge_enhancements.exploration_graph import ExplorationGraph
+from atlasforge_enhancements.graph_layout import (
+    GraphLayout, LOCAL_ITERATIONS, MARGIN, _exact_repulsion, _grid_repulsion
+)
+
+
+def chain_graph(n, width=800, height=600):
+    node_ids = [f"n{i}" for i in range(n)]
+    edges = [(i, i + 1) for i in range(n - 1)]
+    return node_ids, edges, [1.0] * len(edges)
+
+
+def test_grid_repulsion_matches_exact_for_close_pairs():
+    rng = np.random.default_rng(1)
+    pos = rng.uniform(0, 100, size=(40, 2))
+    k_sq = 400.0  # Cutoff 2k = 40
+
+    exact = np.zeros_like(pos)
+    for i in range(len(pos)):
+        diff = pos - pos[i]
+        dist_sq = np.maximum((diff ** 2).sum(axis=1), 1e-4)
+        close = (dist_sq < 4 * k_sq) & (np.arange(len(pos)) != i)
+        exact[i] = -(diff[close] * (k_sq / dist_sq[close])[:, None]).sum(axis=0)
+
+    everyone = np.arange(len(pos))
+    assert np.allclose(_grid_repulsion(pos, k_sq, everyone), exact)
+    # Forces on a subset of nodes
+    subset = np.array([3, 17, 30])
+    assert np.allclose(_grid_repulsion(pos, k_sq, subset), exact[subset])
+    # Same as all-pairs once every pair is within the cutoff
+    small = pos[:5] / 10
+    assert np.allclose(_grid_repulsion(small, k_sq, everyone[:5]), _exact_repulsion(small, k_sq, everyone[:5]))
+    assert np.allclose(_exact_repulsion(small, k_sq, subset[:1]), _exact_repulsion(small, k_sq, everyone[:5])[3])
+
+
+def test_large_layout_stays_on_canvas():
+    node_ids, edges, strengths = chain_graph(3000)
+    layout = GraphLayout()
+    positions = layout.layout(node_ids, edges, strengths, 800, 600)
+
+    pos = np.array([positions[nid] for nid in node_ids])
+    assert pos[:, 0].min() >= MARGIN and pos[:, 0].max() <= 800 - MARGIN
+    assert pos[:, 1].min() >= MARGIN and pos[:, 1].max() <= 600 - MARGIN
+    # Linked nodes end up closer than random pairs
+    linked = np.linalg.norm(pos[1:] - pos[:-1], axis=1).mean()
+    random_pairs = np.linalg.norm(pos - pos[np.random.default_rng(0).permutation(len(pos))], axis=1).mean()
+    assert linked < random_pairs / 2
+
+
+def test_positions_are_persisted_and_reused(tmp_path):
+    node_ids, edges, strengths = chain_graph(50)
+    first = GraphLayout(tmp_path / "layout.json")
+    positions = first.layout(node_ids, edges, strengths, 800, 600)
+    assert first.last_iterations > 0
+
+    second = GraphLayout(tmp_path / "layout.json")
+    assert second.layout(node_ids, edges, strengths, 800, 600) == positions
+    assert second.last_iterations == 0
+
+    # Other canvas sizes scale the stored positions
+    scaled = second.layout(node_ids, edges, strengths, 400, 300)
+    assert np.allclose(scaled["n7"], np.array(positions["n7"]) / 2)
+
+
+def test_new_nodes_relax_locally():
+    node_ids, edges, strengths = chain_graph(100)
+    layout = GraphLayout()
+    before = layout.layout(node_ids, edges, strengths, 800, 600)
+
+    # Attach a new node to n10
+    grown = node_ids + ["new"]
+    grown_edges = edges + [(10, 100)]
+    after = layout.layout(grown, grown_edges, strengths + [1.0], 800, 600)
+    assert layout.last_iterations == LOCAL_ITERATIONS
+
+    moved = {nid for nid in node_ids if after[nid] != before[nid]}
+    assert moved <= {"n10"}
+    assert np.linalg.norm(np.array(after["new"]) - np.array(after["n10"])) < 200
+
+    # Removed nodes are dropped from the cache
+    layout.layout(node_ids[:90], edges[:89], strengths[:89], 800, 600)
+    assert len(layout._positions) == 90
+
+
+def test_export_uses_cached_layout_and_can_skip_it(tmp_path):
+    graph = ExplorationGraph(tmp_path)
+    a = graph.add_file_node("/src/a.py", "A", "m1")
+    b = graph.add_file_node("/src/b.py", "B", "m1")
+    c = graph.add_file_node("/src/c.py", "C", "m1")
+    graph.add_edge(a.id, b.id, "import", "m1")
+    graph.add_edge(b.id, c.id, "import", "m1")
+    graph.save()
+
+    data = graph.export_for_visualization(800, 600)
+    assert all('x' in n and 'y' in n for n in data['nodes'])
+    assert (tmp_path / "layout.json").exists()
+
+    again = ExplorationGraph(tmp_path).export_for_visualization(800, 600)
+    assert [(n['x'], n['y']) for n in again['nodes']] == [(n['x'], n['y']) for n in data['nodes']]
+
+    plain = graph.export_for_visualization(800, 600, include_layout=False)
+    assert len(plain['nodes']) == 3 and all('x' not in n for n in plain['nodes'])
+    assert len(plain['edges']) == 2
+
+    graph.reset_layout()
+    assert not (tmp_path / "layout.json").exists()
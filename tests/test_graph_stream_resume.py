@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for resumable, batched exploration graph streaming
+
+Validates:
+- Graph events get consecutive sequence numbers; stats updates are not logged
+- Resume tokens return only missed events, or a snapshot when too old or
+  from another stream
+- Events are serialized once and broadcast as one frame per tick
+"""
+
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+import pytest
+
+# Add AtlasForge root to path
+AF_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(AF_ROOT))
+
+from realtime_graph_streaming import BATCH_INTERVAL, ExplorationStreamManager
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(ExplorationStreamManager, '_instance', None)
+    return ExplorationStreamManager()
+
+
+def add_nodes(manager, count, start=0):
+    for i in range(start, start + count):
+        manager.emit_node_added(node_id=f"n{i}", name=f"file{i}.py", parent_id=f"n{i - 1}" if i else None)
+
+
+def test_sequences_and_log(manager):
+    add_nodes(manager, 3)
+    manager.emit_edge_added("n0", "n1")
+    manager.emit_stats_update()
+    manager.emit_node_updated("n2", {'exploration_count': 2})
+
+    assert [e['sequence'] for e in manager.recent_events] == [1, 2, 3, 4, 5]
+    assert [e['event_type'] for e in manager.get_recent_events(2)] == ['edge_added', 'node_updated']
+
+
+def test_resume_returns_missed_events(manager):
+    add_nodes(manager, 3)
+    token = manager.get_current_state()['resume_token']
+
+    add_nodes(manager, 2, start=3)
+    changes = manager.get_changes_since(token)
+    assert changes['mode'] == 'delta'
+    assert [e['data']['id'] for e in changes['events']] == ['n3', 'n4']
+    assert changes['sequence'] == 5
+
+    # Up to date: nothing to send
+    assert manager.get_changes_since(changes['resume_token'])['events'] == []
+
+    # No token, a token from before a reset, or a malformed one: snapshot
+    assert manager.get_changes_since(None)['mode'] == 'snapshot'
+    assert len(manager.get_changes_since(None)['nodes']) == 5
+    assert manager.get_changes_since('garbage')['mode'] == 'snapshot'
+    manager.reset()
+    add_nodes(manager, 5)
+    assert manager.get_changes_since(token)['mode'] == 'snapshot'
+
+
+def test_too_far_behind_gets_snapshot(manager):
+    manager.recent_events = deque(maxlen=10)
+    add_nodes(manager, 5)
+    token = manager.get_current_state()['resume_token']
+
+    add_nodes(manager, 10, start=5)
+    assert manager.get_changes_since(token)['mode'] == 'delta'
+    add_nodes(manager, 1, start=15)
+    snapshot = manager.get_changes_since(token)
+    assert snapshot['mode'] == 'snapshot'
+    assert len(snapshot['nodes']) == 16 and snapshot['sequence'] == 16
+
+
+def test_events_are_batched(manager):
+    frames = []
+    manager.set_broadcast_callback(lambda name, data: frames.append((name, data)))
+
+    add_nodes(manager, 3)
+    manager.emit_edge_added("n0", "n1")
+    assert frames == []
+    assert manager.flush_events() == 4
+
+    (name, frame), = frames
+    assert name == 'graph_batch'
+    assert [e['sequence'] for e in frame['events']] == [1, 2, 3, 4]
+    # One serialized dict per event, shared with the resume log
+    assert frame['events'][0] is manager.recent_events[0]
+    assert frame['resume_token'] == manager.get_current_state()['resume_token']
+
+    # The timer sends the next frame on its own
+    add_nodes(manager, 2, start=3)
+    deadline = time.monotonic() + 5
+    while len(frames) < 2 and time.monotonic() < deadline:
+        time.sleep(BATCH_INTERVAL / 2)
+    assert [e['sequence'] for e in frames[1][1]['events']] == [5, 6]
+    assert manager.flush_events() == 0
+    assert len(frames) == 2
+
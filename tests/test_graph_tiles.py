@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests for exploration graph tiling and level-of-detail
+
+Validates:
+- The tiles of a zoom level partition the nodes
+- Dense tiles are clustered, sparse and deepest tiles are sent in full
+- Tile ETags only change when the tile's own content changes
+- Viewports merge the covering tiles
+- The API answers unchanged tiles with 304
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+from flask import Flask
+
+# Add AtlasForge root to path
+AF_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(AF_ROOT))
+
+import interactive_graph_api
+from graph_tiles import DETAIL_MAX_NODES, MAX_ZOOM, TileIndex, zoom_for_viewport
+
+
+def make_graph(count, seed=0, width=800, height=600):
+    rng = random.Random(seed)
+    nodes = [{
+        'id': f"n{i}", 'name': f"file{i}.py", 'type': 'file' if i % 4 else 'concept',
+        'exploration_count': 1 + i % 5,
+        'x': round(rng.uniform(30, width - 30), 2), 'y': round(rng.uniform(30, height - 30), 2)
+    } for i in range(count)]
+    edges = [{'source': f"n{i}", 'target': f"n{rng.randrange(count)}", 'relationship': 'import', 'strength': 1.0}
+             for i in range(count)]
+    return nodes, [e for e in edges if e['source'] != e['target']]
+
+
+def test_tiles_partition_nodes():
+    nodes, edges = make_graph(2000)
+    index = TileIndex(nodes, edges)
+
+    for z in (0, 1, 3):
+        seen = 0
+        for x in range(1 << z):
+            for y in range(1 << z):
+                tile = index.tile(z, x, y)
+                x0, y0, x1, y1 = tile['tile']['bounds']
+                if tile['level'] == 'detail':
+                    members = tile['nodes']
+                    assert all(x0 <= n['x'] <= x1 and y0 <= n['y'] <= y1 for n in members)
+                    seen += len(members)
+                else:
+                    seen += len(tile['nodes']) + sum(c['count'] for c in tile['clusters'])
+        assert seen == len(nodes)
+
+    with pytest.raises(ValueError):
+        index.tile(1, 2, 0)
+
+
+def test_level_of_detail():
+    nodes, edges = make_graph(2000)
+    index = TileIndex(nodes, edges)
+
+    overview = index.tile(0, 0, 0)
+    assert overview['level'] == 'cluster'
+    assert len(overview['nodes']) + len(overview['clusters']) <= 64
+    assert sum(c['count'] for c in overview['clusters']) + len(overview['nodes']) == 2000
+    # Aggregated edges between clusters
+    assert sum(e['count'] for e in overview['edges']) <= len(edges)
+    assert all(e['source'] != e['target'] for e in overview['edges'])
+
+    assert index.tile(MAX_ZOOM, 0, 0)['level'] == 'detail'
+    assert index.tile(3, 2, 2)['metadata']['tile_nodes'] <= DETAIL_MAX_NODES
+    assert index.tile(3, 2, 2)['level'] == 'detail'
+
+
+def test_etag_follows_tile_content():
+    nodes, edges = make_graph(500)
+    before = TileIndex(nodes, edges)
+
+    # A new node in the bottom-right corner
+    grown = nodes + [{'id': 'new', 'name': 'new.py', 'type': 'file', 'x': 790.0, 'y': 590.0}]
+    after = TileIndex(grown, edges)
+
+    assert after.tile(2, 0, 0)['etag'] == before.tile(2, 0, 0)['etag']
+    assert after.tile(2, 3, 3)['etag'] != before.tile(2, 3, 3)['etag']
+
+
+def test_viewport_merges_covering_tiles():
+    nodes, edges = make_graph(2000)
+    index = TileIndex(nodes, edges)
+
+    assert zoom_for_viewport((0, 0, 800, 600), 800, 600) == 0
+    view = index.viewport((100, 100, 250, 200))
+    assert view['zoom'] == zoom_for_viewport((100, 100, 250, 200), 800, 600) == 2
+    assert [(t['x'], t['y']) for t in view['tiles']] == [(0, 0), (1, 0), (0, 1), (1, 1)]
+    ids = [n['id'] for n in view['nodes']]
+    assert len(ids) == len(set(ids))
+    assert len({(e['source'], e['target']) for e in view['edges']}) == len(view['edges'])
+
+
+@pytest.fixture
+def client(monkeypatch):
+    nodes, edges = make_graph(1000)
+
+    def visualization_data(graph, width=800, height=600, **filters):
+        return {'nodes': [dict(n) for n in nodes], 'edges': [dict(e) for e in edges],
+                'metadata': {'generated_at': 'now'}, 'filters_applied': filters}
+
+    monkeypatch.setattr(interactive_graph_api, '_load_exploration_graph', lambda: object())
+    monkeypatch.setattr(interactive_graph_api, 'get_filtered_visualization_data', visualization_data)
+    app = Flask(__name__)
+    interactive_graph_api.register_interactive_graph_routes(app)
+    return app.test_client()
+
+
+def test_tile_api_serves_304(client):
+    response = client.get('/api/atlasforge/graph-tiles/1/0/1')
+    assert response.status_code == 200
+    etag = response.headers['ETag'].strip('"')
+    assert response.get_json()['etag'] == etag
+
+    again = client.get('/api/atlasforge/graph-tiles/1/0/1', headers={'If-None-Match': f'"{etag}"'})
+    assert again.status_code == 304
+    assert client.get('/api/atlasforge/graph-tiles/1/5/0').status_code == 400
+
+    view = client.get('/api/atlasforge/exploration-graph-enhanced?bbox=0,0,400,300')
+    assert view.get_json()['zoom'] == 1
+    full = client.get('/api/atlasforge/exploration-graph-enhanced')
+    assert len(full.get_json()['nodes']) == 1000
+    assert client.get('/api/atlasforge/exploration-graph-enhanced',
+                      headers={'If-None-Match': full.headers['ETag']}).status_code == 304
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Tests for the JSON state store in io_utils
+
+Validates:
+- Writes replace the file atomically (new inode, no temp files left) as compact JSON
+- Reads of unchanged files come from the cache and return independent copies
+- Files replaced by another writer are re-read
+- Coalesced writes and updates collapse into one write and are flushed on read
+- Writers lock the target file, not its directory, and wait for the lock
+"""
+
+import fcntl
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+# Add AtlasForge root to path
+AF_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(AF_ROOT))
+
+import io_utils
+from io_utils import JSONStateStore
+
+
+def test_write_is_rename_and_compact(tmp_path):
+    store = JSONStateStore()
+    path = tmp_path / "state.json"
+    path.write_text('{"old": true}')
+    inode = path.stat().st_ino
+
+    assert store.write(path, {"a": [1, 2], "b": "x"})
+
+    assert path.stat().st_ino != inode
+    assert path.read_text() == '{"a":[1,2],"b":"x"}'
+    assert sorted(os.listdir(tmp_path)) == [".state.json.lock", "state.json"]
+
+
+def test_read_cache_returns_copies(tmp_path):
+    store = JSONStateStore()
+    path = tmp_path / "state.json"
+    store.write(path, {"items": [1]})
+
+    first = store.read(path)
+    first["items"].append(2)
+    second = store.read(path)
+
+    assert second == {"items": [1]}
+    assert store.get_stats()["cache_hits"] == 2
+
+
+def test_external_change_invalidates_cache(tmp_path):
+    store = JSONStateStore()
+    path = tmp_path / "state.json"
+    store.write(path, {"v": 1})
+    assert store.read(path) == {"v": 1}
+
+    # Another process replacing the file
+    other = JSONStateStore()
+    other.write(path, {"v": 2})
+
+    assert store.read(path) == {"v": 2}
+
+
+def test_missing_empty_and_invalid_files(tmp_path):
+    store = JSONStateStore()
+    assert store.read(tmp_path / "missing.json", {"d": 1}) == {"d": 1}
+    (tmp_path / "empty.json").write_text("")
+    assert store.read(tmp_path / "empty.json", []) == []
+    (tmp_path / "bad.json").write_text("{not json")
+    assert store.read(tmp_path / "bad.json") == {}
+
+
+def test_update(tmp_path):
+    store = JSONStateStore()
+    path = tmp_path / "history.json"
+
+    result = store.update(path, lambda h: h + [1], [])
+    store.update(path, lambda h: h + [2], [])
+
+    assert result == [1]
+    assert json.loads(path.read_text()) == [1, 2]
+
+
+def test_coalesced_operations(tmp_path):
+    store = JSONStateStore(coalesce_window=60.0)
+    path = tmp_path / "state.json"
+
+    store.write(path, {"n": 0}, coalesce=True)
+    for _ in range(5):
+        store.update(path, lambda d: {"n": d["n"] + 1}, coalesce=True)
+    assert not path.exists()
+
+    # Reads in this process flush first
+    assert store.read(path) == {"n": 5}
+    stats = store.get_stats()
+    assert stats["writes"] == 1
+    assert stats["coalesced"] == 5
+
+
+def test_coalesced_updates_apply_to_current_content(tmp_path):
+    store = JSONStateStore(coalesce_window=60.0)
+    path = tmp_path / "chat.json"
+    store.update(path, lambda h: h + ["a"], [], coalesce=True)
+
+    # Written by someone else meanwhile
+    path.write_text('["human"]')
+
+    assert store.flush()
+    assert json.loads(path.read_text()) == ["human", "a"]
+
+
+def test_coalesced_write_flushed_by_background_thread(tmp_path):
+    store = JSONStateStore(coalesce_window=0.01)
+    path = tmp_path / "state.json"
+    store.write(path, {"v": 1}, coalesce=True)
+
+    done = threading.Event()
+    for _ in range(200):
+        if path.exists():
+            break
+        done.wait(0.01)
+    assert json.loads(path.read_text()) == {"v": 1}
+
+
+def test_concurrent_updates_are_not_lost(tmp_path):
+    path = tmp_path / "counter.json"
+    io_utils.atomic_write_json(path, {"n": 0})
+
+    def worker():
+        store = JSONStateStore()  # Separate cache, like another process
+        for _ in range(25):
+            store.update(path, lambda d: {"n": d["n"] + 1})
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert io_utils.atomic_read_json(path) == {"n": 100}
+
+
+def test_writers_lock_their_file_only(tmp_path):
+    store = JSONStateStore(lock_timeout=5)
+    busy = tmp_path / "busy.json"
+    store.write(busy, {"v": 0})
+
+    # Another process holds busy.json's lock
+    holder = open(tmp_path / ".busy.json.lock", "a")
+    fcntl.flock(holder, fcntl.LOCK_EX)
+    try:
+        assert store.write(tmp_path / "other.json", {"v": 1})
+
+        done = []
+        writer = threading.Thread(target=lambda: done.append(store.write(busy, {"v": 2})))
+        writer.start()
+        writer.join(0.3)
+        assert writer.is_alive()  # Waiting, not given up
+    finally:
+        fcntl.flock(holder, fcntl.LOCK_UN)
+        holder.close()
+    writer.join(5)
+    assert done == [True]
+    assert io_utils.atomic_read_json(busy) == {"v": 2}
+
+    # Times out when the lock is never released
+    impatient = JSONStateStore(lock_timeout=0.2)
+    with open(tmp_path / ".busy.json.lock", "a") as holder:
+        fcntl.flock(holder, fcntl.LOCK_EX)
+        assert not impatient.write(busy, {"v": 3})
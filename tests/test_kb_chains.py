@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Tests for FastChainComputer's sparse similarity graph
+
+Validates:
+- Chains match connected components of a dense cosine similarity matrix
+- Coherence is the exact average pairwise similarity
+- The model and graph are persisted and reused by a new instance
+- New learnings are linked in without rebuilding the graph
+- Edited learnings are tokenized again, also after a restart
+"""
+
+import sqlite3
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+# Add AtlasForge root to path
+AF_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(AF_ROOT))
+
+import kb_analytics
+from kb_analytics import FastChainComputer
+
+TOPICS = [
+    "GPU kernel optimization with CUDA streams",
+    "JSON log parsing and validation",
+    "API retry with exponential backoff",
+    "Flask dashboard websocket updates",
+]
+
+
+def _learnings(n_missions, start=0):
+    rows = []
+    for m in range(start, start + n_missions):
+        for t, topic in enumerate(TOPICS):
+            rows.append((f"m{m}_l{t}", f"m{m}", topic, f"{topic} in mission {m} step {t}",
+                         "general" if t else "gpu_optimization", f"2026-01-{m + 1:02d}T00:00:{t:02d}"))
+    return rows
+
+
+def _insert(db_path, rows):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS learnings (
+                learning_id TEXT PRIMARY KEY, mission_id TEXT, title TEXT,
+                description TEXT, problem_domain TEXT, timestamp TEXT
+            )
+        """)
+        conn.executemany("INSERT INTO learnings VALUES (?, ?, ?, ?, ?, ?)", rows)
+    conn.close()
+
+
+def _dense_chains(rows, threshold):
+    """The previous dense implementation's components."""
+    rows = sorted(rows, key=lambda r: r[5])
+    vectorizer = TfidfVectorizer(min_df=1, max_df=0.95, ngram_range=(1, 2),
+                                 stop_words='english', max_features=3000)
+    sims = cosine_similarity(vectorizer.fit_transform([f"{r[2]} {r[3]}" for r in rows]))
+    parent = list(range(len(rows)))
+
+    def find(x):
+        while parent[x] != x:
+            x = parent[x]
+        return x
+
+    for i in range(len(rows)):
+        for j in range(i + 1, len(rows)):
+            if sims[i, j] >= threshold and rows[i][1] != rows[j][1]:
+                parent[find(i)] = find(j)
+    groups = defaultdict(list)
+    for i in range(len(rows)):
+        groups[find(i)].append(i)
+    result = {}
+    for indices in groups.values():
+        if len(indices) >= 2 and len({rows[i][1] for i in indices}) >= 2:
+            sub = sims[np.ix_(indices, indices)]
+            coherence = float(np.mean(sub[np.triu_indices(len(indices), k=1)]))
+            result[frozenset(rows[i][0] for i in indices)] = round(coherence, 3)
+    return result
+
+
+@pytest.fixture
+def computer(tmp_path):
+    FastChainComputer._instance = None
+    db_path = tmp_path / "kb.db"
+    _insert(db_path, _learnings(5))
+    yield FastChainComputer(db_path)
+    FastChainComputer._instance = None
+
+
+def _as_dict(chains):
+    return {frozenset(c['learning_ids']): c['coherence'] for c in chains}
+
+
+def test_matches_dense_components(computer):
+    chains = computer.get_learning_chains_fast(min_chain_length=2, similarity_threshold=0.5)
+    assert chains
+    assert _as_dict(chains) == _dense_chains(_learnings(5), 0.5)
+    assert chains[0]['theme'] in ("Gpu Optimization", "General")
+
+
+def test_state_is_persisted(computer, tmp_path):
+    expected = _as_dict(computer.get_learning_chains_fast())
+    assert (tmp_path / "kb_chains_graph.npz").exists()
+
+    FastChainComputer._instance = None
+    reloaded = FastChainComputer(tmp_path / "kb.db")
+    reloaded._load_state()
+    assert reloaded._graph is not None
+    assert _as_dict(reloaded.get_learning_chains_fast()) == expected
+
+
+def test_new_learnings_are_linked_incrementally(computer, monkeypatch):
+    computer.get_learning_chains_fast()
+    monkeypatch.setattr(FastChainComputer, "REBUILD_THRESHOLD", 0.5)
+    builds = []
+    original = kb_analytics.similarity_graph
+    monkeypatch.setattr(kb_analytics, "similarity_graph", lambda *a, **k: builds.append(1) or original(*a, **k))
+
+    _insert(computer.db_path, _learnings(1, start=5))
+    computer.invalidate()
+    chains = computer.get_learning_chains_fast()
+
+    assert builds == []
+    assert any("m5_l0" in c['learning_ids'] for c in chains)
+    assert set(_as_dict(chains)) == set(_dense_chains(_learnings(6), 0.5))
+
+
+def test_edited_learnings_are_revectorized(computer):
+    computer.get_learning_chains_fast()
+
+    # m0's GPU learning is rewritten about log parsing
+    rows = _learnings(5)
+    rows[0] = rows[0][:2] + (TOPICS[1], f"{TOPICS[1]} in mission 0 step 0") + rows[0][4:]
+    with sqlite3.connect(computer.db_path) as conn:
+        conn.execute("UPDATE learnings SET title = ?, description = ? WHERE learning_id = 'm0_l0'",
+                     rows[0][2:4])
+    conn.close()
+    computer.invalidate()
+    chains = computer.get_learning_chains_fast()
+    assert _as_dict(chains) == _dense_chains(rows, 0.5)
+    assert any({"m0_l0", "m1_l1"} <= set(c['learning_ids']) for c in chains)
+
+    # A new process with the persisted model sees no further change
+    FastChainComputer._instance = None
+    reloaded = FastChainComputer(computer.db_path)
+    assert _as_dict(reloaded.get_learning_chains_fast()) == _dense_chains(rows, 0.5)
+    assert reloaded._text_hashes == computer._text_hashes
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Tests for sandboxed, parallel mutation testing
+
+Validates:
+- The original file is never modified while mutants run
+- Mutants are killed or survive the same way as when tested one by one
+- Sampled mutants apply the mutation they describe
+- Timed-out test runs are killed and count as killed mutants
+- Coverage guidance skips uncovered mutants and runs only covering tests,
+  and falls back to all tests when the code is tested through subprocesses
+- Tests failing on the unmutated code abort the run; a sandbox root
+  holding the tests and the package makes them load the mutant
+"""
+
+import sys
+from pathlib import Path
+
+# Add AtlasForge root to path
+AF_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(AF_ROOT))
+
+from adversarial_testing.adversarial_runner import AdversarialConfig, AdversarialRunner
+from adversarial_testing.mutation_testing import MutationTester
+
+CODE = '''
+def add(a, b):
+    return a + b
+
+def is_positive(n):
+    return n > 0
+
+def unused(flag=True):
+    return flag
+'''
+
+TESTS = '''
+from calc import add, is_positive
+
+def test_add():
+    assert add(2, 3) == 5
+
+def test_is_positive():
+    assert is_positive(1)
+    assert not is_positive(-1)
+'''
+
+
+def _project(tmp_path):
+    (tmp_path / "calc.py").write_text(CODE)
+    (tmp_path / "test_calc.py").write_text(TESTS)
+    return tmp_path / "calc.py"
+
+
+def test_parallel_run_leaves_original_untouched(tmp_path):
+    code_path = _project(tmp_path)
+    tester = MutationTester(max_mutants=20, max_workers=3)
+
+    result = tester.run_mutation_testing(code_path, f"{sys.executable} -m pytest -q")
+
+    assert code_path.read_text() == CODE
+    assert sorted(p.name for p in tmp_path.iterdir() if not p.name.startswith(".")) == \
+        ["calc.py", "test_calc.py"]
+    by_description = {(m.location, m.description): m.killed for m in result.mutants}
+    assert by_description[("line:3", "Replace Add with Sub")] is True
+    assert by_description[("line:6", "Replace Gt with GtE")] is False  # 0 is never tested
+    assert by_description[("line:9", "Replace return value with None")] is False
+    assert all(m.error is None for m in result.mutants)
+    assert result.score.total_mutants == len(tester.generate_mutants(CODE))
+
+
+def test_sampled_mutants_match_their_description(tmp_path):
+    tester = MutationTester(max_mutants=2)
+    for _ in range(10):
+        for mutant in tester.generate_mutants(CODE):
+            if mutant.description == "Replace Add with Sub":
+                assert "a - b" in mutant.mutated_code
+            elif mutant.description == "Replace Gt with GtE":
+                assert "n >= 0" in mutant.mutated_code
+
+
+def test_timeout_kills_test_process(tmp_path):
+    code_path = _project(tmp_path)
+    tester = MutationTester(max_mutants=1, timeout_per_mutant=1)
+    mutant = tester.generate_mutants(CODE)[0]
+
+    tester.test_mutant(mutant, "sleep 30", code_path)
+
+    assert mutant.killed and mutant.error == "Timeout"
+    assert code_path.read_text() == CODE
+
+
+def test_coverage_guided_selection(tmp_path):
+    code_path = _project(tmp_path)
+    tester = MutationTester(max_mutants=20, max_workers=2)
+
+    result = tester.run_mutation_testing(code_path, f"{sys.executable} -m pytest -q")
+    mutants = {(m.location, m.description): m for m in result.mutants}
+
+    unused = mutants[("line:9", "Replace return value with None")]
+    assert unused.covered is False and not unused.killed and unused.test_output.startswith("Not covered")
+    # Default argument: evaluated at import, runs every test
+    assert mutants[("line:8", "Replace True with False")].covered is True
+
+    add = mutants[("line:3", "Replace Add with Sub")]
+    assert add.covered and add.killed
+    assert "1 deselected" in add.test_output and "test_add" in add.test_output
+    assert result.score.not_covered_mutants == 1
+
+
+def test_coverage_guidance_falls_back_without_pytest(tmp_path):
+    code_path = _project(tmp_path)
+    tester = MutationTester(max_mutants=20, max_workers=2)
+    mutant = [m for m in tester.generate_mutants(CODE) if m.location == "line:9"][0]
+
+    tester.test_mutants([mutant], f"{sys.executable} -c 'import calc'", code_path)
+
+    assert mutant.covered is None and not mutant.killed
+
+
+SUBPROCESS_TESTS = '''
+import subprocess
+import sys
+
+def check(expression):
+    subprocess.run([sys.executable, "-c", f"import calc; assert {expression}"], check=True)
+
+def test_add():
+    check("calc.add(2, 3) == 5")
+
+def test_is_positive():
+    check("calc.is_positive(1) and not calc.is_positive(-1)")
+'''
+
+
+def test_coverage_guidance_falls_back_for_subprocess_tests(tmp_path):
+    code_path = _project(tmp_path)
+    (tmp_path / "test_calc.py").write_text(SUBPROCESS_TESTS)
+    tester = MutationTester(max_mutants=20, max_workers=2)
+
+    result = tester.run_mutation_testing(code_path, f"{sys.executable} -m pytest -q")
+
+    assert all(m.covered is None for m in result.mutants)
+    assert result.score.not_covered_mutants == 0
+    add = [m for m in result.mutants if m.description == "Replace Add with Sub"][0]
+    assert add.killed
+    assert result.score.score > 0.5
+
+
+def test_mostly_uncovered_runs_all_tests(tmp_path):
+    code_path = _project(tmp_path)
+    # Traces add() in the test process, checks is_positive() in a subprocess
+    (tmp_path / "test_calc.py").write_text(SUBPROCESS_TESTS.replace(
+        'check("calc.add(2, 3) == 5")', 'assert calc_add(2, 3) == 5'
+    ).replace("import sys\n", "import sys\nfrom calc import add as calc_add\n"))
+    tester = MutationTester(max_mutants=20, max_workers=2)
+    mutants = [m for m in tester.generate_mutants(CODE) if m.location in ("line:3", "line:6")]
+
+    tester.test_mutants(mutants, f"{sys.executable} -m pytest -q", code_path)
+
+    assert all(m.covered is None for m in mutants)
+    # Killed in the subprocess instead of skipped as not covered
+    assert [m.killed for m in mutants if m.location == "line:6" and "Gt" not in m.description] == [True, True]
+
+
+def _package_project(tmp_path):
+    """calc as a package, tested from a sibling tests/ directory."""
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "__init__.py").write_text("")
+    (tmp_path / "pkg" / "calc.py").write_text(CODE)
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_calc.py").write_text(TESTS.replace("from calc", "from pkg.calc"))
+    return tmp_path / "pkg" / "calc.py"
+
+
+def test_failing_baseline_aborts(tmp_path):
+    code_path = _package_project(tmp_path)
+    tester = MutationTester(max_mutants=5, coverage_guided=False)
+
+    # Only pkg/ is copied: ../tests is missing from the sandbox
+    result = tester.run_mutation_testing(code_path, f"{sys.executable} -m pytest -q ../tests")
+    assert not result.success and "unmutated code" in result.error
+    assert result.mutants == [] and result.score is None
+
+
+def test_sandbox_root_holds_tests_and_package(tmp_path):
+    code_path = _package_project(tmp_path)
+    config = AdversarialConfig(
+        enable_red_team=False, enable_property=False, enable_blind_validation=False,
+        enable_parallel=False, max_mutants=20, mutation_sandbox_root=tmp_path
+    )
+    runner = AdversarialRunner(config)
+
+    # The tests import pkg.calc, which must resolve to the sandbox copy
+    results = runner.run_full_suite(code_path, test_command=f"{sys.executable} -m pytest -q ../tests")
+    assert results.errors == []
+    mutants = {(m.location, m.description): m for m in results.report.mutation_result.mutants}
+    assert mutants[("line:3", "Replace Add with Sub")].killed
+    assert not mutants[("line:6", "Replace Gt with GtE")].killed
+    assert code_path.read_text() == CODE
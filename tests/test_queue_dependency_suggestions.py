@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for indexed dependency suggestions in MissionQueueScheduler
+
+Validates:
+- Suggestions from candidate pairs match scoring every pair
+- Explicit dependency markers without shared tokens are still found
+- Description features are extracted once and reused while queued
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add AtlasForge root to path
+AF_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(AF_ROOT))
+
+from mission_queue_scheduler import MissionQueueScheduler, QueueState
+
+WORDS = ("auth token cache layer dashboard widget parser config scheduler queue "
+         "metrics exporter database migration endpoint websocket handler").split()
+VERBS = ["add", "create", "implement", "use", "extend", "update", "integrate", "fix", "setup", "improve"]
+PHRASES = [
+    lambda r: f"{r.choice(VERBS)} the {r.choice(WORDS)} {r.choice(WORDS)}",
+    lambda r: f"in {r.choice(['api.py', 'dashboard_ui.js', 'auth/token.py', 'config.json'])}",
+    lambda r: f"depends on {r.choice(WORDS)} {r.choice(WORDS)}",
+    lambda r: f"for the {r.choice(WORDS)}_{r.choice(WORDS)} module",
+    lambda r: "after the foundation core setup",
+]
+
+
+def _scheduler(descriptions):
+    scheduler = MissionQueueScheduler()
+    queue = [{"id": f"q{i}", "mission_title": f"Mission {i}", "mission_description": d}
+             for i, d in enumerate(descriptions)]
+    scheduler._load_queue = lambda: QueueState.from_dict({"queue": queue, "enabled": True})
+    return scheduler
+
+
+def _all_pairs(scheduler, descriptions):
+    pairs = []
+    for i in range(len(descriptions)):
+        for j in range(i + 1, len(descriptions)):
+            confidence, _ = scheduler._calculate_dependency_confidence(descriptions[i], descriptions[j])
+            if confidence >= scheduler.CONFIDENCE_THRESHOLD:
+                pairs.append((f"q{i}", f"q{j}", round(confidence, 2)))
+    return sorted(pairs)
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_matches_pairwise_scoring(seed):
+    r = random.Random(seed)
+    descriptions = [", ".join(r.choice(PHRASES)(r) for _ in range(r.randint(2, 6))) for _ in range(60)]
+    scheduler = _scheduler(descriptions)
+
+    suggestions = scheduler.suggest_dependencies()
+
+    assert suggestions
+    assert sorted((s["mission_a"], s["mission_b"], s["confidence"]) for s in suggestions) == \
+        _all_pairs(scheduler, descriptions)
+    confidences = [s["confidence"] for s in suggestions]
+    assert confidences == sorted(confidences, reverse=True)
+
+
+def test_explicit_marker_without_shared_tokens():
+    descriptions = ["Initial db setup", "Unrelated chores", "Improve speed, requires db"]
+    suggestions = _scheduler(descriptions).suggest_dependencies()
+
+    assert [(s["mission_a"], s["mission_b"]) for s in suggestions] == [("q0", "q2")]
+    assert "Explicit dependency: 'db' in A" in suggestions[0]["reason"]
+
+
+def test_features_cached_per_description():
+    descriptions = ["Create the parser module", "Extend the parser with caching", "Fix the exporter"]
+    scheduler = _scheduler(descriptions)
+    extracted = []
+    original = scheduler._extract_features
+
+    def tracking_extract(description):
+        extracted.append(description)
+        return original(description)
+
+    scheduler._extract_features = tracking_extract
+    scheduler.suggest_dependencies()
+    scheduler.suggest_dependencies()
+    assert extracted == descriptions
+
+    descriptions[2] = "Update the exporter"
+    scheduler._load_queue = _scheduler(descriptions)._load_queue
+    scheduler.suggest_dependencies()
+    assert extracted[3:] == ["Update the exporter"]
+    assert len(scheduler._feature_cache) == 3
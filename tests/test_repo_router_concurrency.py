@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Tests for concurrent multi-repo operations in the repo router
+
+Validates:
+- get_repo_status parses a single porcelain v2 status call
+- map_repos runs repos concurrently but never two operations on one repo
+- sync_all and commit_all handle several repos and keep result order
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add AtlasForge root to path
+AF_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(AF_ROOT))
+
+from repo_router import ChangeDispatcher, RepoConfig, RepoRegistry, RepoRouter, RouteResult, RoutedFile
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Test", "GIT_AUTHOR_EMAIL": "test@example.com",
+    "GIT_COMMITTER_NAME": "Test", "GIT_COMMITTER_EMAIL": "test@example.com",
+}
+
+
+@pytest.fixture(autouse=True)
+def git_identity(monkeypatch):
+    for key, value in GIT_ENV.items():
+        monkeypatch.setenv(key, value)
+
+
+def git(path, *args):
+    return subprocess.run(["git", "-C", str(path), *args], check=True, capture_output=True, text=True).stdout
+
+
+def make_repo(tmp_path, name):
+    """A repo with one pushed commit and an 'origin' bare remote."""
+    remote = tmp_path / f"{name}.git"
+    path = tmp_path / name
+    git(tmp_path, "init", "-q", "--bare", str(remote))
+    git(tmp_path, "init", "-q", "-b", "main", str(path))
+    (path / "a.txt").write_text("a\n")
+    git(path, "add", "a.txt")
+    git(path, "commit", "-q", "-m", "initial")
+    git(path, "remote", "add", "origin", str(remote))
+    git(path, "push", "-q", "-u", "origin", "main")
+    return RepoConfig(id=name, name=name, path=str(path), remote="origin")
+
+
+def test_status_from_one_call(tmp_path):
+    repo = make_repo(tmp_path, "r1")
+    path = Path(repo.path)
+    (path / "a.txt").write_text("changed\n")
+    (path / "new.txt").write_text("new\n")
+    (path / "b.txt").write_text("b\n")
+    git(path, "add", "b.txt")
+    git(path, "commit", "-q", "-m", "second")
+    git(path, "mv", "b.txt", "c.txt")
+
+    dispatcher = ChangeDispatcher(RepoRegistry({repo.id: repo}), str(tmp_path))
+    status = dispatcher.get_repo_status(repo)
+
+    assert sorted((c["status"], c["file"]) for c in status["changes"]) == [
+        (" M", "a.txt"), ("??", "new.txt"), ("R ", "b.txt -> c.txt")
+    ]
+    assert status["has_changes"]
+    assert (status["ahead"], status["behind"]) == (1, 0)
+    assert (status["branch"], status["upstream"]) == ("main", "origin/main")
+
+
+def test_map_repos_is_concurrent_per_repo_serial(tmp_path):
+    repos = [RepoConfig(id=f"r{i}", name=f"r{i}", path=str(tmp_path / f"r{i}")) for i in range(4)]
+    # The same path twice: must not overlap
+    repos.append(RepoConfig(id="alias", name="alias", path=str(tmp_path / "r0")))
+    dispatcher = ChangeDispatcher(RepoRegistry({r.id: r for r in repos}), str(tmp_path), max_workers=5)
+
+    active = {}
+    overlaps = []
+    lock = threading.Lock()
+
+    def operation(repo):
+        with lock:
+            active[repo.path] = active.get(repo.path, 0) + 1
+            if active[repo.path] > 1:
+                overlaps.append(repo.path)
+        time.sleep(0.2)
+        with lock:
+            active[repo.path] -= 1
+        return repo.id
+
+    start = time.monotonic()
+    assert dispatcher.map_repos(repos, operation) == ["r0", "r1", "r2", "r3", "alias"]
+    elapsed = time.monotonic() - start
+
+    assert not overlaps
+    assert elapsed < 0.2 * len(repos)
+
+
+def test_map_repos_raises_after_all_ran(tmp_path):
+    repos = [RepoConfig(id=f"r{i}", name=f"r{i}", path=str(tmp_path / f"r{i}")) for i in range(3)]
+    dispatcher = ChangeDispatcher(RepoRegistry({r.id: r for r in repos}), str(tmp_path))
+    ran = []
+
+    def operation(repo):
+        ran.append(repo.id)
+        if repo.id == "r0":
+            raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        dispatcher.map_repos(repos, operation)
+    assert sorted(ran) == ["r0", "r1", "r2"]
+
+
+def test_commit_and_sync_all(tmp_path):
+    repos = [make_repo(tmp_path, f"r{i}") for i in range(3)]
+    router = RepoRouter(config_path=str(tmp_path / "missing.yaml"), atlasforge_root=str(tmp_path))
+    router.registry = RepoRegistry({r.id: r for r in repos})
+    router.dispatcher = ChangeDispatcher(router.registry, str(tmp_path))
+
+    route = RouteResult(files_by_repo={}, unrouted_files=[], warnings=[])
+    for repo in repos[:2]:
+        (Path(repo.path) / "new.txt").write_text(repo.id)
+        route.files_by_repo[repo.id] = [RoutedFile(
+            file_path=f"{repo.id}/new.txt", absolute_path=os.path.join(repo.path, "new.txt"),
+            repo_id=repo.id, repo_path=repo.path, rule_pattern="**", rule_priority=0
+        )]
+
+    results = router.commit_all(route, "add new.txt", per_repo_messages={"r1": "custom"})
+    assert [(r.repo_id, r.success, r.files_committed) for r in results] == [
+        ("r0", True, ["new.txt"]), ("r1", True, ["new.txt"])
+    ]
+    assert git(repos[1].path, "log", "-1", "--format=%s").strip() == "custom"
+
+    status = router.get_status()
+    assert status["repos_ahead"] == 2
+
+    results = router.sync_all()
+    assert [r["message"] for r in results] == ["Pushed to origin", "Pushed to origin", "Already up to date"]
+    assert all(r["success"] for r in results)
+    for repo in repos:
+        assert router.dispatcher.get_repo_status(repo)["ahead"] == 0
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming TF-IDF behind SemanticIndex
+
+Validates:
+- StreamingTfidf matches TfidfVectorizer similarities, also after removals
+- SemanticIndex persists its model next to the database and resumes from it
+- Pending additions are applied without re-tokenizing the corpus
+- Learnings whose text changed are re-vectorized
+- The state is rewritten at checkpoints, not after every addition
+- invalidate() discards the persisted state
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+# Add AtlasForge root to path
+AF_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(AF_ROOT))
+
+from mission_knowledge_base import SemanticIndex
+from streaming_tfidf import StreamingTfidf
+
+PARAMS = dict(min_df=1, max_df=0.95, ngram_range=(1, 2), stop_words='english',
+              sublinear_tf=True, max_features=5000)
+
+DOCS = [
+    "GPU kernel optimization with CUDA streams",
+    "File parsing of JSON logs",
+    "API integration with retries and backoff",
+    "GPU memory optimization tricks",
+    "Parsing CSV files with pandas",
+    "Retry backoff for flaky API calls",
+]
+
+
+def _make_db(path: Path, docs):
+    with sqlite3.connect(path) as conn:
+        conn.execute("""
+            CREATE TABLE learnings (
+                learning_id TEXT PRIMARY KEY, title TEXT, description TEXT, problem_domain TEXT
+            )
+        """)
+        conn.executemany("INSERT INTO learnings VALUES (?, ?, ?, ?)",
+                         [(f"l{i}", doc, "", "") for i, doc in enumerate(docs)])
+
+
+class TestStreamingTfidf:
+    """Tests for StreamingTfidf."""
+
+    def test_matches_tfidf_vectorizer(self):
+        expected = TfidfVectorizer(**PARAMS).fit_transform(DOCS)
+        model = StreamingTfidf(**PARAMS)
+        model.add_documents(DOCS[:2])
+        model.add_documents(DOCS[2:])
+
+        assert np.allclose((model.matrix @ model.matrix.T).toarray(),
+                           (expected @ expected.T).toarray())
+
+    def test_remove_documents(self, tmp_path):
+        model = StreamingTfidf(**PARAMS)
+        model.add_documents(DOCS)
+        model.save(tmp_path / "state.npz", {'ids': list(range(len(DOCS)))})
+
+        restored = StreamingTfidf(**PARAMS)
+        assert restored.load(tmp_path / "state.npz") == {'ids': list(range(len(DOCS)))}
+        restored.remove_documents([1, 4])
+
+        kept = [doc for i, doc in enumerate(DOCS) if i not in (1, 4)]
+        expected = TfidfVectorizer(**PARAMS).fit_transform(kept)
+        assert np.allclose((restored.matrix @ restored.matrix.T).toarray(),
+                           (expected @ expected.T).toarray())
+
+
+class TestSemanticIndexStreaming:
+    """Tests for SemanticIndex persistence and incremental updates."""
+
+    def test_resumes_from_persisted_state(self, tmp_path):
+        db_path = tmp_path / "kb.db"
+        _make_db(db_path, DOCS)
+        assert SemanticIndex(db_path).fit()
+        assert (tmp_path / "kb_tfidf.npz").exists()
+
+        index = SemanticIndex(db_path)
+        with patch.object(StreamingTfidf, 'add_documents') as add_documents:
+            assert index.fit()
+        add_documents.assert_not_called()
+        assert index.query("gpu optimization", top_k=1)[0][0] in ("l0", "l3")
+
+    def test_catches_up_with_database(self, tmp_path):
+        db_path = tmp_path / "kb.db"
+        _make_db(db_path, DOCS)
+        SemanticIndex(db_path).fit()
+
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("DELETE FROM learnings WHERE learning_id = 'l0'")
+            conn.execute("INSERT INTO learnings VALUES ('l9', 'Shader compilation cache', '', '')")
+
+        index = SemanticIndex(db_path)
+        index.fit()
+        assert sorted(index.learning_ids) == sorted(["l1", "l2", "l3", "l4", "l5", "l9"])
+        assert index.query("shader cache", top_k=1)[0][0] == "l9"
+
+    def test_pending_additions_are_incremental(self, tmp_path):
+        db_path = tmp_path / "kb.db"
+        _make_db(db_path, DOCS)
+        index = SemanticIndex(db_path)
+        index.fit()
+
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("INSERT INTO learnings VALUES ('l9', 'Shader compilation cache', '', '')")
+        with patch.object(index, 'fit') as fit:
+            index.add_learning_incremental("l9", "Shader compilation cache")
+            assert index.query("shader compilation", top_k=1)[0][0] == "l9"
+        fit.assert_not_called()
+        assert index.tfidf_matrix.shape[0] == len(DOCS) + 1
+
+        # Not saved yet: the next fit() reads it from the database
+        reopened = SemanticIndex(db_path)
+        reopened.fit()
+        assert "l9" in reopened.learning_ids
+
+    def test_edited_learnings_are_revectorized(self, tmp_path):
+        db_path = tmp_path / "kb.db"
+        _make_db(db_path, DOCS)
+        SemanticIndex(db_path).fit()
+
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("UPDATE learnings SET title = 'Zebra giraffe savanna' WHERE learning_id = 'l3'")
+
+        index = SemanticIndex(db_path)
+        index.fit()
+        assert index.query("zebra giraffe savanna", top_k=1)[0][0] == "l3"
+        assert sorted(index.learning_ids) == sorted(f"l{i}" for i in range(len(DOCS)))
+
+        # Re-stored with new text while the index is loaded
+        assert index.add_learning_incremental("l1", "Lion pride hunting") is True
+        assert index.add_learning_incremental("l2", DOCS[2]) is False
+        index.ensure_up_to_date()
+        assert index.query("lion pride", top_k=1)[0][0] == "l1"
+        assert index.tfidf_matrix.shape[0] == len(DOCS)
+
+    def test_state_saved_at_checkpoints(self, tmp_path):
+        db_path = tmp_path / "kb.db"
+        _make_db(db_path, DOCS * 5)
+        index = SemanticIndex(db_path)
+        index.fit()
+
+        with patch.object(StreamingTfidf, 'save') as save:
+            for i in range(12):
+                index.add_learning_incremental(f"n{i}", f"Shader compilation cache {i}")
+                index.ensure_up_to_date()
+        # 30 learnings: saved once 8 of 38 rows are unsaved, the next save needs 10 more
+        assert save.call_count == 1
+
+    def test_invalidate_discards_state(self, tmp_path):
+        db_path = tmp_path / "kb.db"
+        _make_db(db_path, DOCS)
+        index = SemanticIndex(db_path)
+        index.fit()
+
+        index.invalidate()
+        assert not (tmp_path / "kb_tfidf.npz").exists()
+        assert index.fit()
+        assert len(index.learning_ids) == len(DOCS)
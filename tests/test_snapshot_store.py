@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed mission snapshot store
+
+Validates:
+- Snapshots round-trip through restore and get_snapshot_content
+- Successive snapshots only write the chunks that changed
+- verify_snapshot detects corrupt or missing chunks
+- Rotation deletes chunks no longer referenced
+- Chunks collected by another process are written again
+- Legacy full-copy snapshots remain readable
+"""
+
+import json
+import sys
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add AtlasForge root to path
+AF_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(AF_ROOT))
+
+from mission_snapshot_manager import SnapshotManager
+
+
+def make_mission(history_size):
+    return {
+        'mission_id': 'm1',
+        'current_stage': 'BUILDING',
+        'iteration': 3,
+        'problem_statement': 'Build a thing. ' * 200,
+        'history': [
+            {'stage': 'BUILDING', 'event': f'Step {i}', 'details': 'x' * 200}
+            for i in range(history_size)
+        ],
+    }
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = SnapshotManager(snapshots_dir=tmp_path / "snapshots", mission_path=tmp_path / "mission.json")
+    # Rotation runs in a background thread after each snapshot
+    manager.rotate_snapshots = lambda *args, **kwargs: None
+    return manager
+
+
+def write_mission(manager, mission):
+    with open(manager.mission_path, 'w') as f:
+        json.dump(mission, f, indent=2)
+
+
+def chunk_files(manager):
+    return set((manager.snapshots_dir / "chunks").glob('*/*.z'))
+
+
+def test_round_trip(manager):
+    mission = make_mission(500)
+    write_mission(manager, mission)
+    snapshot = manager.create_snapshot(stage_hint='test')
+
+    assert manager.verify_snapshot(snapshot.snapshot_id)
+    assert manager.get_snapshot_content(snapshot.snapshot_id) == mission
+
+    write_mission(manager, {'mission_id': 'm1', 'current_stage': 'COMPLETE'})
+    assert manager.restore_snapshot(snapshot.snapshot_id)
+    with open(manager.mission_path) as f:
+        restored = json.load(f)
+    assert restored == mission
+    assert list(restored) == list(mission)
+
+
+def test_unchanged_chunks_are_shared(manager):
+    mission = make_mission(2000)
+    write_mission(manager, mission)
+    first = manager.create_snapshot()
+    first_size = sum(p.stat().st_size for p in chunk_files(manager))
+    before = chunk_files(manager)
+
+    # Appending to and trimming the history only touches chunks at its ends
+    mission['history'] = mission['history'][100:] + [{'stage': 'BUILDING', 'event': 'new'}]
+    mission['iteration'] = 4
+    write_mission(manager, mission)
+    second = manager.create_snapshot()
+
+    added = chunk_files(manager) - before
+    added_size = sum(p.stat().st_size for p in added)
+    assert added_size < first_size / 5
+    assert Path(second.file_path).stat().st_size < 20000
+
+    assert manager.get_snapshot_content(first.snapshot_id)['history'][0]['event'] == 'Step 0'
+    assert manager.get_snapshot_content(second.snapshot_id) == mission
+
+
+def test_verify_detects_bad_chunks(manager):
+    write_mission(manager, make_mission(300))
+    snapshot = manager.create_snapshot()
+    chunk = sorted(chunk_files(manager))[0]
+
+    data = chunk.read_bytes()
+    chunk.write_bytes(zlib.compress(b'[]'))
+    assert not manager.verify_snapshot(snapshot.snapshot_id)
+    assert not manager.restore_snapshot(snapshot.snapshot_id)
+
+    chunk.write_bytes(data)
+    assert manager.verify_snapshot(snapshot.snapshot_id)
+    chunk.unlink()
+    assert not manager.verify_snapshot(snapshot.snapshot_id)
+
+
+def age_snapshot(snapshot, days, minutes=0):
+    with open(snapshot.file_path) as f:
+        data = json.load(f)
+    timestamp = datetime.now().replace(hour=12) - timedelta(days=days, minutes=minutes)
+    data['snapshot_metadata']['timestamp'] = timestamp.isoformat()
+    with open(snapshot.file_path, 'w') as f:
+        json.dump(data, f)
+
+
+def test_rotation_collects_unreferenced_chunks(manager):
+    snapshots = []
+    for statement in ('First. ', 'Second. ', 'Third. '):
+        mission = make_mission(300)
+        mission['problem_statement'] = statement * 200
+        write_mission(manager, mission)
+        snapshots.append(manager.create_snapshot())
+    oldest, same_day, latest = snapshots
+
+    # Two snapshots on the same old day: only the newest of them is kept
+    age_snapshot(oldest, days=3, minutes=10)
+    age_snapshot(same_day, days=3)
+    SnapshotManager.rotate_snapshots(manager)
+
+    assert manager.get_snapshot_by_id(oldest.snapshot_id) is None
+    referenced = set()
+    for snapshot in (same_day, latest):
+        assert manager.verify_snapshot(snapshot.snapshot_id)
+        referenced.update(manager._manifest_chunks(json.loads(Path(snapshot.file_path).read_text())))
+    assert {p.stem for p in chunk_files(manager)} == referenced
+    assert manager.get_snapshot_content(latest.snapshot_id) == mission
+
+
+def test_chunks_collected_elsewhere_are_rewritten(manager):
+    mission = make_mission(300)
+    write_mission(manager, mission)
+    first = manager.create_snapshot()
+
+    # Another process rotates out every snapshot and collects their chunks
+    other = SnapshotManager(snapshots_dir=manager.snapshots_dir, mission_path=manager.mission_path)
+    Path(first.file_path).unlink()
+    with other._store_lock():
+        other._collect_garbage()
+    assert chunk_files(manager) == set()
+
+    # Same content again: the chunks must not be assumed to exist
+    second = manager.create_snapshot()
+    assert manager.verify_snapshot(second.snapshot_id)
+    assert manager.get_snapshot_content(second.snapshot_id) == mission
+
+
+def test_legacy_snapshot_is_readable(manager):
+    mission = make_mission(3)
+    path = manager.snapshots_dir / "snapshot_m1_legacy.json"
+    path.write_text(json.dumps({
+        'snapshot_metadata': {
+            'snapshot_id': 'snapshot_m1_legacy', 'mission_id': 'm1',
+            'timestamp': datetime.now().isoformat(), 'stage': 'BUILDING',
+            'sha256_hash': 'a' * 64, 'file_path': str(path), 'extra': {}
+        },
+        'mission_state': mission
+    }, indent=2))
+
+    assert manager.verify_snapshot('snapshot_m1_legacy')
+    assert manager.get_snapshot_content('snapshot_m1_legacy') == mission
+    assert manager.restore_snapshot('snapshot_m1_legacy')
+    assert json.loads(manager.mission_path.read_text()) == mission
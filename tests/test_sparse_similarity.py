@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for the blocked sparse similarity join
+
+Validates:
+- similarity_graph() finds exactly the pairs a dense all-pairs pass finds
+- Block size does not change the result and top_k caps each row
+- row_neighbors() extends a graph with new rows
+- average_linkage_clusters() matches scikit-learn's average linkage
+- SemanticIndex duplicate detection and clustering run on the graph
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import numpy as np
+from scipy.sparse import random as sparse_random
+from sklearn.cluster import AgglomerativeClustering
+from sklearn.metrics import adjusted_rand_score
+from sklearn.preprocessing import normalize
+
+# Add AtlasForge root to path
+AF_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(AF_ROOT))
+
+from mission_knowledge_base import SemanticIndex
+from sparse_similarity import average_linkage_clusters, row_neighbors, similarity_graph
+
+
+def _matrix(n=300, features=200, seed=0):
+    rng = np.random.default_rng(seed)
+    matrix = sparse_random(n, features, density=0.05, format='csr', random_state=seed)
+    # Plant near-duplicates so high thresholds have something to find
+    matrix = matrix.tolil()
+    for i in range(0, 40, 2):
+        matrix[i + 1] = matrix[i] * (1 + rng.random() * 0.01)
+    return normalize(matrix.tocsr())
+
+
+def _dense_pairs(matrix, threshold):
+    sims = (matrix @ matrix.T).toarray()
+    np.fill_diagonal(sims, 0.0)
+    return np.where(sims >= threshold, sims, 0.0)
+
+
+class TestSimilarityGraph:
+    """Tests for similarity_graph()."""
+
+    def test_matches_dense_pairs(self):
+        matrix = _matrix()
+        for threshold in (0.2, 0.5, 0.9):
+            graph = similarity_graph(matrix, threshold, top_k=None, block_size=37)
+            assert np.allclose(graph.toarray(), _dense_pairs(matrix, threshold))
+
+    def test_top_k_caps_rows(self):
+        matrix = _matrix()
+        graph = similarity_graph(matrix, 0.05, top_k=3, block_size=64)
+        full = similarity_graph(matrix, 0.05, top_k=None)
+
+        # Every kept pair is a real pair, and each row's strongest pair survives
+        assert np.allclose(graph.toarray()[graph.toarray() > 0], full.toarray()[graph.toarray() > 0])
+        assert np.allclose(graph.toarray().max(axis=1), full.toarray().max(axis=1))
+
+
+    def test_row_neighbors_extend_graph(self):
+        matrix = _matrix()
+        graph = similarity_graph(matrix[:250], 0.2, top_k=None)
+        added = row_neighbors(matrix, np.arange(250, 300), 0.2, top_k=None, block_size=16)
+
+        graph.resize((300, 300))
+        extended = graph.maximum(added).maximum(added.T)
+        assert np.allclose(extended.toarray(), _dense_pairs(matrix, 0.2))
+
+
+class TestAverageLinkageClusters:
+    """Tests for average_linkage_clusters()."""
+
+    def test_matches_agglomerative_clustering(self):
+        matrix = _matrix(n=200)
+        for distance_threshold in (0.5, 0.8):
+            expected = AgglomerativeClustering(
+                n_clusters=None, distance_threshold=distance_threshold,
+                metric='cosine', linkage='average'
+            ).fit_predict(matrix.toarray())
+            labels = average_linkage_clusters(similarity_graph(matrix, 0.0, top_k=None), distance_threshold)
+            assert adjusted_rand_score(expected, labels) == 1.0
+
+
+class TestSemanticIndexGraph:
+    """Tests for SemanticIndex on top of the neighbour graph."""
+
+    def test_duplicates_and_clusters(self, tmp_path):
+        db_path = tmp_path / "kb.db"
+        docs = [
+            "Retry flaky API calls with exponential backoff",
+            "Retry flaky API calls with exponential backoff and jitter",
+            "Cache GPU kernels between CUDA builds",
+            "Cache compiled GPU kernels between CUDA builds",
+            "Parse JSON logs line by line",
+        ]
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("CREATE TABLE learnings (learning_id TEXT PRIMARY KEY, title TEXT, "
+                         "description TEXT, problem_domain TEXT)")
+            conn.executemany("INSERT INTO learnings VALUES (?, ?, '', '')",
+                             [(f"l{i}", doc) for i, doc in enumerate(docs)])
+
+        index = SemanticIndex(db_path)
+        groups = index.find_duplicates(threshold=0.7)
+        assert sorted(sorted(g['learning_ids']) for g in groups) == [["l0", "l1"], ["l2", "l3"]]
+
+        clusters = index.get_clusters(distance_threshold=0.5)
+        assert sorted(sorted(c) for c in clusters.values()) == [["l0", "l1"], ["l2", "l3"], ["l4"]]
+        assert index.get_representative_learning(["l0", "l1"]) in ("l0", "l1")
+        assert 0.7 < index.compute_cluster_coherence(["l0", "l1"]) <= 1.0
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite connection pool and bulk learning hydration
+
+Validates:
+- Pooled connections are reused, run in WAL mode and roll back on error
+- Idle connections are dropped when the database file is replaced
+- query_relevant_learnings hydrates index hits with one bulk query
+- Decoded learnings are cached until the database changes
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add AtlasForge root to path
+AF_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(AF_ROOT))
+
+from mission_knowledge_base import MissionKnowledgeBase, MissionLearning
+from sqlite_pool import SQLitePool, in_placeholders
+
+
+def test_connections_are_reused_in_wal_mode(tmp_path):
+    pool = SQLitePool(tmp_path / "test.db")
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE t (v INTEGER)")
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    with pool.connection() as conn:
+        conn.execute("INSERT INTO t VALUES (1)")
+
+    assert pool.get_stats() == {"opened": 1, "reused": 1, "idle": 1}
+    pool.close()
+
+
+def test_error_rolls_back(tmp_path):
+    pool = SQLitePool(tmp_path / "test.db")
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE t (v INTEGER)")
+
+    with pytest.raises(RuntimeError):
+        with pool.connection() as conn:
+            conn.execute("INSERT INTO t VALUES (1)")
+            raise RuntimeError("boom")
+
+    with pool.connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    pool.close()
+
+
+def test_replaced_database_is_reopened(tmp_path):
+    path = tmp_path / "test.db"
+    pool = SQLitePool(path)
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE t (v INTEGER)")
+
+    # Replaced by another process
+    replacement = tmp_path / "new.db"
+    with sqlite3.connect(replacement) as conn:
+        conn.execute("CREATE TABLE other (v INTEGER)")
+    conn.close()
+    for suffix in ("-wal", "-shm"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+    replacement.replace(path)
+
+    with pool.connection() as conn:
+        tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master")}
+    assert tables == {"other"}
+    assert pool.get_stats()["opened"] == 2
+    pool.close()
+
+
+def test_in_placeholders_pad_to_buckets():
+    placeholders, params = in_placeholders(["a", "b", "c"])
+    assert placeholders.count("?") == 8
+    assert params == ["a", "b", "c"] + ["c"] * 5
+    assert in_placeholders(list(range(9)))[0].count("?") == 16
+
+
+@pytest.fixture
+def kb(tmp_path):
+    kb = MissionKnowledgeBase(storage_path=tmp_path, use_hybrid=False)
+    topics = ["GPU kernel tuning", "JSON log parsing", "API retry backoff",
+              "GPU memory pooling", "CSV parsing with pandas", "Flaky API calls"]
+    for i, topic in enumerate(topics):
+        kb._store_learning(MissionLearning(
+            learning_id=f"l{i}", mission_id=f"m{i}", learning_type="technique",
+            title=topic, description=f"How to handle {topic}", problem_domain="general",
+            outcome="success"
+        ))
+    return kb
+
+
+def test_query_hydrates_with_one_query(kb):
+    kb._semantic_index.fit()
+    queries = []
+    original = kb._pool.connection
+
+    def tracking_connection():
+        queries.append(1)
+        return original()
+
+    kb._pool.connection = tracking_connection
+    results = kb.query_relevant_learnings("GPU tuning and memory", top_k=3)
+
+    assert results and results[0]["learning_id"] in ("l0", "l3")
+    assert len(queries) == 1
+
+    # Served from the cache the second time
+    kb.query_relevant_learnings("GPU tuning and memory", top_k=3)
+    assert len(queries) == 1
+
+
+def test_cache_follows_database_changes(kb):
+    assert kb._get_learning_by_id("l1").title == "JSON log parsing"
+
+    # Written by another process
+    with sqlite3.connect(kb.db_path) as conn:
+        conn.execute("UPDATE learnings SET title = 'Changed' WHERE learning_id = 'l1'")
+    conn.close()
+
+    assert kb._get_learning_by_id("l1").title == "Changed"
+    assert kb._get_learning_by_id("missing") is None
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Tests for MinHash/LSH near-duplicate detection of suggestions
+
+Validates:
+- LSH parameters reach the recall target at the threshold
+- MergeCandidateIndex finds the same merge candidates as the full scan
+- Signatures are stored on write, refreshed on text edits and dropped on delete
+- find_similar queries stored suggestions with exact verification, most similar first
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add AtlasForge root to path
+AF_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(AF_ROOT))
+
+from minhash_lsh import MIN_RECALL, MinHashLSH, lsh_params, minhash_signature
+from suggestion_analyzer import HealthAnalyzer, MergeCandidateIndex
+from suggestion_storage import SQLiteSuggestionStorage
+
+VOCABULARY = [f"word{i}" for i in range(400)]
+
+
+def make_suggestions(count, seed=0):
+    """Random suggestions, a third of them near-copies of an earlier one."""
+    rng = random.Random(seed)
+    suggestions = []
+    for i in range(count):
+        if suggestions and i % 3 == 0:
+            base = rng.choice(suggestions)
+            words = base['mission_description'].split()
+            words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+            description = ' '.join(words)
+            title = base['mission_title']
+        else:
+            description = ' '.join(rng.sample(VOCABULARY, 12))
+            title = ' '.join(rng.sample(VOCABULARY, 3))
+        suggestions.append({'id': f"s{i}", 'mission_title': title, 'mission_description': description})
+    return suggestions
+
+
+@pytest.mark.parametrize("threshold", [0.4, 0.5, 0.7])
+def test_lsh_params_reach_recall(threshold):
+    bands, rows = lsh_params(threshold)
+    assert 1 - (1 - threshold ** rows) ** bands >= MIN_RECALL
+    assert bands * rows <= 128
+
+
+def test_identical_sets_always_collide():
+    lsh = MinHashLSH(0.5)
+    lsh.insert("a", minhash_signature({"x", "y", "z"}))
+    lsh.insert("empty", minhash_signature(set()))
+    assert lsh.query(minhash_signature({"z", "y", "x"})) == {"a"}
+    assert len(lsh) == 1
+    lsh.remove("a")
+    assert lsh.query(minhash_signature({"x", "y", "z"})) == set()
+
+
+def test_index_matches_full_scan():
+    suggestions = make_suggestions(600)
+    analyzer = HealthAnalyzer()
+    index = MergeCandidateIndex(suggestions)
+
+    missed = 0
+    expected_total = 0
+    for suggestion in suggestions:
+        expected = analyzer.get_merge_candidates(suggestion, suggestions)
+        found = analyzer.get_merge_candidates(suggestion, suggestions, index=index)
+        # Candidates are verified exactly: no false positives, same order
+        assert [i for i in expected if i in found] == found
+        missed += len(expected) - len(found)
+        expected_total += len(expected)
+
+    assert expected_total > 100
+    assert missed <= expected_total * (1 - MIN_RECALL)
+
+
+def test_index_threshold_mismatch_falls_back_to_full_scan():
+    suggestions = make_suggestions(30)
+    analyzer = HealthAnalyzer()
+    index = MergeCandidateIndex(suggestions, threshold=0.5)
+    for suggestion in suggestions:
+        assert analyzer.get_merge_candidates(suggestion, suggestions, threshold=0.4, index=index) == \
+            analyzer.get_merge_candidates(suggestion, suggestions, threshold=0.4)
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return SQLiteSuggestionStorage(db_path=tmp_path / "suggestions.db")
+
+
+def test_signatures_follow_writes(storage):
+    storage.add({'id': 'a', 'mission_title': 'Add retry', 'mission_description': 'to the API client'})
+    storage.add({'id': 'b', 'mission_title': 'Add retry', 'mission_description': 'to the API client now'})
+    storage.add({'id': 'c', 'mission_title': 'Profile', 'mission_description': 'the GPU kernels'})
+
+    signatures = storage.get_minhash_signatures()
+    assert set(signatures) == {'a', 'b', 'c'}
+    assert storage.find_similar('add retry to the api client', exclude_id='a') == ['b']
+
+    assert storage.find_similar('Profile the memory allocator') == []
+    storage.update('c', {'mission_description': 'the memory allocator'})
+    assert storage.get_minhash_signatures()['c'][0] != signatures['c'][0]
+    assert storage.find_similar('Profile the memory allocator') == ['c']
+
+    # Other fields leave the signature alone
+    before = storage.get_minhash_signatures()['a']
+    storage.update('a', {'priority_score': 5})
+    assert storage.get_minhash_signatures()['a'] is before
+
+    storage.delete('b')
+    assert set(storage.get_minhash_signatures()) == {'a', 'c'}
+    assert storage.find_similar('add retry to the api client', exclude_id='a') == []
+
+
+def test_stored_signatures_are_reused(storage):
+    suggestions = make_suggestions(60)
+    storage.upsert_batch(suggestions)
+    signatures = storage.get_minhash_signatures()
+
+    with_stored = MergeCandidateIndex(suggestions, signatures=signatures)
+    computed = MergeCandidateIndex(suggestions)
+    for suggestion in suggestions:
+        assert with_stored.candidates(suggestion) == computed.candidates(suggestion)
+
+
+def test_find_similar_ranks_by_similarity(storage):
+    storage.add({'id': 'a', 'mission_title': 'Add retry', 'mission_description': 'to the API client now please'})
+    storage.add({'id': 'z', 'mission_title': 'Add retry', 'mission_description': 'to the API client'})
+
+    assert storage.find_similar('add retry to the api client') == ['z', 'a']
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests for batched transcript ingestion in MissionAnalytics
+
+Validates:
+- Transcript usage is recorded once, with duplicate request IDs skipped
+- Re-ingestion only parses the appended tail and still reports whole-file totals
+- Partial trailing lines are left for the next ingestion
+- Replaced transcripts are re-read from the start
+"""
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add AtlasForge root to path
+AF_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(AF_ROOT))
+
+import mission_analytics
+from mission_analytics import MissionAnalytics
+
+
+def _line(request_id, input_tokens, output_tokens=10):
+    return json.dumps({
+        "type": "assistant", "requestId": request_id,
+        "message": {"model": "claude-sonnet-4-20250514",
+                    "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens}}
+    }) + "\n"
+
+
+def _event_count(analytics):
+    with sqlite3.connect(analytics.db_path) as conn:
+        count = conn.execute("SELECT COUNT(*), SUM(input_tokens) FROM token_events").fetchone()
+    conn.close()
+    return count
+
+
+@pytest.fixture
+def analytics(tmp_path):
+    analytics = MissionAnalytics(storage_path=tmp_path / "analytics")
+    analytics.start_mission("m1")
+    analytics.start_stage("m1", "BUILDING")
+    return analytics
+
+
+def test_batch_skips_duplicates(analytics, tmp_path):
+    transcript = tmp_path / "t.jsonl"
+    transcript.write_text(_line("r1", 100) + '{"type": "user"}\n' + _line("r2", 200) + _line("r1", 100))
+
+    result = analytics.ingest_transcript(transcript, "m1", stage="BUILDING")
+
+    assert result["records_processed"] == 3
+    assert result["records_recorded"] == 2
+    assert _event_count(analytics) == (2, 300)
+    stage = next(iter(analytics.get_mission_summary("m1").stages.values()))
+    assert stage.input_tokens == 300 and stage.output_tokens == 20
+
+
+def test_reingestion_parses_tail_only(analytics, tmp_path, monkeypatch):
+    transcript = tmp_path / "t.jsonl"
+    transcript.write_text(_line("r1", 100) + _line("r2", 200))
+    analytics.ingest_transcript(transcript, "m1")
+
+    offsets = []
+    original = mission_analytics.read_jsonl_records
+
+    def tracking_read(path, offset=0, **kwargs):
+        offsets.append(offset)
+        return original(path, offset, **kwargs)
+
+    monkeypatch.setattr(mission_analytics, "read_jsonl_records", tracking_read)
+    size = transcript.stat().st_size
+    with open(transcript, "a") as f:
+        f.write(_line("r3", 300) + _line("r4", 400)[:20])  # Last line still being written
+
+    result = analytics.ingest_transcript(transcript, "m1")
+    assert offsets[0] == size
+    assert result["input_tokens"] == 600 and result["records_recorded"] == 1
+
+    with open(transcript, "a") as f:
+        f.write(_line("r4", 400)[20:])
+    result = analytics.ingest_transcript(transcript, "m1")
+    assert result["input_tokens"] == 1000 and result["records_processed"] == 4
+    assert _event_count(analytics) == (4, 1000)
+
+    # Nothing new: no parsing at all
+    offsets.clear()
+    assert analytics.ingest_transcript(transcript, "m1")["input_tokens"] == 1000
+    assert offsets == []
+
+
+def test_replaced_transcript_is_reread(analytics, tmp_path):
+    transcript = tmp_path / "t.jsonl"
+    transcript.write_text(_line("r1", 100) + _line("r2", 200))
+    analytics.ingest_transcript(transcript, "m1")
+
+    replacement = tmp_path / "new.jsonl"
+    replacement.write_text(_line("r5", 50))
+    replacement.replace(transcript)
+
+    result = analytics.ingest_transcript(transcript, "m1")
+    assert result["input_tokens"] == 50
+    assert _event_count(analytics) == (3, 350)
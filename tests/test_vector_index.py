@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Tests for the persistent NumPy vector index
+
+Validates:
+- Exact search ranks the closest vector first
+- Updates overwrite rows in place and removals drop ids from results
+- The index reopens from disk and picks up other instances' appends
+- Removed and pruned ids stay removed across reopens and are compacted away
+- The IVF coarse quantizer is trained past the threshold and keeps recall
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add AtlasForge root to path
+AF_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(AF_ROOT))
+
+from atlasforge_enhancements.vector_index import VectorIndex
+
+
+def _vectors(n, dim=32, seed=0):
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+
+class TestVectorIndex:
+    """Tests for VectorIndex."""
+
+    def test_exact_search(self, tmp_path):
+        index = VectorIndex(tmp_path, 'node')
+        vectors = _vectors(100)
+        index.add_many((f"n{i}", v) for i, v in enumerate(vectors))
+
+        results = index.search(vectors[42], top_k=3)
+        assert results[0][0] == "n42"
+        assert results[0][1] > 0.99
+        assert len(results) == 3
+
+    def test_update_and_remove(self, tmp_path):
+        index = VectorIndex(tmp_path, 'node')
+        vectors = _vectors(10)
+        index.add_many((f"n{i}", v) for i, v in enumerate(vectors))
+
+        index.add("n0", vectors[5])
+        assert len(index) == 10
+        assert {item_id for item_id, _ in index.search(vectors[5], top_k=2)} == {"n0", "n5"}
+
+        index.remove("n5")
+        assert "n5" not in index
+        assert index.search(vectors[5], top_k=1)[0][0] == "n0"
+
+    def test_reopen_and_cross_instance_appends(self, tmp_path):
+        vectors = _vectors(20)
+        first = VectorIndex(tmp_path, 'node')
+        first.add_many((f"n{i}", v) for i, v in enumerate(vectors[:10]))
+
+        second = VectorIndex(tmp_path, 'node')
+        assert len(second) == 10
+        second.add_many((f"n{i}", v) for i, v in enumerate(vectors[10:], start=10))
+
+        assert first.search(vectors[15], top_k=1)[0][0] == "n15"
+        assert len(first) == 20
+
+    def test_removals_persist_and_compact(self, tmp_path):
+        vectors = _vectors(100)
+        index = VectorIndex(tmp_path, 'node')
+        index.add_many((f"n{i}", v) for i, v in enumerate(vectors))
+        for i in range(10):
+            index.remove(f"n{i}")
+
+        # Tombstones survive a reopen, below the compaction ratio
+        reopened = VectorIndex(tmp_path, 'node')
+        assert len(reopened) == 90 and "n3" not in reopened
+        assert reopened.get_stats()['rows'] == 100
+
+        # sync() drops ids the caller no longer knows: 20 more dead rows
+        reopened.sync({f"n{i}": vectors[i] for i in range(30, 100)})
+        assert len(reopened) == 70 and "n25" not in reopened
+        assert reopened.get_stats()['rows'] == 70  # Compacted past DEAD_ROW_RATIO
+        assert reopened.search(vectors[50], top_k=1)[0][0] == "n50"
+
+    def test_compaction_on_open(self, tmp_path):
+        vectors = _vectors(40)
+        index = VectorIndex(tmp_path, 'node')
+        index.add_many((f"n{i}", v) for i, v in enumerate(vectors))
+        for i in range(20):
+            index.remove(f"n{i}")
+
+        reopened = VectorIndex(tmp_path, 'node')
+        assert reopened.get_stats()['rows'] == 20
+        assert reopened.search(vectors[30], top_k=1)[0][0] == "n30"
+
+    def test_growth_past_initial_capacity(self, tmp_path):
+        index = VectorIndex(tmp_path, 'node')
+        vectors = _vectors(3000, dim=8)
+        index.add_many((f"n{i}", v) for i, v in enumerate(vectors))
+
+        assert index.get_stats()['capacity'] >= 3000
+        assert index.search(vectors[2999], top_k=1)[0][0] == "n2999"
+
+    def test_ivf_quantizer(self, tmp_path):
+        index = VectorIndex(tmp_path, 'node', ivf_threshold=500)
+        vectors = _vectors(2000)
+        index.add_many((f"n{i}", v) for i, v in enumerate(vectors))
+
+        # Trained in the background, not by add_many()
+        index._train_thread.join()
+        stats = index.get_stats()
+        assert stats['ivf_trained']
+        hits = sum(index.search(vectors[i], top_k=1)[0][0] == f"n{i}" for i in range(0, 2000, 50))
+        assert hits == 40
+
+        reopened = VectorIndex(tmp_path, 'node', ivf_threshold=500)
+        assert reopened.get_stats()['ivf_trained']
+        assert reopened.search(vectors[7], top_k=1)[0][0] == "n7"